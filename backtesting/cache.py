@@ -0,0 +1,224 @@
+# [ 📄 backtesting/cache.py (신규 파일) ]
+# 최적화 실행 시 반복 계산되는 결과(신호 데이터셋 등)를 디스크에 저장/재사용하는 캐시
+
+import os
+import json
+import time
+import pickle
+import hashlib
+from collections import OrderedDict
+
+# 캐시 파일이 저장될 폴더 (프로젝트 루트 기준)
+CACHE_DIR = "cache"
+
+
+def _normalize(value):
+    """해시가 1 / 1.0 처럼 같은 값에 대해 달라지지 않도록 숫자 타입을 통일합니다."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+def config_hash(config, exclude=()):
+    """
+    설정 딕셔너리에서 exclude에 포함된 키를 제외한 나머지 값으로
+    결정적(deterministic) 해시 문자열을 만듭니다.
+
+    :param config: (dict) 설정값 딕셔너리
+    :param exclude: 해시 계산에서 제외할 키 목록
+    :return: 16자리 16진수 문자열
+    """
+    payload = {k: _normalize(v) for k, v in config.items() if k not in exclude}
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def file_fingerprint(path):
+    """
+    파일 크기와 수정 시각으로 데이터 버전 문자열을 만듭니다.
+    (DB가 새로 수집되면 값이 바뀌므로 오래된 캐시가 자동으로 무효화됩니다)
+    """
+    if not os.path.exists(path):
+        return 'missing'
+    st = os.stat(path)
+    return f"{st.st_size}-{int(st.st_mtime)}"
+
+
+def code_fingerprint(paths):
+    """
+    소스 파일 내용으로 코드 버전 문자열을 만듭니다.
+    (전략/지표 코드가 바뀌면 값이 바뀌므로, 예전 코드로 계산한 결과를 재사용하지 않게 됩니다)
+    """
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        digest.update(path.encode('utf-8'))
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+class DiskCache:
+    """
+    key -> 파이썬 객체를 pickle 파일로 저장하는 단순한 디스크 캐시입니다.
+    namespace별로 하위 폴더를 분리해서 사용합니다. (예: cache/portfolio_signals/)
+    """
+
+    def __init__(self, namespace, cache_dir=CACHE_DIR):
+        self.path = os.path.join(cache_dir, namespace)
+
+    def _file(self, key):
+        return os.path.join(self.path, f"{key}.pkl")
+
+    def exists(self, key):
+        return os.path.exists(self._file(key))
+
+    def get(self, key):
+        """캐시된 객체를 반환합니다. 없거나 손상된 경우 None."""
+        file_path = self._file(key)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"⚠️ 캐시 파일 손상 ({file_path}): {e}")
+            return None
+
+    def put(self, key, value):
+        """
+        객체를 저장합니다. 임시 파일에 먼저 쓴 뒤 교체하므로
+        여러 프로세스가 동시에 써도 반쯤 쓰인 파일이 읽히지 않습니다.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        file_path = self._file(key)
+        tmp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            print(f"⚠️ 캐시 저장 실패 ({file_path}): {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self):
+        """namespace 폴더의 캐시 파일을 모두 삭제합니다."""
+        if not os.path.isdir(self.path):
+            return
+        for name in os.listdir(self.path):
+            if name.endswith('.pkl'):
+                os.remove(os.path.join(self.path, name))
+
+
+# ==========================================
+# 단계별(Stage) 캐시 + 적중률 통계
+# ==========================================
+def new_stage_stats():
+    """단계 하나의 통계 딕셔너리 (적중/미스 횟수, 절약한 시간)"""
+    return {'hits': 0, 'misses': 0, 'saved_sec': 0.0}
+
+
+def merge_stage_stats(total, delta):
+    """
+    {stage: stats} 형태의 통계를 누적합니다.
+    (워커 프로세스에서 돌려받은 통계를 메인 프로세스에서 합칠 때 사용)
+    """
+    for stage, stats in delta.items():
+        acc = total.setdefault(stage, new_stage_stats())
+        for k, v in stats.items():
+            acc[k] = acc.get(k, 0) + v
+    return total
+
+
+def format_stage_report(stats_by_stage):
+    """단계별 캐시 적중률/절약 시간 리포트 문자열을 만듭니다."""
+    lines = [f"{'Stage':<12} {'Hit':>8} {'Miss':>8} {'HitRate':>9} {'Saved(s)':>10}"]
+    total_saved = 0.0
+    for stage, st in stats_by_stage.items():
+        total = st['hits'] + st['misses']
+        rate = (st['hits'] / total * 100) if total > 0 else 0.0
+        total_saved += st['saved_sec']
+        lines.append(f"{stage:<12} {st['hits']:>8} {st['misses']:>8} {rate:>8.1f}% {st['saved_sec']:>10.1f}")
+    lines.append(f"⏱️ 캐시로 절약한 계산 시간(추정): {total_saved:.1f}초")
+    return "\n".join(lines)
+
+
+class StageCache:
+    """
+    파이프라인 한 단계의 결과를 key별로 저장하는 캐시입니다.
+    프로세스 메모리(LRU) -> 디스크(persist=True일 때) 순으로 조회하고,
+    적중 시에는 '처음 계산할 때 걸린 시간 - 불러오는 데 걸린 시간'을 절약 시간으로 집계합니다.
+
+    저장 형식: (value, compute_sec)
+    """
+
+    def __init__(self, stage, persist=True, memory_size=128, namespace='stages', cache_dir=CACHE_DIR):
+        self.stage = stage
+        self.memory_size = memory_size
+        self.disk = DiskCache(os.path.join(namespace, stage), cache_dir) if persist else None
+        self._memory = OrderedDict()
+        self.stats = new_stage_stats()
+
+    def _remember(self, key, entry):
+        if self.memory_size <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_or_compute(self, key, func, refresh=False):
+        """
+        key에 해당하는 결과를 반환합니다. 없으면 func()를 호출해 계산하고 저장합니다.
+        func 안에서 상위 단계 캐시를 다시 조회하므로, 적중 시 상위 단계 전체가 생략됩니다.
+
+        :param refresh: True면 캐시를 무시하고 다시 계산
+        """
+        start = time.perf_counter()
+        entry = None
+        if not refresh:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+            elif self.disk is not None:
+                entry = self.disk.get(key)
+                if entry is not None:
+                    self._remember(key, entry)
+
+        if entry is not None:
+            value, compute_sec = entry
+            self.stats['hits'] += 1
+            self.stats['saved_sec'] += max(compute_sec - (time.perf_counter() - start), 0.0)
+            return value
+
+        value = func()
+        entry = (value, time.perf_counter() - start)
+        self.stats['misses'] += 1
+        self._remember(key, entry)
+        # 계산 실패(None)는 디스크에 남기지 않음 -> 다음 실행에서 다시 시도
+        if self.disk is not None and value is not None:
+            self.disk.put(key, entry)
+        return value
+
+    def contains(self, key):
+        """메모리 또는 디스크에 key가 있는지 확인합니다. (통계에는 반영하지 않음)"""
+        return key in self._memory or (self.disk is not None and self.disk.exists(key))
+
+    def put(self, key, value, compute_sec=0.0):
+        """
+        밖에서 미리 계산한 결과를 저장합니다. (미스 1회로 집계)
+        :param compute_sec: 계산에 걸린 시간 (이후 적중 시 절약 시간 추정에 사용)
+        """
+        entry = (value, compute_sec)
+        self.stats['misses'] += 1
+        self._remember(key, entry)
+        if self.disk is not None and value is not None:
+            self.disk.put(key, entry)
+
+    def pop_stats(self):
+        """누적 통계를 반환하고 0으로 초기화합니다. (워커 -> 메인 전달용)"""
+        stats, self.stats = self.stats, new_stage_stats()
+        return stats
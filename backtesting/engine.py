@@ -1,11 +1,17 @@
 import pandas as pd
 import config
+from backtesting.streaming import StreamingStats
 
 
-def run_backtest(df_signals, initial_capital, context):
+def run_backtest(df_signals, initial_capital, context, pruner=None, stats_only=False):
     """
     매매 신호(df_signals)를 기반으로 가상 매매를 실행합니다.
     (★) strategy_name에 따라 서로 다른 리스크 관리 로직을 적용합니다.
+
+    :param pruner: (선택) backtesting.pruning.Pruner - 체크포인트에서 규칙에 걸리면 시뮬레이션을 조기 중단하고
+                   반환되는 DataFrame의 attrs['prune_reason']에 사유를 남깁니다.
+    :param stats_only: True면 일별 기록(DataFrame) 대신 streaming.StreamingStats 누적기를 반환합니다.
+                       (조합당 메모리 O(1) - 최종 통계만 필요한 대규모 스윕용, calculate_metrics에 그대로 전달 가능)
     """
 
     # 1. 초기 설정
@@ -13,7 +19,7 @@ def run_backtest(df_signals, initial_capital, context):
     shares = 0
     portfolio_value = initial_capital
 
-    portfolio_history = []
+    portfolio_history = StreamingStats(initial_capital) if stats_only else []
     trade_history = []
 
     buy_price = 0.0
@@ -26,6 +32,9 @@ def run_backtest(df_signals, initial_capital, context):
     risk_percent = context.get('risk_percent', 0.01)
     stop_loss_atr_multiplier = context.get('stop_loss_atr', 2.0)
 
+    if pruner is not None:
+        pruner.reset()
+
     for date, row in df_signals.iterrows():
 
         current_equity = (shares * row['close']) + cash
@@ -53,6 +62,8 @@ def run_backtest(df_signals, initial_capital, context):
                     'shares': shares,
                     'pnl': (sell_price - buy_price) * shares  # PnL 기록 추가
                 })
+                if stats_only:
+                    portfolio_history.add_trade(sell_price / buy_price - 1, sell_price - buy_price)
                 shares = 0
                 buy_price = 0.0
                 stop_loss_price = 0.0
@@ -93,6 +104,8 @@ def run_backtest(df_signals, initial_capital, context):
                     'shares': shares,
                     'pnl': (sell_price - buy_price) * shares  # PnL 기록 추가
                 })
+                if stats_only:
+                    portfolio_history.add_trade(sell_price / buy_price - 1, sell_price - buy_price)
                 shares = 0
                 buy_price = 0.0
                 stop_loss_price = 0.0
@@ -131,21 +144,35 @@ def run_backtest(df_signals, initial_capital, context):
                     'shares': shares,
                     'pnl': (sell_price - buy_price) * shares  # PnL 기록 추가
                 })
+                if stats_only:
+                    portfolio_history.add_trade(sell_price / buy_price - 1, sell_price - buy_price)
                 shares = 0
 
         # 4. 일별 포트폴리오 가치 기록
         # --- [ (★) 핵심 수정 2: metrics.py 호환성 확보 ] ---
         # cash, shares, total_asset 컬럼을 명시적으로 추가해야 metrics가 계산됩니다.
         portfolio_value = (shares * row['close']) + cash
-        portfolio_history.append({
-            'date': date,
-            'portfolio_value': portfolio_value,  # 기존 호환
-            'total_asset': portfolio_value,  # metrics 호환
-            'cash': cash,  # Exposure 계산용
-            'shares': shares,
-            'close': row['close']
-        })
-
-    df_portfolio = pd.DataFrame(portfolio_history).set_index('date')
+        if stats_only:
+            portfolio_history.update(date, portfolio_value, cash)
+        else:
+            portfolio_history.append({
+                'date': date,
+                'portfolio_value': portfolio_value,  # 기존 호환
+                'total_asset': portfolio_value,  # metrics 호환
+                'cash': cash,  # Exposure 계산용
+                'shares': shares,
+                'close': row['close']
+            })
+
+        # 5. (선택) 가지치기 체크포인트: 가망 없는 조합은 여기서 중단
+        if pruner is not None and pruner.update(date, portfolio_value, len(trade_history)):
+            break
+
+    if stats_only:
+        df_portfolio = portfolio_history
+    else:
+        df_portfolio = pd.DataFrame(portfolio_history).set_index('date')
+    if pruner is not None and pruner.reason:
+        df_portfolio.attrs['prune_reason'] = pruner.reason
 
     return df_portfolio, trade_history
\ No newline at end of file
@@ -1,154 +1,296 @@
 # [ 📄 backtesting/metrics.py (DCA 수정본) ]
+# 모든 실행기(단일 백테스트 / 포트폴리오 / 워크포워드 / 검증 / 부트스트랩)가 공용으로 쓰는 성과 지표 계산
+#
+# - 자산곡선 지표(equity_metrics, max_drawdown, yearly_returns)는 1차원(곡선 1개) 또는
+#   2차원(N개 곡선 x T일) 배열을 그대로 받아 행렬 연산으로 계산합니다. (파이썬 루프 없음)
+# - 거래 지표(trade_stats)와 벤치마크(buy_and_hold, dca_curve)도 배열 연산
+# - 단위: 수익률/CAGR/MDD는 % (MDD는 음수), Sharpe/Sortino = CAGR / 연율화 변동성(하방 변동성)
 
 import pandas as pd
 import numpy as np  # (DCA 로직에 필요)
 
+TRADING_DAYS = 252
+DCA_MONTHLY_AMOUNT = 100.0  # calculate_metrics의 DCA 벤치마크: 매월 첫 거래일 100달러 매수
+PROFIT_FACTOR_NO_LOSS = 99.9  # 손실 거래가 없을 때 포트폴리오 리포트가 쓰는 손익비 값
 
-def calculate_metrics(portfolio_history, trade_history, df_signals, initial_capital):
-    """
-    성과 통계, 벤치마크(B&H, DCA), 그리고 트레이딩 상세 지표(SQN, 손익비)를 계산합니다.
 
-    :param portfolio_history: engine에서 반환된 일별 포트폴리오 DataFrame
-    :param trade_history: engine에서 반환된 거래 내역 list
-    :param df_signals: (신규) 원본 가격 데이터 (벤치마크 계산용)
-    :param initial_capital: 초기 자본금
-    :return: (dict) 통계 지표 딕셔너리
-    """
+def _as_2d(values):
+    """1차원이면 (1 x T)로 바꾸고, 결과를 다시 스칼라로 돌려야 하는지 여부를 함께 반환"""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        return values[None, :], True
+    return values, False
 
-    stats = {}
 
-    # 1. 총 수익률 (Total Return) - (기존 코드)
-    if not portfolio_history.empty:
-        final_value = portfolio_history['portfolio_value'].iloc[-1]
-        total_return_pct = (final_value / initial_capital) - 1
-        stats['total_return_pct'] = total_return_pct
-        stats['final_value'] = final_value
+def _squeeze(result, single):
+    if not single:
+        return result
+    return {k: (v[0].item() if isinstance(v, np.ndarray) and v.ndim == 1 else v) for k, v in result.items()}
 
-        # MDD
-        portfolio_history['peak'] = portfolio_history['portfolio_value'].cummax()
-        portfolio_history['drawdown'] = (portfolio_history['portfolio_value'] / portfolio_history['peak']) - 1
-        max_drawdown = portfolio_history['drawdown'].min()
-        stats['max_drawdown_pct'] = max_drawdown
 
-        # [수정됨] Exposure (시장 노출도) 안전하게 계산
-        # 'cash' 컬럼이 존재할 때만 계산, 없으면 0 처리
-        if 'cash' in portfolio_history.columns:
-            total_days = len(portfolio_history)
-            # 현금 비중이 99% 미만인 날 = 주식 보유일
-            invested_days = portfolio_history[portfolio_history['cash'] < (portfolio_history['portfolio_value'] * 0.99)].shape[0]
-            exposure_pct = (invested_days / total_days) * 100.0
-        else:
-            exposure_pct = 0.0  # 'cash' 정보가 없으면 0으로 처리 (에러 방지)
+# ==========================================
+# 1. 자산곡선 지표 (1D / 2D 공용)
+# ==========================================
+def drawdown_curve(equity):
+    """고점 대비 낙폭 곡선 (비율, 0 이하). equity와 같은 shape"""
+    equity = np.asarray(equity, dtype=np.float64)
+    peak = np.maximum.accumulate(equity, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(peak > 0, equity / peak - 1.0, 0.0)
+
+
+def max_drawdown(equity):
+    """최대 낙폭 (%, 음수). 1D면 float, 2D면 곡선별 배열"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if equity.shape[-1] == 0:
+        return 0.0 if equity.ndim == 1 else np.zeros(equity.shape[0])
+    return drawdown_curve(equity).min(axis=-1) * 100
+
 
-        stats['exposure_pct'] = exposure_pct
+def equity_metrics(equity, dates=None, initial_capital=None, periods_per_year=TRADING_DAYS):
+    """
+    자산곡선의 성과 지표를 계산합니다.
 
+    :param equity: 자산 배열 (T,) 또는 (N x T) - 모든 곡선이 같은 날짜를 공유
+    :param dates: 날짜 (길이 T). 있으면 CAGR 기간을 실제 일수로, 없으면 T / periods_per_year 년으로 계산
+    :param initial_capital: 수익률/CAGR 기준 원금 (기본: 곡선의 첫 값)
+    :return: {'return', 'cagr', 'mdd', 'volatility', 'sharpe', 'sortino', 'calmar', 'final_equity'}
+             1D 입력이면 float, 2D 입력이면 길이 N 배열
+    """
+    eq, single = _as_2d(equity)
+    n_curves, length = eq.shape
+    initial = eq[:, 0] if initial_capital is None else np.full(n_curves, float(initial_capital))
+    final = eq[:, -1]
+
+    if dates is not None and length > 1:
+        dates = pd.DatetimeIndex(dates)
+        days = (dates[-1] - dates[0]).days
     else:
-        stats['total_return_pct'] = 0.0
-        stats['final_value'] = initial_capital
-        stats['max_drawdown_pct'] = 0.0
-        stats['exposure_pct'] = 0.0
+        days = (length - 1) * 365 / periods_per_year
 
-    # --- 2. 트레이딩 상세 지표 (승률, 손익비, SQN) ---
-    total_trades = 0
-    winning_trades = 0
-    gross_profit = 0.0
-    gross_loss = 0.0
-    trade_returns = []  # SQN 계산용 수익률 리스트
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = final / initial
+        total_ret = (growth - 1) * 100
+        if days > 0:
+            cagr = np.where(growth > 0, np.power(np.maximum(growth, 0.0), 365 / days) - 1, -1.0) * 100
+        else:
+            cagr = np.zeros(n_curves)
 
-    # trade_history 구조: {'date':..., 'type': 'Sell', 'price':..., 'pnl':...} 가정
-    # engine.py에서 trade_history에 'pnl'(실현손익)을 넣어준다고 가정하고 계산합니다.
-    # 만약 pnl이 없다면 기존 방식대로 계산합니다.
+        # 일별 수익률 (첫날은 0 - pct_change().fillna(0)과 동일)
+        rets = np.zeros_like(eq)
+        rets[:, 1:] = eq[:, 1:] / eq[:, :-1] - 1
+        vol = rets.std(axis=1, ddof=1) * np.sqrt(periods_per_year) if length > 1 else np.zeros(n_curves)
 
-    # 기존 코드의 흐름을 살려 계산
-    current_buy_price = 0.0
+        # 하방 변동성: 음수 수익률만의 표준편차 (곡선마다 개수가 다르므로 마스크로 계산)
+        neg = rets < 0
+        n_neg = neg.sum(axis=1)
+        neg_mean = np.where(n_neg > 0, (rets * neg).sum(axis=1) / np.maximum(n_neg, 1), 0.0)
+        neg_var = (((rets - neg_mean[:, None]) * neg) ** 2).sum(axis=1) / np.maximum(n_neg - 1, 1)
+        down_vol = np.where(n_neg > 1, np.sqrt(neg_var) * np.sqrt(periods_per_year), 0.0)
 
-    for trade in trade_history:
-        if trade['type'] == 'Buy':
-            current_buy_price = trade['price']
+        mdd = max_drawdown(eq)
+        sharpe = np.where(vol > 0, (cagr / 100) / vol, 0.0)
+        sortino = np.where(down_vol > 0, (cagr / 100) / down_vol, 0.0)
+        calmar = np.where(mdd != 0, np.abs(cagr / mdd), 0.0)
 
-        elif trade['type'] in ['Sell', 'Stop-Loss']:
-            if current_buy_price > 0:
-                total_trades += 1
+    return _squeeze({
+        'return': total_ret, 'cagr': cagr, 'mdd': mdd, 'volatility': vol,
+        'sharpe': sharpe, 'sortino': sortino, 'calmar': calmar, 'final_equity': final,
+    }, single)
 
-                # 수익률 계산
-                pnl_amount = trade['price'] - current_buy_price
-                pnl_pct = pnl_amount / current_buy_price
-                trade_returns.append(pnl_pct)
 
-                # 승률 체크
-                if pnl_amount > 0:
-                    winning_trades += 1
-                    gross_profit += pnl_amount
-                else:
-                    gross_loss += abs(pnl_amount)
+def yearly_returns(equity, dates, initial_capital=None):
+    """
+    연도별 수익률 (%): 각 연도 마지막 자산 / 직전 연도 마지막 자산 - 1 (첫 해는 원금 대비)
 
-                current_buy_price = 0.0
+    :return: (연도 리스트, 배열) - 배열은 1D 입력이면 (연도 수,), 2D 입력이면 (N x 연도 수)
+    """
+    eq, single = _as_2d(equity)
+    years = pd.DatetimeIndex(dates).year.to_numpy()
+    if len(years) == 0:
+        return [], np.empty(0) if single else np.empty((eq.shape[0], 0))
+
+    year_end = np.append(np.flatnonzero(np.diff(years) != 0), len(years) - 1)
+    closes = eq[:, year_end]
+    initial = eq[:, :1] if initial_capital is None else np.full((eq.shape[0], 1), float(initial_capital))
+    previous = np.concatenate([initial, closes[:, :-1]], axis=1)
+    returns = (closes / previous - 1) * 100
+    return years[year_end].tolist(), returns[0] if single else returns
+
+
+# ==========================================
+# 2. 거래 지표
+# ==========================================
+def paired_trades(trade_history):
+    """
+    engine.run_backtest의 거래 내역에서 (매수 -> 매도/손절) 쌍을 찾아
+    (거래별 수익률, 주당 손익) 배열을 반환합니다. (매수 없이 나온 매도는 무시)
+    """
+    if not trade_history:
+        return np.empty(0), np.empty(0)
+    trades = pd.DataFrame(trade_history)
+    is_buy = (trades['type'] == 'Buy').to_numpy()
+    is_exit = trades['type'].isin(['Sell', 'Stop-Loss']).to_numpy()
+    price = trades['price'].to_numpy(dtype=np.float64)
+
+    # 매수마다 새 그룹 -> 그룹의 매수가를 이후 행에 채우고, 그룹당 첫 번째 청산만 거래로 인정
+    group = np.cumsum(is_buy)
+    buy_price = pd.Series(np.where(is_buy, price, np.nan)).ffill().to_numpy()
+    exit_rows = np.flatnonzero(is_exit & (group > 0))
+    _, first = np.unique(group[exit_rows], return_index=True)
+    exit_rows = exit_rows[first]
+    exit_rows = exit_rows[buy_price[exit_rows] > 0]
+
+    pnl = price[exit_rows] - buy_price[exit_rows]
+    return pnl / buy_price[exit_rows], pnl
+
+
+def trade_stats(returns, profits=None, no_loss_profit_factor=None):
+    """
+    거래별 수익률(과 손익) 배열로 거래 지표를 계산합니다.
 
-    # (1) 승률
-    win_rate = (winning_trades / total_trades) if total_trades > 0 else 0.0
-    stats['win_rate_pct'] = win_rate  # 0.55 (=55%)
+    :param returns: 거래별 수익률 (0.05 = 5%)
+    :param profits: 거래별 손익 금액 (손익비 계산용, 기본: returns)
+    :param no_loss_profit_factor: 손실 합계가 0일 때의 손익비 (기본: 총이익, 이익도 없으면 0)
+    :return: {'total_trades', 'win_rate'(비율), 'profit_factor', 'avg_win'(%), 'avg_loss'(%), 'sqn',
+              'gross_profit', 'gross_loss'}
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    profits = returns if profits is None else np.asarray(profits, dtype=np.float64)
+    total = len(returns)
+    wins = returns > 0
 
-    # (2) 손익비 (Profit Factor)
+    gross_profit = profits[wins].sum()
+    gross_loss = abs(profits[~wins].sum())
     if gross_loss > 0:
         profit_factor = gross_profit / gross_loss
+    elif no_loss_profit_factor is not None:
+        profit_factor = no_loss_profit_factor
     else:
-        profit_factor = gross_profit if gross_profit > 0 else 0.0  # 손실 0이면 수익 자체가 PF
-    stats['profit_factor'] = profit_factor
+        profit_factor = gross_profit if gross_profit > 0 else 0.0
 
-    # (3) SQN (System Quality Number)
     sqn = 0.0
-    if total_trades > 1:  # 표준편차 계산 위해 최소 2개 필요
-        avg_return = np.mean(trade_returns)
-        std_return = np.std(trade_returns)
-        if std_return > 0:
-            sqn = (avg_return / std_return) * np.sqrt(total_trades)
-    stats['sqn'] = sqn
+    if total > 1:  # 표준편차 계산 위해 최소 2개 필요
+        std = returns.std()
+        if std > 0:
+            sqn = returns.mean() / std * np.sqrt(total)
+
+    return {
+        'total_trades': total,
+        'win_rate': wins.sum() / total if total > 0 else 0.0,
+        'profit_factor': float(profit_factor),
+        'avg_win': returns[wins].mean() * 100 if wins.any() else 0.0,
+        'avg_loss': returns[~wins].mean() * 100 if (~wins).any() else 0.0,
+        'sqn': float(sqn),
+        'gross_profit': float(gross_profit),
+        'gross_loss': float(gross_loss),
+    }
+
+
+# ==========================================
+# 3. 벤치마크 (Buy & Hold / DCA)
+# ==========================================
+def buy_and_hold(close, initial_capital=1.0):
+    """
+    첫날 전액 매수 후 보유한 자산곡선. close가 (N x T)면 종목별 곡선 N개
+    (수익률은 equity_metrics(buy_and_hold(close))['return'])
+    """
+    close = np.asarray(close, dtype=np.float64)
+    return close / close[..., :1] * initial_capital
 
-    stats['total_trades'] = total_trades
 
-    # 4. 벤치마크: Buy & Hold 수익률 계산 - (기존 코드)
-    if not df_signals.empty:
-        first_close = df_signals['close'].iloc[0]
-        last_close = df_signals['close'].iloc[-1]
-        buy_and_hold_pct = (last_close / first_close) - 1
-        stats['buy_and_hold_pct'] = buy_and_hold_pct
-    else:
-        stats['buy_and_hold_pct'] = 0.0
-
-    # --- [ 5. (신규) 벤치마크: DCA (적립식) ] ---
-    # (가정: 매월 100달러씩, 월초 첫 거래일에 매수)
-    DCA_MONTHLY_AMOUNT = 100.0
+def dca_curve(close, dates, monthly_amount=DCA_MONTHLY_AMOUNT):
+    """
+    매월 첫 거래일에 monthly_amount씩 매수하는 적립식(DCA)의 일별 평가금액과 누적 투자금
 
-    total_invested_cash = 0.0
-    total_shares_held = 0.0
-    last_month = -1
+    :param close: 종가 (T,) 또는 (N x T)
+    :return: (평가금액 배열, 누적 투자금 배열) - close와 같은 shape
+    """
+    close = np.asarray(close, dtype=np.float64)
+    dates = pd.DatetimeIndex(dates)
+    month_key = dates.year * 12 + dates.month
+    buy_day = np.ones(len(dates), dtype=bool)
+    buy_day[1:] = np.diff(month_key) != 0
+
+    shares = np.cumsum(np.where(buy_day, monthly_amount / close, 0.0), axis=-1)
+    invested = np.cumsum(buy_day * monthly_amount).astype(np.float64)
+    return shares * close, np.broadcast_to(invested, close.shape)
+
+
+def dca_stats(close, dates, monthly_amount=DCA_MONTHLY_AMOUNT):
+    """DCA의 (총수익률 %, MDD %, 총 투자금). close가 2D면 각각 종목별 배열"""
+    if np.asarray(close).shape[-1] == 0:
+        return 0.0, 0.0, 0.0
+    values, invested = dca_curve(close, dates, monthly_amount)
+    final_value, total_invested = values[..., -1], invested[..., -1]
+    if values.ndim == 1:
+        final_value, total_invested = float(final_value), float(total_invested)
+    return (final_value / total_invested - 1) * 100, max_drawdown(values), total_invested
+
+
+# ==========================================
+# 4. 단일 종목 백테스트 통계 (engine.run_backtest 결과용)
+# ==========================================
+def calculate_metrics(portfolio_history, trade_history, df_signals, initial_capital):
+    """
+    성과 통계, 벤치마크(B&H, DCA), 그리고 트레이딩 상세 지표(SQN, 손익비)를 계산합니다.
 
-    if not df_signals.empty:
-        for date, row in df_signals.iterrows():
-            current_month = date.month
+    :param portfolio_history: engine에서 반환된 일별 포트폴리오 DataFrame
+                              (stats_only=True로 실행했다면 streaming.StreamingStats - 결과 키는 동일)
+    :param trade_history: engine에서 반환된 거래 내역 list
+    :param df_signals: (신규) 원본 가격 데이터 (벤치마크 계산용)
+    :param initial_capital: 초기 자본금
+    :return: (dict) 통계 지표 딕셔너리
+    """
 
-            # 1. 월이 바뀌었고,
-            # 2. (선택) 데이터가 너무 적어(예: 100일) 월이 안 바뀌는 경우, 첫날 1회 매수
-            if current_month != last_month or (last_month == -1 and total_invested_cash == 0):
-                # $100로 현재 종가에 몇 주를 살 수 있는가
-                shares_to_buy = DCA_MONTHLY_AMOUNT / row['close']
+    stats = {}
 
-                total_shares_held += shares_to_buy
-                total_invested_cash += DCA_MONTHLY_AMOUNT
+    # 1. 총 수익률 / MDD / Exposure
+    if not isinstance(portfolio_history, pd.DataFrame):
+        # 통계 전용 모드: 엔진이 일별 기록 대신 누적기(StreamingStats)를 반환
+        summary = portfolio_history.equity_summary()
+        final_value = summary['final_equity'] if summary else initial_capital
+        stats['total_return_pct'] = (final_value / initial_capital) - 1 if summary else 0.0
+        stats['final_value'] = final_value
+        stats['max_drawdown_pct'] = summary['mdd'] / 100 if summary else 0.0
+        stats['exposure_pct'] = summary['exposure'] if summary else 0.0
+    elif not portfolio_history.empty:
+        values = portfolio_history['portfolio_value'].to_numpy(dtype=np.float64)
+        final_value = values[-1]
+        stats['total_return_pct'] = (final_value / initial_capital) - 1
+        stats['final_value'] = final_value
+        stats['max_drawdown_pct'] = max_drawdown(values) / 100
 
-                last_month = current_month
+        # 'cash' 컬럼이 존재할 때만 계산, 없으면 0 처리
+        # 현금 비중이 99% 미만인 날 = 주식 보유일
+        if 'cash' in portfolio_history.columns:
+            cash = portfolio_history['cash'].to_numpy(dtype=np.float64)
+            stats['exposure_pct'] = (cash < values * 0.99).mean() * 100.0
+        else:
+            stats['exposure_pct'] = 0.0
+    else:
+        stats['total_return_pct'] = 0.0
+        stats['final_value'] = initial_capital
+        stats['max_drawdown_pct'] = 0.0
+        stats['exposure_pct'] = 0.0
 
-        # 최종 가치 계산
-        final_dca_value = total_shares_held * df_signals['close'].iloc[-1]
+    # 2. 트레이딩 상세 지표 (승률, 손익비, SQN) - 매수가 대비 매도가(주당 손익) 기준
+    returns, pnl = paired_trades(trade_history)
+    trades = trade_stats(returns, pnl)
+    stats['win_rate_pct'] = trades['win_rate']  # 0.55 (=55%)
+    stats['profit_factor'] = trades['profit_factor']
+    stats['sqn'] = trades['sqn']
+    stats['total_trades'] = trades['total_trades']
 
-        if total_invested_cash > 0:
-            dca_return_pct = (final_dca_value / total_invested_cash) - 1
-            stats['dca_return_pct'] = dca_return_pct
-            stats['dca_total_invested'] = total_invested_cash
-        else:
-            stats['dca_return_pct'] = 0.0
-            stats['dca_total_invested'] = 0.0
+    # 3. 벤치마크: Buy & Hold / DCA (적립식, 매월 100달러)
+    if not df_signals.empty:
+        close = df_signals['close'].to_numpy(dtype=np.float64)
+        stats['buy_and_hold_pct'] = close[-1] / close[0] - 1
+        dca_return, _, dca_invested = dca_stats(close, df_signals.index)
+        stats['dca_return_pct'] = dca_return / 100
+        stats['dca_total_invested'] = dca_invested
     else:
+        stats['buy_and_hold_pct'] = 0.0
         stats['dca_return_pct'] = 0.0
         stats['dca_total_invested'] = 0.0
 
@@ -163,4 +305,43 @@ def calculate_metrics(portfolio_history, trade_history, df_signals, initial_capi
     # SQN, Exposure, Profit Factor는 그대로 전달
     # (이미 계산됨)
 
-    return stats
\ No newline at end of file
+    return stats
+
+
+# ==========================================
+# 5. 포트폴리오 통계 (run_portfolio_backtest 결과용)
+# ==========================================
+def portfolio_stats(history, trade_log, initial_capital):
+    """
+    포트폴리오 시뮬레이션 결과(일별 자산 기록 + 청산 거래 기록)의 통계
+
+    :param history: [{'date', 'equity'}, ...]
+    :param trade_log: [{'return', 'profit', ...}, ...]
+    :return: {'return', 'cagr', 'mdd', 'final_equity', 'sharpe', 'sortino', 'calmar', 'yearly',
+              'total_trades', 'win_rate'(%), 'profit_factor', 'avg_win', 'avg_loss'}
+             yearly는 {연도: 수익률 %}
+    """
+    dates = pd.DatetimeIndex([h['date'] for h in history])
+    equity = np.fromiter((h['equity'] for h in history), dtype=np.float64, count=len(history))
+
+    result = equity_metrics(equity, dates, initial_capital)
+    years, yearly = yearly_returns(equity, dates, initial_capital)
+    result['yearly'] = dict(zip(years, yearly.tolist()))
+
+    trades = None
+    if trade_log:
+        returns = np.fromiter((t['return'] for t in trade_log), dtype=np.float64, count=len(trade_log))
+        profits = np.fromiter((t['profit'] for t in trade_log), dtype=np.float64, count=len(trade_log))
+        trades = trade_stats(returns, profits, no_loss_profit_factor=PROFIT_FACTOR_NO_LOSS)
+    result.update(portfolio_trade_fields(trades))
+    return result
+
+
+def portfolio_trade_fields(trades):
+    """trade_stats 결과 -> 포트폴리오 리포트의 거래 항목 (win_rate는 %). 거래가 없으면(None) 모두 0"""
+    if trades is None:
+        return {'total_trades': 0, 'win_rate': 0.0, 'profit_factor': 0.0, 'avg_win': 0.0, 'avg_loss': 0.0}
+    return {
+        'total_trades': trades['total_trades'], 'win_rate': trades['win_rate'] * 100,
+        'profit_factor': trades['profit_factor'], 'avg_win': trades['avg_win'], 'avg_loss': trades['avg_loss'],
+    }
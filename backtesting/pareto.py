@@ -0,0 +1,189 @@
+# [ 📄 backtesting/pareto.py (신규 파일) ]
+# 최적화 결과에서 여러 목적(CAGR↑, MDD↑(음수 %), Sharpe↑, 거래 수 등)에 대한
+# Pareto Front(어느 목적으로도 더 나은 조합이 없는 '비지배' 조합 집합)를 구하는 도구
+#
+# - 2개 목적: 정렬 + 누적 최댓값 한 번 (O(n log n))
+# - 3개 목적: 정렬 + (2, 3번째 목적) 계단(staircase)을 이진 탐색으로 유지 (O(n log n))
+# - 4개 이상: Front 후보와 블록 비교 (O(n * |Front|))
+# - ParetoFront: 새 결과가 들어올 때마다 기존 Front + 새 행만 다시 계산 (증분 갱신)
+#
+# 사용 예)
+#   front = pareto_frontier(df, {'cagr': 'max', 'mdd': 'max', 'sharpe_ratio': 'max'})
+#   python -m backtesting.pareto --table optimization_log --objectives cagr:max mdd:max sharpe_ratio:max
+
+import argparse
+from bisect import bisect_left
+import numpy as np
+import pandas as pd
+
+SENSES = ('max', 'min')
+
+
+def _oriented(values, senses):
+    """목적별 방향(max/min)을 반영해 '모두 클수록 좋음' 기준의 float 배열로 변환합니다."""
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    for sense in senses:
+        if sense not in SENSES:
+            raise ValueError(f"목적 방향은 {SENSES} 중 하나여야 합니다: {sense}")
+    signs = np.array([1.0 if s == 'max' else -1.0 for s in senses])
+    return values * signs
+
+
+def _front_2d(values, order):
+    second = values[order, 1]
+    prev_max = np.maximum.accumulate(np.concatenate(([-np.inf], second[:-1])))
+    return order[second > prev_max]
+
+
+def _front_3d(values, order):
+    # (2번째, 3번째) 목적의 계단: 2번째 목적 오름차순, 3번째 목적 내림차순으로 유지
+    # -> 'y >= a'인 점들 중 z 최댓값은 bisect로 찾은 첫 점의 z
+    ys, zs, front = [], [], []
+    for i in order:
+        a, b = values[i, 1], values[i, 2]
+        pos = bisect_left(ys, a)
+        if pos < len(ys) and zs[pos] >= b:
+            continue  # 1번째 목적이 같거나 큰 점 중에 (y, z) 모두 같거나 큰 점이 있음 -> 지배됨
+        front.append(i)
+        # 새 점이 지배하는 계단 점(y <= a, z <= b) 제거 후 삽입
+        end = pos + 1 if pos < len(ys) and ys[pos] == a else pos
+        start = end
+        while start > 0 and zs[start - 1] <= b:
+            start -= 1
+        ys[start:end] = [a]
+        zs[start:end] = [b]
+    return np.asarray(front, dtype=np.int64)
+
+
+def _front_nd(values, order):
+    front = []
+    for i in order:
+        row = values[i]
+        if front:
+            f = values[front]
+            if np.any(np.all(f >= row, axis=1)):  # 정렬 순서상 앞선 점이 모두 같거나 크면 지배 (또는 중복)
+                continue
+        front.append(i)
+    return np.asarray(front, dtype=np.int64)
+
+
+def pareto_mask(values, senses=None):
+    """
+    (n x m) 배열에서 Pareto Front에 속하는 행의 불리언 마스크를 반환합니다.
+    NaN이 있는 행은 제외하고, 완전히 같은 점이 여러 개면 하나만 남깁니다.
+
+    :param values: (n x m) 목적 값 배열
+    :param senses: 목적별 'max' / 'min' 리스트 (None이면 모두 'max')
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if values.ndim == 1:
+        values = values[:, None]
+    senses = senses or ['max'] * values.shape[1]
+    values = _oriented(values, senses)
+
+    mask = np.zeros(len(values), dtype=bool)
+    valid = np.flatnonzero(~np.isnan(values).any(axis=1))
+    if len(valid) == 0:
+        return mask
+
+    sub = values[valid]
+    order = np.lexsort(-sub.T[::-1])  # 1번째 목적 내림차순 (동률이면 다음 목적 내림차순)
+    if sub.shape[1] == 1:
+        front = order[:1]
+    elif sub.shape[1] == 2:
+        front = _front_2d(sub, order)
+    elif sub.shape[1] == 3:
+        front = _front_3d(sub, order)
+    else:
+        front = _front_nd(sub, order)
+    mask[valid[front]] = True
+    return mask
+
+
+def pareto_frontier(df, objectives, sort=True):
+    """
+    DataFrame에서 Pareto Front 행만 반환합니다.
+
+    :param objectives: {컬럼: 'max' 또는 'min'} (예: {'cagr': 'max', 'mdd': 'max', 'total_trades': 'min'})
+    :param sort: True면 첫 번째 목적 기준으로 좋은 순서대로 정렬
+    """
+    names = list(objectives)
+    mask = pareto_mask(df[names].to_numpy(dtype=np.float64), [objectives[n] for n in names])
+    front = df[mask]
+    if sort:
+        front = front.sort_values(names[0], ascending=objectives[names[0]] != 'max')
+    return front
+
+
+class ParetoFront:
+    """
+    결과가 계속 쌓일 때 Front를 증분으로 갱신합니다.
+    (기존 Front에 없는 행은 이후에도 Front에 들어올 수 없으므로, Front + 새 행만 다시 계산)
+
+    사용 예)
+        front = ParetoFront({'cagr': 'max', 'mdd': 'max'})
+        added, removed = front.update(new_rows_df)
+    """
+
+    def __init__(self, objectives):
+        self.objectives = dict(objectives)
+        self.frame = None
+
+    def update(self, rows):
+        """
+        새 결과 행(DataFrame, index는 행 ID)을 반영합니다.
+        :return: (새로 Front에 들어온 index 목록, Front에서 밀려난 index 목록)
+        """
+        if rows is None or len(rows) == 0:
+            return [], []
+        previous = self.frame
+        combined = rows if previous is None else pd.concat([previous, rows])
+        combined = combined[~combined.index.duplicated(keep='last')]
+        self.frame = pareto_frontier(combined, self.objectives)
+
+        before = pd.Index([]) if previous is None else previous.index
+        added = list(self.frame.index.difference(before, sort=False))
+        removed = list(before.difference(self.frame.index, sort=False))
+        return added, removed
+
+    def __len__(self):
+        return 0 if self.frame is None else len(self.frame)
+
+
+def _parse_objective(text):
+    name, _, sense = text.rpartition(':')
+    if not name:
+        name, sense = sense, 'max'
+    return name, sense
+
+
+def main(argv=None):
+    from backtesting.result_store import ResultStore
+
+    parser = argparse.ArgumentParser(description="결과 테이블의 Pareto Front 추출")
+    parser.add_argument('--table', default='optimization_log', help="결과 테이블 이름")
+    parser.add_argument('--db', default=None, help="SQLite DB 경로 (기본: config.BACKTEST_DB_NAME)")
+    parser.add_argument('--objectives', nargs='+', default=['cagr:max', 'mdd:max', 'sharpe_ratio:max'],
+                        help="컬럼:max|min 목록 (예: cagr:max mdd:max total_trades:min)")
+    parser.add_argument('--columns', nargs='*', default=[], help="함께 출력할 컬럼 (파라미터 등)")
+    parser.add_argument('--csv', default=None, help="결과를 저장할 CSV 경로")
+    args = parser.parse_args(argv)
+
+    objectives = dict(_parse_objective(o) for o in args.objectives)
+    store = ResultStore(args.table, db_path=args.db)
+    store.sync()
+    front = store.pareto(objectives, columns=args.columns)
+
+    print(f"⚖️ [{args.table}] {len(store):,}행 중 Pareto Front {len(front)}개 "
+          f"({', '.join(f'{k}:{v}' for k, v in objectives.items())})")
+    print(front.to_string())
+    if args.csv:
+        front.to_csv(args.csv)
+        print(f"💾 {args.csv} 저장 완료")
+    return front
+
+
+if __name__ == "__main__":
+    main()
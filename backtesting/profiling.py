@@ -0,0 +1,327 @@
+# [ 📄 backtesting/profiling.py (신규 파일) ]
+# 백테스트 실행기 단계별 시간 측정 / 프로파일링 훅
+#
+# - with span('indicators'): ... 로 단계를 감싸면, 켜져 있을 때만 단계별 시간(히스토그램)을 누적합니다.
+#   꺼져 있으면 미리 만든 no-op 객체를 돌려주는 것뿐이라 span 하나에 1us보다 훨씬 적게 듭니다. (빈 함수 호출 비용 약 0.05us를 뺀 값으로 약 0.35us)
+# - 켜는 방법: 환경변수 BACKTEST_PROFILE=spans[,cprofile][,tracemalloc] (all = 전부)
+#              또는 실행기의 --profile 옵션 (enable()이 환경변수도 설정 -> 새로 뜨는 워커 프로세스에도 적용)
+# - 병렬 실행: 워커에서 쌓인 span 통계는 결과와 함께 메인 프로세스로 돌아와 합쳐집니다. (pop_snapshot / merge)
+#   cProfile / tracemalloc은 메인 프로세스만 측정합니다. (워커 코드까지 보려면 processes=1)
+#
+# 출력 (cache/profiles/<이름>-<시각>.*)
+#   .json   : 단계별 count / total / mean / p50 / p95 / max + log2(us) 히스토그램 (+ tracemalloc 상위 할당 위치)
+#   .folded : 중첩 span 경로별 자기 시간(us) - flamegraph.pl / speedscope / inferno에서 바로 열림
+#   .prof   : cProfile 결과 (pstats / snakeviz)
+
+import json
+import multiprocessing
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+from backtesting.cache import CACHE_DIR
+
+ENV_VAR = 'BACKTEST_PROFILE'
+MODES = ('spans', 'cprofile', 'tracemalloc')
+PROFILE_DIR = os.path.join(CACHE_DIR, 'profiles')
+TOP_ALLOCATIONS = 15
+
+# --- 프로세스 전역 상태 ---
+_modes = frozenset()
+_spans_on = False
+_stats = {}       # span 경로('backtest;engine') -> 통계
+_stack = []       # 현재 열려 있는 span
+_profiler = None  # cProfile.Profile (cprofile 모드)
+
+
+class _NullSpan:
+    """꺼져 있을 때 span()이 돌려주는 공용 no-op 컨텍스트 매니저"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'path', 'start', 'child_us', 'mem_start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.path = f"{_stack[-1].path};{self.name}" if _stack else self.name
+        self.child_us = 0.0
+        self.mem_start = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+        _stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_us = (time.perf_counter() - self.start) * 1e6
+        _stack.pop()
+        if _stack:
+            _stack[-1].child_us += elapsed_us
+        mem_bytes = tracemalloc.get_traced_memory()[0] - self.mem_start if self.mem_start is not None else 0
+        _record(self.path, elapsed_us, elapsed_us - self.child_us, mem_bytes)
+        return False
+
+
+def span(name):
+    """단계 구간 측정용 컨텍스트 매니저 (꺼져 있으면 no-op)"""
+    if not _spans_on:
+        return _NULL_SPAN
+    return _Span(name)
+
+
+def _new_entry():
+    return {'count': 0, 'total_us': 0.0, 'self_us': 0.0, 'min_us': None, 'max_us': 0.0, 'mem_bytes': 0, 'hist': {}}
+
+
+def _record(path, total_us, self_us, mem_bytes):
+    entry = _stats.get(path)
+    if entry is None:
+        entry = _stats[path] = _new_entry()
+    entry['count'] += 1
+    entry['total_us'] += total_us
+    entry['self_us'] += self_us
+    entry['min_us'] = total_us if entry['min_us'] is None else min(entry['min_us'], total_us)
+    entry['max_us'] = max(entry['max_us'], total_us)
+    entry['mem_bytes'] += mem_bytes
+    # log2 히스토그램: 구간 b = [2^(b-1), 2^b) us
+    bucket = int(total_us).bit_length()
+    entry['hist'][bucket] = entry['hist'].get(bucket, 0) + 1
+
+
+# ==========================================
+# ⚙️ 켜기 / 끄기
+# ==========================================
+
+def parse_modes(value):
+    """'spans,cprofile' / 'all' / '1' -> 모드 집합 (cprofile / tracemalloc만 적어도 spans는 함께 켬)"""
+    if not value or value.strip().lower() in ('0', 'false', 'off', 'none'):
+        return frozenset()
+    names = {v.strip().lower() for v in value.split(',') if v.strip()}
+    if names & {'1', 'true', 'on', 'all'}:
+        names = set(MODES) if 'all' in names else {'spans'}
+    unknown = names - set(MODES)
+    if unknown:
+        raise ValueError(f"알 수 없는 프로파일 모드: {sorted(unknown)} (가능: {', '.join(MODES)}, all)")
+    return frozenset(names | {'spans'})
+
+
+def enable(modes='spans'):
+    """
+    프로파일링을 켭니다. (환경변수도 설정해서 이후 새로 뜨는 워커 프로세스도 같은 모드로 동작)
+
+    :param modes: 'spans,cprofile,tracemalloc' 형식 문자열 또는 리스트
+    """
+    global _modes, _spans_on, _profiler
+    if not isinstance(modes, str):
+        modes = ','.join(modes)
+    _modes = parse_modes(modes)
+    _spans_on = 'spans' in _modes
+    os.environ[ENV_VAR] = ','.join(sorted(_modes))
+
+    if 'tracemalloc' in _modes and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if 'cprofile' in _modes and _profiler is None:
+        import cProfile
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+
+
+def disable():
+    """프로파일링을 끄고 cProfile / tracemalloc을 멈춥니다. (누적된 통계는 유지)"""
+    global _modes, _spans_on, _profiler
+    if _profiler is not None:
+        _profiler.disable()
+    if 'tracemalloc' in _modes and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _modes, _spans_on = frozenset(), False
+    os.environ.pop(ENV_VAR, None)
+
+
+def configure_from_env():
+    """BACKTEST_PROFILE 환경변수로 켜기 (import 시 자동 호출 - spawn 방식 워커도 같은 설정을 따름)"""
+    global _modes, _spans_on
+    modes = parse_modes(os.environ.get(ENV_VAR, ''))
+    if not modes:
+        return
+    if multiprocessing.parent_process() is not None:
+        modes = modes - {'cprofile'}  # 워커의 cProfile 결과는 저장하지 않으므로 켜지 않음
+    if _profiler is None and not tracemalloc.is_tracing():
+        enable(modes)
+    else:
+        _modes, _spans_on = modes, 'spans' in modes
+
+
+def is_enabled():
+    return _spans_on
+
+
+def reset():
+    _stats.clear()
+
+
+# ==========================================
+# 🔁 워커 -> 메인 프로세스 합치기
+# ==========================================
+
+def pop_snapshot():
+    """[워커] 지금까지 쌓인 span 통계를 반환하고 비웁니다. (꺼져 있거나 비어 있으면 None)"""
+    if not _stats:
+        return None
+    snapshot = {path: dict(entry, hist=dict(entry['hist'])) for path, entry in _stats.items()}
+    _stats.clear()
+    return snapshot
+
+
+def merge(snapshot):
+    """[메인] 워커에서 돌려받은 span 통계를 누적합니다."""
+    if not snapshot:
+        return
+    for path, delta in snapshot.items():
+        entry = _stats.get(path)
+        if entry is None:
+            entry = _stats[path] = _new_entry()
+        for k in ('count', 'total_us', 'self_us', 'max_us', 'mem_bytes'):
+            entry[k] = max(entry[k], delta[k]) if k == 'max_us' else entry[k] + delta[k]
+        if delta['min_us'] is not None:
+            entry['min_us'] = delta['min_us'] if entry['min_us'] is None else min(entry['min_us'], delta['min_us'])
+        for bucket, count in delta['hist'].items():
+            bucket = int(bucket)
+            entry['hist'][bucket] = entry['hist'].get(bucket, 0) + count
+
+
+# ==========================================
+# 📊 리포트 / 파일 출력
+# ==========================================
+
+def _hist_quantile(hist, q):
+    """log2 히스토그램에서 분위수 근사 (해당 구간의 상한, us)"""
+    total = sum(hist.values())
+    seen = 0
+    for bucket in sorted(hist):
+        seen += hist[bucket]
+        if seen >= q * total:
+            return float(2 ** bucket)
+    return 0.0
+
+
+def stage_summary():
+    """
+    단계 이름(span 경로의 마지막)별로 합친 통계 (총 시간 큰 순)
+    :return: [{'stage', 'count', 'total_sec', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms', 'mem_mb', 'hist'}]
+    """
+    stages = {}
+    for path, entry in _stats.items():
+        name = path.rsplit(';', 1)[-1]
+        acc = stages.setdefault(name, _new_entry())
+        for k in ('count', 'total_us', 'self_us', 'mem_bytes'):
+            acc[k] += entry[k]
+        acc['max_us'] = max(acc['max_us'], entry['max_us'])
+        for bucket, count in entry['hist'].items():
+            acc['hist'][bucket] = acc['hist'].get(bucket, 0) + count
+
+    rows = []
+    for name, acc in stages.items():
+        rows.append({
+            'stage': name, 'count': acc['count'], 'total_sec': acc['total_us'] / 1e6,
+            'mean_ms': acc['total_us'] / acc['count'] / 1000, 'p50_ms': _hist_quantile(acc['hist'], 0.5) / 1000,
+            'p95_ms': _hist_quantile(acc['hist'], 0.95) / 1000, 'max_ms': acc['max_us'] / 1000,
+            'mem_mb': acc['mem_bytes'] / 1e6, 'hist': {str(b): c for b, c in sorted(acc['hist'].items())},
+        })
+    return sorted(rows, key=lambda r: r['total_sec'], reverse=True)
+
+
+def format_report():
+    """단계별 시간 리포트 문자열 (p50 / p95는 log2 히스토그램 구간 상한 근사)"""
+    rows = stage_summary()
+    if not rows:
+        return "(기록된 span 없음)"
+    show_mem = 'tracemalloc' in _modes
+    lines = [f"{'Stage':<22} {'Count':>8} {'Total(s)':>10} {'Mean(ms)':>10} {'p50(ms)':>9} {'p95(ms)':>9} {'Max(ms)':>10}"
+             + (f" {'Mem(MB)':>9}" if show_mem else "")]
+    for r in rows:
+        lines.append(f"{r['stage']:<22} {r['count']:>8} {r['total_sec']:>10.2f} {r['mean_ms']:>10.2f} "
+                     f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['max_ms']:>10.2f}"
+                     + (f" {r['mem_mb']:>9.1f}" if show_mem else ""))
+    return "\n".join(lines)
+
+
+def folded_stacks():
+    """flamegraph용 folded stack 줄 목록 ('backtest;engine 12345' - 값은 자기 시간 us)"""
+    return [f"{path} {int(entry['self_us'])}" for path, entry in sorted(_stats.items()) if entry['self_us'] >= 1]
+
+
+def _top_allocations():
+    snapshot = tracemalloc.take_snapshot()
+    return [{'location': str(stat.traceback), 'size_mb': stat.size / 1e6, 'count': stat.count}
+            for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]]
+
+
+def write_outputs(name, output_dir=PROFILE_DIR):
+    """
+    JSON / folded stack / (cprofile 모드면) .prof 파일을 씁니다.
+    :return: 기록한 파일 경로 리스트
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    paths = []
+
+    payload = {'name': name, 'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'modes': sorted(_modes),
+               'stages': stage_summary(),
+               'spans': {path: dict(entry, hist={str(b): c for b, c in sorted(entry['hist'].items())})
+                         for path, entry in sorted(_stats.items())}}
+    if tracemalloc.is_tracing():
+        payload['top_allocations'] = _top_allocations()
+        payload['traced_peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    paths.append(base + '.json')
+
+    with open(base + '.folded', 'w', encoding='utf-8') as f:
+        f.write("\n".join(folded_stacks()) + "\n")
+    paths.append(base + '.folded')
+
+    if _profiler is not None:
+        _profiler.dump_stats(base + '.prof')
+        paths.append(base + '.prof')
+    return paths
+
+
+@contextmanager
+def profile_run(name, verbose=True):
+    """
+    실행기 최상위에서 감싸는 용도: 켜져 있으면 끝날 때 리포트를 출력하고 파일을 씁니다. (꺼져 있으면 아무것도 안 함)
+
+    사용 예)
+        with profiling.profile_run('batch_backtest'):
+            run_batch_backtests(contexts)
+    """
+    if not _spans_on:
+        yield
+        return
+    try:
+        yield
+    finally:
+        if _profiler is not None:
+            _profiler.disable()
+        paths = write_outputs(name)
+        if _profiler is not None:
+            _profiler.enable()
+        if verbose:
+            print("\n⏱️ 단계별 소요 시간")
+            print(format_report())
+            print(f"📁 프로파일 저장: {', '.join(paths)}")
+
+
+configure_from_env()
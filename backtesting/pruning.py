@@ -0,0 +1,111 @@
+# [ 📄 backtesting/pruning.py (신규 파일) ]
+# 최적화 중 '이미 가망이 없는' 조합의 시뮬레이션을 도중에 끊기 위한 가지치기(Pruning) 도구
+#
+# - 규칙(rule): state 딕셔너리를 받아 중단 사유(str) 또는 None을 반환하는 함수
+#   state = {'date', 'bar', 'days', 'equity', 'drawdown', 'max_drawdown', 'trades'}
+#   (drawdown / max_drawdown은 % 단위 음수, trades는 진입 포함 체결 횟수)
+# - Pruner: 엔진이 매 bar마다 update()를 호출하면, 체크포인트(N bar마다 / 연도 경계)에서만 규칙을 검사
+#
+# 사용 예)
+#   pruner = make_pruner()                       # config.py의 PRUNE_* 설정 사용
+#   portfolio, trades = engine.run_backtest(df, 10000.0, context, pruner=pruner)
+#   portfolio.attrs.get('prune_reason')          # 중단됐으면 사유 문자열
+
+import config
+
+
+def max_drawdown_rule(limit):
+    """누적 MDD(%)가 limit(예: -50.0)보다 나빠지면 중단"""
+    def rule(state):
+        if state['max_drawdown'] < limit:
+            return f"MDD {state['max_drawdown']:.1f}% < {limit:.0f}%"
+        return None
+    return rule
+
+
+def min_trades_rule(min_trades, after_days):
+    """after_days일이 지났는데 체결 횟수가 min_trades 미만이면 중단"""
+    def rule(state):
+        if state['days'] >= after_days and state['trades'] < min_trades:
+            return f"{state['days']}일 동안 체결 {state['trades']}회"
+        return None
+    return rule
+
+
+def default_rules():
+    """config.py의 PRUNE_* 설정으로 기본 규칙 리스트를 만듭니다."""
+    rules = []
+    if config.PRUNE_MAX_DRAWDOWN is not None:
+        rules.append(max_drawdown_rule(config.PRUNE_MAX_DRAWDOWN))
+    if config.PRUNE_MIN_TRADES is not None:
+        rules.append(min_trades_rule(config.PRUNE_MIN_TRADES, config.PRUNE_MIN_TRADES_AFTER_DAYS))
+    return rules
+
+
+class Pruner:
+    """
+    시뮬레이션 한 번의 진행 상황(자산, 낙폭, 체결 수)을 추적하며 체크포인트마다 규칙을 검사합니다.
+    엔진이 시작할 때 reset()을 호출하므로 같은 Pruner를 여러 시뮬레이션에 재사용할 수 있습니다.
+
+    :param rules: 규칙 함수 리스트
+    :param every: 'year'(연도 경계마다) 또는 정수 N(N bar마다)
+    """
+
+    def __init__(self, rules, every='year'):
+        self.rules = list(rules)
+        self.every = every
+        self.reset()
+
+    def reset(self):
+        self.bar = 0
+        self.start_date = None
+        self.last_year = None
+        self.peak = None
+        self.max_drawdown = 0.0
+        self.reason = None
+
+    def _is_checkpoint(self, date):
+        if self.every == 'year':
+            year = date.year
+            crossed = self.last_year is not None and year != self.last_year
+            self.last_year = year
+            return crossed
+        return self.bar % int(self.every) == 0
+
+    def update(self, date, equity, trades):
+        """
+        매 bar 마감 후 호출합니다.
+        :return: 중단해야 하면 사유 문자열, 아니면 None
+        """
+        self.bar += 1
+        if self.start_date is None:
+            self.start_date = date
+        if self.peak is None or equity > self.peak:
+            self.peak = equity
+        drawdown = (equity / self.peak - 1) * 100 if self.peak > 0 else 0.0
+        self.max_drawdown = min(self.max_drawdown, drawdown)
+
+        if not self.rules or not self._is_checkpoint(date):
+            return None
+
+        state = {
+            'date': date,
+            'bar': self.bar,
+            'days': (date - self.start_date).days,
+            'equity': equity,
+            'drawdown': drawdown,
+            'max_drawdown': self.max_drawdown,
+            'trades': trades,
+        }
+        for rule in self.rules:
+            reason = rule(state)
+            if reason:
+                self.reason = f"{date:%Y-%m-%d} {reason}"
+                return self.reason
+        return None
+
+
+def make_pruner(rules=None, every=None):
+    """config.py 설정을 기본값으로 Pruner를 만듭니다."""
+    return Pruner(default_rules() if rules is None else rules,
+                  every=config.PRUNE_CHECK_EVERY if every is None else every)
@@ -0,0 +1,262 @@
+# [ 📄 backtesting/result_sink.py (신규 파일) ]
+# 백테스트/최적화 결과를 SQLite에 모아서 쓰는 공용 Writer
+#
+# - DB 연결은 writer 스레드 하나만 가짐 (WAL 모드) -> 프로세스 안에서 유일한 writer
+# - write()는 큐에 넣기만 하고 바로 반환 -> 병렬 Sweep의 결과 수신 루프를 막지 않음
+# - 테이블 스키마(컬럼 목록)는 처음 한 번만 조회해서 캐시, 새 컬럼이 나오면 그때만 ALTER TABLE
+# - 행은 버퍼에 모았다가 개수(batch_size) 또는 시간(flush_interval) 기준으로 executemany + 한 번의 commit
+#
+# 사용 예)
+#   sink = get_result_sink("backtest_log.db")
+#   sink.write('optimization_log', {'Symbol': 'AAPL', 'In_Return(%)': 12.3})
+#   sink.flush()   # (선택) 지금까지 넣은 행이 DB에 기록될 때까지 대기. 프로그램 종료 시 자동 flush
+#
+# 주의: 정상 종료(atexit)가 아니라 프로세스가 강제로 죽으면 아직 commit 안 된 행
+#       (최대 batch_size행 / flush_interval초 분량)은 사라집니다.
+#       '저장된 결과는 다시 계산하지 않는' 이어서 실행(run_optimizer)처럼 행 단위 보장이 필요하면
+#       결과마다 flush()를 호출하세요.
+# 저장 실패(SQLite 오류, 저장할 수 없는 값 등)는 writer 스레드를 죽이지 않고 모아 두었다가
+# 다음 flush() / close()에서 ResultSinkError로 알려줍니다.
+
+import os
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_BATCH_SIZE = 200  # 버퍼에 이만큼 쌓이면 flush
+DEFAULT_FLUSH_INTERVAL = 2.0  # 마지막 flush 후 이 시간(초)이 지나면 flush
+DEFAULT_CLOSE_TIMEOUT = 60.0  # close()가 writer 스레드를 기다리는 최대 시간(초)
+WAIT_POLL_SEC = 0.5  # flush/close 대기 중 writer 스레드 생존 확인 주기
+
+
+class ResultSinkError(RuntimeError):
+    """결과 저장 실패 / writer 스레드 종료 / 대기 시간 초과"""
+
+
+def _quote(name):
+    """컬럼/테이블 이름 인용 ('In_Return(%)' 같은 이름도 안전하게 사용)"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _column_type(value):
+    """값으로 컬럼 타입을 추론합니다. (기존 logger 규칙과 동일: 문자열 TEXT, 정수 INTEGER, 나머지 REAL)"""
+    if isinstance(value, str):
+        return 'TEXT'
+    if isinstance(value, int):
+        return 'INTEGER'
+    return 'REAL'
+
+
+def _adapt(value):
+    """sqlite3가 바로 저장할 수 없는 값(numpy 숫자, Timestamp 등)을 기본 타입으로 변환합니다."""
+    if value is None or isinstance(value, (str, int, float, bytes)):
+        return value
+    if hasattr(value, 'item'):  # numpy 스칼라
+        return value.item()
+    return str(value)
+
+
+class ResultSink:
+    """
+    DB 파일 하나에 대한 배치 Writer입니다. (스레드 1개 + 큐)
+    같은 DB에는 get_result_sink()로 프로세스당 하나만 만들어 공유하세요.
+    """
+
+    def __init__(self, db_path, batch_size=DEFAULT_BATCH_SIZE, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._closed = False
+        self._tables = set()  # ensure_table()로 등록한 테이블
+        self._pid = os.getpid()
+        self._errors = []  # writer 스레드에서 생긴 저장 실패 메시지 (flush/close에서 꺼내 알림)
+        self._errors_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"ResultSink({db_path})", daemon=True)
+        self._thread.start()
+        atexit.register(self.close, raise_errors=False)
+
+    # --- 호출하는 쪽 API (어느 스레드에서든 호출 가능) ---
+    def ensure_table(self, table, create_sql):
+        """
+        테이블이 없을 때 실행할 CREATE 문을 등록합니다. (고정 컬럼/제약조건이 필요한 테이블용)
+        테이블마다 처음 한 번만 실행되므로 매 결과마다 호출해도 됩니다.
+        """
+        if table in self._tables: return
+        self._tables.add(table)
+        self._queue.put(('ddl', table, create_sql))
+
+    def write(self, table, record):
+        """행 하나를 버퍼에 추가합니다. (DB 기록은 writer 스레드가 배치로 수행)"""
+        if self._closed:
+            raise ResultSinkError(f"이미 닫힌 ResultSink입니다: {self.db_path}")
+        if not self._thread.is_alive():
+            raise ResultSinkError(f"ResultSink writer 스레드가 종료되었습니다: {self.db_path}")
+        self._queue.put(('row', table, dict(record)))
+
+    def flush(self, timeout=None):
+        """
+        지금까지 write()한 행이 모두 commit될 때까지 기다립니다.
+        :param timeout: 최대 대기 시간(초, None이면 writer 스레드가 살아 있는 동안 계속 대기)
+        :raises ResultSinkError: 그동안 저장에 실패한 행이 있거나, writer 스레드가 종료됐거나, 시간 초과
+        """
+        if self._closed: return
+        done = threading.Event()
+        self._queue.put(('flush', done, None))
+        self._wait(done, timeout)
+        self._raise_errors()
+
+    def close(self, timeout=DEFAULT_CLOSE_TIMEOUT, raise_errors=True):
+        """
+        남은 행을 기록하고 writer 스레드와 DB 연결을 종료합니다.
+        :param raise_errors: False면 저장 실패를 예외 대신 출력만 함 (프로그램 종료 시 atexit)
+        """
+        if self._closed: return
+        self._closed = True
+        done = threading.Event()
+        self._queue.put(('close', done, None))
+        try:
+            self._wait(done, timeout)
+            self._thread.join(timeout)
+            self._raise_errors()
+        except ResultSinkError as e:
+            if raise_errors:
+                raise
+            print(f"⚠️ {e}")
+
+    def _wait(self, done, timeout):
+        """writer 스레드가 done을 설정할 때까지 대기 (스레드가 죽었거나 시간 초과면 예외)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(WAIT_POLL_SEC):
+            if not self._thread.is_alive():
+                self._raise_errors()  # (종료 원인이 기록돼 있으면 그것부터 알림)
+                raise ResultSinkError(f"ResultSink writer 스레드가 종료되었습니다: {self.db_path}")
+            if deadline is not None and time.monotonic() >= deadline:
+                raise ResultSinkError(f"ResultSink 대기 시간 초과 ({timeout:.0f}초): {self.db_path}")
+
+    def _report_error(self, message):
+        print(f"SQLite 오류 ({message})")
+        with self._errors_lock:
+            self._errors.append(message)
+
+    def _raise_errors(self):
+        with self._errors_lock:
+            errors, self._errors = self._errors, []
+        if errors:
+            raise ResultSinkError(f"결과 저장 실패 {len(errors)}건 ({self.db_path}): " + " / ".join(errors[:5]))
+
+    # --- writer 스레드 ---
+    def _run(self):
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+        except Exception as e:
+            # 연결조차 안 되면 이후 write/flush는 '스레드 종료'로 바로 실패
+            self._report_error(f"DB 연결 실패 {self.db_path}: {e}")
+            self._drain_waiters()
+            return
+
+        columns = {}  # table -> 현재 컬럼 집합 (스키마 캐시)
+        buffer = []  # [(table, record)]
+        last_flush = time.monotonic()
+
+        while True:
+            timeout = max(self.flush_interval - (time.monotonic() - last_flush), 0.0)
+            try:
+                kind, a, b = self._queue.get(timeout=timeout if buffer else None)
+            except queue.Empty:
+                kind, a, b = 'timer', None, None
+
+            # 어떤 예외가 나도 스레드는 계속 돌고, 기다리는 쪽(flush/close)은 반드시 깨움
+            try:
+                if kind == 'row':
+                    buffer.append((a, b))
+                elif kind == 'ddl':
+                    self._commit(conn, columns, buffer)
+                    buffer = []
+                    try:
+                        conn.execute(b)
+                        conn.commit()
+                    except Exception as e:
+                        self._report_error(f"테이블 생성 {a}: {e}")
+                    columns.pop(a, None)
+
+                if kind in ('flush', 'close', 'timer') or len(buffer) >= self.batch_size \
+                        or (buffer and time.monotonic() - last_flush >= self.flush_interval):
+                    self._commit(conn, columns, buffer)
+                    buffer = []
+                    last_flush = time.monotonic()
+            except Exception as e:
+                self._report_error(f"결과 {len(buffer)}건 처리 실패: {type(e).__name__}: {e}")
+                buffer = []
+                columns.clear()
+            finally:
+                if kind in ('flush', 'close'):
+                    a.set()
+
+            if kind == 'close':
+                conn.close()
+                return
+
+    def _drain_waiters(self):
+        """writer 스레드가 시작하자마자 끝날 때: 이미 큐에 들어온 flush/close 대기자를 깨움"""
+        while True:
+            try:
+                kind, a, _ = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if kind in ('flush', 'close'):
+                a.set()
+
+    def _table_columns(self, conn, columns, table):
+        if table not in columns:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} (id INTEGER PRIMARY KEY AUTOINCREMENT)")
+            columns[table] = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+        return columns[table]
+
+    def _commit(self, conn, columns, buffer):
+        """버퍼의 행들을 (테이블, 컬럼 구성)별로 묶어 executemany 후 한 번에 commit합니다."""
+        if not buffer: return
+        try:
+            groups = {}
+            for table, record in buffer:
+                existing = self._table_columns(conn, columns, table)
+                for name, value in record.items():
+                    if name not in existing:
+                        col_type = _column_type(value)
+                        print(f"로그: 새 컬럼 발견. '{name}' (Type: {col_type})을/를 {table} 테이블에 추가합니다.")
+                        conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)} {col_type}")
+                        existing.add(name)
+                groups.setdefault((table, tuple(record.keys())), []).append(
+                    [_adapt(v) for v in record.values()])
+
+            for (table, keys), rows in groups.items():
+                sql = (f"INSERT INTO {_quote(table)} ({', '.join(_quote(k) for k in keys)}) "
+                       f"VALUES ({', '.join(['?'] * len(keys))})")
+                conn.executemany(sql, rows)
+            conn.commit()
+        except Exception as e:
+            # (sqlite3.Error뿐 아니라 저장할 수 없는 값 등 어떤 예외든 이 배치만 버리고 계속)
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            columns.clear()  # ALTER가 롤백됐을 수 있으므로 스키마 캐시 초기화
+            self._report_error(f"결과 {len(buffer)}건 저장 실패: {type(e).__name__}: {e}")
+
+
+_SINKS = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def get_result_sink(db_path):
+    """DB 경로별로 프로세스에 하나뿐인 ResultSink를 반환합니다."""
+    with _SINKS_LOCK:
+        sink = _SINKS.get(db_path)
+        # (fork로 복사된 Sink는 writer 스레드가 없으므로 새로 만듦)
+        if sink is None or sink._closed or sink._pid != os.getpid():
+            sink = _SINKS[db_path] = ResultSink(db_path)
+        return sink
@@ -0,0 +1,311 @@
+# [ 📄 backtesting/result_store.py (신규 파일) ]
+# SQLite 결과 테이블(optimization_log, results 등)을 컬럼 단위 NumPy 파일로 미러링하고,
+# 분석에 필요한 컬럼만 빠르게 읽어오는 조회 API
+#
+# - 저장 형식: cache/result_store/<table>/part-00000/<컬럼>.npy (파트 = 한 번의 동기화 분량)
+#   숫자 컬럼: float64 (NULL -> NaN), 문자열 컬럼: int32 코드 + 카테고리 배열 (NULL -> -1)
+# - sync(): SQLite의 rowid 기준으로 새로 추가된 행만 새 파트로 내보냄 (증분)
+# - 조회: load / top_k / group_agg / pareto 모두 where 조건과 필요한 컬럼만 읽음 (mmap)
+#
+# 사용 예)
+#   store = ResultStore('optimization_log')
+#   store.sync()
+#   df = store.load(['exit_period', 'cagr'], where={'rs_weight': [0.5, 1.0], 'mdd': (-30, None)})
+#   best = store.top_k('sharpe_ratio', k=10, columns=['cagr', 'mdd'])
+
+import os
+import json
+import shutil
+import sqlite3
+import numpy as np
+import pandas as pd
+
+import config
+from backtesting.cache import CACHE_DIR
+from backtesting.pareto import pareto_mask
+
+STORE_DIR = os.path.join(CACHE_DIR, "result_store")
+SYNC_CHUNK_ROWS = 100000  # 한 파트에 담을 최대 행 수
+MAX_PARTS = 16  # 파트가 이보다 많아지면 하나로 합침 (파일 수 / 로드 시간 관리)
+ROWID_COLUMN = '_rowid'
+
+
+def _is_text_type(declared):
+    """SQLite 선언 타입으로 문자열 컬럼 여부를 판단합니다."""
+    declared = (declared or '').upper()
+    return 'CHAR' in declared or 'TEXT' in declared or 'CLOB' in declared
+
+
+def _file_name(column):
+    """컬럼 이름을 파일 이름으로 변환 ('In_Return(%)' 같은 이름도 안전하게)"""
+    return column.replace('%', '%25').replace('/', '%2F')
+
+
+def _range_mask(values, bounds):
+    lo, hi = bounds
+    mask = np.ones(len(values), dtype=bool)
+    if lo is not None:
+        mask &= values >= lo
+    if hi is not None:
+        mask &= values <= hi
+    return mask
+
+
+class ResultStore:
+    """
+    SQLite 결과 테이블 하나의 컬럼형 미러입니다.
+    (SQLite 쪽 행이 삭제/수정되는 경우는 sync(rebuild=True)로 전체를 다시 만드세요)
+    """
+
+    def __init__(self, table, db_path=None, store_dir=STORE_DIR):
+        self.table = table
+        self.db_path = db_path or config.BACKTEST_DB_NAME
+        self.path = os.path.join(store_dir, table)
+        self.meta = self._read_meta()
+        self._columns_cache = {}
+
+    # ------------------------------------------
+    # 메타데이터
+    # ------------------------------------------
+    def _meta_file(self):
+        return os.path.join(self.path, "meta.json")
+
+    def _read_meta(self):
+        try:
+            with open(self._meta_file(), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {'db_path': None, 'last_rowid': 0, 'n_rows': 0, 'columns': {}, 'parts': []}
+
+    def _write_meta(self):
+        os.makedirs(self.path, exist_ok=True)
+        tmp_path = f"{self._meta_file()}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self._meta_file())
+
+    @property
+    def columns(self):
+        """저장된 컬럼 이름 목록 (SQLite 테이블 순서)"""
+        return list(self.meta['columns'].keys())
+
+    def __len__(self):
+        return self.meta['n_rows']
+
+    # ------------------------------------------
+    # SQLite -> 컬럼 파일 동기화
+    # ------------------------------------------
+    def sync(self, rebuild=False):
+        """
+        SQLite 테이블에서 마지막 동기화 이후 추가된 행만 읽어 새 파트로 저장합니다.
+        :param rebuild: True면 기존 파일을 지우고 처음부터 다시 내보냄
+        :return: 새로 추가된 행 수
+        """
+        conn = sqlite3.connect(self.db_path)
+        try:
+            declared = {row[1]: row[2] for row in conn.execute(f'PRAGMA table_info("{self.table}")')}
+            if not declared:
+                print(f"⚠️ [{self.table}] 테이블이 없습니다: {self.db_path}")
+                return 0
+
+            max_rowid, count = conn.execute(f'SELECT MAX(rowid), COUNT(*) FROM "{self.table}"').fetchone()
+            max_rowid = max_rowid or 0
+            # DB 파일이 바뀌었거나 행이 삭제된 경우 -> 전체 재생성
+            if (self.meta['db_path'] != os.path.abspath(self.db_path)
+                    or max_rowid < self.meta['last_rowid'] or count < self.meta['n_rows']):
+                rebuild = True
+            if rebuild:
+                self._reset()
+                self.meta['db_path'] = os.path.abspath(self.db_path)
+
+            for name, col_type in declared.items():
+                self.meta['columns'].setdefault(name, 'text' if _is_text_type(col_type) else 'num')
+
+            added = 0
+            query = f'SELECT rowid AS {ROWID_COLUMN}, * FROM "{self.table}" WHERE rowid > ? ORDER BY rowid'
+            for chunk in pd.read_sql_query(query, conn, params=(self.meta['last_rowid'],),
+                                           chunksize=SYNC_CHUNK_ROWS):
+                if chunk.empty:
+                    continue
+                self._write_part(chunk)
+                added += len(chunk)
+        finally:
+            conn.close()
+
+        if len(self.meta['parts']) > MAX_PARTS:
+            self.compact()
+        self._write_meta()
+        self._columns_cache = {}
+        if added:
+            print(f"🗂️ [{self.table}] 컬럼 저장소 동기화: +{added:,}행 (총 {len(self):,}행)")
+        return added
+
+    def _reset(self):
+        if os.path.isdir(self.path):
+            shutil.rmtree(self.path)
+        self.meta = {'db_path': None, 'last_rowid': 0, 'n_rows': 0, 'columns': {}, 'parts': []}
+        self._columns_cache = {}
+
+    def _write_part(self, frame, name=None):
+        """DataFrame 한 덩어리를 파트 폴더 하나로 저장합니다."""
+        name = name or f"part-{len(self.meta['parts']):05d}"
+        part_dir = os.path.join(self.path, name)
+        os.makedirs(part_dir, exist_ok=True)
+
+        for column in frame.columns:
+            if column == ROWID_COLUMN:
+                continue
+            kind = self.meta['columns'].get(column, 'num')
+            series = frame[column]
+            if kind == 'num':
+                values = pd.to_numeric(series, errors='coerce')
+                if values.notna().sum() < series.notna().sum():
+                    # 숫자 컬럼으로 선언됐지만 문자열이 섞여 있음 -> 이 파트부터는 문자열로 저장
+                    kind = self.meta['columns'][column] = 'text'
+                else:
+                    np.save(os.path.join(part_dir, f"{_file_name(column)}.npy"),
+                            values.to_numpy(dtype=np.float64))
+                    continue
+            codes, categories = pd.factorize(series.astype(object).where(series.notna(), None))
+            np.save(os.path.join(part_dir, f"{_file_name(column)}.codes.npy"), codes.astype(np.int32))
+            np.save(os.path.join(part_dir, f"{_file_name(column)}.cats.npy"),
+                    np.asarray(categories.astype(str), dtype=str))
+
+        self.meta['parts'].append({'name': name, 'rows': len(frame)})
+        self.meta['n_rows'] += len(frame)
+        self.meta['last_rowid'] = int(frame[ROWID_COLUMN].iloc[-1])
+
+    def compact(self):
+        """모든 파트를 하나로 합칩니다."""
+        if len(self.meta['parts']) <= 1:
+            return
+        frame = self.load()
+        last_rowid = self.meta['last_rowid']
+        frame[ROWID_COLUMN] = last_rowid  # 이후 증분 동기화에는 마지막 rowid만 필요
+        old_parts = [part['name'] for part in self.meta['parts']]
+
+        # 임시 이름으로 새 파트를 쓴 뒤, 기존 파트를 지우고 part-00000으로 이름 변경
+        self.meta['parts'], self.meta['n_rows'] = [], 0
+        self._write_part(frame, name='part-compact')
+        for name in old_parts:
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+        os.replace(os.path.join(self.path, 'part-compact'), os.path.join(self.path, 'part-00000'))
+        self.meta['parts'][0]['name'] = 'part-00000'
+        self.meta['last_rowid'] = last_rowid
+        self._columns_cache = {}
+
+    # ------------------------------------------
+    # 컬럼 읽기
+    # ------------------------------------------
+    def _read_part_column(self, part, column, kind):
+        base = os.path.join(self.path, part['name'], _file_name(column))
+        if os.path.exists(f"{base}.npy"):
+            values = np.load(f"{base}.npy", mmap_mode='r')
+            return values if kind == 'num' else values.astype(object)
+        if os.path.exists(f"{base}.codes.npy"):
+            codes = np.load(f"{base}.codes.npy")
+            categories = np.load(f"{base}.cats.npy").astype(object)
+            values = np.empty(len(codes), dtype=object)
+            valid = codes >= 0
+            values[valid] = categories[codes[valid]]
+            if kind == 'num':
+                return pd.to_numeric(values, errors='coerce').astype(np.float64)
+            return values
+        # 이 파트 이후에 추가된 컬럼
+        if kind == 'num':
+            return np.full(part['rows'], np.nan)
+        return np.full(part['rows'], None, dtype=object)
+
+    def column(self, name):
+        """컬럼 하나를 전체 행에 대해 NumPy 배열로 반환합니다. (숫자: float64, 문자열: object)"""
+        if name not in self._columns_cache:
+            kind = self.meta['columns'].get(name)
+            if kind is None:
+                raise KeyError(f"[{self.table}] 컬럼 '{name}'이(가) 없습니다. (store.columns로 확인)")
+            pieces = [self._read_part_column(part, name, kind) for part in self.meta['parts']]
+            if not pieces:
+                array = np.empty(0, dtype=np.float64 if kind == 'num' else object)
+            else:
+                array = np.concatenate(pieces) if len(pieces) > 1 else np.asarray(pieces[0])
+            self._columns_cache[name] = array
+        return self._columns_cache[name]
+
+    def mask(self, where=None):
+        """
+        where 조건에 맞는 행의 불리언 마스크를 만듭니다.
+        :param where: {컬럼: 조건}
+                      - 스칼라: 같은 값 (예: {'exit_period': 20})
+                      - list/set: 그 중 하나 (예: {'Symbol': ['AAPL', 'MSFT']})
+                      - tuple (lo, hi): 범위, 양 끝 포함, None이면 열린 구간 (예: {'mdd': (-30, None)})
+        """
+        result = np.ones(len(self), dtype=bool)
+        for name, cond in (where or {}).items():
+            values = self.column(name)
+            if isinstance(cond, tuple):
+                result &= _range_mask(values, cond)
+            elif isinstance(cond, (list, set, frozenset)):
+                result &= np.isin(values, list(cond))
+            else:
+                result &= values == cond
+        return result
+
+    # ------------------------------------------
+    # 조회 API
+    # ------------------------------------------
+    def load(self, columns=None, where=None):
+        """
+        필요한 컬럼만 DataFrame으로 읽어옵니다.
+        :param columns: 읽을 컬럼 목록 (None이면 전체)
+        :param where: mask()와 같은 형식의 필터 조건
+        """
+        columns = self.columns if columns is None else list(columns)
+        rows = None if not where else np.flatnonzero(self.mask(where))
+        data = {}
+        for name in columns:
+            values = self.column(name)
+            data[name] = np.asarray(values if rows is None else values[rows])
+        return pd.DataFrame(data, columns=columns)
+
+    def top_k(self, metric, k=10, columns=None, ascending=False, where=None):
+        """
+        metric 기준 상위 k개 행을 반환합니다. (NaN 제외, 전체 정렬 없이 argpartition 사용)
+        :param ascending: True면 작은 값이 상위 (예: MDD 절댓값 등)
+        """
+        values = np.asarray(self.column(metric), dtype=np.float64)
+        keys = values if ascending else -values
+        candidates = np.flatnonzero(self.mask(where) & ~np.isnan(values))
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(keys[candidates], k - 1)[:k]]
+        rows = candidates[np.argsort(keys[candidates], kind='stable')]
+
+        columns = [c for c in (columns or []) if c != metric]
+        frame = pd.DataFrame({name: np.asarray(self.column(name)[rows]) for name in [metric] + columns})
+        frame.index = rows
+        return frame
+
+    def group_agg(self, by, metrics, agg='mean', where=None):
+        """
+        by 컬럼(들)로 묶어서 metrics를 집계합니다.
+        :param by: 컬럼 이름 또는 리스트
+        :param metrics: 컬럼 이름 또는 리스트
+        :param agg: pandas 집계 함수 이름 또는 리스트 (예: 'mean', ['mean', 'count'])
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        frame = self.load(by + metrics, where=where)
+        return frame.groupby(by, observed=True)[metrics].agg(agg)
+
+    def pareto(self, objectives, columns=None, where=None):
+        """
+        여러 목적에 대한 Pareto Front(비지배 해 집합)를 반환합니다.
+        :param objectives: {컬럼: 'max' 또는 'min'} (예: {'cagr': 'max', 'mdd': 'max'} - mdd는 음수 %)
+        """
+        names = list(objectives)
+        matrix = np.column_stack([np.asarray(self.column(n), dtype=np.float64) for n in names])
+        rows = np.flatnonzero(self.mask(where))
+        front = rows[pareto_mask(matrix[rows], [objectives[n] for n in names])]
+
+        columns = [c for c in (columns or []) if c not in names]
+        frame = pd.DataFrame({name: np.asarray(self.column(name)[front]) for name in names + columns})
+        frame.index = front
+        return frame.sort_values(names[0], ascending=objectives[names[0]] != 'max')
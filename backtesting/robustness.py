@@ -0,0 +1,143 @@
+# [ 📄 backtesting/robustness.py (신규 파일) ]
+# 몬테카를로 / 부트스트랩 강건성 검사
+#
+# 거래별 수익률(또는 일별 수익률)을 복원 추출로 섞어 N개의 '있을 법한' 경로를 만들고,
+# 경로별 CAGR / MDD / Sharpe의 분포(신뢰구간)를 구합니다.
+# - 경로 생성과 지표 계산은 모두 (N x T) 행렬 연산 (파이썬 루프 없음)
+# - N x T가 MAX_MATRIX_CELLS를 넘으면 경로를 나눠서(chunk) 계산 -> 메모리는 chunk 크기로 제한
+# - block_size를 주면 블록 부트스트랩 (연속된 수익률 묶음을 뽑아 변동성 군집/자기상관 유지)
+#
+# 사용 예)
+#   stats = metrics.calculate_metrics(portfolio, trades, df, 10000.0)
+#   attach_robustness(stats, daily_returns(portfolio), n_paths=5000, block_size=20)
+#   stats['mc_cagr_p5'], stats['mc_mdd_p5'], stats['mc_prob_loss']
+
+import numpy as np
+from backtesting import metrics
+
+DEFAULT_PATHS = 5000
+DEFAULT_PERCENTILES = (5, 50, 95)
+TRADING_DAYS = metrics.TRADING_DAYS
+MAX_MATRIX_CELLS = 20_000_000  # 한 번에 만들 최대 행렬 크기 (float64 기준 약 160MB)
+
+
+def daily_returns(portfolio_history, column='portfolio_value'):
+    """engine.run_backtest의 일별 포트폴리오 DataFrame -> 일별 수익률 배열"""
+    if portfolio_history is None or portfolio_history.empty:
+        return np.empty(0)
+    return portfolio_history[column].pct_change().dropna().to_numpy(dtype=np.float64)
+
+
+def trade_returns(trade_history):
+    """
+    engine.run_backtest의 거래 내역 -> 거래별 수익률 배열
+    (metrics.calculate_metrics와 같은 방식: Buy 가격 대비 Sell/Stop-Loss 가격)
+    """
+    returns = []
+    buy_price = 0.0
+    for trade in trade_history:
+        if trade['type'] == 'Buy':
+            buy_price = trade['price']
+        elif trade['type'] in ('Sell', 'Stop-Loss') and buy_price > 0:
+            returns.append(trade['price'] / buy_price - 1)
+            buy_price = 0.0
+    return np.asarray(returns, dtype=np.float64)
+
+
+def bootstrap_paths(returns, n_paths, length=None, block_size=None, rng=None):
+    """
+    수익률 배열에서 복원 추출한 (n_paths x length) 수익률 행렬을 만듭니다.
+
+    :param length: 경로 길이 (기본: 원본 길이)
+    :param block_size: None/1이면 i.i.d. 부트스트랩, 2 이상이면 순환(circular) 블록 부트스트랩
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    rng = rng if rng is not None else np.random.default_rng()
+    n = len(returns)
+    length = length or n
+
+    if not block_size or block_size <= 1:
+        return returns[rng.integers(0, n, size=(n_paths, length))]
+
+    # 블록 시작점만 무작위로 뽑고, 시작점 + [0..block_size) 인덱스를 브로드캐스트로 펼침
+    n_blocks = -(-length // block_size)
+    starts = rng.integers(0, n, size=(n_paths, n_blocks, 1))
+    index = (starts + np.arange(block_size)) % n
+    return returns[index.reshape(n_paths, -1)[:, :length]]
+
+
+def path_metrics(paths, periods_per_year=TRADING_DAYS):
+    """
+    (N x T) 수익률 행렬의 경로별 지표 (모두 길이 N 배열, metrics.equity_metrics에 2D로 한 번에 전달)
+    - total_return(%), cagr(%), mdd(%, 음수), sharpe(CAGR / 연율화 변동성)
+    """
+    growth = np.empty((paths.shape[0], paths.shape[1] + 1))
+    growth[:, 0] = 1.0  # 시작 자본도 고점/수익률 계산에 포함
+    np.cumprod(1.0 + paths, axis=1, out=growth[:, 1:])
+
+    stats = metrics.equity_metrics(growth, periods_per_year=periods_per_year)
+    return {
+        'total_return': stats['return'],
+        'cagr': stats['cagr'],
+        'mdd': stats['mdd'],
+        'sharpe': stats['sharpe'],
+    }
+
+
+def simulate(returns, n_paths=DEFAULT_PATHS, block_size=None, periods_per_year=TRADING_DAYS,
+             length=None, seed=42, max_cells=MAX_MATRIX_CELLS):
+    """
+    부트스트랩 경로 N개의 지표 분포를 계산합니다.
+    N x T가 max_cells를 넘으면 경로를 나눠서 계산하므로, 메모리는 경로 수가 아니라 chunk 크기에 비례합니다.
+
+    :return: {'total_return', 'cagr', 'mdd', 'sharpe'} -> 각각 길이 n_paths 배열 (수익률이 2개 미만이면 None)
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    returns = returns[np.isfinite(returns)]
+    if len(returns) < 2:
+        return None
+
+    rng = np.random.default_rng(seed)
+    length = length or len(returns)
+    chunk = max(1, min(n_paths, max_cells // length))
+
+    pieces = []
+    for done in range(0, n_paths, chunk):
+        paths = bootstrap_paths(returns, min(chunk, n_paths - done), length, block_size, rng)
+        pieces.append(path_metrics(paths, periods_per_year))
+    return {key: np.concatenate([p[key] for p in pieces]) for key in pieces[0]}
+
+
+def summarize(distributions, percentiles=DEFAULT_PERCENTILES):
+    """지표 분포 -> {지표: {'p5': .., 'p50': .., 'p95': .., 'mean': ..}} + 손실 확률"""
+    summary = {}
+    for key, values in distributions.items():
+        qs = np.percentile(values, percentiles)
+        summary[key] = {f"p{p:g}": float(q) for p, q in zip(percentiles, qs)}
+        summary[key]['mean'] = float(values.mean())
+    summary['prob_loss'] = float((distributions['total_return'] < 0).mean())
+    return summary
+
+
+def attach_robustness(stats, returns, prefix='mc_', n_paths=DEFAULT_PATHS, percentiles=DEFAULT_PERCENTILES,
+                      **kwargs):
+    """
+    calculate_metrics 등이 반환한 통계 딕셔너리에 부트스트랩 분포 요약을 평평한 키로 추가합니다.
+    (DB 로거가 그대로 컬럼으로 저장할 수 있도록 'mc_cagr_p5' 같은 형태)
+
+    :param returns: daily_returns() 또는 trade_returns() 결과
+    :param kwargs: simulate()에 전달 (block_size, periods_per_year, seed 등)
+                   거래별 수익률이면 periods_per_year를 연간 거래 수로 지정하세요.
+    :return: stats (같은 객체)
+    """
+    distributions = simulate(returns, n_paths=n_paths, **kwargs)
+    if distributions is None:
+        return stats
+
+    summary = summarize(distributions, percentiles)
+    for key in ('cagr', 'mdd', 'sharpe'):
+        for name, value in summary[key].items():
+            stats[f"{prefix}{key}_{name}"] = value
+    stats[f"{prefix}prob_loss"] = summary['prob_loss']
+    stats[f"{prefix}paths"] = n_paths
+    return stats
@@ -0,0 +1,344 @@
+# [ 📄 backtesting/search.py (신규 파일) ]
+# 전수 조사(Grid Search) 대신 쓸 수 있는 탐색 전략 모음
+#
+# - successive_halving: 모든 조합을 '싼 예산'(짧은 기간 / 일부 종목)으로 먼저 평가하고,
+#   상위 일부만 점점 더 큰 예산으로 승격시켜 마지막에는 전체 예산으로 평가합니다.
+# - hyperband: 시작 예산이 서로 다른 successive halving을 여러 번(bracket) 돌려
+#   '초반 성적이 나빴지만 끝에는 좋은 조합'을 놓칠 위험을 줄입니다.
+#
+# 예산(budget)은 0 < b <= 1 인 비율입니다. (1.0 = 전체 기간 / 전체 종목)
+# 실제로 예산을 어떻게 적용할지는 evaluate_batch 쪽에서 결정합니다.
+
+import math
+import random
+import numpy as np
+
+# 기본 예산 스케줄: 1/9 -> 1/3 -> 전체 (eta=3)
+DEFAULT_BUDGETS = (1 / 9, 1 / 3, 1.0)
+DEFAULT_ETA = 3
+
+
+def make_budgets(eta=DEFAULT_ETA, rungs=3):
+    """eta 배씩 커지는 예산 스케줄을 만듭니다. 예) eta=3, rungs=3 -> (1/9, 1/3, 1.0)"""
+    return tuple(eta ** -(rungs - 1 - i) for i in range(rungs))
+
+
+def _top_indices(indices, scores, keep, groups):
+    """그룹별로 점수 상위 keep(n) 개의 인덱스를 고릅니다. (동점이면 원래 순서가 앞선 조합 우선)"""
+    by_group = {}
+    for i in indices:
+        by_group.setdefault(groups[i], []).append(i)
+
+    survivors = []
+    for members in by_group.values():
+        valid = [i for i in members if scores.get(i) is not None]
+        valid.sort(key=lambda i: -scores[i])  # sort는 안정 정렬
+        survivors.extend(valid[:keep(len(members))])
+    return sorted(survivors)
+
+
+def successive_halving(candidates, evaluate_batch, score, budgets=DEFAULT_BUDGETS, eta=DEFAULT_ETA,
+                       min_keep=1, group=None, desc="Halving"):
+    """
+    Successive Halving 탐색을 수행합니다.
+
+    :param candidates: 평가할 조합 리스트 (예: 파라미터 dict 리스트)
+    :param evaluate_batch: evaluate_batch(candidates, budget) -> 결과 리스트 (candidates와 같은 순서, 실패는 None)
+                           한 단계(rung)의 조합을 한 번에 넘기므로 병렬 실행기(run_sweep 등)를 그대로 쓸 수 있음
+    :param score: score(result) -> 점수 (클수록 좋음, None이면 탈락)
+    :param budgets: 오름차순 예산 스케줄 (마지막 값이 전체 예산)
+    :param eta: 단계마다 상위 1/eta만 다음 단계로 승격
+    :param min_keep: 단계마다 (그룹별) 최소 승격 개수 -> 최종 후보를 최소 이만큼 전체 예산으로 평가
+    :param group: group(candidate) -> 그룹 key. 주어지면 승격을 그룹별로 따로 수행
+                  (예: 종목 x 전략 실험 여러 개를 한 번에 돌릴 때)
+    :return: (final, summary)
+             final: [(candidate, result), ...] 전체 예산으로 평가된 조합 (candidates 순서)
+             summary: {'evaluations', 'full_equivalent', 'exhaustive', 'rungs': [(budget, 평가 수), ...]}
+    """
+    candidates = list(candidates)
+    groups = [group(c) if group else None for c in candidates]
+    keep = lambda n: max(min_keep, math.ceil(n / eta))
+
+    alive = list(range(len(candidates)))
+    results = {}
+    summary = {'evaluations': 0, 'full_equivalent': 0.0, 'exhaustive': len(candidates), 'rungs': []}
+
+    for rung, budget in enumerate(budgets):
+        if not alive: break
+        print(f"🪜 [{desc}] Rung {rung + 1}/{len(budgets)}: {len(alive)}개 조합 x 예산 {budget:.0%}")
+
+        outputs = evaluate_batch([candidates[i] for i in alive], budget)
+        results = dict(zip(alive, outputs))
+        scores = {i: (score(r) if r is not None else None) for i, r in results.items()}
+
+        summary['evaluations'] += len(alive)
+        summary['full_equivalent'] += len(alive) * budget
+        summary['rungs'].append((budget, len(alive)))
+
+        if rung < len(budgets) - 1:
+            alive = _top_indices(alive, scores, keep, groups)
+
+    final = [(candidates[i], results[i]) for i in sorted(results) if results[i] is not None]
+
+    saving = 1 - summary['full_equivalent'] / summary['exhaustive'] if summary['exhaustive'] else 0.0
+    print(f"✂️ [{desc}] 평가 {summary['evaluations']}회 (전체 예산 환산 {summary['full_equivalent']:.1f}회) "
+          f"/ 전수 조사 {summary['exhaustive']}회 -> 계산량 {saving:.0%} 절감")
+    return final, summary
+
+
+def hyperband(candidates, evaluate_batch, score, budgets=DEFAULT_BUDGETS, eta=DEFAULT_ETA,
+              min_keep=1, group=None, seed=42, desc="Hyperband"):
+    """
+    Hyperband 탐색: 시작 예산이 다른 successive halving bracket을 여러 번 실행합니다.
+    - bracket 0: 전체 조합을 가장 작은 예산부터 (공격적으로 걸러냄)
+    - bracket k: 무작위로 뽑은 1/eta^k 조합을 k번째 예산부터 (덜 공격적)
+    같은 (조합, 예산) 평가는 bracket 간에 재사용합니다.
+
+    :param seed: bracket별 조합 샘플링용 시드 (결과 재현성)
+    :return: successive_halving과 같은 형식. final은 bracket들의 전체 예산 결과를 합친 것
+    """
+    candidates = list(candidates)
+    rng = random.Random(seed)
+    memo = {}  # (조합 번호, 예산) -> 결과
+
+    def memo_batch(indices, budget):
+        todo = [i for i in indices if (i, budget) not in memo]
+        if todo:
+            for i, out in zip(todo, evaluate_batch([candidates[i] for i in todo], budget)):
+                memo[(i, budget)] = out
+        return [memo[(i, budget)] for i in indices]
+
+    final = {}
+    summary = {'evaluations': 0, 'full_equivalent': 0.0, 'exhaustive': len(candidates), 'rungs': []}
+    for k in range(len(budgets)):
+        n = min(len(candidates), math.ceil(len(candidates) / eta ** k))
+        indices = sorted(rng.sample(range(len(candidates)), n)) if k > 0 else list(range(len(candidates)))
+        before = len(memo)
+
+        bracket, _ = successive_halving(indices, memo_batch, score, budgets=budgets[k:], eta=eta,
+                                        min_keep=min_keep, group=(lambda i: group(candidates[i])) if group else None,
+                                        desc=f"{desc} bracket {k + 1}")
+        for i, result in bracket:
+            final[i] = result
+
+        # 실제로 새로 계산한 평가만 집계 (memo 적중 제외)
+        for (i, budget) in list(memo)[before:]:
+            summary['evaluations'] += 1
+            summary['full_equivalent'] += budget
+        summary['rungs'].append((budgets[k], n))
+
+    print(f"✂️ [{desc}] 총 평가 {summary['evaluations']}회 (전체 예산 환산 {summary['full_equivalent']:.1f}회) "
+          f"/ 전수 조사 {summary['exhaustive']}회")
+    return [(candidates[i], final[i]) for i in sorted(final)], summary
+
+
+def run_search(mode, candidates, evaluate_batch, score, **kwargs):
+    """
+    mode 이름으로 탐색 전략을 선택합니다.
+    - 'grid': 전수 조사 (모든 조합을 전체 예산으로 1회씩)
+    - 'halving': successive_halving
+    - 'hyperband': hyperband
+    """
+    if mode == 'halving':
+        return successive_halving(candidates, evaluate_batch, score, **kwargs)
+    if mode == 'hyperband':
+        return hyperband(candidates, evaluate_batch, score, **kwargs)
+    if mode == 'grid':
+        candidates = list(candidates)
+        outputs = evaluate_batch(candidates, 1.0)
+        final = [(c, r) for c, r in zip(candidates, outputs) if r is not None]
+        return final, {'evaluations': len(candidates), 'full_equivalent': float(len(candidates)),
+                       'exhaustive': len(candidates), 'rungs': [(1.0, len(candidates))]}
+    raise ValueError(f"알 수 없는 탐색 모드: {mode}")
+
+
+# ==========================================
+# 🎯 Bayesian 탐색 (TPE: Tree-structured Parzen Estimator)
+# ==========================================
+# 탐색 공간(space) 형식: {파라미터 이름: spec}
+#   ('int', lo, hi)            : 정수 구간 (예: 이동평균 기간)
+#   ('float', lo, hi[, step])  : 실수 구간 (step이 있으면 그 간격으로 반올림)
+#   ('choice', [v1, v2, ...])  : 범주형
+#   ('fixed', v)               : 고정값 (탐색하지 않음)
+
+def space_from_grid(params_grid):
+    """
+    Grid Search용 params_grid를 탐색 공간으로 변환합니다.
+    - 값이 1개: fixed
+    - 숫자 여러 개: 최소~최대 구간 (모두 정수면 int, 아니면 float)
+    - 그 외: choice
+    """
+    space = {}
+    for key, values in params_grid.items():
+        values = list(values)
+        if len(values) == 1:
+            space[key] = ('fixed', values[0])
+        elif all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            kind = 'int' if all(isinstance(v, int) for v in values) else 'float'
+            space[key] = (kind, min(values), max(values))
+        else:
+            space[key] = ('choice', values)
+    return space
+
+
+class TPESampler:
+    """
+    파라미터별로 독립인 TPE 샘플러입니다. (외부 최적화 라이브러리 없이 numpy만 사용)
+    - 초반 n_startup회는 무작위 탐색
+    - 이후에는 지금까지의 시도를 점수 상위 gamma(좋은 그룹) / 나머지(나쁜 그룹)로 나누고,
+      좋은 그룹 분포 l(x)에서 후보를 뽑아 l(x)/g(x)가 가장 큰 후보를 제안
+    """
+
+    def __init__(self, space, gamma=0.25, n_startup=10, n_candidates=24, seed=42):
+        self.space = space
+        self.gamma = gamma
+        self.n_startup = n_startup
+        self.n_candidates = n_candidates
+        self.rng = np.random.default_rng(seed)
+        self.trials = []  # [(params, score)] score None = 실패
+
+    # --- 값 <-> [0, 1] 변환 (숫자형 파라미터) ---
+    def _to_unit(self, spec, value):
+        lo, hi = spec[1], spec[2]
+        return (value - lo) / (hi - lo) if hi > lo else 0.5
+
+    def _from_unit(self, spec, u):
+        kind, lo, hi = spec[0], spec[1], spec[2]
+        value = lo + min(max(u, 0.0), 1.0) * (hi - lo)
+        if kind == 'int':
+            return int(round(value))
+        step = spec[3] if len(spec) > 3 else None
+        return float(round(round(value / step) * step, 10) if step else round(value, 4))
+
+    def _random(self):
+        params = {}
+        for key, spec in self.space.items():
+            if spec[0] == 'fixed':
+                params[key] = spec[1]
+            elif spec[0] == 'choice':
+                params[key] = spec[1][self.rng.integers(len(spec[1]))]
+            else:
+                params[key] = self._from_unit(spec, self.rng.random())
+        return params
+
+    def _split(self):
+        """시도들을 (좋은 그룹, 나쁜 그룹) 파라미터 리스트로 나눕니다."""
+        ranked = sorted(self.trials, key=lambda t: -t[1] if t[1] is not None else float('inf'))
+        n_good = max(1, int(math.ceil(self.gamma * len([t for t in ranked if t[1] is not None]))))
+        good = [p for p, s in ranked[:n_good] if s is not None]
+        bad = [p for p, _ in ranked[len(good):]]
+        return good, bad
+
+    def _numeric_density(self, points, u):
+        """[0,1] 구간 Parzen 밀도 (관측점마다 가우시안 + 균등 prior 1개)"""
+        n = len(points)
+        if n == 0:
+            return np.ones_like(u)
+        points = np.asarray(points)
+        sigma = float(np.clip(1.06 * points.std() * n ** -0.2, 0.05, 0.5)) if n > 1 else 0.25
+        kernels = np.exp(-0.5 * ((u[:, None] - points[None, :]) / sigma) ** 2) / (sigma * np.sqrt(2 * np.pi))
+        return (kernels.sum(axis=1) + 1.0) / (n + 1)
+
+    def _sample_numeric(self, points, size):
+        n = len(points)
+        sigma = float(np.clip(1.06 * np.std(points) * n ** -0.2, 0.05, 0.5)) if n > 1 else 0.25
+        # 각 샘플마다 (관측점 n개 + prior 1개) 중 하나를 골라 거기서 뽑음
+        comp = self.rng.integers(n + 1, size=size)
+        u = self.rng.random(size)
+        is_kernel = comp < n
+        u[is_kernel] = np.asarray(points)[comp[is_kernel]] + self.rng.normal(0, sigma, is_kernel.sum())
+        return np.clip(u, 0.0, 1.0)
+
+    def _suggest(self):
+        good, bad = self._split()
+        log_ratio = np.zeros(self.n_candidates)
+        columns = {}
+
+        for key, spec in self.space.items():
+            if spec[0] == 'fixed':
+                columns[key] = [spec[1]] * self.n_candidates
+            elif spec[0] == 'choice':
+                values = list(spec[1])
+                good_w = np.array([1.0 + sum(p[key] == v for p in good) for v in values])
+                bad_w = np.array([1.0 + sum(p[key] == v for p in bad) for v in values])
+                good_w /= good_w.sum()
+                bad_w /= bad_w.sum()
+                picks = self.rng.choice(len(values), size=self.n_candidates, p=good_w)
+                columns[key] = [values[i] for i in picks]
+                log_ratio += np.log(good_w[picks]) - np.log(bad_w[picks])
+            else:
+                good_u = [self._to_unit(spec, p[key]) for p in good]
+                bad_u = [self._to_unit(spec, p[key]) for p in bad]
+                u = self._sample_numeric(good_u, self.n_candidates)
+                columns[key] = [self._from_unit(spec, x) for x in u]
+                log_ratio += np.log(self._numeric_density(good_u, u)) - np.log(self._numeric_density(bad_u, u))
+
+        order = np.argsort(-log_ratio)
+        return [{key: columns[key][i] for key in self.space} for i in order]
+
+    @staticmethod
+    def _key(params):
+        return tuple(sorted((k, repr(v)) for k, v in params.items()))
+
+    def ask(self, n=1):
+        """다음에 평가할 조합 n개를 제안합니다. (이미 시도했거나 같은 배치에 있는 조합은 제외)"""
+        seen = {self._key(p) for p, _ in self.trials}
+        proposals = []
+        for _ in range(n):
+            if len(self.trials) < self.n_startup:
+                candidates = [self._random() for _ in range(self.n_candidates)]
+            else:
+                candidates = self._suggest() + [self._random() for _ in range(self.n_candidates)]
+            for params in candidates:
+                if self._key(params) not in seen:
+                    seen.add(self._key(params))
+                    proposals.append(params)
+                    break
+        return proposals
+
+    def tell(self, params, score):
+        """평가 결과를 기록합니다. (score None = 실패 -> 나쁜 그룹으로 취급)"""
+        self.trials.append((params, score))
+
+
+def bayesian_search(space, evaluate_batch, score, budget=40, batch_size=4, n_startup=10, seed=42,
+                    on_trial=None, desc="TPE"):
+    """
+    TPE 기반 순차 탐색. 평가 예산(budget)만큼 조합을 제안/평가합니다.
+
+    :param space: 탐색 공간 (space_from_grid 참고)
+    :param evaluate_batch: evaluate_batch(candidates, budget) -> 결과 리스트 (run_search와 같은 형식, budget은 항상 1.0)
+    :param score: score(result) -> 점수 (클수록 좋음)
+    :param budget: 총 평가 횟수
+    :param batch_size: 한 번에 제안해서 같이 평가할 조합 수 (병렬 평가용)
+    :param on_trial: on_trial(trial_no, params, result) - 평가마다 호출 (DB 기록 등, result는 None일 수 있음)
+    :return: (trials, summary)
+             trials: [(trial_no, params, result), ...] 평가 순서대로
+             summary: {'evaluations', 'best_score', 'best_params', 'best_trial'}
+    """
+    sampler = TPESampler(space, n_startup=n_startup, seed=seed)
+    trials = []
+    best = (None, None, None)  # (score, params, trial_no)
+
+    while len(trials) < budget:
+        proposals = sampler.ask(min(batch_size, budget - len(trials)))
+        if not proposals:
+            print(f"🎯 [{desc}] 더 이상 새로운 조합이 없습니다. (탐색 공간 소진)")
+            break
+
+        outputs = evaluate_batch(proposals, 1.0)
+        for params, result in zip(proposals, outputs):
+            trial_no = len(trials) + 1
+            value = score(result) if result is not None else None
+            sampler.tell(params, value)
+            trials.append((trial_no, params, result))
+            if on_trial is not None:
+                on_trial(trial_no, params, result)
+            if value is not None and (best[0] is None or value > best[0]):
+                best = (value, params, trial_no)
+
+        if best[0] is not None:
+            print(f"🎯 [{desc}] {len(trials)}/{budget} 평가 완료 | 현재 최고 점수 {best[0]:.4f} (trial #{best[2]})")
+
+    summary = {'evaluations': len(trials), 'best_score': best[0], 'best_params': best[1], 'best_trial': best[2]}
+    return trials, summary
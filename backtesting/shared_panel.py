@@ -0,0 +1,93 @@
+# [ 📄 backtesting/shared_panel.py (신규 파일) ]
+# 전 종목 OHLCV를 (종목 x 날짜 x 필드) 배열 하나로 만들어 multiprocessing.shared_memory로 공유합니다.
+# 워커는 종목 인덱스만 받아서 공유 메모리에서 바로 DataFrame을 만들어 쓰므로,
+# 종목별 DataFrame을 매번 pickle 해서 보낼 필요가 없습니다.
+
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory
+
+PANEL_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+class SharedPricePanel:
+    """
+    공유 메모리 위의 가격 패널.
+    - 메인 프로세스: SharedPricePanel.publish(df_all, symbols) 로 생성 (owner)
+    - 워커 프로세스: SharedPricePanel.attach(panel.meta) 로 연결 (읽기 전용으로 사용)
+    """
+
+    def __init__(self, shm, meta, owner=False):
+        self._shm = shm
+        self.meta = meta
+        self.owner = owner
+        self.symbols = list(meta['symbols'])
+        self.fields = list(meta['fields'])
+        self.dates = pd.DatetimeIndex(meta['dates'], name='date')
+        self.values = np.ndarray(meta['shape'], dtype=np.float64, buffer=shm.buf)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    @classmethod
+    def publish(cls, df_all, symbols=None, fields=PANEL_FIELDS):
+        """
+        get_all_price_data_bulk()가 반환한 long 포맷 DataFrame(date, symbol, OHLCV)을
+        3차원 배열로 변환해 공유 메모리에 올립니다.
+
+        :param df_all: date, symbol, open, high, low, close, volume 컬럼을 가진 DataFrame
+        :param symbols: 패널에 포함할 종목 리스트 (None이면 전체)
+        """
+        if symbols is not None:
+            df_all = df_all[df_all['symbol'].isin(symbols)]
+        symbols = sorted(df_all['symbol'].unique())
+        dates = np.sort(df_all['date'].unique())
+
+        sym_idx = pd.Index(symbols).get_indexer(df_all['symbol'])
+        date_idx = pd.DatetimeIndex(dates).get_indexer(df_all['date'])
+
+        shape = (len(symbols), len(dates), len(fields))
+        nbytes = max(int(np.prod(shape)) * 8, 1)
+        shm = shared_memory.SharedMemory(create=True, size=nbytes)
+
+        values = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        values.fill(np.nan)
+        for k, field in enumerate(fields):
+            values[sym_idx, date_idx, k] = df_all[field].to_numpy(dtype=np.float64)
+
+        meta = {
+            'name': shm.name,
+            'shape': shape,
+            'symbols': symbols,
+            'fields': list(fields),
+            # 정수(ns)로 전달 -> pandas 버전에 따라 기본 해상도가 us/s여도 attach에서 같은 날짜로 복원
+            'dates': pd.DatetimeIndex(dates).as_unit('ns').asi8,
+        }
+        return cls(shm, meta, owner=True)
+
+    @classmethod
+    def attach(cls, meta):
+        """워커 프로세스에서 이미 공개된 패널에 연결합니다."""
+        shm = shared_memory.SharedMemory(name=meta['name'])
+        return cls(shm, meta, owner=False)
+
+    def symbol_index(self, symbol):
+        """종목 코드 -> 패널 인덱스 (없으면 -1)"""
+        return self._index.get(symbol, -1)
+
+    def frame(self, idx):
+        """
+        idx번째 종목의 OHLCV DataFrame(날짜 인덱스)을 만듭니다.
+        해당 종목에 데이터가 없는 날짜(모든 필드가 NaN)는 제외합니다.
+        """
+        block = self.values[idx]
+        mask = ~np.isnan(block).all(axis=1)
+        return pd.DataFrame(block[mask].copy(), index=self.dates[mask], columns=self.fields)
+
+    def close(self):
+        """이 프로세스의 매핑을 해제합니다. owner라면 공유 메모리 자체도 삭제합니다."""
+        self.values = None
+        self._shm.close()
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,232 @@
+# [ 📄 backtesting/streaming.py (신규 파일) ]
+# 스트리밍(온라인) 성과 지표 누적기 - '통계 전용' 시뮬레이션용
+#
+# 대규모 스윕에서는 조합마다 일별 자산 기록(portfolio_history) 전체가 필요하지 않고 최종 통계만 필요합니다.
+# StreamingStats는 bar마다 update()로 자산 값을 받아 아래 값만 유지하므로 조합당 메모리가 O(T)가 아니라 O(1)입니다.
+# - 누적 고점 / 최대 낙폭
+# - 일별 수익률의 평균/분산 (Welford), 음수 수익률만의 평균/분산 (하방 변동성)
+# - 주식 보유일 수 (Exposure), 연도 경계의 자산 값 (연도별 수익률)
+# - 거래 승/패 집계 (건수, 수익률 합, 손익 합, SQN용 평균/분산)
+#
+# 결과는 metrics.equity_metrics / yearly_returns / trade_stats와 같은 정의, 같은 키입니다.
+# update()에 스칼라 대신 길이 N 배열을 주면 N개 조합을 한 번에 누적합니다. (같은 날짜를 공유하는 조합들)
+#
+# 사용 예)
+#   portfolio, trades = engine.run_backtest(df, 10000.0, context, stats_only=True)   # portfolio = StreamingStats
+#   stats = metrics.calculate_metrics(portfolio, trades, df, 10000.0)                 # 키는 기존과 동일
+
+import numpy as np
+from backtesting import metrics
+
+EXPOSURE_CASH_RATIO = 0.99  # 현금 비중이 이 값 미만인 날 = 주식 보유일 (metrics.calculate_metrics와 동일)
+
+
+def _value(v):
+    """0차원(스칼라 누적)이면 float, 아니면 배열 그대로"""
+    return float(v) if np.ndim(v) == 0 else v
+
+
+class StreamingStats:
+    """
+    bar 단위로 갱신되는 성과 지표 누적기
+
+    :param initial_capital: 수익률/CAGR/연도별 수익률의 기준 원금 (None이면 첫 자산 값)
+    :param shape: 동시에 누적할 곡선 shape (기본: 스칼라 1개, (N,)이면 N개 조합)
+    :param periods_per_year: 변동성 연율화 계수
+    """
+
+    def __init__(self, initial_capital=None, shape=(), periods_per_year=metrics.TRADING_DAYS):
+        self.initial_capital = initial_capital
+        self.shape = shape
+        self.periods_per_year = periods_per_year
+        self.attrs = {}  # engine이 DataFrame.attrs처럼 prune_reason 등을 남기는 자리
+
+        self.bars = 0
+        self.first_date = self.last_date = None
+        self.first = self.last = self.peak = None
+        self.max_dd = np.zeros(shape)
+
+        # 일별 수익률 Welford (개수 = bars, 첫날 수익률은 0 - equity_metrics와 동일)
+        self.ret_mean = np.zeros(shape)
+        self.ret_m2 = np.zeros(shape)
+        self.neg_count = np.zeros(shape, dtype=np.int64)
+        self.neg_mean = np.zeros(shape)
+        self.neg_m2 = np.zeros(shape)
+
+        self.exposure_days = np.zeros(shape, dtype=np.int64)
+        self.year = None
+        self.year_marks = {}  # {연도: 그 해 마지막 자산}
+
+        # 거래 집계
+        self.trades = np.zeros(shape, dtype=np.int64)
+        self.wins = np.zeros(shape, dtype=np.int64)
+        self.win_return_sum = np.zeros(shape)
+        self.loss_return_sum = np.zeros(shape)
+        self.gross_profit = np.zeros(shape)
+        self.loss_profit_sum = np.zeros(shape)
+        self.trade_mean = np.zeros(shape)
+        self.trade_m2 = np.zeros(shape)
+
+    def __len__(self):
+        return self.bars
+
+    # ------------------------------------------------------------------
+    # 갱신
+    # ------------------------------------------------------------------
+    def update(self, date, equity, cash=None):
+        """
+        bar 하나의 마감 자산을 누적합니다.
+
+        :param date: 날짜 (연도별 수익률 / CAGR 기간용, None이면 bar 수로 기간 계산)
+        :param equity: 자산 값 (스칼라 또는 shape 배열)
+        :param cash: (선택) 현금 - 주면 Exposure(주식 보유일 비율)도 집계
+        """
+        equity = np.array(equity, dtype=np.float64)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if self.bars == 0:
+                self.first = equity
+                self.first_date = date
+                self.peak = equity.copy()
+                ret = np.zeros(self.shape)
+            else:
+                ret = equity / self.last - 1
+                np.maximum(self.peak, equity, out=self.peak)
+
+            drawdown = np.where(self.peak > 0, equity / self.peak - 1.0, 0.0)
+            np.minimum(self.max_dd, drawdown, out=self.max_dd)
+
+        if date is not None:
+            if self.year is not None and date.year != self.year:
+                self.year_marks[self.year] = self.last
+            self.year = date.year
+
+        self.bars += 1
+        delta = ret - self.ret_mean
+        self.ret_mean += delta / self.bars
+        self.ret_m2 += delta * (ret - self.ret_mean)
+
+        neg = ret < 0
+        self.neg_count += neg
+        delta = np.where(neg, ret - self.neg_mean, 0.0)
+        self.neg_mean += delta / np.maximum(self.neg_count, 1)
+        self.neg_m2 += delta * (ret - self.neg_mean)
+
+        if cash is not None:
+            self.exposure_days += np.asarray(cash) < equity * EXPOSURE_CASH_RATIO
+
+        self.last = equity
+        self.last_date = date
+
+    def add_trade(self, ret, profit=None, where=None):
+        """
+        청산된 거래를 누적합니다.
+
+        :param ret: 거래 수익률 (0.05 = 5%)
+        :param profit: 거래 손익 금액 (손익비 계산용, 기본: ret)
+        :param where: (배열 누적 시) 이번 거래가 해당하는 조합 마스크
+        """
+        ret = np.asarray(ret, dtype=np.float64)
+        profit = ret if profit is None else np.asarray(profit, dtype=np.float64)
+        hit = np.ones(self.shape, dtype=bool) if where is None else np.asarray(where, dtype=bool)
+        win = hit & (ret > 0)
+        loss = hit & ~(ret > 0)
+
+        self.trades += hit
+        self.wins += win
+        self.win_return_sum += np.where(win, ret, 0.0)
+        self.loss_return_sum += np.where(loss, ret, 0.0)
+        self.gross_profit += np.where(win, profit, 0.0)
+        self.loss_profit_sum += np.where(loss, profit, 0.0)
+
+        delta = np.where(hit, ret - self.trade_mean, 0.0)
+        self.trade_mean += delta / np.maximum(self.trades, 1)
+        self.trade_m2 += delta * (ret - self.trade_mean)
+
+    # ------------------------------------------------------------------
+    # 결과
+    # ------------------------------------------------------------------
+    def equity_summary(self):
+        """
+        metrics.equity_metrics와 같은 키 + 'yearly'({연도: 수익률 %}) + 'exposure'(%)
+        (배열 누적이면 값은 길이 N 배열, yearly의 값도 배열)
+        """
+        if self.bars == 0:
+            return None
+
+        ppy = self.periods_per_year
+        initial = self.first if self.initial_capital is None else np.full(self.shape, float(self.initial_capital))
+        if self.first_date is not None and self.bars > 1:
+            days = (self.last_date - self.first_date).days
+        else:
+            days = (self.bars - 1) * 365 / ppy
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            growth = self.last / initial
+            total_ret = (growth - 1) * 100
+            if days > 0:
+                cagr = np.where(growth > 0, np.power(np.maximum(growth, 0.0), 365 / days) - 1, -1.0) * 100
+            else:
+                cagr = np.zeros(self.shape)
+
+            vol = np.sqrt(self.ret_m2 / (self.bars - 1)) * np.sqrt(ppy) if self.bars > 1 else np.zeros(self.shape)
+            down_vol = np.where(self.neg_count > 1,
+                                np.sqrt(self.neg_m2 / np.maximum(self.neg_count - 1, 1)) * np.sqrt(ppy), 0.0)
+            mdd = self.max_dd * 100
+            sharpe = np.where(vol > 0, (cagr / 100) / vol, 0.0)
+            sortino = np.where(down_vol > 0, (cagr / 100) / down_vol, 0.0)
+            calmar = np.where(mdd != 0, np.abs(cagr / mdd), 0.0)
+
+            yearly = {}
+            previous = initial
+            marks = dict(self.year_marks)
+            if self.year is not None:
+                marks[self.year] = self.last
+            for year, close in marks.items():
+                yearly[year] = _value((close / previous - 1) * 100)
+                previous = close
+
+        result = {
+            'return': total_ret, 'cagr': cagr, 'mdd': mdd, 'volatility': vol,
+            'sharpe': sharpe, 'sortino': sortino, 'calmar': calmar, 'final_equity': self.last,
+            'exposure': self.exposure_days / self.bars * 100.0,
+        }
+        result = {k: _value(v) for k, v in result.items()}
+        result['yearly'] = yearly
+        return result
+
+    def trade_summary(self, no_loss_profit_factor=None):
+        """metrics.trade_stats와 같은 키와 정의 (win_rate는 비율, avg_win/avg_loss는 %)"""
+        losses = self.trades - self.wins
+        gross_loss = np.abs(self.loss_profit_sum)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            no_loss = np.where(self.gross_profit > 0, self.gross_profit, 0.0) if no_loss_profit_factor is None \
+                else np.full(self.shape, float(no_loss_profit_factor))
+            profit_factor = np.where(gross_loss > 0, self.gross_profit / gross_loss, no_loss)
+
+            std = np.sqrt(self.trade_m2 / np.maximum(self.trades, 1))  # 모표준편차 (trade_stats와 동일)
+            sqn = np.where((self.trades > 1) & (std > 0), self.trade_mean / std * np.sqrt(self.trades), 0.0)
+
+            result = {
+                'total_trades': self.trades,
+                'win_rate': np.where(self.trades > 0, self.wins / np.maximum(self.trades, 1), 0.0),
+                'profit_factor': profit_factor,
+                'avg_win': np.where(self.wins > 0, self.win_return_sum / np.maximum(self.wins, 1) * 100, 0.0),
+                'avg_loss': np.where(losses > 0, self.loss_return_sum / np.maximum(losses, 1) * 100, 0.0),
+                'sqn': sqn,
+                'gross_profit': self.gross_profit,
+                'gross_loss': gross_loss,
+            }
+        result = {k: _value(v) for k, v in result.items()}
+        if np.ndim(self.trades) == 0:
+            result['total_trades'] = int(self.trades)
+        return result
+
+    def portfolio_stats(self):
+        """metrics.portfolio_stats와 같은 결과 (run_portfolio_backtest의 통계 전용 모드용, 스칼라 누적 전제)"""
+        result = self.equity_summary()
+        if result is None:
+            return None
+        trades = self.trade_summary(no_loss_profit_factor=metrics.PROFIT_FACTOR_NO_LOSS) if self.trades else None
+        result.update(metrics.portfolio_trade_fields(trades))
+        return result
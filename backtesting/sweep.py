@@ -0,0 +1,135 @@
+# [ 📄 backtesting/sweep.py (신규 파일) ]
+# 단일 종목 최적화기들이 공용으로 쓰는 병렬 그리드 서치 실행기
+#
+# - (data_key, params) 작업을 프로세스 풀에 chunk 단위로 분배
+# - 각 워커는 data_key별 데이터를 처음 한 번만 로드해서 메모리에 보관
+# - 결과는 메인 프로세스로 스트리밍되고, DB 기록은 메인 프로세스(단일 writer)에서만 수행
+#   -> SQLite 결과 테이블에 여러 프로세스가 동시에 쓰면서 생기는 lock 경합이 없음
+# - 프로파일링(backtesting/profiling.py)이 켜져 있으면 워커의 단계별 span 통계도 결과와 함께 돌려받아 합침
+
+import math
+import time
+from multiprocessing import Pool, cpu_count
+from lazy_imports import lazy_attr
+from backtesting import profiling
+
+tqdm = lazy_attr('tqdm', 'tqdm')  # 진행 바를 실제로 띄울 때 import
+
+# --- 워커 프로세스 전역 상태 ---
+_worker_evaluate = None
+_worker_load_data = None
+_worker_data = {}
+_worker_data_limit = None
+_worker_ships_spans = False  # 별도 워커 프로세스면 span 통계를 결과와 함께 메인 프로세스로 보냄
+
+
+def _init_sweep_worker(evaluate, load_data, data_cache_size=None, ships_spans=False):
+    global _worker_evaluate, _worker_load_data, _worker_data, _worker_data_limit, _worker_ships_spans
+    _worker_evaluate = evaluate
+    _worker_load_data = load_data
+    _worker_data = {}
+    _worker_data_limit = data_cache_size
+    _worker_ships_spans = ships_spans
+    if ships_spans:
+        profiling.reset()  # fork로 복사된 메인 프로세스의 통계를 다시 보내지 않도록
+
+
+def _get_worker_data(data_key):
+    """워커 안에서 data_key별 데이터를 한 번만 로드합니다. (data_cache_size를 넘으면 오래된 것부터 버림)"""
+    if data_key not in _worker_data:
+        if _worker_data_limit is not None:
+            while _worker_data and len(_worker_data) >= _worker_data_limit:
+                del _worker_data[next(iter(_worker_data))]
+        with profiling.span('load'):
+            _worker_data[data_key] = _worker_load_data(data_key)
+    return _worker_data[data_key]
+
+
+def _run_sweep_task(task):
+    """(job 번호, (data_key, params)) -> (job 번호, 결과, 에러 메시지, span 통계)"""
+    idx, (data_key, params) = task
+    result, error = None, None
+    try:
+        data = _get_worker_data(data_key)
+        if data is not None:
+            with profiling.span('evaluate'):
+                result = _worker_evaluate(data, params)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return idx, result, error, (profiling.pop_snapshot() if _worker_ships_spans else None)
+
+
+def run_sweep(jobs, evaluate, load_data, on_result=None, processes=None, chunksize=None, desc="Sweep",
+              data_cache_size=None, with_index=False):
+    """
+    (data_key, params) 작업 리스트를 병렬로 평가합니다.
+
+    :param jobs: [(data_key, params), ...] - data_key는 load_data에 넘길 값 (예: 종목 코드)
+    :param evaluate: evaluate(data, params) -> 결과 (None이면 결과 없음). 모듈 최상위 함수여야 함 (pickle)
+    :param load_data: load_data(data_key) -> 데이터 (None이면 해당 key의 작업은 모두 스킵)
+    :param on_result: on_result(job, result) - 메인 프로세스에서 결과가 도착할 때마다 호출 (DB 기록 등)
+    :param processes: 워커 수 (기본: CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+    :param chunksize: 한 번에 워커에 넘길 작업 수 (기본: 코어당 약 4 chunk)
+    :param data_cache_size: 워커가 메모리에 들고 있을 data_key 수 (기본: 제한 없음)
+                            데이터가 큰 경우(예: 조합별 신호 데이터셋) 1~2로 제한
+    :param with_index: True면 results를 [(jobs 안의 번호, job, result), ...]로 반환
+                       (결과가 빠진 작업이 있어도 호출 쪽에서 번호로 원래 위치를 찾을 수 있음)
+    :return: (results, summary)
+             results: [(job, result), ...] jobs와 같은 순서 (결과가 없거나 실패한 작업은 제외)
+             summary: {'total', 'completed', 'empty', 'errors', 'elapsed_sec', 'combos_per_sec'}
+    """
+    jobs = list(jobs)
+    processes = processes or cpu_count()
+
+    # 같은 data_key의 작업이 같은 chunk에 모이도록 정렬 -> 워커별 데이터 로드 횟수 최소화
+    order = sorted(range(len(jobs)), key=lambda i: str(jobs[i][0]))
+    tasks = [(i, jobs[i]) for i in order]
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(tasks) / (processes * 4)))
+
+    results = []
+    summary = {'total': len(jobs), 'completed': 0, 'empty': 0, 'errors': 0}
+    error_samples = []
+
+    def handle(idx, result, error, spans=None):
+        profiling.merge(spans)
+        if error is not None:
+            summary['errors'] += 1
+            if len(error_samples) < 5:
+                error_samples.append(f"{jobs[idx][0]} {jobs[idx][1]} -> {error}")
+            return
+        if result is None:
+            summary['empty'] += 1
+            return
+        summary['completed'] += 1
+        results.append((idx, jobs[idx], result))
+        if on_result is not None:
+            on_result(jobs[idx], result)
+
+    start_time = time.time()
+    if processes == 1:
+        _init_sweep_worker(evaluate, load_data, data_cache_size)
+        for task in tqdm(tasks, desc=desc):
+            handle(*_run_sweep_task(task))
+    else:
+        with Pool(processes=processes, initializer=_init_sweep_worker,
+                  initargs=(evaluate, load_data, data_cache_size, True)) as pool:
+            for out in tqdm(pool.imap_unordered(_run_sweep_task, tasks, chunksize=chunksize),
+                            total=len(tasks), desc=desc):
+                handle(*out)
+
+    elapsed = time.time() - start_time
+    summary['elapsed_sec'] = elapsed
+    summary['combos_per_sec'] = len(jobs) / elapsed if elapsed > 0 else 0.0
+
+    print(f"⚡ [{desc}] {len(jobs)}개 조합 / {elapsed:.1f}초 "
+          f"({summary['combos_per_sec']:.1f} combos/sec, 워커 {processes}개, chunk {chunksize})")
+    if summary['errors']:
+        print(f"   ⚠️ 실패 {summary['errors']}건 (예시)")
+        for line in error_samples:
+            print(f"     - {line}")
+
+    results.sort(key=lambda x: x[0])
+    if with_index:
+        return results, summary
+    return [(job, result) for _, job, result in results], summary
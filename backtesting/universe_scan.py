@@ -0,0 +1,171 @@
+# [ 📄 backtesting/universe_scan.py (신규 파일) ]
+# 전 종목(유니버스) 스캔 공용 실행기 - 스크리너 / 실전 봇 / 전 종목 검증이 함께 사용
+#
+# - 종목 리스트를 chunk 단위로 프로세스 풀에 분배하고, 종목마다 analyze(symbol)를 실행
+# - 각 워커는 읽기 전용 DB 연결 하나를 열어두고 재사용 (data_manager.use_read_only_connection)
+#   -> analyze 안에서 data_manager.get_price_data()를 그대로 호출해도 조회마다 연결을 새로 열지 않음
+# - 결과는 종목 리스트 순서대로 반환, 실패는 종목별 에러 메시지로 수집 (except: continue로 삼키지 않음)
+# - DB 기록 등은 on_result 콜백으로 메인 프로세스에서만 수행 (단일 writer)
+#
+# 확장성 측정)
+#   python -m backtesting.universe_scan --target screener --processes 1 2 4 8 --limit 200
+
+import argparse
+import math
+import time
+from multiprocessing import Pool, cpu_count
+import pandas as pd
+from lazy_imports import lazy_attr
+
+tqdm = lazy_attr('tqdm', 'tqdm')  # 진행 바를 실제로 띄울 때 import
+import data_manager
+
+# --- 워커 프로세스 전역 상태 ---
+_worker_analyze = None
+
+
+def _init_scan_worker(analyze, db_path):
+    global _worker_analyze
+    _worker_analyze = analyze
+    data_manager.use_read_only_connection(db_path)
+
+
+def _run_scan_task(task):
+    """(순번, 종목) -> (순번, 결과, 에러 메시지)"""
+    idx, symbol = task
+    try:
+        return idx, _worker_analyze(symbol), None
+    except Exception as e:
+        return idx, None, f"{type(e).__name__}: {e}"
+
+
+def scan_universe(symbols, analyze, on_result=None, processes=None, chunksize=None, db_path=None,
+                  desc="Universe scan", verbose=True):
+    """
+    종목 리스트 전체에 analyze(symbol)를 병렬로 실행합니다.
+
+    :param symbols: 종목 코드 리스트 (예: data_manager.get_ticker_list())
+    :param analyze: analyze(symbol) -> 결과 (None이면 결과 없음). 모듈 최상위 함수여야 함 (pickle)
+    :param on_result: on_result(symbol, result) - 메인 프로세스에서 결과가 도착할 때마다 호출 (DB 기록 등)
+    :param processes: 워커 수 (기본: CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+    :param chunksize: 한 번에 워커에 넘길 종목 수 (기본: 코어당 약 4 chunk)
+    :param db_path: 워커가 읽기 전용으로 열 DB (기본: 현재 data_manager의 DB)
+    :return: (results, errors, summary)
+             results: [(symbol, result), ...] symbols와 같은 순서 (결과 없음 / 실패는 제외)
+             errors: {symbol: 'ErrorType: message'}
+             summary: {'total', 'completed', 'empty', 'errors', 'elapsed_sec', 'symbols_per_sec', 'processes'}
+    """
+    symbols = list(symbols)
+    processes = processes or cpu_count()
+    db_path = db_path or data_manager.get_manager().db_path
+    tasks = list(enumerate(symbols))
+    if chunksize is None:
+        chunksize = max(1, math.ceil(len(tasks) / (processes * 4)))
+
+    results, errors = [], {}
+    summary = {'total': len(symbols), 'completed': 0, 'empty': 0, 'errors': 0}
+
+    def handle(idx, result, error):
+        symbol = symbols[idx]
+        if error is not None:
+            summary['errors'] += 1
+            errors[symbol] = error
+            return
+        if result is None:
+            summary['empty'] += 1
+            return
+        summary['completed'] += 1
+        results.append((idx, symbol, result))
+        if on_result is not None:
+            on_result(symbol, result)
+
+    start_time = time.time()
+    if processes == 1:
+        global _worker_analyze
+        _worker_analyze = analyze
+        for task in tqdm(tasks, desc=desc, disable=not verbose):
+            handle(*_run_scan_task(task))
+    else:
+        with Pool(processes=processes, initializer=_init_scan_worker, initargs=(analyze, db_path)) as pool:
+            for out in tqdm(pool.imap_unordered(_run_scan_task, tasks, chunksize=chunksize),
+                            total=len(tasks), desc=desc, disable=not verbose):
+                handle(*out)
+
+    elapsed = time.time() - start_time
+    summary['elapsed_sec'] = elapsed
+    summary['symbols_per_sec'] = len(symbols) / elapsed if elapsed > 0 else 0.0
+    summary['processes'] = processes
+
+    if verbose:
+        print(f"⚡ [{desc}] {len(symbols)}개 종목 / {elapsed:.1f}초 "
+              f"({summary['symbols_per_sec']:.1f} symbols/sec, 워커 {processes}개, chunk {chunksize})")
+        if errors:
+            print(f"   ⚠️ 실패 {len(errors)}건 (예시)")
+            for symbol, error in list(errors.items())[:5]:
+                print(f"     - {symbol}: {error}")
+
+    results.sort(key=lambda x: x[0])
+    return [(symbol, result) for _, symbol, result in results], errors, summary
+
+
+def measure_scaling(symbols, analyze, process_counts, chunksize=None):
+    """
+    같은 종목 리스트를 워커 수만 바꿔가며 스캔하고 처리량 / 속도 향상 / 효율을 표로 반환합니다.
+    (첫 행 대비 speedup, efficiency = speedup / (워커 수 / 첫 행 워커 수))
+    """
+    rows = []
+    for processes in process_counts:
+        _, _, summary = scan_universe(symbols, analyze, processes=processes, chunksize=chunksize,
+                                      desc=f"scan x{processes}", verbose=False)
+        rows.append({'processes': processes, 'elapsed_sec': summary['elapsed_sec'],
+                     'symbols_per_sec': summary['symbols_per_sec'], 'errors': summary['errors']})
+    df = pd.DataFrame(rows)
+    base = df.iloc[0]
+    df['speedup'] = base['elapsed_sec'] / df['elapsed_sec']
+    df['efficiency'] = df['speedup'] / (df['processes'] / base['processes'])
+    return df
+
+
+def _scan_target(name):
+    """CLI용 분석 함수 (스캔 대상 스크립트를 필요할 때만 import)"""
+    if name == 'screener':
+        import screener
+        return screener.compute_latest_signal
+    if name == 'live':
+        import run_live_trading
+        return run_live_trading.analyze_ticker
+    if name == 'verify':
+        import run_final_verification_all
+        return run_final_verification_all.verify_symbol
+    raise ValueError(f"알 수 없는 스캔 대상: {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="유니버스 스캔 실행기 확장성 측정 (워커 수별 처리량)")
+    parser.add_argument('--target', choices=['screener', 'live', 'verify'], default='screener')
+    parser.add_argument('--processes', type=int, nargs='+', default=None,
+                        help="측정할 워커 수 목록 (기본: 1, 2, 4, ... CPU 코어 수)")
+    parser.add_argument('--limit', type=int, default=None, help="앞에서부터 N개 종목만 사용")
+    parser.add_argument('--chunksize', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    counts = args.processes
+    if not counts:
+        counts, n = [], 1
+        while n < cpu_count():
+            counts.append(n)
+            n *= 2
+        counts.append(cpu_count())
+
+    symbols = data_manager.get_ticker_list()
+    if args.limit:
+        symbols = symbols[:args.limit]
+    print(f"📏 [{args.target}] {len(symbols)}개 종목, 워커 수 {counts}")
+
+    df = measure_scaling(symbols, _scan_target(args.target), counts, chunksize=args.chunksize)
+    print(df.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    return df
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# [ 📄 benchmarks/import_time.py (신규 파일) ]
+# 모듈 import 시간 예산 점검 (python -X importtime 기반)
+#
+# 모듈마다 새 파이썬 프로세스에서 'import <모듈>'만 실행하고, -X importtime 출력에서
+# - 그 모듈의 누적 import 시간(ms)이 예산 안인지
+# - 지연 import 대상(DEFERRED_MODULES)이 import 시점에 로드되지 않았는지
+# 를 확인합니다. 하나라도 어기면 종료 코드 1 (CI / 커밋 전 점검용)
+#
+# 실행)
+#   python benchmarks/import_time.py                 # 전체 점검
+#   python benchmarks/import_time.py --scale 2.0     # 느린 머신: 예산을 2배로
+#   python benchmarks/import_time.py run_live_trading --top 15   # 한 모듈의 느린 import 상위 15개
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 처음 사용할 때만 import해야 하는 무거운 의존성 (lazy_imports.py 참고)
+DEFERRED_MODULES = ('pandas_ta', 'yfinance', 'requests', 'tqdm', 'seaborn', 'matplotlib', 'dotenv')
+
+# 모듈별 누적 import 시간 예산 (ms) - pandas(약 300~400ms)를 import하는 모듈은 그 위에 여유분
+IMPORT_BUDGETS_MS = {
+    'config': 20,
+    'lazy_imports': 20,
+    'cli': 60,  # 하위 명령 모듈은 실행 시점에 import -> 표준 라이브러리만 (pandas 없이)
+    'pipeline': 150,
+    'data_manager': 700,
+    'indicator': 700,
+    'strategy': 700,
+    'database': 700,
+    'market_analyzer': 700,
+    'data_collector': 700,
+    'screener': 900,
+    'run_live_trading': 900,
+    'run_backtest': 900,
+    'run_portfolio_backtest': 1000,
+    'service': 1000,
+    'main': 1000,
+}
+DEFAULT_REPEAT = 3
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 -> [(모듈 이름, 자기 시간 us, 누적 시간 us, 깊이)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        # 'import time:  self | cumulative |   [들여쓰기] name' (들여쓰기 2칸 = import 깊이 1)
+        self_part, cumulative_part, raw_name = line.split(':', 1)[1].split('|', 2)
+        try:
+            self_us, cumulative_us = int(self_part), int(cumulative_part)
+        except ValueError:
+            continue
+        depth = (len(raw_name) - len(raw_name.lstrip(' ')) - 1) // 2
+        rows.append((raw_name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+
+def measure(module, repeat=DEFAULT_REPEAT):
+    """
+    새 프로세스에서 module을 repeat번 import해 가장 빠른 회차를 반환합니다.
+
+    :return: (누적 ms, importtime 행 리스트) - import 실패 시 예외
+    """
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              cwd=REPO_ROOT, capture_output=True, text=True)
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'unknown error'
+            raise RuntimeError(f"{module} import 실패: {error}")
+        rows = parse_importtime(proc.stderr)
+        total = next((cum for name, _, cum, depth in rows if name == module and depth == 0), None)
+        if total is None:
+            total = sum(cum for _, _, cum, depth in rows if depth == 0)
+        if best is None or total < best[0]:
+            best = (total, rows)
+    return best[0] / 1000.0, best[1]
+
+
+def deferred_loaded(rows):
+    """import 시점에 로드된 지연 대상 모듈 목록"""
+    loaded = {name.split('.')[0] for name, _, _, _ in rows}
+    return sorted(loaded.intersection(DEFERRED_MODULES))
+
+
+def check_budgets(budgets=None, scale=1.0, repeat=DEFAULT_REPEAT, verbose=True):
+    """
+    모든 모듈의 import 시간 / 지연 대상 로드 여부를 점검합니다.
+
+    :return: (통과 여부, [{'module', 'ms', 'budget_ms', 'deferred', 'ok', 'error'}])
+    """
+    budgets = budgets or IMPORT_BUDGETS_MS
+    report = []
+    for module, budget in budgets.items():
+        row = {'module': module, 'ms': None, 'budget_ms': budget * scale, 'deferred': [], 'error': None}
+        try:
+            row['ms'], rows = measure(module, repeat)
+            row['deferred'] = deferred_loaded(rows)
+        except RuntimeError as e:
+            row['error'] = str(e)
+        row['ok'] = row['error'] is None and not row['deferred'] and row['ms'] <= row['budget_ms']
+        report.append(row)
+
+        if verbose:
+            icon = '✅' if row['ok'] else '❌'
+            if row['error']:
+                print(f" {icon} {module:<24} {row['error']}")
+                continue
+            detail = f" (import됨: {', '.join(row['deferred'])})" if row['deferred'] else ""
+            print(f" {icon} {module:<24} {row['ms']:>7.1f}ms / 예산 {row['budget_ms']:>6.0f}ms{detail}")
+
+    return all(r['ok'] for r in report), report
+
+
+def print_slowest(module, top=20, repeat=DEFAULT_REPEAT):
+    """module import 중 자기 시간(self)이 긴 하위 import 상위 top개"""
+    total, rows = measure(module, repeat)
+    print(f"⏱️ {module}: 누적 {total:.1f}ms")
+    for name, self_us, cumulative_us, _ in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"   {self_us / 1000:>8.1f}ms  (누적 {cumulative_us / 1000:>8.1f}ms)  {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모듈 import 시간 예산 점검 (python -X importtime)")
+    parser.add_argument('modules', nargs='*', help="점검할 모듈 (기본: IMPORT_BUDGETS_MS 전체)")
+    parser.add_argument('--scale', type=float, default=1.0, help="예산 배율 (느린 머신용)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="모듈별 측정 횟수 (가장 빠른 회차 사용)")
+    parser.add_argument('--top', type=int, default=None, help="모듈별 느린 import 상위 N개 출력")
+    args = parser.parse_args(argv)
+
+    if args.top:
+        for module in args.modules or IMPORT_BUDGETS_MS:
+            print_slowest(module, args.top, args.repeat)
+        return 0
+
+    budgets = {m: IMPORT_BUDGETS_MS.get(m, max(IMPORT_BUDGETS_MS.values())) for m in args.modules} or None
+    print(f"📏 import 시간 예산 점검 (x{args.scale:g}, {args.repeat}회 중 최솟값)")
+    ok, _ = check_budgets(budgets, scale=args.scale, repeat=args.repeat)
+    print("✅ 모든 모듈이 예산 안입니다." if ok else "❌ 예산 초과 / 지연 import 위반이 있습니다.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# [ 📄 benchmarks/results.py (신규 파일) ]
+# 벤치마크 결과 저장 / 불러오기 / 커밋 간 회귀 비교
+#
+# 실행 1회 = JSON 파일 1개 (cache/benchmarks/<시각>_<git sha>.json)
+#   {'created_at', 'git': {'sha', 'branch', 'dirty'}, 'machine': {...}, 'options': {...},
+#    'results': [{'scale', 'name', 'group', 'median_sec', 'min_sec', 'mean_sec', 'stdev_sec',
+#                 'items', 'unit', 'throughput', 'peak_mb', 'error'}]}
+#
+# 회귀 판단: 같은 (scale, name)의 중앙값이 기준 실행보다 threshold 비율 이상 느려지고,
+#            절대 차이도 MIN_DELTA_SEC 이상일 때 (아주 짧은 벤치마크의 잡음 무시)
+
+import glob
+import hashlib
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, 'cache', 'benchmarks')
+DEFAULT_THRESHOLD = 0.15   # 15% 이상 느려지면 회귀
+MIN_DELTA_SEC = 0.002
+
+
+def _git(*args):
+    try:
+        proc = subprocess.run(['git', *args], cwd=REPO_ROOT, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return proc.stdout.strip() if proc.returncode == 0 else None
+
+
+def git_info():
+    """현재 커밋 SHA / 브랜치 / 커밋되지 않은 변경 여부 (git이 없으면 'unknown')"""
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return {'sha': _git('rev-parse', 'HEAD') or 'unknown',
+            'branch': _git('rev-parse', '--abbrev-ref', 'HEAD') or 'unknown',
+            'dirty': bool(status)}
+
+
+def machine_info():
+    """머신 정보 + 같은 머신끼리만 비교하기 위한 machine_id"""
+    import numpy as np
+    import pandas as pd
+
+    info = {
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+    }
+    identity = f"{info['hostname']}|{info['processor']}|{info['cpu_count']}"
+    info['machine_id'] = hashlib.sha1(identity.encode()).hexdigest()[:12]
+    return info
+
+
+def new_run(options):
+    return {'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 'git': git_info(),
+            'machine': machine_info(), 'options': options, 'results': []}
+
+
+def save_run(run, results_dir=RESULTS_DIR):
+    """실행 결과를 JSON으로 저장하고 파일 경로를 반환합니다."""
+    os.makedirs(results_dir, exist_ok=True)
+    stamp = datetime.strptime(run['created_at'], '%Y-%m-%d %H:%M:%S').strftime('%Y%m%d-%H%M%S')
+    path = os.path.join(results_dir, f"{stamp}_{run['git']['sha'][:10]}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(run, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def list_runs(results_dir=RESULTS_DIR):
+    """저장된 실행 파일 경로 (오래된 순)"""
+    return sorted(glob.glob(os.path.join(results_dir, '*.json')))
+
+
+def load_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def find_baseline(ref='previous', machine_id=None, exclude_path=None, results_dir=RESULTS_DIR):
+    """
+    비교 기준 실행을 찾습니다.
+
+    :param ref: 'previous' (같은 머신의 가장 최근 실행) / 파일 경로 / git SHA 앞부분
+    :return: (경로, 실행 dict) - 없으면 (None, None)
+    """
+    if ref and os.path.exists(ref):
+        return ref, load_run(ref)
+
+    for path in reversed(list_runs(results_dir)):
+        if exclude_path and os.path.abspath(path) == os.path.abspath(exclude_path):
+            continue
+        run = load_run(path)
+        if ref and ref != 'previous':
+            if run['git']['sha'].startswith(ref):
+                return path, run
+            continue
+        if machine_id is None or run['machine'].get('machine_id') == machine_id:
+            return path, run
+    return None, None
+
+
+def compare_runs(base, current, threshold=DEFAULT_THRESHOLD, min_delta_sec=MIN_DELTA_SEC):
+    """
+    두 실행의 (scale, name)별 중앙값 비교
+
+    :return: [{'scale', 'name', 'base_sec', 'current_sec', 'change', 'status'}]
+             status: 'regression' / 'improvement' / 'ok' / 'new' / 'error'
+    """
+    base_map = {(r['scale'], r['name']): r for r in base['results'] if r.get('median_sec') is not None}
+    rows = []
+    for r in current['results']:
+        key = (r['scale'], r['name'])
+        row = {'scale': r['scale'], 'name': r['name'], 'base_sec': None, 'current_sec': r.get('median_sec'),
+               'change': None, 'status': 'ok'}
+        if r.get('error') or r.get('median_sec') is None:
+            row['status'] = 'error'
+        elif key not in base_map:
+            row['status'] = 'new'
+        else:
+            row['base_sec'] = base_map[key]['median_sec']
+            delta = row['current_sec'] - row['base_sec']
+            row['change'] = delta / row['base_sec'] if row['base_sec'] > 0 else 0.0
+            if abs(delta) >= min_delta_sec:
+                if row['change'] > threshold:
+                    row['status'] = 'regression'
+                elif row['change'] < -threshold:
+                    row['status'] = 'improvement'
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows, base, current):
+    """compare_runs 결과 -> 출력용 문자열"""
+    icons = {'regression': '🔴', 'improvement': '🟢', 'ok': '⚪', 'new': '🆕', 'error': '❌'}
+    lines = [f"📊 기준 {base['git']['sha'][:10]} ({base['created_at']}) -> 현재 {current['git']['sha'][:10]}"
+             + (" (+ 커밋 안 된 변경)" if current['git'].get('dirty') else "")]
+    if base['machine'].get('machine_id') != current['machine'].get('machine_id'):
+        lines.append("⚠️ 다른 머신에서 측정한 기준입니다. 차이는 참고만 하세요.")
+    for row in rows:
+        base_ms = '-' if row['base_sec'] is None else f"{row['base_sec'] * 1000:.1f}"
+        current_ms = '-' if row['current_sec'] is None else f"{row['current_sec'] * 1000:.1f}"
+        change = '' if row['change'] is None else f"{row['change'] * 100:+.1f}%"
+        lines.append(f" {icons[row['status']]} [{row['scale']:<6}] {row['name']:<40} "
+                     f"{base_ms:>10}ms -> {current_ms:>10}ms  {change}")
+    return "\n".join(lines)
@@ -0,0 +1,540 @@
+# [ 📄 benchmarks/suite.py (신규 파일) ]
+# 핵심 경로 벤치마크 (합성 DB 규모별 실행 시간 / 처리량 / 최대 메모리 + 커밋 간 회귀 검사)
+#
+# 측정 대상
+# - data      : get_price_data, get_all_price_data_bulk
+# - indicator : indicator.add_* (종목 SAMPLE_SIZE개의 전체 기간)
+# - strategy  : strategy.generate_*_signals, apply_ensemble_strategy
+# - engine    : engine.run_backtest, metrics.calculate_metrics
+#   (strategy / engine은 행 단위 루프가 있어 LOOP_SAMPLE_SIZE개 종목만)
+# - portfolio : prepare_market_data (캐시 없이), run_backtest_with_config (panel 준비 후 시뮬레이션)
+# - screener  : update_latest_signals (전 종목), run_screener(refresh=True)
+#
+# 실행 구조
+# - 규모(scale)마다 benchmarks/synthetic_data.py로 합성 DB를 준비하고 (설정이 같으면 재사용)
+#   cache/bench/<scale>/ 작업 폴더에 market_data.db로 연결한 뒤, 그 폴더에서 워커 프로세스를 실행합니다.
+#   -> 코드 곳곳의 상대 경로(market_data.db, cache/)가 실제 DB / 캐시 대신 합성 DB / 작업 폴더 캐시를 가리킴
+# - 벤치마크마다 setup(시간 제외) -> run(시간 측정)을 repeat번, 중앙값 사용
+#   최대 메모리는 별도 1회 실행을 tracemalloc으로 측정 (워커 풀 자식 프로세스의 메모리는 포함되지 않음)
+# - 결과는 git SHA / 머신 정보와 함께 cache/benchmarks/에 저장하고, 같은 머신의 직전 실행과 비교 (benchmarks/results.py)
+#
+# 실행)
+#   python benchmarks/suite.py                              # small 규모, 직전 실행과 비교
+#   python benchmarks/suite.py --scales small medium large --repeat 3
+#   python benchmarks/suite.py --filter indicator. strategy.macd --no-save
+#   python benchmarks/suite.py --baseline 1a2b3c4 --threshold 0.10   # 특정 커밋 결과와 비교, 10% 이상 느려지면 실패
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks import results as bench_results
+from benchmarks import synthetic_data
+
+WORK_DIR = os.path.join(REPO_ROOT, 'cache', 'bench')
+DEFAULT_SCALES = ['small']
+DEFAULT_REPEAT = 5
+SAMPLE_SIZE = 10         # 종목 단위 벤치마크(지표/전략)에 쓰는 종목 수 (규모와 무관하게 고정 -> 규모 간 비교 가능)
+LOOP_SAMPLE_SIZE = 3      # 행 단위 루프가 있는 전략 신호 / engine.run_backtest는 더 적게 (처리량은 행 기준이라 비교 가능)
+BULK_START_DATE = '2015-01-01'
+SCAN_REGIME = 'BULL'      # screener.run_screener 벤치마크에서 고정하는 시장 국면 (스캔이 실행되는 국면)
+HEAVY_MAX_REPEAT = 3      # 전 종목 단위 벤치마크(bulk / portfolio / screener)의 최대 반복 수
+SLOW_RUN_SEC = 1.0        # 첫 회가 이보다 오래 걸린 벤치마크도 HEAVY_MAX_REPEAT번까지만 반복
+
+
+# ==========================================
+# 🧩 벤치마크 등록
+# ==========================================
+BENCHMARKS = []
+GROUP_ORDER = ['data', 'indicator', 'strategy', 'engine', 'portfolio', 'screener']
+
+
+class Benchmark:
+    """
+    setup(env) -> state  : 측정 전 준비 (반복마다 호출, 시간 제외)
+    run(state) -> int    : 측정 대상, 처리한 항목 수(행 / 종목 등)를 반환
+    teardown(state)      : 정리 (선택)
+    """
+
+    def __init__(self, name, group, run, setup=None, teardown=None, unit='rows', max_repeat=None):
+        self.name = name
+        self.group = group
+        self.run = run
+        self.setup = setup or (lambda env: env)
+        self.teardown = teardown
+        self.unit = unit
+        self.max_repeat = max_repeat
+
+
+def register(name, group, run, **kwargs):
+    BENCHMARKS.append(Benchmark(name, group, run, **kwargs))
+
+
+class BenchEnv:
+    """워커 프로세스에서 벤치마크들이 공유하는 입력 데이터 (처음 필요할 때 만들고 재사용)"""
+
+    def __init__(self, processes=None, sample_size=SAMPLE_SIZE):
+        self.processes = processes
+        self.sample_size = sample_size
+        self._cache = {}
+
+    def _memo(self, key, func):
+        if key not in self._cache:
+            self._cache[key] = func()
+        return self._cache[key]
+
+    def sample_symbols(self):
+        import database
+
+        def load():
+            conn = database.get_connection()
+            try:
+                rows = conn.execute("SELECT symbol FROM tickers WHERE listing_board != 'ETF' ORDER BY symbol LIMIT ?",
+                                    (self.sample_size,)).fetchall()
+            finally:
+                conn.close()
+            return [r[0] for r in rows]
+        return self._memo('symbols', load)
+
+    def price_frames(self):
+        import data_manager
+        return self._memo('prices', lambda: [data_manager.get_price_data(s) for s in self.sample_symbols()])
+
+    def indicator_frames(self):
+        """앙상블 전략 전체가 쓰는 지표(스크리너와 동일 + 거래량 지표)가 모두 계산된 프레임 (LOOP_SAMPLE_SIZE개 종목)"""
+        import indicator
+        import screener
+
+        def load():
+            frames = [screener._prepare_data_for_ensemble(df.copy()) for df in self.price_frames()[:LOOP_SAMPLE_SIZE]]
+            return [indicator.add_volume_indicators(df, screener.DEFAULT_PARAMS) for df in frames]
+        return self._memo('indicators', load)
+
+    def engine_inputs(self):
+        """(context, 신호 프레임) - engine.run_backtest 입력 (macd 전략)"""
+        from run_backtest import build_context, INDICATOR_FUNCTIONS, SIGNAL_FUNCTIONS
+
+        def load():
+            inputs = []
+            for symbol, df in zip(self.sample_symbols()[:LOOP_SAMPLE_SIZE], self.price_frames()):
+                context = build_context('macd', symbol)
+                inputs.append((context, SIGNAL_FUNCTIONS['macd'](INDICATOR_FUNCTIONS['macd'](df.copy(), context), context)))
+            return inputs
+        return self._memo('engine_inputs', load)
+
+    def engine_outputs(self):
+        """(context, portfolio_history, trade_history, 신호 프레임) - calculate_metrics 입력"""
+        from backtesting import engine
+
+        def load():
+            outputs = []
+            for context, df_signals in self.engine_inputs():
+                history, trades = engine.run_backtest(df_signals, context['initial_capital'], context)
+                outputs.append((context, history, trades, df_signals))
+            return outputs
+        return self._memo('engine_outputs', load)
+
+    def portfolio_session(self):
+        import run_portfolio_backtest
+        return self._memo('session', lambda: run_portfolio_backtest.PortfolioSession(processes=self.processes))
+
+    def close(self):
+        session = self._cache.pop('session', None)
+        if session is not None:
+            session.close()
+
+
+# --- data ---
+
+def _run_get_price_data(env):
+    import data_manager
+    return sum(len(data_manager.get_price_data(s)) for s in env.sample_symbols())
+
+
+def _run_bulk(env):
+    import data_manager
+    return len(data_manager.get_all_price_data_bulk(start_date=BULK_START_DATE))
+
+
+register('data.get_price_data', 'data', _run_get_price_data)
+register('data.get_all_price_data_bulk', 'data', _run_bulk, max_repeat=HEAVY_MAX_REPEAT)
+
+
+# --- indicator ---
+
+def _copies(frames):
+    return [df.copy() for df in frames]
+
+
+def _indicator_case(func):
+    def run(frames):
+        return sum(len(func(df)) for df in frames)
+    return run
+
+
+def _register_indicators():
+    import indicator
+    from screener import DEFAULT_PARAMS
+
+    cases = {name: (lambda f: lambda df: f(df, DEFAULT_PARAMS))(getattr(indicator, name))
+             for name in sorted(dir(indicator)) if name.startswith('add_') and name.endswith('_indicators')}
+    cases['add_turtle_channels'] = lambda df: indicator.add_turtle_channels(df, 20, 10)
+    cases['add_atr'] = lambda df: indicator.add_atr(df, 20)
+    for name, func in sorted(cases.items()):
+        register(f'indicator.{name}', 'indicator', _indicator_case(func),
+                 setup=lambda env: _copies(env.price_frames()))
+
+
+# --- strategy ---
+
+def _register_strategies():
+    import strategy
+    from screener import DEFAULT_PARAMS
+
+    for name in strategy.ENSEMBLE_STRATEGIES:
+        func = getattr(strategy, f'generate_{name}_signals')
+        register(f'strategy.generate_{name}_signals', 'strategy',
+                 (lambda f: lambda frames: sum(len(f(df, DEFAULT_PARAMS)) for df in frames))(func),
+                 setup=lambda env: _copies(env.indicator_frames()))
+    register('strategy.apply_ensemble_strategy', 'strategy',
+             lambda frames: sum(len(strategy.apply_ensemble_strategy(df, DEFAULT_PARAMS)) for df in frames),
+             setup=lambda env: _copies(env.indicator_frames()))
+
+
+# --- engine ---
+
+def _run_engine(inputs):
+    from backtesting import engine
+    for context, df_signals in inputs:
+        engine.run_backtest(df_signals, context['initial_capital'], context)
+    return sum(len(df) for _, df in inputs)
+
+
+def _run_metrics(outputs):
+    from backtesting import metrics
+    for context, history, trades, df_signals in outputs:
+        metrics.calculate_metrics(history, trades, df_signals, context['initial_capital'])
+    return sum(len(df) for *_, df in outputs)
+
+
+register('engine.run_backtest', 'engine', _run_engine, setup=lambda env: env.engine_inputs())
+register('metrics.calculate_metrics', 'engine', _run_metrics, setup=lambda env: env.engine_outputs())
+
+
+# --- portfolio ---
+
+def _setup_portfolio_cold(env):
+    """디스크 / 메모리 캐시를 모두 비우고 새 세션으로 (워커 풀 시작은 시간 제외)"""
+    import backtesting.cache
+    import run_portfolio_backtest as rpb
+
+    env.close()
+    shutil.rmtree(os.path.join(backtesting.cache.CACHE_DIR, 'portfolio_stages'), ignore_errors=True)
+    rpb._grouped_cache.clear()
+    rpb._prefetched.clear()
+    for cache in rpb.STAGE_CACHES.values():
+        cache._memory.clear()
+    session = env.portfolio_session()
+    session.start()
+    return session
+
+
+def _run_prepare(session):
+    import run_portfolio_backtest as rpb
+    market_data, _ = rpb.prepare_market_data(dict(rpb.PORTFOLIO_CONFIG), use_cache=False, session=session)
+    return sum(len(day) for day in market_data.values())
+
+
+def _setup_portfolio_warm(env):
+    """panel을 미리 만들어 두고 시뮬레이션만 측정"""
+    import run_portfolio_backtest as rpb
+    session = env.portfolio_session()
+    rpb.prepare_market_data(dict(rpb.PORTFOLIO_CONFIG), session=session)
+    return session
+
+
+def _run_portfolio(session):
+    import run_portfolio_backtest as rpb
+    _, date_list = rpb.prepare_market_data(dict(rpb.PORTFOLIO_CONFIG), session=session)
+    rpb.run_backtest_with_config(dict(rpb.PORTFOLIO_CONFIG), session=session)
+    return len(date_list)
+
+
+register('portfolio.prepare_market_data', 'portfolio', _run_prepare, setup=_setup_portfolio_cold,
+         unit='symbol-days', max_repeat=HEAVY_MAX_REPEAT)
+register('portfolio.run_backtest_with_config', 'portfolio', _run_portfolio, setup=_setup_portfolio_warm,
+         unit='days', max_repeat=HEAVY_MAX_REPEAT)
+
+
+# --- screener ---
+
+def _setup_screener(env):
+    """latest_signals를 비워 전 종목 재계산을 측정"""
+    import database
+    conn = database.get_connection()
+    try:
+        database.create_latest_signals_table(conn.cursor())
+        conn.execute("DELETE FROM latest_signals")
+        conn.commit()
+        count = conn.execute("SELECT COUNT(DISTINCT symbol) FROM daily_price").fetchone()[0]
+    finally:
+        conn.close()
+    return env, count
+
+
+def _run_update_signals(state):
+    import screener
+    env, count = state
+    screener.update_latest_signals(verbose=False, processes=env.processes)
+    return count
+
+
+def _setup_screener_scan(env):
+    """
+    run_screener는 PANIC / BEAR 국면이면 스캔 없이 바로 반환 -> 합성 데이터의 마지막 국면과 관계없이 스캔하도록
+    시장 분석은 그대로 실행하되 국면만 SCAN_REGIME으로 고정 (teardown에서 원복)
+    """
+    import market_analyzer
+    state = _setup_screener(env)
+    original = market_analyzer.analyze_market_status
+
+    def pinned_status():
+        return dict(original(), status=SCAN_REGIME)
+
+    market_analyzer.analyze_market_status = pinned_status
+    return state + (original,)
+
+
+def _run_screener(state):
+    import screener
+    _, count, _ = state
+    screener.run_screener(refresh=True)
+    return count
+
+
+def _teardown_screener_scan(state):
+    """시장 분석 원복 + 스캔이 실제로 전 종목 신호를 갱신했는지 확인 (조기 반환을 측정하지 않도록)"""
+    import database
+    import market_analyzer
+    _, count, original = state
+    market_analyzer.analyze_market_status = original
+
+    conn = database.get_connection()
+    try:
+        scanned = conn.execute("SELECT COUNT(DISTINCT symbol) FROM latest_signals").fetchone()[0]
+    finally:
+        conn.close()
+    if scanned == 0 and count > 0:
+        raise RuntimeError(f"run_screener가 스캔하지 않았습니다. (latest_signals 0 / {count}개 종목)")
+
+
+register('screener.update_latest_signals', 'screener', _run_update_signals, setup=_setup_screener,
+         unit='symbols', max_repeat=HEAVY_MAX_REPEAT)
+register('screener.run_screener', 'screener', _run_screener, setup=_setup_screener_scan,
+         teardown=_teardown_screener_scan, unit='symbols', max_repeat=HEAVY_MAX_REPEAT)
+
+
+def load_benchmarks():
+    """indicator / strategy 벤치마크는 모듈 함수 목록에서 만들므로 워커에서 한 번만 등록"""
+    if not any(b.group == 'indicator' for b in BENCHMARKS):
+        _register_indicators()
+        _register_strategies()
+        BENCHMARKS.sort(key=lambda b: GROUP_ORDER.index(b.group))
+    return BENCHMARKS
+
+
+def select(benchmarks, filters):
+    if not filters:
+        return list(benchmarks)
+    return [b for b in benchmarks if any(f in b.name for f in filters)]
+
+
+# ==========================================
+# ⏱️ 측정 (워커 프로세스)
+# ==========================================
+
+def measure(bench, env, repeat):
+    """repeat번 측정 + tracemalloc 1회 -> 결과 dict"""
+    row = {'name': bench.name, 'group': bench.group, 'unit': bench.unit, 'median_sec': None, 'min_sec': None,
+           'mean_sec': None, 'stdev_sec': None, 'items': None, 'throughput': None, 'peak_mb': None, 'error': None}
+    repeat = min(repeat, bench.max_repeat or repeat)
+    timings = []
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for i in range(repeat):
+                if i > 0 and timings[0] > SLOW_RUN_SEC and i >= HEAVY_MAX_REPEAT:
+                    break
+                state = bench.setup(env)
+                try:
+                    start = time.perf_counter()
+                    items = bench.run(state)
+                    timings.append(time.perf_counter() - start)
+                finally:
+                    if bench.teardown: bench.teardown(state)
+
+            state = bench.setup(env)
+            tracemalloc.start()
+            try:
+                bench.run(state)
+                row['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+            finally:
+                tracemalloc.stop()
+                if bench.teardown: bench.teardown(state)
+    except Exception as e:
+        row['error'] = f"{type(e).__name__}: {e}"
+        return row
+    if not items:
+        # 빈 결과를 빠르게 반환한 것을 '빨라졌다'로 기록하지 않도록 실패 처리
+        row['error'] = "처리한 항목이 없습니다. (입력 데이터 / 경로 확인)"
+        return row
+
+    row.update({'median_sec': statistics.median(timings), 'min_sec': min(timings),
+                'mean_sec': statistics.mean(timings),
+                'stdev_sec': statistics.stdev(timings) if len(timings) > 1 else 0.0, 'items': items})
+    row['throughput'] = items / row['median_sec'] if row['median_sec'] > 0 else None
+    return row
+
+
+def run_worker(args):
+    """작업 폴더(합성 DB가 market_data.db)에서 선택된 벤치마크를 측정하고 JSON으로 기록"""
+    env = BenchEnv(processes=args.processes, sample_size=args.sample)
+    rows = []
+    try:
+        for bench in select(load_benchmarks(), args.filter):
+            row = measure(bench, env, args.repeat)
+            row['scale'] = args.scale
+            rows.append(row)
+            if row['error']:
+                print(f"   ❌ {bench.name:<40} {row['error']}", file=sys.stderr)
+            else:
+                print(f"   ⏱️ {bench.name:<40} {row['median_sec'] * 1000:>10.1f}ms  "
+                      f"{row['throughput']:>12,.0f} {bench.unit}/s  peak {row['peak_mb']:>8.1f}MB", file=sys.stderr)
+    finally:
+        env.close()
+
+    try:
+        import resource
+        max_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    except ImportError:
+        max_rss_mb = None
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'results': rows, 'max_rss_mb': max_rss_mb}, f)
+    return 0
+
+
+# ==========================================
+# 🚀 실행 (메인 프로세스)
+# ==========================================
+
+def prepare_workdir(scale, years):
+    """합성 DB를 준비하고 cache/bench/<scale>/market_data.db로 연결 (하드 링크, 실패하면 복사)"""
+    db_path = synthetic_data.ensure_db(scale, years=years)
+    workdir = os.path.join(WORK_DIR, scale)
+    os.makedirs(workdir, exist_ok=True)
+    target = os.path.join(workdir, 'market_data.db')
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(db_path, target)
+    except OSError:
+        shutil.copyfile(db_path, target)
+    return workdir
+
+
+def run_scale(scale, args):
+    """한 규모의 벤치마크를 별도 프로세스에서 실행하고 결과 행 리스트를 반환"""
+    workdir = prepare_workdir(scale, args.years)
+    fd, output = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    cmd = [sys.executable, '-m', 'benchmarks.suite', '--worker', '--scale', scale, '--repeat', str(args.repeat),
+           '--sample', str(args.sample), '--output', output]
+    if args.processes: cmd += ['--processes', str(args.processes)]
+    if args.filter: cmd += ['--filter', *args.filter]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in (REPO_ROOT, os.environ.get('PYTHONPATH')) if p))
+
+    print(f"\n🏁 [{scale}] {workdir}")
+    try:
+        proc = subprocess.run(cmd, cwd=workdir, env=env, stdout=subprocess.DEVNULL)
+        if proc.returncode != 0:
+            print(f"❌ [{scale}] 워커 실패 (exit {proc.returncode})")
+            return []
+        with open(output, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    finally:
+        os.remove(output)
+    if data.get('max_rss_mb'):
+        print(f"   📦 [{scale}] 워커 최대 RSS {data['max_rss_mb']:.0f}MB")
+    return data['results']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="핵심 경로 벤치마크 (합성 DB 규모별) + 회귀 검사")
+    parser.add_argument('--scales', nargs='+', default=DEFAULT_SCALES, choices=sorted(synthetic_data.SCALES))
+    parser.add_argument('--years', type=int, default=synthetic_data.DEFAULT_YEARS)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--sample', type=int, default=SAMPLE_SIZE, help="종목 단위 벤치마크의 종목 수")
+    parser.add_argument('--processes', type=int, default=None, help="워커 풀 크기 (portfolio / screener)")
+    parser.add_argument('--filter', nargs='+', default=None, help="이름에 이 문자열이 들어간 벤치마크만")
+    parser.add_argument('--baseline', default='previous', help="비교 기준: previous / 결과 파일 경로 / git SHA")
+    parser.add_argument('--threshold', type=float, default=bench_results.DEFAULT_THRESHOLD,
+                        help="이 비율 이상 느려지면 회귀 (0.15 = 15%%)")
+    parser.add_argument('--no-save', action='store_true', help="결과를 저장하지 않음")
+    parser.add_argument('--no-compare', action='store_true', help="기준 실행과 비교하지 않음")
+    parser.add_argument('--list', action='store_true', help="벤치마크 목록만 출력")
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--scale', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--output', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        return run_worker(args)
+    if args.list:
+        for bench in select(load_benchmarks(), args.filter):
+            print(f" - {bench.name:<44} ({bench.group}, {bench.unit})")
+        return 0
+
+    run = bench_results.new_run({'scales': args.scales, 'years': args.years, 'repeat': args.repeat,
+                                 'sample': args.sample, 'processes': args.processes, 'filter': args.filter})
+    print(f"📏 벤치마크: {', '.join(args.scales)} / 반복 {args.repeat}회 / "
+          f"{run['git']['sha'][:10]}{' (dirty)' if run['git']['dirty'] else ''} / CPU {run['machine']['cpu_count']}개")
+    for scale in args.scales:
+        run['results'].extend(run_scale(scale, args))
+
+    errors = [r for r in run['results'] if r.get('error')]
+    path = None
+    if not args.no_save and run['results']:
+        path = bench_results.save_run(run)
+        print(f"\n💾 결과 저장: {path}")
+
+    regressions = []
+    if not args.no_compare:
+        base_path, base = bench_results.find_baseline(args.baseline, run['machine']['machine_id'], exclude_path=path)
+        if base is None:
+            print("ℹ️ 비교할 기준 실행이 없습니다. (이번 결과가 다음 실행의 기준)")
+        else:
+            rows = bench_results.compare_runs(base, run, threshold=args.threshold)
+            print("\n" + bench_results.format_comparison(rows, base, run))
+            regressions = [r for r in rows if r['status'] == 'regression']
+
+    if regressions:
+        print(f"\n🔴 {len(regressions)}개 벤치마크가 {args.threshold * 100:.0f}% 이상 느려졌습니다.")
+    if errors:
+        print(f"❌ {len(errors)}개 벤치마크 실행 실패")
+    return 1 if regressions or errors or not run['results'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
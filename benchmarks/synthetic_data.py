@@ -0,0 +1,379 @@
+# [ 📄 benchmarks/synthetic_data.py (신규 파일) ]
+# 오프라인 벤치마크용 합성 market_data.db 생성기
+#
+# data_collector(네트워크)를 거치지 않고 실제 DB와 같은 스키마(database.create_tables)로
+# - tickers        : 종목 정보 (listing_board 태그: NASDAQ100 / US_Stock / ETF)
+# - daily_price    : 종목별 일봉 OHLCV (SPY, QQQ 포함 - add_etf_data.py와 동일)
+# - market_index   : SPY, QQQ, ^VIX, ^TNX, DX-Y.NYB (data_collector.update_market_indices와 동일한 심볼)
+# 을 채웁니다.
+#
+# 가격 모델
+# - 시장 국면(BULL / SIDEWAYS / BEAR / PANIC) 마르코프 체인 -> 국면별 drift / 변동성의 시장 수익률
+# - 종목 수익률 = alpha + beta * 시장 + 섹터 요인 + 두꺼운 꼬리(student-t) 고유 변동 + 드문 갭(실적 발표)
+# - ^VIX는 국면 변동성을 따라가는 평균회귀 과정, ^TNX / DX-Y.NYB는 단순 평균회귀 과정
+#
+# 결정성
+# - 같은 (seed, 종목 수, 기간) -> 바이트 단위까지 같은 값 (머신/커밋이 달라도 벤치마크 숫자 비교 가능)
+# - 시장 경로는 seed만으로, i번째 종목은 (seed, i)로 생성 -> 작은 규모 DB는 큰 규모 DB의 앞부분과 같은 종목
+# - 기간은 고정 종료일(END_DATE) 기준 (실행 날짜와 무관)
+#
+# 실행)
+#   python benchmarks/synthetic_data.py                       # small (50종목 x 25년)
+#   python benchmarks/synthetic_data.py --scale large         # 5000종목 x 25년 (수 GB, 수 분 소요)
+#   python benchmarks/synthetic_data.py --symbols 200 --years 10 --output /tmp/market_data.db
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import database
+
+# ==========================================
+# ⚙️ 생성 설정
+# ==========================================
+GENERATOR_VERSION = 1            # 생성 로직이 바뀌면 올림 (기존 합성 DB를 다시 만들도록)
+DEFAULT_SEED = 42
+DEFAULT_YEARS = 25
+END_DATE = '2024-12-31'
+SCALES = {'small': 50, 'medium': 600, 'large': 5000}   # 규모 이름 -> 종목 수
+SYNTHETIC_DIR = os.path.join(REPO_ROOT, 'cache', 'synthetic')
+INSERT_BATCH_SYMBOLS = 50        # 이 종목 수마다 한 번씩 executemany + commit
+
+# 시장 국면: (연 drift, 연 변동성), 일별 전이 확률 (행: 오늘 국면 -> 열: 내일 국면)
+REGIMES = ['BULL', 'SIDEWAYS', 'BEAR', 'PANIC']
+REGIME_PARAMS = {
+    'BULL': (0.20, 0.12),
+    'SIDEWAYS': (0.04, 0.16),
+    'BEAR': (-0.20, 0.26),
+    'PANIC': (-0.50, 0.60),
+}
+# 정상 분포 약 BULL 59% / SIDEWAYS 25% / BEAR 14% / PANIC 2% -> 시장 연 기대 로그수익 약 7%, 연 변동성 약 18%
+REGIME_TRANSITIONS = np.array([
+    [0.993, 0.005, 0.002, 0.000],
+    [0.012, 0.980, 0.007, 0.001],
+    [0.008, 0.010, 0.976, 0.006],
+    [0.000, 0.030, 0.030, 0.940],
+])
+
+SECTORS = ['Technology', 'Healthcare', 'Financial Services', 'Consumer Cyclical', 'Industrials',
+           'Communication Services', 'Consumer Defensive', 'Energy', 'Utilities', 'Real Estate', 'Basic Materials']
+NASDAQ100_COUNT = 100            # 앞쪽 종목부터 이 수만큼 NASDAQ100 태그 (나머지는 data_collector 기본값 US_Stock)
+LATE_LISTING_RATIO = 0.15        # 기간 중간에 상장되는 종목 비율
+TRADING_DAYS = 252
+
+
+def default_db_path(scale='small'):
+    return os.path.join(SYNTHETIC_DIR, f"market_data_{scale}.db")
+
+
+def trading_dates(years=DEFAULT_YEARS, end_date=END_DATE):
+    """종료일 기준 years년 평일 달력 (휴장일은 무시)"""
+    end = pd.Timestamp(end_date)
+    return pd.bdate_range(end - pd.DateOffset(years=years) + pd.Timedelta(days=1), end)
+
+
+# ==========================================
+# 📈 가격 과정
+# ==========================================
+
+def simulate_regimes(rng, n_days):
+    """마르코프 체인 국면 경로 (REGIMES 인덱스 배열)"""
+    cumulative = REGIME_TRANSITIONS.cumsum(axis=1)
+    draws = rng.random(n_days)
+    path = np.empty(n_days, dtype=np.int8)
+    state = 0
+    for t in range(n_days):
+        path[t] = state
+        state = int(np.searchsorted(cumulative[state], draws[t], side='right'))
+        state = min(state, len(REGIMES) - 1)
+    return path
+
+
+def ou_process(rng, n_days, mean, speed, vol, start=None):
+    """이산 평균회귀(Ornstein-Uhlenbeck) 과정"""
+    values = np.empty(n_days)
+    x = mean if start is None else start
+    shocks = rng.standard_normal(n_days) * vol
+    for t in range(n_days):
+        x += speed * (mean - x) + shocks[t]
+        values[t] = x
+    return values
+
+
+def simulate_market(seed, n_days):
+    """
+    시장 공통 요인 (종목 수와 무관하게 seed만으로 결정)
+
+    :return: dict(regimes, market, sectors(섹터 x 일), vol(국면 일 변동성), vix, tnx, dxy)
+    """
+    rng = np.random.default_rng([seed, 0])
+    regimes = simulate_regimes(rng, n_days)
+    drift = np.array([REGIME_PARAMS[r][0] for r in REGIMES])[regimes] / TRADING_DAYS
+    vol = np.array([REGIME_PARAMS[r][1] for r in REGIMES])[regimes] / np.sqrt(TRADING_DAYS)
+
+    market = drift - 0.5 * vol ** 2 + vol * rng.standard_normal(n_days)
+    sectors = 0.004 * rng.standard_normal((len(SECTORS), n_days)) * (vol / vol.min())
+
+    # VIX: 국면 변동성(연율, %)을 지수 이동평균으로 따라가고, 평균회귀 잡음을 더함
+    target = pd.Series(vol * np.sqrt(TRADING_DAYS) * 100 * 1.15).ewm(span=10).mean().to_numpy()
+    vix = np.clip(target + ou_process(rng, n_days, 0.0, 0.05, 1.2), 9.0, 85.0)
+    tnx = np.clip(ou_process(rng, n_days, 3.0, 0.002, 0.05, start=5.0), 0.3, 8.0)
+    dxy = np.clip(ou_process(rng, n_days, 95.0, 0.001, 0.4, start=100.0), 70.0, 130.0)
+    return {'regimes': regimes, 'market': market, 'sectors': sectors, 'vol': vol, 'vix': vix, 'tnx': tnx, 'dxy': dxy}
+
+
+def simulate_ohlcv(rng, log_returns, start_price, base_volume):
+    """일 로그 수익률 -> (open, high, low, close, volume) 배열"""
+    n = len(log_returns)
+    close = start_price * np.exp(np.cumsum(log_returns))
+    prev_close = np.concatenate(([start_price], close[:-1]))
+    # 시가: 전일 종가 대비 갭 (당일 수익률의 일부가 장 시작 전에 반영)
+    gap_share = rng.uniform(0.0, 0.5, n)
+    open_ = prev_close * np.exp(log_returns * gap_share)
+    day_range = np.abs(rng.standard_normal((2, n))) * np.maximum(np.abs(log_returns), 0.004) * 0.6
+    high = np.maximum(open_, close) * np.exp(day_range[0])
+    low = np.minimum(open_, close) * np.exp(-day_range[1])
+    volume = base_volume * np.exp(0.35 * rng.standard_normal(n) + 12.0 * np.abs(log_returns))
+    return open_, high, low, close, volume.astype(np.int64)
+
+
+def simulate_symbol(seed, index, market):
+    """
+    index번째 종목 (seed, index로만 결정 -> 전체 종목 수와 무관)
+
+    :return: (종목 정보 dict, 첫 거래일 위치, (open, high, low, close, volume))
+    """
+    rng = np.random.default_rng([seed, 1, index])
+    n_days = len(market['market'])
+    sector_id = int(rng.integers(len(SECTORS)))
+    beta = rng.uniform(0.5, 1.7)
+    alpha = rng.normal(0.02, 0.06) / TRADING_DAYS
+    idio_vol = rng.uniform(0.10, 0.35) / np.sqrt(TRADING_DAYS) * np.sqrt(market['vol'] / market['vol'].min())
+
+    # 두꺼운 꼬리 (자유도 4 student-t, 분산 1로 정규화), 국면 변동성에 비례해 커짐
+    # 고유 변동의 변동성 손실(-0.5 * sigma^2)은 보정 -> 고변동 종목이 기계적으로 0을 향해 녹지 않도록
+    shocks = rng.standard_t(4, n_days) / np.sqrt(2.0)
+    returns = (alpha + beta * market['market'] + market['sectors'][sector_id]
+               + idio_vol * shocks + 0.5 * idio_vol ** 2)
+    # 분기마다 한 번 정도의 실적 갭
+    gaps = rng.random(n_days) < 1.0 / 63
+    returns[gaps] += rng.normal(0.0, 0.06, gaps.sum())
+    returns = np.clip(returns, -0.5, 0.5)
+
+    first_day = 0
+    if rng.random() < LATE_LISTING_RATIO:
+        first_day = int(rng.integers(1, int(n_days * 0.8)))
+
+    start_price = float(np.exp(rng.normal(np.log(40.0), 0.8)))
+    base_volume = float(np.exp(rng.normal(np.log(2e6), 1.0)))
+    ohlcv = simulate_ohlcv(rng, returns[first_day:], start_price, base_volume)
+
+    info = {'sector': SECTORS[sector_id], 'industry': f"{SECTORS[sector_id]} #{int(rng.integers(1, 6))}"}
+    return info, first_day, ohlcv
+
+
+def symbol_name(index):
+    """0 -> 'SYA', 1 -> 'SYB', ... (실제 티커와 겹치지 않도록 'SY' 접두사 + 알파벳)"""
+    letters = ''
+    index += 1
+    while index > 0:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord('A') + rem) + letters
+    return 'SY' + letters
+
+
+def index_series(market):
+    """market_index / ETF 일봉용 지수 로그 수익률 (SPY = 시장, QQQ = 기술주 섹터 비중이 큰 고베타 시장)"""
+    tech = market['sectors'][SECTORS.index('Technology')]
+    return {
+        'SPY': market['market'],
+        'QQQ': 1.2 * market['market'] + 0.8 * tech,
+    }
+
+
+# ==========================================
+# 💾 DB 기록
+# ==========================================
+
+def _round(values, digits=4):
+    return np.round(values, digits).tolist()
+
+
+def _price_rows(symbol, dates, ohlcv):
+    open_, high, low, close, volume = ohlcv
+    close_list = _round(close)
+    return zip([symbol] * len(dates), dates, _round(open_), _round(high), _round(low), close_list, close_list,
+               volume.tolist())
+
+
+def _index_rows(symbol, dates, close):
+    close = np.round(close, 4)
+    sma_200 = np.nan_to_num(pd.Series(close).rolling(200).mean().to_numpy(), nan=0.0)
+    return zip([symbol] * len(dates), dates, close.tolist(), close.tolist(), _round(sma_200))
+
+
+def _write_meta(conn, meta):
+    conn.execute("CREATE TABLE IF NOT EXISTS synthetic_meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.executemany("INSERT OR REPLACE INTO synthetic_meta (key, value) VALUES (?, ?)",
+                     [(k, str(v)) for k, v in meta.items()])
+
+
+def read_meta(db_path):
+    """합성 DB의 생성 정보 (합성 DB가 아니거나 파일이 없으면 None)"""
+    if not os.path.exists(db_path):
+        return None
+    conn = sqlite3.connect(db_path)
+    try:
+        return dict(conn.execute("SELECT key, value FROM synthetic_meta").fetchall())
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+
+def _expected_meta(n_symbols, years, seed):
+    return {'generator_version': GENERATOR_VERSION, 'symbols': n_symbols, 'years': years, 'seed': seed,
+            'end_date': END_DATE}
+
+
+def generate(db_path, n_symbols=SCALES['small'], years=DEFAULT_YEARS, seed=DEFAULT_SEED, verbose=True):
+    """
+    합성 market_data.db를 새로 만듭니다. (기존 파일은 덮어씀)
+
+    :return: {'symbols', 'price_rows', 'index_rows', 'elapsed_sec', 'size_mb'}
+    """
+    start_time = time.time()
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    tmp_path = db_path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    database.create_tables(db_path=tmp_path)
+    dates = trading_dates(years)
+    date_strs = dates.strftime('%Y-%m-%d').tolist()
+    market = simulate_market(seed, len(dates))
+    if verbose:
+        print(f"🧪 [Synthetic] {n_symbols}종목 x {len(dates)}일 ({date_strs[0]} ~ {date_strs[-1]}, seed={seed}) -> {db_path}")
+
+    conn = sqlite3.connect(tmp_path)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    price_sql = ("INSERT INTO daily_price (symbol, date, open, high, low, close, adj_close, volume) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+    ticker_sql = ("INSERT INTO tickers (symbol, name, sector, industry, listing_board, last_updated) "
+                  "VALUES (?, ?, ?, ?, ?, ?)")
+    price_rows = 0
+
+    # 1. 시장 지수 (market_index) + 지수 ETF 일봉 (daily_price, tickers의 ETF 태그)
+    index_rng = np.random.default_rng([seed, 2])
+    index_closes = {}
+    for symbol, returns in index_series(market).items():
+        ohlcv = simulate_ohlcv(index_rng, returns, 100.0, 8e7)
+        index_closes[symbol] = ohlcv[3]
+        conn.executemany(price_sql, _price_rows(symbol, date_strs, ohlcv))
+        conn.execute(ticker_sql, (symbol, f"Synthetic {symbol}", 'ETF', 'ETF', 'ETF', END_DATE))
+        price_rows += len(date_strs)
+    index_closes.update({'^VIX': market['vix'], '^TNX': market['tnx'], 'DX-Y.NYB': market['dxy']})
+
+    index_rows = 0
+    for symbol, close in index_closes.items():
+        conn.executemany("INSERT INTO market_index (symbol, date, close, adj_close, moving_avg_200) VALUES (?, ?, ?, ?, ?)",
+                         _index_rows(symbol, date_strs, close))
+        index_rows += len(date_strs)
+
+    # 2. 개별 종목 (INSERT_BATCH_SYMBOLS 종목씩 기록)
+    for index in range(n_symbols):
+        symbol = symbol_name(index)
+        info, first_day, ohlcv = simulate_symbol(seed, index, market)
+        board = 'NASDAQ100' if index < NASDAQ100_COUNT else 'US_Stock'
+        conn.execute(ticker_sql, (symbol, f"Synthetic {symbol}", info['sector'], info['industry'], board, END_DATE))
+        conn.executemany(price_sql, _price_rows(symbol, date_strs[first_day:], ohlcv))
+        price_rows += len(date_strs) - first_day
+
+        if (index + 1) % INSERT_BATCH_SYMBOLS == 0 or index + 1 == n_symbols:
+            conn.commit()
+            if verbose:
+                print(f"   ... {index + 1}/{n_symbols} 종목 ({price_rows:,} rows, {time.time() - start_time:.1f}초)")
+
+    _write_meta(conn, _expected_meta(n_symbols, years, seed))
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+    os.replace(tmp_path, db_path)
+
+    summary = {'symbols': n_symbols, 'price_rows': price_rows, 'index_rows': index_rows,
+               'elapsed_sec': time.time() - start_time, 'size_mb': os.path.getsize(db_path) / 1e6}
+    if verbose:
+        print(f"✅ [Synthetic] 완료: {price_rows:,} price rows / {index_rows:,} index rows, "
+              f"{summary['size_mb']:.1f}MB, {summary['elapsed_sec']:.1f}초")
+    return summary
+
+
+def ensure_db(scale='small', n_symbols=None, years=DEFAULT_YEARS, seed=DEFAULT_SEED, db_path=None, verbose=True):
+    """
+    같은 설정으로 만든 합성 DB가 이미 있으면 재사용하고, 없거나 설정이 다르면 새로 만듭니다.
+
+    :return: DB 파일 경로
+    """
+    n_symbols = n_symbols or SCALES[scale]
+    db_path = db_path or default_db_path(scale)
+    expected = {k: str(v) for k, v in _expected_meta(n_symbols, years, seed).items()}
+    if read_meta(db_path) != expected:
+        generate(db_path, n_symbols, years, seed, verbose=verbose)
+    elif verbose:
+        print(f"♻️ [Synthetic] 기존 합성 DB 재사용: {db_path}")
+    return db_path
+
+
+def content_hash(db_path):
+    """DB 내용 해시 (결정성 확인용 - 같은 설정이면 머신과 무관하게 같은 값)"""
+    import hashlib
+
+    digest = hashlib.sha256()
+    conn = sqlite3.connect(db_path)
+    try:
+        queries = ["SELECT symbol, name, sector, industry, listing_board FROM tickers ORDER BY symbol",
+                   "SELECT symbol, date, open, high, low, close, adj_close, volume FROM daily_price ORDER BY symbol, date",
+                   "SELECT symbol, date, close, adj_close, moving_avg_200 FROM market_index ORDER BY symbol, date"]
+        for query in queries:
+            for row in conn.execute(query):
+                digest.update(repr(row).encode())
+    finally:
+        conn.close()
+    return digest.hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="오프라인 벤치마크용 합성 market_data.db 생성")
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small', help="규모 (종목 수: %s)" % SCALES)
+    parser.add_argument('--symbols', type=int, default=None, help="종목 수 (지정하면 --scale 대신 사용)")
+    parser.add_argument('--years', type=int, default=DEFAULT_YEARS)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--output', default=None, help="DB 경로 (기본: cache/synthetic/market_data_<scale>.db)")
+    parser.add_argument('--force', action='store_true', help="같은 설정의 DB가 있어도 다시 생성")
+    parser.add_argument('--hash', action='store_true', help="생성 후 내용 해시 출력 (결정성 확인)")
+    args = parser.parse_args(argv)
+
+    db_path = args.output or default_db_path(args.scale)
+    if os.path.abspath(db_path) == os.path.abspath(os.path.join(REPO_ROOT, database.DB_PATH)):
+        raise SystemExit("❌ 실제 market_data.db는 덮어쓰지 않습니다. --output으로 다른 경로를 지정하세요.")
+    if args.force:
+        generate(db_path, args.symbols or SCALES[args.scale], args.years, args.seed)
+    else:
+        ensure_db(args.scale, args.symbols, args.years, args.seed, db_path=db_path)
+    if args.hash:
+        print(f"🔑 content hash: {content_hash(db_path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,339 @@
+# cli.py (통합 실행 진입점)
+# 흩어져 있던 run_* 스크립트를 하나의 명령(stock-screener)과 하위 명령으로 묶습니다.
+#
+# - 하위 명령에 필요한 모듈만 실행 시점에 import (짧은 명령은 무거운 모듈을 로드하지 않음)
+# - backtest는 여러 종목/전략/기간/파라미터를 한 프로세스 풀에서 실행 (run_backtest.run_batch_backtests)
+#   -> 실행마다 파이썬 시작 / import / 종목 데이터 로드를 반복하지 않고, 배치당 한 번만
+# - 작업 파일(JSON/YAML)로 여러 백테스트를 한 번에 지정 가능
+#
+# 사용 예)
+#   python cli.py backtest -s SPY --strategy macd --start 2022-01-01 --end 2022-12-31
+#   python cli.py backtest -s SPY QQQ TSLA --strategy macd dema --param macd_fast_period=8
+#   python cli.py backtest --jobs jobs.yaml --output results.csv
+#   python cli.py sweep --strategies macd dema --symbols TSLA --search halving --prune
+#   python cli.py portfolio walk-forward --train-months 24
+#   python cli.py verify --symbols AAPL MSFT
+#   python cli.py screen --refresh
+#   python cli.py live
+#   python cli.py collect --force price_update
+#   python cli.py bench import-time --scale 2
+#   python cli.py bench suite --scales small medium
+#   python cli.py backtest -s SPY QQQ --strategy macd dema --profile cprofile   # 단계별 시간 + cProfile
+#
+# 작업 파일 형식 (JSON 또는 YAML)
+#   defaults: {strategy: macd, start: '2020-01-01', end: '2024-12-31'}
+#   jobs:
+#     - {symbols: [SPY, QQQ]}                                   # 종목 x 기본 전략
+#     - {symbol: TSLA, strategies: [bbs, dema], stop_loss_atr: 3.0}
+#     - {symbol: SPY, grid: {macd_fast_period: [8, 12], macd_slow_period: [21, 26]}}   # 조합 전체
+#   (jobs만 있는 리스트도 가능, 그 밖의 키는 context 값으로 그대로 전달)
+
+import argparse
+import itertools
+import json
+import os
+import sys
+
+PROG = "stock-screener"
+JOB_RESERVED_KEYS = ('symbol', 'symbols', 'strategy', 'strategies', 'start', 'end', 'grid')
+
+
+# ==========================================
+# 🛠️ 공용 헬퍼
+# ==========================================
+
+def parse_value(text):
+    """명령줄 / 작업 파일 문자열 값 -> int / float / bool / str"""
+    if not isinstance(text, str):
+        return text
+    if text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_params(pairs):
+    """['key=value', ...] -> {key: value}"""
+    params = {}
+    for pair in pairs or []:
+        if '=' not in pair:
+            raise SystemExit(f"❌ --param은 key=value 형식이어야 합니다: {pair}")
+        key, value = pair.split('=', 1)
+        params[key.strip()] = parse_value(value.strip())
+    return params
+
+
+def load_job_file(path):
+    """JSON / YAML 작업 파일 로드 (YAML은 PyYAML이 있을 때만)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise SystemExit("❌ YAML 작업 파일을 읽으려면 PyYAML이 필요합니다. (pip install pyyaml) JSON도 사용 가능합니다.")
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+def expand_jobs(spec):
+    """
+    작업 명세 -> run_backtest.build_context()로 만든 context 리스트
+    (symbols x strategies x grid 조합을 모두 펼침, 나머지 키는 context 값으로 덮어씀)
+    """
+    from run_backtest import build_context
+
+    if isinstance(spec, list):
+        spec = {'jobs': spec}
+    defaults = spec.get('defaults') or {}
+    contexts = []
+    for job in spec.get('jobs') or [{}]:
+        job = {**defaults, **job}
+        symbols = job.get('symbols') or [job.get('symbol', 'SPY')]
+        strategies = job.get('strategies') or [job.get('strategy', 'turtle')]
+        overrides = {k: parse_value(v) for k, v in job.items() if k not in JOB_RESERVED_KEYS}
+        if job.get('start'): overrides['start_date'] = str(job['start'])
+        if job.get('end'): overrides['end_date'] = str(job['end'])
+
+        grid = job.get('grid') or {}
+        keys = list(grid)
+        for symbol, strategy_name in itertools.product(symbols, strategies):
+            for values in itertools.product(*(grid[k] for k in keys)):
+                params = {**overrides, **dict(zip(keys, values))}  # 같은 키는 그리드 값이 우선
+                # strategy_name / symbol이 일반 키나 그리드로 들어와도 build_context 위치 인자와 겹치지 않도록
+                job_symbol = params.pop('symbol', symbol)
+                job_strategy = params.pop('strategy_name', params.pop('strategy', strategy_name))
+                contexts.append(build_context(job_strategy, job_symbol, **params))
+    return contexts
+
+
+def profile_modes(text):
+    """--profile 값 검증 (backtesting/profiling.py 모드: spans, cprofile, tracemalloc, all)"""
+    from backtesting import profiling
+    try:
+        profiling.parse_modes(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return text
+
+
+def add_profile_argument(p):
+    p.add_argument('--profile', nargs='?', const='spans', default=None, type=profile_modes, metavar='MODES',
+                   help="단계별 시간 측정 (spans / cprofile / tracemalloc / all, 쉼표로 여러 개) -> cache/profiles")
+
+
+def varying_keys(contexts):
+    """실행마다 값이 다른 context 키 (그리드 / 작업별 덮어쓰기 파라미터 -> 결과표에 함께 표시)"""
+    if len(contexts) < 2:
+        return []
+    return [k for k in contexts[0] if len({repr(c.get(k)) for c in contexts}) > 1]
+
+
+# ==========================================
+# 🧩 하위 명령
+# ==========================================
+
+def cmd_backtest(args):
+    """단일 / 배치 백테스트"""
+    import run_backtest
+
+    if args.jobs:
+        contexts = expand_jobs(load_job_file(args.jobs))
+    else:
+        job = {'symbols': args.symbol, 'strategies': args.strategy, 'start': args.start, 'end': args.end,
+               **parse_params(args.param)}
+        contexts = expand_jobs({'jobs': [job]})
+
+    # 한 건이면 기존 단일 실행과 똑같이 (단계별 메시지 + 콘솔 리포트 + DB 기록)
+    if len(contexts) == 1 and not args.output and not args.no_log:
+        run_backtest.run_single_backtest(contexts[0])
+        return 0
+
+    print(f"🧪 [Backtest] {len(contexts)}개 백테스트를 한 번에 실행합니다.")
+    results, summary = run_backtest.run_batch_backtests(contexts, processes=args.processes,
+                                                        log_results=not args.no_log)
+    df = run_backtest.batch_summary(results, extra_columns=varying_keys(contexts))
+    if df.empty:
+        print("🤷 결과가 없습니다. (데이터 없는 종목 / 기간 확인)")
+        return 1
+    print(df.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+    if args.output:
+        df.to_csv(args.output, index=False)
+        print(f"💾 결과 저장: {args.output}")
+    return 0 if summary['errors'] == 0 else 1
+
+
+def cmd_sweep(args):
+    """시장 국면 x 종목 x 전략 파라미터 최적화 (run_optimization)"""
+    import run_optimization
+    run_optimization.run_batch_optimization(args.regimes, args.strategies, args.symbols, processes=args.processes,
+                                            search_mode=args.search, prune=args.prune)
+    return 0
+
+
+def cmd_portfolio(args):
+    """포트폴리오 백테스트 / 파라미터 최적화 / 워크포워드"""
+    if args.mode == 'run':
+        import run_portfolio_backtest
+        run_portfolio_backtest.run_portfolio_simulation()
+    elif args.mode == 'optimize':
+        import run_optimizer
+        run_optimizer.run_optimization(force=args.force)
+    else:
+        import config
+        import run_walk_forward
+        run_walk_forward.run_walk_forward(
+            processes=args.processes,
+            anchored=args.anchored or config.WALK_FORWARD_ANCHORED,
+            train_months=args.train_months or config.WALK_FORWARD_TRAIN_MONTHS,
+            test_months=args.test_months or config.WALK_FORWARD_TEST_MONTHS)
+    return 0
+
+
+def cmd_verify(args):
+    """전 종목(또는 지정 종목) 전략 vs B&H vs DCA 검증"""
+    import run_final_verification_all
+    run_final_verification_all.main(tickers=args.symbols)
+    return 0
+
+
+def cmd_screen(args):
+    """latest_signals 기반 스크리너"""
+    import screener
+    threshold = screener.SCORE_THRESHOLD if args.threshold is None else args.threshold
+    screener.run_screener(refresh=args.refresh, threshold=threshold)
+    return 0
+
+
+def cmd_live(args):
+    """실전 알림 봇 데일리 스캔"""
+    import run_live_trading
+    run_live_trading.run_daily_scan(bulk=not args.per_symbol)
+    return 0
+
+
+def cmd_collect(args):
+    """일일 파이프라인 (수집 -> 시장 분석 -> 신호 갱신 -> 스크리닝 -> 알림, 신선한 단계는 건너뜀)"""
+    import main as daily_pipeline
+    argv = ['--workers', str(args.workers)]
+    if args.force is not None:
+        argv += ['--force', *args.force]
+    daily_pipeline.main(argv)
+    return 0
+
+
+def cmd_serve(args):
+    """메모리 상주 로컬 조회 서비스"""
+    import service
+    argv = []
+    if args.host: argv += ['--host', args.host]
+    if args.port: argv += ['--port', str(args.port)]
+    if args.start: argv += ['--start', args.start]
+    service.main(argv)
+    return 0
+
+
+def cmd_bench(args):
+    """벤치마크 (benchmarks/ 아래 스크립트에 나머지 인자를 그대로 전달)"""
+    if args.target == 'import-time':
+        from benchmarks import import_time
+        return import_time.main(args.rest)
+    if args.target == 'suite':
+        from benchmarks import suite
+        return suite.main(args.rest)
+    if args.target == 'synthetic':
+        from benchmarks import synthetic_data
+        return synthetic_data.main(args.rest)
+    raise SystemExit(f"❌ 알 수 없는 벤치마크: {args.target}")
+
+
+# ==========================================
+# 🚀 명령줄 파서
+# ==========================================
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog=PROG, description="주식 스크리너 / 백테스트 통합 명령")
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND')
+    sub.required = True
+
+    p = sub.add_parser('backtest', help="단일 / 배치 백테스트")
+    p.add_argument('-s', '--symbol', nargs='+', default=['SPY'], help="종목 (여러 개 가능)")
+    p.add_argument('--strategy', nargs='+', default=['turtle'], help="전략 (turtle, rsi, sma, bbands, macd, bbs, dema)")
+    p.add_argument('--start', default=None, help="시작일 (YYYY-MM-DD)")
+    p.add_argument('--end', default=None, help="종료일 (YYYY-MM-DD)")
+    p.add_argument('--param', action='append', metavar='KEY=VALUE', help="context 값 덮어쓰기 (반복 가능)")
+    p.add_argument('--jobs', default=None, help="작업 파일 (JSON/YAML) - 지정하면 위 옵션 대신 사용")
+    p.add_argument('--processes', type=int, default=None, help="워커 수 (기본: CPU 코어 수)")
+    p.add_argument('--output', default=None, help="배치 결과 CSV 경로")
+    p.add_argument('--no-log', action='store_true', help="결과 DB(backtest_log.db)에 기록하지 않음")
+    add_profile_argument(p)
+    p.set_defaults(func=cmd_backtest)
+
+    p = sub.add_parser('sweep', help="시장 국면별 전략 파라미터 최적화")
+    p.add_argument('--regimes', nargs='+', default=['BEAR_TREND', 'BULL_TREND', 'BULL_SIDEWAYS', 'BEAR_SIDEWAYS'])
+    p.add_argument('--strategies', nargs='+', default=['macd', 'dema', 'bbs', 'sma', 'turtle'])
+    p.add_argument('--symbols', nargs='+', default=['TSLA', 'TQQQ', 'SOXL'])
+    p.add_argument('--search', choices=['grid', 'halving', 'hyperband'], default='grid')
+    p.add_argument('--prune', action='store_true', help="가망 없는 조합 조기 중단")
+    p.add_argument('--processes', type=int, default=None)
+    add_profile_argument(p)
+    p.set_defaults(func=cmd_sweep)
+
+    p = sub.add_parser('portfolio', help="포트폴리오 백테스트 / 최적화 / 워크포워드")
+    p.add_argument('mode', nargs='?', choices=['run', 'optimize', 'walk-forward'], default='run')
+    p.add_argument('--force', action='store_true', help="(optimize) 저장된 결과를 무시하고 다시 계산")
+    p.add_argument('--anchored', action='store_true', help="(walk-forward) 훈련 구간 시작 고정")
+    p.add_argument('--train-months', type=int, default=None)
+    p.add_argument('--test-months', type=int, default=None)
+    p.add_argument('--processes', type=int, default=None)
+    add_profile_argument(p)
+    p.set_defaults(func=cmd_portfolio)
+
+    p = sub.add_parser('verify', help="전략 vs B&H vs DCA 전 종목 검증")
+    p.add_argument('--symbols', nargs='+', default=None, help="검증할 종목 (기본: DB 전체)")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser('screen', help="매수 후보 스크리닝")
+    p.add_argument('--refresh', action='store_true', help="조회 전에 latest_signals 갱신")
+    p.add_argument('--threshold', type=float, default=None, help="최소 합산 점수")
+    p.set_defaults(func=cmd_screen)
+
+    p = sub.add_parser('live', help="실전 알림 봇 데일리 스캔")
+    p.add_argument('--per-symbol', action='store_true', help="일괄 분석 대신 종목별 병렬 분석")
+    p.set_defaults(func=cmd_live)
+
+    p = sub.add_parser('collect', help="일일 파이프라인 (데이터 수집 ~ 알림)")
+    p.add_argument('--force', nargs='*', default=None, help="다시 실행할 단계 (이름 없이 쓰면 전체)")
+    p.add_argument('--workers', type=int, default=4)
+    p.set_defaults(func=cmd_collect)
+
+    p = sub.add_parser('serve', help="메모리 상주 로컬 조회 서비스 (HTTP/JSON)")
+    p.add_argument('--host', default=None)
+    p.add_argument('--port', type=int, default=None)
+    p.add_argument('--start', default=None, help="메모리에 올릴 가격 데이터 시작일")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser('bench', help="벤치마크")
+    p.add_argument('target', choices=['import-time', 'suite', 'synthetic'],
+                   help="import-time: import 시간 예산 / suite: 핵심 경로 벤치마크 + 회귀 검사 / synthetic: 합성 DB 생성")
+    p.add_argument('rest', nargs=argparse.REMAINDER, help="벤치마크 스크립트에 전달할 인자")
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from backtesting import profiling
+    if getattr(args, 'profile', None):
+        profiling.enable(args.profile)
+    # (--profile 또는 BACKTEST_PROFILE 환경변수로 켜져 있을 때만 끝나고 리포트 / 파일 출력)
+    with profiling.profile_run(args.command):
+        return args.func(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,7 @@
 import pandas as pd
 import data_manager
 import numpy as np
+from backtesting import metrics
 
 # ==========================================
 # 사용자 전략 성적 (방금 나온 결과 입력)
@@ -23,26 +24,14 @@ def calculate_benchmark_stats(ticker, start_date='2018-01-02', end_date='2025-12
         print(f"⚠️ {ticker} 데이터가 없습니다.")
         return None
 
-    # 1. Buy & Hold (거치식)
-    initial_price = df['close'].iloc[0]
-    final_price = df['close'].iloc[-1]
-
-    bh_return = ((final_price - initial_price) / initial_price) * 100
-
-    # MDD 계산
-    roll_max = df['close'].cummax()
-    daily_drawdown = (df['close'] / roll_max) - 1.0
-    bh_mdd = daily_drawdown.min() * 100
-
-    # CAGR 계산
-    days = (df.index[-1] - df.index[0]).days
-    bh_cagr = ((final_price / initial_price) ** (365 / days) - 1) * 100
+    # 1. Buy & Hold (거치식) - 종가 곡선 자체가 자산곡선 (수익률 / MDD / CAGR 한 번에 계산)
+    stats = metrics.equity_metrics(df['close'].to_numpy(dtype=np.float64), df.index)
 
     return {
         'name': ticker + ' (Buy&Hold)',
-        'return': bh_return,
-        'mdd': bh_mdd,
-        'cagr': bh_cagr
+        'return': stats['return'],
+        'mdd': stats['mdd'],
+        'cagr': stats['cagr']
     }
 
 
@@ -1,10 +1,16 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# API 키는 .env에서 읽습니다. (처음 접근할 때 load_dotenv - config를 import만 하는 모듈은 dotenv를 로드하지 않음)
+ENV_KEYS = ("ALPHA_VANTAGE_API_KEY", "OPENAI_API_KEY")
 
-ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+def __getattr__(name):
+    if name not in ENV_KEYS:
+        raise AttributeError(f"module 'config' has no attribute '{name}'")
+    from dotenv import load_dotenv
+    load_dotenv()
+    globals().update({key: os.getenv(key) for key in ENV_KEYS})
+    return globals()[name]
 
 # 2. Screener Settings
 MIN_MARKET_CAP = 10_000_000_000 # 최소 시가총액 (예: 100억 달러)
@@ -147,4 +153,28 @@ STRATEGY_GRID_MAP = {
     'sma': SMA_GRID,
     'turtle': TURTLE_GRID,
     # 'bbands', 'rsi' 등도 필요하면 추가 가능
-}
\ No newline at end of file
+}
+# 16. Early-abort Pruning (최적화 중 가망 없는 조합 조기 중단)
+# 시뮬레이션 도중 체크포인트마다 아래 규칙을 검사해서, 하나라도 걸리면 그 자리에서 중단하고
+# 결과에 '가지치기(pruned)' 표시를 남깁니다. (최적화기에서만 사용, 단일 백테스트에는 적용 안 됨)
+PRUNE_CHECK_EVERY = 'year'  # 'year': 연도가 바뀔 때마다, 정수 N: N bar(거래일)마다
+PRUNE_MAX_DRAWDOWN = -50.0  # 누적 MDD(%)가 이보다 나빠지면 중단 (None이면 규칙 끔)
+PRUNE_MIN_TRADES = 1  # PRUNE_MIN_TRADES_AFTER_DAYS일이 지났는데 체결 횟수가 이보다 적으면 중단 (None이면 끔)
+PRUNE_MIN_TRADES_AFTER_DAYS = 730  # (약 2년)
+
+# 17. Walk-forward Analysis (run_walk_forward.py)
+# 전체 기간을 [훈련 구간 -> 바로 다음 검증 구간] fold로 나눠, fold마다 훈련 구간에서 고른 파라미터를
+# 검증 구간에서만 평가하고, 검증 구간 자산곡선을 이어 붙여 '실전에 가까운' OOS 성과를 봅니다.
+WALK_FORWARD_START = '2018-01-01'  # 신호 데이터셋 시작일(2018-01-01) 이후
+WALK_FORWARD_END = OUT_OF_SAMPLE_END
+WALK_FORWARD_TRAIN_MONTHS = 36  # 훈련 구간 길이
+WALK_FORWARD_TEST_MONTHS = 12  # 검증 구간 길이 (= fold 간 이동 간격)
+WALK_FORWARD_ANCHORED = False  # True면 훈련 구간 시작을 WALK_FORWARD_START에 고정 (Anchored), False면 Rolling
+
+# 18. Local Query Service (service.py)
+# 가격 데이터 / 계산 결과를 메모리에 올려두고 localhost에서만 HTTP/JSON으로 응답하는 상주 서비스
+SERVICE_HOST = '127.0.0.1'  # 외부 접속 차단 (로컬 전용)
+SERVICE_PORT = 8765
+SERVICE_PRICE_START = '2010-01-01'  # 메모리에 올릴 가격 데이터 시작일 (백테스트 가능 기간)
+SERVICE_CACHE_SIZE = 1024  # 점수 / 백테스트 결과 LRU 캐시 항목 수
+SERVICE_RELOAD_CHECK_SEC = 60  # 이 간격마다 DB에 새 데이터가 들어왔는지 확인해 자동으로 다시 로드
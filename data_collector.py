@@ -1,12 +1,15 @@
 #data_collector.py
 
-import yfinance as yf
 import pandas as pd
 import sqlite3
-import requests
 from io import StringIO
 import time
 from datetime import datetime
+from lazy_imports import lazy_module
+
+# 수집을 실제로 할 때만 import (다른 모듈이 이 파일을 import해도 네트워크 라이브러리를 로드하지 않음)
+yf = lazy_module('yfinance')
+requests = lazy_module('requests')
 
 DB_PATH = "market_data.db"
 
@@ -98,11 +101,13 @@ def update_tickers_info(tickers):
 
 
 def update_market_indices():
+    """시장 지수 업데이트 -> 실패한 지수 {심볼: 사유} (비어 있으면 전부 성공)"""
     indices = {
         'SPY': 'S&P 500 ETF', 'QQQ': 'NASDAQ 100 ETF',
         '^VIX': 'Volatility Index', '^TNX': '10-Year Treasury Yield',
         'DX-Y.NYB': 'US Dollar Index'
     }
+    failed = {}
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     print("\n[Market Index] 시장 지표 업데이트 시작...")
@@ -137,10 +142,14 @@ def update_market_indices():
             print(f" - {symbol}: 업데이트 완료")
         except Exception as e:
             print(f"Error {symbol}: {e}")
+            failed[symbol] = f"{type(e).__name__}: {e}"
     conn.close()
+    return failed
 
 
 def update_stock_data(tickers):
+    """종목 주가 업데이트 -> 실패한 종목 {종목: 사유} (비어 있으면 전부 성공)"""
+    failed = {}
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     print(f"\n📊 총 {len(tickers)}개 종목 주가 업데이트 시작...")
@@ -181,8 +190,13 @@ def update_stock_data(tickers):
             time.sleep(0.1)
         except Exception as e:
             print(f"Error {ticker}: {e}")
+            failed[ticker] = f"{type(e).__name__}: {e}"
     conn.close()
-    print("✅ 모든 업데이트가 완료되었습니다.")
+    if failed:
+        print(f"⚠️ {len(failed)}개 종목 업데이트 실패: {', '.join(list(failed)[:10])}")
+    else:
+        print("✅ 모든 업데이트가 완료되었습니다.")
+    return failed
 
 
 # --- 메인 실행 ---
@@ -11,15 +11,35 @@ class DataManager:
     SQLite 데이터베이스에서 주식 데이터를 조회하여 DataFrame으로 반환하는 클래스
     """
 
-    def __init__(self, db_path=DB_PATH):
+    def __init__(self, db_path=DB_PATH, read_only=False):
+        """
+        :param read_only: True면 읽기 전용 연결 하나를 열어두고 모든 조회에 재사용합니다.
+                          (병렬 스캔 워커용 - 조회마다 연결을 새로 열고 닫는 비용이 없음)
+        """
         self.db_path = db_path
+        self.read_only = read_only
+        self._conn = None
         if not os.path.exists(self.db_path):
             print(f"⚠️ 경고: 데이터베이스 파일({self.db_path})을 찾을 수 없습니다.")
             print("database.py와 data_collector.py를 먼저 실행하여 DB를 구축해주세요.")
 
     def get_connection(self):
-        """DB 연결 객체 반환"""
-        return sqlite3.connect(self.db_path)
+        """DB 연결 객체 반환 (read_only면 열어둔 읽기 전용 연결)"""
+        if not self.read_only:
+            return sqlite3.connect(self.db_path)
+        if self._conn is None:
+            self._conn = sqlite3.connect(f"file:{os.path.abspath(self.db_path)}?mode=ro", uri=True)
+        return self._conn
+
+    def _release(self, conn):
+        """조회가 끝난 연결 정리 (열어둔 읽기 전용 연결은 유지)"""
+        if conn is not self._conn:
+            conn.close()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
     def get_price_data(self, ticker, start_date=None, end_date=None):
         """
@@ -76,7 +96,7 @@ class DataManager:
             return pd.DataFrame()
 
         finally:
-            conn.close()
+            self._release(conn)
 
     def get_ticker_list(self):
         """
@@ -106,7 +126,7 @@ class DataManager:
             print(f"❌ 종목 리스트 조회 중 오류: {e}")
             return []
         finally:
-            conn.close()
+            self._release(conn)
 
     def get_all_price_data_bulk(self, start_date=None):
         """
@@ -139,22 +159,48 @@ class DataManager:
             print(f"❌ 전체 데이터 조회 실패: {e}")
             return pd.DataFrame()
         finally:
-            conn.close()
+            self._release(conn)
 
 
-# --- 전역 인스턴스 생성 ---
+# --- 전역 인스턴스 ---
 # 기존 코드들이 'import data_manager' 후 'data_manager.get_price_data'로
-# 호출할 수 있도록 인스턴스를 미리 생성해둡니다.
-manager = DataManager()
+# 호출할 수 있도록 전역 인스턴스를 둡니다.
+# (import 시점에는 만들지 않고 처음 사용할 때 생성 -> import만으로 DB 파일을 확인/경고하지 않음)
+_manager = None
+
+
+def get_manager():
+    """전역 DataManager (처음 호출할 때 생성)"""
+    global _manager
+    if _manager is None:
+        _manager = DataManager()
+    return _manager
+
+
+def __getattr__(name):
+    # 기존 코드의 data_manager.manager 접근 호환
+    if name == 'manager':
+        return get_manager()
+    raise AttributeError(f"module 'data_manager' has no attribute '{name}'")
+
+
+def use_read_only_connection(db_path=DB_PATH):
+    """
+    [병렬 스캔 워커] 이 프로세스의 전역 manager를 읽기 전용 연결을 재사용하는 인스턴스로 교체합니다.
+    (아래 래퍼 함수들은 호출 시점의 manager를 쓰므로 기존 코드는 그대로 동작)
+    """
+    global _manager
+    _manager = DataManager(db_path, read_only=True)
+    return _manager
 
 
 # 하위 호환성을 위한 래퍼 함수 (기존 코드가 data_manager.get_price_data() 함수를 직접 호출할 경우 대비)
 def get_price_data(ticker, start_date=None, end_date=None):
-    return manager.get_price_data(ticker, start_date, end_date)
+    return get_manager().get_price_data(ticker, start_date, end_date)
 
 
 def get_ticker_list():
-    return manager.get_ticker_list()
+    return get_manager().get_ticker_list()
 
 def get_all_price_data_bulk(start_date=None):
-    return manager.get_all_price_data_bulk(start_date)
\ No newline at end of file
+    return get_manager().get_all_price_data_bulk(start_date)
\ No newline at end of file
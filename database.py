@@ -1,21 +1,50 @@
 import sqlite3
 import os
+from strategy import ENSEMBLE_STRATEGIES
 
 # DB 파일 경로 설정
 DB_PATH = "market_data.db"
 
 
-def get_connection():
-    """데이터베이스 연결 객체를 반환합니다."""
-    conn = sqlite3.connect(DB_PATH)
+def get_connection(db_path=None):
+    """데이터베이스 연결 객체를 반환합니다. (db_path를 주면 기본 DB 대신 그 파일)"""
+    conn = sqlite3.connect(db_path or DB_PATH)
     return conn
 
 
-def create_tables():
+def create_latest_signals_table(cursor):
+    """
+    종목별 최신 신호 테이블 (종목당 1행)
+    - date: 신호를 계산한 마지막 bar 날짜 (daily_price의 최신 날짜보다 이전이면 재계산 대상)
+    - score / strategies: 앙상블 점수와 매수 신호를 낸 전략 목록 (데이터 부족 종목은 score NULL)
+    - indicators_json: 마지막 bar의 지표 값 (JSON)
+    - params_hash: 계산에 쓴 파라미터/가중치 해시 (바뀌면 전 종목 재계산)
+    - signal_{전략명}: strategy.ENSEMBLE_STRATEGIES 각 전략의 마지막 bar 신호
+    """
+    signal_columns = ",\n        ".join(f"signal_{name} INTEGER" for name in ENSEMBLE_STRATEGIES)
+    cursor.execute(f"""
+    CREATE TABLE IF NOT EXISTS latest_signals (
+        symbol TEXT PRIMARY KEY,
+        date DATE,
+        close REAL,
+        bars INTEGER,
+        score REAL,
+        strategies TEXT,
+        {signal_columns},
+        indicators_json TEXT,
+        params_hash TEXT,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_latest_signals_score ON latest_signals (score)")
+
+
+def create_tables(db_path=None):
     """
     시스템에 필요한 테이블들을 생성합니다.
+    (db_path: 기본 DB 대신 테이블을 만들 파일 - 예: benchmarks/synthetic_data.py의 합성 DB)
     """
-    conn = get_connection()
+    conn = get_connection(db_path)
     cursor = conn.cursor()
 
     print("Checking and creating tables...")
@@ -99,10 +128,13 @@ def create_tables():
 
     print("Checking tables... (market_status_log added)")
 
+    # 5. Latest Signals Table (스크리너용 종목별 최신 신호)
+    create_latest_signals_table(cursor)
+
 
     conn.commit()
     conn.close()
-    print(f"Database initialized successfully at: {os.path.abspath(DB_PATH)}")
+    print(f"Database initialized successfully at: {os.path.abspath(db_path or DB_PATH)}")
 
 
 def check_db_status():
@@ -110,7 +142,7 @@ def check_db_status():
     conn = get_connection()
     cursor = conn.cursor()
 
-    tables = ['tickers', 'daily_price', 'market_index', 'financials']
+    tables = ['tickers', 'daily_price', 'market_index', 'financials', 'latest_signals']
     print("\n--- Current Database Status ---")
     for table in tables:
         try:
@@ -1,8 +1,10 @@
 # indicator.py (터틀, RSI, SMA, 볼린저밴드 평균 회귀, MACD, 볼린저밴드 스퀴즈, DEMA, ATR, 거래량
 
 import pandas as pd
-import pandas_ta as ta
 import numpy as np
+from lazy_imports import lazy_module
+
+ta = lazy_module('pandas_ta')  # 지표 함수를 처음 호출할 때 import (import 시간 절약)
 
 
 # config.py는 더 이상 여기서 임포트하지 않습니다.
@@ -0,0 +1,51 @@
+# lazy_imports.py (무거운 의존성 지연 import)
+# pandas_ta / yfinance / requests / tqdm / seaborn / matplotlib 처럼 import만으로 수백 ms가 걸리는 모듈을
+# 실제로 처음 사용할 때 import합니다. (짧은 CLI 명령이 쓰지도 않는 라이브러리 로딩을 기다리지 않도록)
+#
+# 사용 예)
+#   ta = lazy_module('pandas_ta')          # 기존 'import pandas_ta as ta' 대신, ta.rsi(...) 호출 시점에 import
+#   tqdm = lazy_attr('tqdm', 'tqdm')       # 기존 'from tqdm import tqdm' 대신
+#
+# import 시간 예산 점검: python benchmarks/import_time.py
+
+import importlib
+import types
+
+
+class LazyModule(types.ModuleType):
+    """속성에 처음 접근할 때 실제 모듈을 import해서 위임하는 모듈 대리 객체"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_target'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_target']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_lazy_target'] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_module(name):
+    """name 모듈의 지연 대리 객체 (이미 import된 모듈이면 그대로 반환)"""
+    module = importlib.sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
+
+
+def lazy_attr(module_name, attr):
+    """module_name.attr 함수/클래스를 호출 시점에 import해서 호출하는 래퍼"""
+
+    def call(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), attr)(*args, **kwargs)
+
+    call.__name__ = attr
+    call.__qualname__ = attr
+    call.__doc__ = f"{module_name}.{attr} (첫 호출 시 import)"
+    return call
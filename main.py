@@ -1,6 +1,6 @@
 import sys
 import os
-import time
+import argparse
 from datetime import datetime
 
 # 모듈 임포트
@@ -8,6 +8,16 @@ import database
 import data_collector
 import market_analyzer
 import screener
+from pipeline import Stage, StageIncomplete, Pipeline, STAMP_FILE
+
+# ==========================================
+# ⚙️ 파이프라인 설정
+# ==========================================
+# 종목 리스트(S&P500)는 자주 바뀌지 않으므로 주 1회만 다시 가져옵니다. (ISO 연도-주차가 바뀌면 갱신)
+# 지수 / 주가 수집은 하루 1회 (같은 날 다시 실행하면 건너뜀, 강제로 하려면 --force)
+SKIP_SCREENING_STATUS = ['PANIC', 'BEAR']  # 이 시장 상태에서는 스크리닝/알림을 하지 않음
+# yfinance 다운로드는 스레드 안전하지 않고, 수집 단계마다 같은 DB에 쓰기 연결을 엶 -> 수집 단계는 한 번에 하나씩
+COLLECT_LANE = 'collect'
 
 
 def print_header():
@@ -17,80 +27,168 @@ def print_header():
     print("=" * 60)
 
 
-def main():
-    print_header()
+def _today():
+    return datetime.now().strftime('%Y-%m-%d')
 
-    # --- 1. 데이터베이스 점검 및 구축 ---
-    print("\n[Step 1] 시스템 점검 (Database)")
-    if not os.path.exists(database.DB_PATH):
-        print(" ⚠️ DB 파일이 없습니다. 새로 구축합니다.")
-        database.create_tables()
-    else:
-        print(f" ✅ DB 연결 확인: {database.DB_PATH}")
 
-    # --- 2. 데이터 업데이트 (수집) ---
-    print("\n[Step 2] 데이터 동기화 (Data Collection)")
-    print(" ⏳ 최신 데이터를 수집합니다. (시간이 소요될 수 있습니다)")
+def _this_week():
+    year, week, _ = datetime.now().isocalendar()
+    return f"{year}-W{week:02d}"
+
 
+def _table_version(table, column='date'):
+    """테이블의 (행 수, 최신 날짜) - 데이터가 바뀌었는지 판단하는 출력 스탬프 값"""
+    conn = database.get_connection()
     try:
-        # (1) 종목 리스트 확보
-        tickers = data_collector.get_sp500_tickers()
+        return list(conn.execute(f"SELECT COUNT(*), MAX({column}) FROM {table}").fetchone())
+    finally:
+        conn.close()
 
-        # (2) 시장 지수(SPY, QQQ, VIX 등) 업데이트
-        data_collector.update_market_indices()
 
-        # (3) 종목 상세 정보 업데이트 (가끔 실행해도 되지만, 일단 매번 체크)
-        data_collector.update_tickers_info(tickers)
+# ==========================================
+# 🧩 단계(Stage) 정의
+# ==========================================
 
-        # (4) 개별 종목 주가 업데이트
-        data_collector.update_stock_data(tickers)
+def stage_universe(inputs):
+    """종목 리스트 확보 (실패하거나 비어 있으면 예외 -> 지난 리스트로 진행)"""
+    tickers = data_collector.get_sp500_tickers()
+    if not tickers:
+        raise RuntimeError("S&P 500 종목 리스트가 비어 있습니다.")
+    return sorted(tickers)
 
-    except Exception as e:
-        print(f" ❌ 데이터 수집 중 치명적 오류 발생: {e}")
-        # 데이터 수집이 실패해도 기존 데이터로 분석을 시도할지 결정해야 함
-        # 여기서는 중단하지 않고 진행
 
-    # --- 3. 시장 상황 분석 ---
-    print("\n[Step 3] 시장 상황 판단 (Market Analysis)")
-    try:
-        market_status = market_analyzer.analyze_market_status()
-        status = market_status.get('status')
-        desc = market_status.get('description')
+def stage_ticker_info(inputs):
+    """종목 상세 정보 (tickers 테이블에 없는 신규 종목만)"""
+    data_collector.update_tickers_info(inputs['universe'])
+    return len(inputs['universe'])
+
+
+def stage_index_update(inputs):
+    """시장 지수(SPY, QQQ, VIX 등) 업데이트 (일부 실패 시 오늘 완료로 기록하지 않음)"""
+    failed = data_collector.update_market_indices()
+    version = _table_version('market_index')
+    if failed:
+        raise StageIncomplete(f"지수 {len(failed)}개 업데이트 실패: {', '.join(failed)}", version)
+    return version
 
-        print(f" 👉 결과: [{status}] {desc}")
 
-        # VIX 정보 등 추가 출력
-        print(f"    (SPY: {market_status.get('spy_close')}, VIX: {market_status.get('vix')})")
+def stage_price_update(inputs):
+    """개별 종목 주가 업데이트 (일부 실패 시 오늘 완료로 기록하지 않음 -> 다음 실행에서 다시 수집)"""
+    failed = data_collector.update_stock_data(inputs['universe'])
+    version = _table_version('daily_price')
+    if failed:
+        raise StageIncomplete(f"{len(failed)}/{len(inputs['universe'])}개 종목 업데이트 실패", version)
+    return version
 
-    except Exception as e:
-        print(f" ❌ 시장 분석 중 오류 발생: {e}")
-        return  # 시장 판단 불가 시 종료
 
-    # --- 4. 유망 종목 스크리닝 ---
-    print("\n[Step 4] 유망 종목 발굴 (Screener)")
+def stage_regime(inputs):
+    """시장 상태 판단 (지수 데이터가 바뀌었을 때만)"""
+    market_status = market_analyzer.analyze_market_status()
+    if market_status.get('status') == 'ERROR':
+        raise RuntimeError(f"시장 분석 실패: {market_status.get('reason')}")
+    print(f" 👉 시장 상태: [{market_status.get('status')}] {market_status.get('description')}")
+    print(f"    (SPY: {market_status.get('spy_close')}, VIX: {market_status.get('vix')})")
+    return market_status
 
-    if status in ['PANIC', 'BEAR']:
+
+def stage_indicators(inputs):
+    """스크리너용 최신 신호 테이블 갱신 (새 bar가 들어온 종목만 재계산)"""
+    updated = screener.update_latest_signals(tickers=inputs['universe'])
+    print(f" ✅ 최신 신호 갱신: {updated}개 종목")
+    return _table_version('latest_signals', column='updated_at')
+
+
+def stage_screening(inputs):
+    """latest_signals에서 매수 후보 조회 (시장 상태가 나쁘면 건너뜀)"""
+    status = inputs['regime'].get('status')
+    if status in SKIP_SCREENING_STATUS:
         print(" ⛔ 시장 상황이 좋지 않아 스크리닝을 건너뜁니다.")
-        print("    (시스템 종료)")
-        return
+        return {'status': status, 'results': []}
+
+    df_result = screener.query_latest_signals(screener.SCORE_THRESHOLD)
+    if not df_result.empty:
+        print(df_result[['Symbol', 'Price', 'Score', 'Strategies']].to_string())
+    return {'status': status, 'results': df_result.to_dict(orient='records')}
+
+
+def stage_notification(inputs):
+    """스크리닝 결과 알림 (결과가 바뀌었을 때만 실행되므로 같은 알림이 반복되지 않음)"""
+    from run_live_trading import send_telegram_message
+
+    screening = inputs['screening']
+    if not screening['results']:
+        return 0
+
+    lines = [f"🕵️ *오늘의 추천 종목* ({inputs['regime'].get('date')}, 시장: {screening['status']})"]
+    for row in screening['results']:
+        lines.append(f"• {row['Symbol']} ${row['Price']:.2f} (점수 {row['Score']:.1f}: {row['Strategies']})")
+    send_telegram_message("\n".join(lines))
+    return len(screening['results'])
+
+
+def build_pipeline(workers=4, stamp_file=STAMP_FILE):
+    """
+    일일 파이프라인 그래프
+        universe ─┬─ ticker_info
+                  └─ price_update ── indicators ─┐
+        index_update ── regime ──────────────────┴─ screening ── notification
+    (universe / index_update는 동시에, regime은 price_update / indicators와 동시에 실행)
+    (ticker_info / index_update / price_update는 COLLECT_LANE - yfinance / DB 쓰기가 겹치지 않도록 차례로 실행)
+    """
+    stages = [
+        Stage('universe', stage_universe, outputs=['universe'], fingerprint=_this_week),
+        Stage('ticker_info', stage_ticker_info, inputs=['universe'], outputs=['ticker_info'], lane=COLLECT_LANE),
+        Stage('index_update', stage_index_update, outputs=['market_index'], fingerprint=_today, lane=COLLECT_LANE),
+        Stage('price_update', stage_price_update, inputs=['universe'], outputs=['prices'], fingerprint=_today,
+              lane=COLLECT_LANE),
+        Stage('regime', stage_regime, inputs=['market_index'], outputs=['regime']),
+        Stage('indicators', stage_indicators, inputs=['universe', 'prices'], outputs=['signals'],
+              fingerprint=screener._params_hash),
+        Stage('screening', stage_screening, inputs=['regime', 'signals'], outputs=['screening']),
+        Stage('notification', stage_notification, inputs=['regime', 'screening'], outputs=['notification']),
+    ]
+    return Pipeline(stages, stamp_file=stamp_file, workers=workers)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="일일 파이프라인 (수집 -> 시장 분석 -> 신호 갱신 -> 스크리닝 -> 알림)")
+    parser.add_argument('--force', nargs='*', default=None,
+                        help="신선도 스탬프와 관계없이 다시 실행할 단계 (이름 없이 쓰면 전체)")
+    parser.add_argument('--workers', type=int, default=4, help="동시에 실행할 최대 단계 수")
+    args = parser.parse_args(argv)
 
-    try:
-        # 스크리너 실행 (결과는 내부에서 출력됨)
-        results = screener.run_screener()
+    print_header()
 
-        if results is not None and not results.empty:
-            print(f"\n✅ 오늘의 추천 종목 ({len(results)}개) 생성이 완료되었습니다.")
-            # 추후 여기에 텔레그램 전송 코드 등을 추가할 수 있습니다.
-        else:
-            print("\n🤷 검색된 종목이 없습니다.")
+    # --- 1. 데이터베이스 점검 및 구축 ---
+    print("\n[Step 1] 시스템 점검 (Database)")
+    if not os.path.exists(database.DB_PATH):
+        print(" ⚠️ DB 파일이 없습니다. 새로 구축합니다.")
+        database.create_tables()
+    else:
+        print(f" ✅ DB 연결 확인: {database.DB_PATH}")
 
-    except Exception as e:
-        print(f" ❌ 스크리닝 중 오류 발생: {e}")
+    # --- 2. 단계 그래프 실행 (입력이 바뀌지 않은 단계는 건너뜀) ---
+    print("\n[Step 2] 일일 파이프라인 실행")
+    force = () if args.force is None else (args.force or True)
+    pipeline = build_pipeline(workers=args.workers)
+    values = pipeline.run(force=force)
+
+    # --- 3. 결과 요약 ---
+    screening = values.get('screening')
+    if screening is None:
+        print("\n❌ 스크리닝 결과를 만들지 못했습니다. (위 단계 로그 확인)")
+    elif screening['status'] in SKIP_SCREENING_STATUS:
+        print(f"\n⛔ 시장 상태 [{screening['status']}] - 추천 종목 없음 (현금 비중 확대 권장)")
+    elif screening['results']:
+        print(f"\n✅ 오늘의 추천 종목 ({len(screening['results'])}개) 생성이 완료되었습니다.")
+    else:
+        print("\n🤷 검색된 종목이 없습니다.")
 
     print("\n" + "=" * 60)
     print("🏁 모든 작업이 완료되었습니다. 성투하세요!")
     print("=" * 60)
+    return values
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
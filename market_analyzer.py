@@ -1,6 +1,5 @@
 import sqlite3
 import pandas as pd
-import pandas_ta as ta  # 지표 계산용
 #10년물 금리, 달러인덱스 확장 예정
 # DB 경로 설정
 DB_PATH = "market_data.db"
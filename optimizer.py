@@ -1,8 +1,18 @@
 # [ 📄 optimizer.py (신규 파일) ]
 
 import config
-from run_backtest import run_single_backtest  # 리팩토링된 단일 실행 함수 임포트
-from tqdm import tqdm  # (선택) 진행률 표시를 위해
+from run_backtest import load_backtest_data, simulate_backtest  # 리팩토링된 단계별 실행 함수 임포트
+from backtesting import logger, report
+from backtesting.sweep import run_sweep
+
+
+# --- 병렬 Sweep용 워커 함수 (모듈 최상위 함수여야 pickle 가능) ---
+def load_symbol_data(symbol):
+    return load_backtest_data({'symbol': symbol, 'output_size': 'full'})
+
+
+def evaluate_context(df_raw, context):
+    return simulate_backtest(df_raw, context, verbose=False)
 
 
 def run_optimization():
@@ -35,22 +45,22 @@ def run_optimization():
         'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER
     }
 
-    # --- 3. 파라미터 리스트 순회 (tqdm 적용) ---
-    for entry_period in tqdm(entry_periods_to_test, desc="최적화 진행률"):
-        # 3-1. 현재 루프의 설정값으로 context 복사 및 수정
+    # --- 3. 파라미터 조합을 병렬로 실행 ---
+    # (향후 확장 예시: exit_periods_to_test 등을 곱해서 jobs에 추가)
+    jobs = []
+    for entry_period in entry_periods_to_test:
         current_context = base_context.copy()
         current_context['entry_period'] = entry_period
+        jobs.append((current_context['symbol'], current_context))
 
-        # (향후 확장 예시: 2중 for문)
-        # for exit_period in exit_periods_to_test:
-        #    current_context['exit_period'] = exit_period
-        #    ...
-
-        # 3-2. 단일 백테스트 실행
-        # (run_single_backtest 함수가 DB 저장 및 콘솔 리포트까지 모두 처리)
-        run_single_backtest(current_context)
+    # 3-1. DB 저장 및 콘솔 리포트는 메인 프로세스에서만 수행 (SQLite 단일 writer)
+    def on_result(job, stats):
+        _, context = job
+        logger.log_backtest_result(context, stats)
+        report.show_console_report(stats, context)
+        print(f"\nEntry: {context['entry_period']}일 테스트 완료.\n" + "-" * 50)
 
-        print(f"\nEntry: {entry_period}일 테스트 완료.\n" + "-" * 50)
+    run_sweep(jobs, evaluate_context, load_symbol_data, on_result=on_result, desc="최적화 진행률")
 
     print("=" * 50)
     print("전략 최적화 완료.")
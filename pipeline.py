@@ -0,0 +1,230 @@
+# pipeline.py (단계 DAG 실행기)
+# 일일 파이프라인(main.py)을 '단계(Stage)' 그래프로 실행합니다.
+#
+# - 각 단계는 입력(inputs: 앞 단계 출력 이름)과 출력(outputs)을 선언 -> 의존 관계가 그래프로 정해짐
+# - 신선도 스탬프: 단계 키 = hash(입력들의 스탬프 + 단계의 외부 상태 fingerprint())
+#   저장된 키와 같으면 실행하지 않고 지난 결과를 그대로 사용 (입력이 바뀌지 않았으므로)
+#   출력 스탬프 = hash(결과 값) -> 다시 실행했어도 결과가 같으면 하위 단계는 건너뜀
+# - 서로 의존하지 않는 단계는 스레드 풀에서 동시에 실행 (수집은 대부분 네트워크/DB 대기)
+#   같은 lane의 단계는 한 번에 하나씩만 실행 (스레드 안전하지 않은 라이브러리 / 같은 DB에 쓰는 단계)
+# - 단계마다 실행 시간(wall time)과 상태를 기록하고, 스탬프 파일(cache/pipeline_stamps.json)에 저장
+# - 단계가 실패하면 지난 성공 결과로 대신 진행 (기존 데이터로라도 분석), 지난 결과가 없으면 하위 단계는 blocked
+#   일부만 실패한 단계(StageIncomplete)는 이번 결과로 진행하되 스탬프를 남기지 않음 -> 다음 실행에서 다시 시도
+#
+# 사용 예)
+#   stages = [Stage('universe', fetch_universe, outputs=['universe'], fingerprint=lambda: week),
+#             Stage('prices', update_prices, inputs=['universe'], outputs=['prices'])]
+#   results = Pipeline(stages).run()
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from backtesting.cache import CACHE_DIR, config_hash
+
+STAMP_FILE = os.path.join(CACHE_DIR, "pipeline_stamps.json")
+DEFAULT_WORKERS = 4
+
+
+def _json_default(value):
+    """numpy 스칼라 등 JSON 기본 타입이 아닌 값 처리"""
+    return value.item() if hasattr(value, 'item') else str(value)
+
+
+class StageIncomplete(Exception):
+    """
+    단계가 일부만 성공했을 때 run()에서 던지는 예외
+    value(부분 결과)는 하위 단계에 그대로 넘기지만, 완료 스탬프는 남기지 않아 다음 실행에서 다시 시도합니다.
+    """
+
+    def __init__(self, message, value):
+        super().__init__(message)
+        self.value = value
+
+
+class Stage:
+    """
+    파이프라인 단계 하나
+
+    :param name: 단계 이름 (스탬프 키)
+    :param run: run(inputs) -> 결과 값. inputs는 {입력 이름: 앞 단계 결과}. 결과는 JSON으로 저장 가능해야 함
+    :param inputs: 이 단계가 읽는 앞 단계 출력 이름 목록
+    :param outputs: 이 단계가 만드는 출력 이름 목록 (결과 값이 모든 출력에 연결됨)
+    :param fingerprint: (선택) 외부 상태 함수 - 값이 바뀌면 입력이 같아도 다시 실행 (예: 오늘 날짜, DB 최신 날짜)
+    :param always: True면 스탬프와 관계없이 매번 실행
+    :param lane: (선택) 같은 lane의 단계는 동시에 실행하지 않음 (예: 같은 DB에 쓰는 수집 단계들)
+    """
+
+    def __init__(self, name, run, inputs=(), outputs=(), fingerprint=None, always=False, lane=None):
+        self.name = name
+        self.run = run
+        self.inputs = list(inputs)
+        self.outputs = list(outputs) or [name]
+        self.fingerprint = fingerprint
+        self.always = always
+        self.lane = lane
+
+
+class Pipeline:
+    """
+    Stage 목록을 의존 관계에 따라 실행합니다.
+
+    :param stages: Stage 리스트 (출력 이름은 단계 간에 겹치면 안 됨)
+    :param stamp_file: 신선도 스탬프 저장 파일 (None이면 저장하지 않음 - 매번 전부 실행)
+    :param workers: 동시에 실행할 최대 단계 수
+    """
+
+    def __init__(self, stages, stamp_file=STAMP_FILE, workers=DEFAULT_WORKERS):
+        self.stages = {stage.name: stage for stage in stages}
+        self.stamp_file = stamp_file
+        self.workers = workers
+        self.producer = {}
+        for stage in stages:
+            for output in stage.outputs:
+                if output in self.producer:
+                    raise ValueError(f"출력 '{output}'을 만드는 단계가 둘 이상입니다: {self.producer[output]}, {stage.name}")
+                self.producer[output] = stage.name
+        for stage in stages:
+            missing = [i for i in stage.inputs if i not in self.producer]
+            if missing:
+                raise ValueError(f"단계 '{stage.name}'의 입력을 만드는 단계가 없습니다: {missing}")
+        self.deps = {stage.name: {self.producer[i] for i in stage.inputs} for stage in stages}
+        self._check_acyclic()
+        self.stamps = self._load_stamps()
+        self.report = []
+        self._lock = threading.Lock()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done': return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"단계 의존 관계에 순환이 있습니다: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.deps[name]:
+                visit(dep, path + [name])
+            state[name] = 'done'
+
+        for name in self.stages:
+            visit(name, [])
+
+    # ------------------------------------------------------------------
+    # 스탬프 저장/로드
+    # ------------------------------------------------------------------
+    def _load_stamps(self):
+        if not self.stamp_file or not os.path.exists(self.stamp_file):
+            return {}
+        try:
+            with open(self.stamp_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [Pipeline] 스탬프 파일 손상 - 전체 재실행: {e}")
+            return {}
+
+    def _save_stamps(self):
+        if not self.stamp_file: return
+        os.makedirs(os.path.dirname(self.stamp_file) or '.', exist_ok=True)
+        tmp_path = f"{self.stamp_file}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.stamps, f, ensure_ascii=False, indent=1, default=_json_default)
+        os.replace(tmp_path, self.stamp_file)
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def _stage_key(self, stage, output_stamps):
+        payload = {'inputs': {i: output_stamps[i] for i in stage.inputs}}
+        if stage.fingerprint is not None:
+            payload['fingerprint'] = stage.fingerprint()
+        return config_hash(payload)
+
+    def _execute(self, stage, values, output_stamps, force):
+        """단계 하나 실행 (또는 건너뜀) -> (상태, 결과 값, 출력 스탬프, 실행 시간, 메시지)"""
+        start = time.time()
+        stored = self.stamps.get(stage.name)
+        try:
+            key = self._stage_key(stage, output_stamps)
+            if stored and stored.get('key') == key and not stage.always and not force:
+                return 'skipped', stored['value'], stored['stamp'], time.time() - start, "입력 변화 없음"
+
+            value = stage.run({i: values[i] for i in stage.inputs})
+            stamp = config_hash({'stage': stage.name, 'value': json.dumps(value, sort_keys=True, default=_json_default)})
+            with self._lock:
+                self.stamps[stage.name] = {'key': key, 'stamp': stamp, 'value': value,
+                                           'finished_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                                           'wall_sec': round(time.time() - start, 3)}
+            return 'done', value, stamp, time.time() - start, ""
+        except StageIncomplete as e:
+            stamp = config_hash({'stage': stage.name, 'value': json.dumps(e.value, sort_keys=True, default=_json_default)})
+            return 'failed', e.value, stamp, time.time() - start, f"{e} (부분 결과로 진행, 다음 실행에서 재시도)"
+        except Exception as e:
+            message = f"{type(e).__name__}: {e}"
+            if stored:
+                return 'failed', stored['value'], stored['stamp'], time.time() - start, f"{message} (지난 결과 사용)"
+            return 'failed', None, None, time.time() - start, message
+
+    def run(self, force=(), verbose=True):
+        """
+        모든 단계를 의존 순서대로 실행합니다.
+
+        :param force: 스탬프와 관계없이 다시 실행할 단계 이름 목록 (True면 전부)
+        :return: {출력 이름: 결과 값}
+        """
+        force_all = force is True
+        force = set() if force_all else set(force)
+        values, output_stamps = {}, {}
+        pending = set(self.stages)
+        running = {}
+        self.report = []
+        start = time.time()
+
+        def finish(name, result):
+            state, value, stamp, wall, message = result
+            if stamp is not None:
+                for output in self.stages[name].outputs:
+                    values[output] = value
+                    output_stamps[output] = stamp
+            self.report.append({'stage': name, 'status': state, 'wall_sec': wall, 'message': message})
+            if verbose:
+                icon = {'done': '✅', 'skipped': '⏭️', 'failed': '❌', 'blocked': '⛔'}[state]
+                print(f" {icon} [{name}] {state} ({wall:.1f}초){' - ' + message if message else ''}")
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            while pending or running:
+                for name in sorted(pending):
+                    deps = self.deps[name]
+                    if any(d in pending or d in running.values() for d in deps):
+                        continue
+                    lane = self.stages[name].lane
+                    if lane is not None and any(self.stages[r].lane == lane for r in running.values()):
+                        continue  # 같은 lane의 단계가 실행 중 -> 끝난 뒤에 실행
+                    pending.discard(name)
+                    stage = self.stages[name]
+                    if any(i not in values for i in stage.inputs):
+                        finish(name, ('blocked', None, None, 0.0, "앞 단계 결과 없음"))
+                        continue
+                    future = pool.submit(self._execute, stage, values, dict(output_stamps),
+                                         force_all or name in force)
+                    running[future] = name
+
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), future.result())
+
+        self._save_stamps()
+        if verbose:
+            print(format_report(self.report, time.time() - start))
+        return values
+
+
+def format_report(report, total_sec):
+    """단계별 상태 / 실행 시간 표"""
+    lines = ["\n⏱️ 단계별 실행 시간"]
+    for row in report:
+        lines.append(f"   {row['stage']:<12} {row['status']:<8} {row['wall_sec']:>7.1f}초")
+    lines.append(f"   {'(전체)':<12} {'':<8} {total_sec:>7.1f}초")
+    return "\n".join(lines)
@@ -1,8 +1,7 @@
 # [ 📄 run_all_stocks.py (신규 파일) ]
 
 import config
-from run_backtest import run_single_backtest  # 리팩토링된 단일 실행 함수 임포트
-from tqdm import tqdm
+from run_backtest import build_context, run_batch_backtests, batch_summary  # 공용 배치 실행기
 
 
 def run_multi_stock_test():
@@ -24,27 +23,12 @@ def run_multi_stock_test():
     print(f"적용할 전략: 터틀 (Entry: {OPTIMAL_ENTRY_PERIOD}일)")
     print("=" * 50)
 
-    # --- 3. 기본 설정값 로드 (config.py에서) ---
-    base_context = {
-        'initial_capital': 10000.0,
-        'output_size': 'full',
-        'entry_period': OPTIMAL_ENTRY_PERIOD,  # (★) 고정된 최적값 사용
-        'exit_period': config.TURTLE_EXIT_PERIOD,
-        'atr_period': config.ATR_PERIOD,
-        'risk_percent': config.RISK_PER_TRADE_PERCENT,
-        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER
-    }
-
-    # --- 4. 종목 리스트 순회 (tqdm 적용) ---
-    for symbol in tqdm(symbols_to_test, desc="다중 종목 테스트 진행률"):
-        # 4-1. 현재 루프의 종목으로 context 수정
-        current_context = base_context.copy()
-        current_context['symbol'] = symbol
-
-        # 4-2. 단일 백테스트 실행
-        run_single_backtest(current_context)
-
-        print(f"\n{symbol} 테스트 완료.\n" + "-" * 50)
+    # --- 3. 종목별 context 조립 (config.py 기본값 + 고정된 최적값) ---
+    contexts = [build_context('turtle', symbol, entry_period=OPTIMAL_ENTRY_PERIOD) for symbol in symbols_to_test]
+
+    # --- 4. 한 번에 병렬 실행 (종목 데이터는 워커마다 한 번만 로드, 결과는 DB에 기록) ---
+    results, _ = run_batch_backtests(contexts, log_results=True, desc="다중 종목 테스트 진행률")
+    print(batch_summary(results).to_string(index=False))
 
     print("=" * 50)
     print("다중 종목 백테스트 완료.")
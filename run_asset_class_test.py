@@ -1,8 +1,7 @@
 # [ 📄 run_asset_class_test.py (신규 파일) ]
 
 import config
-from run_backtest import run_single_backtest  # 리팩토링된 단일 실행 함수 임포트
-from tqdm import tqdm
+from run_backtest import build_context, run_batch_backtests, batch_summary  # 공용 배치 실행기
 
 
 def run_multi_asset_test():
@@ -35,33 +34,13 @@ def run_multi_asset_test():
     print(f"적용할 전략: 터틀 (Entry: {OPTIMAL_ENTRY_PERIOD}일)")
     print("=" * 50)
 
-    # --- 3. 기본 설정값 로드 (config.py에서) ---
-    base_context = {
-        'initial_capital': 10000.0,
-        'output_size': 'full',
-        'entry_period': OPTIMAL_ENTRY_PERIOD,  # (★) 고정된 최적값 사용
-        'exit_period': config.TURTLE_EXIT_PERIOD,
-        'atr_period': config.ATR_PERIOD,
-        'risk_percent': config.RISK_PER_TRADE_PERCENT,
-        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER
-    }
+    # --- 3. 자산군별 context 조립 (config.py 기본값 + 고정된 최적값) ---
+    contexts = [build_context('turtle', symbol, entry_period=OPTIMAL_ENTRY_PERIOD) for symbol in asset_class_tickers]
 
-    # --- 4. 종목 리스트 순회 (tqdm 적용) ---
-    for symbol in tqdm(asset_class_tickers, desc="다중 자산군 테스트 진행률"):
-
-        # 4-1. 현재 루프의 종목으로 context 수정
-        current_context = base_context.copy()
-        current_context['symbol'] = symbol
-
-        # 4-2. 단일 백테스트 실행
-        try:
-            run_single_backtest(current_context)
-        except Exception as e:
-            # (데이터가 없거나(예: USO) 중간에 오류가 나도 멈추지 않도록)
-            print(f"\n*** {symbol} 테스트 중 오류 발생: {e} ***")
-            print("다음 종목으로 넘어갑니다.")
-
-        print(f"\n{symbol} 테스트 완료.\n" + "-" * 50)
+    # --- 4. 한 번에 병렬 실행 ---
+    # (데이터가 없거나(예: USO) 중간에 오류가 난 종목은 건너뛰고, 실패 건수는 실행 요약에 표시됨)
+    results, _ = run_batch_backtests(contexts, log_results=True, desc="다중 자산군 테스트 진행률")
+    print(batch_summary(results).to_string(index=False))
 
     print("=" * 50)
     print("다중 자산군 백테스트 완료.")
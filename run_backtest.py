@@ -7,7 +7,8 @@ import config
 import pandas as pd
 
 # 백테스팅 패키지에서 모듈들을 import
-from backtesting import engine, metrics, report, logger
+from backtesting import engine, metrics, report, logger, robustness, profiling
+from backtesting.sweep import run_sweep
 
 # --- 전략 맵(MAP) 정의 ---
 INDICATOR_FUNCTIONS = {
@@ -35,40 +36,77 @@ SIGNAL_FUNCTIONS = {
 
 # ---------------------------------------------
 
-def run_single_backtest(context):
+def build_context(strategy_name='turtle', symbol='AAPL', **overrides):
     """
-    하나의 설정값(context)을 받아 백테스트를 1회 실행합니다.
-    (★) start_date, end_date가 context에 있으면 데이터를 필터링합니다.
+    config.py의 기본값으로 모든 전략의 파라미터를 담은 context를 만듭니다.
+    (run_*_test 스크립트 / CLI / 조회 서비스가 같은 기본값을 쓰도록 한 곳에서 조립)
+
+    :param overrides: 덮어쓸 키 (start_date, end_date, entry_period 등)
     """
+    context = {
+        # (실행 설정)
+        'strategy_name': strategy_name,  # (★) 실행할 전략 이름 (e.g., 'rsi', 'sma', 'bbands', 'macd', 'bbs', 'dema')
+        'symbol': symbol,
+        'initial_capital': 10000.0,
+        'output_size': 'full',
 
-    # --- 1. 컨텍스트에서 설정값 추출 ---
-    SYMBOL_TO_TEST = context.get('symbol', 'AAPL')
-    INITIAL_CAPITAL = context.get('initial_capital', 10000.0)
-    DATA_OUTPUT_SIZE = context.get('output_size', 'full')
+        # (리스크/엔진 설정 - 공용)
+        'risk_percent': config.RISK_PER_TRADE_PERCENT,
+        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER,
+        'atr_period': config.ATR_PERIOD,  # (공용)
 
-    strategy_name = context.get('strategy_name', 'turtle')
-    if strategy_name not in INDICATOR_FUNCTIONS or strategy_name not in SIGNAL_FUNCTIONS:
-        print(f"오류: 알 수 없는 전략 이름 '{strategy_name}'. 백테스트를 종료합니다.")
-        return
+        # (터틀 설정)
+        'entry_period': config.TURTLE_ENTRY_PERIOD,
+        'exit_period': config.TURTLE_EXIT_PERIOD,
 
-    # (로그용 파라미터 - 기존 코드 유지)
-    entry_period = context.get('entry_period',
-                               context.get('rsi_period',
-                                           context.get('sma_short_period', '?')))
+        # (RSI 설정)
+        'rsi_period': config.RSI_PERIOD,
+        'rsi_oversold': config.RSI_OVERSOLD,
+        'rsi_overbought': config.RSI_OVERBOUGHT,
 
-    # --- [ (★) 신규: 날짜 범위 추출 ] ---
+        # (SMA 설정)
+        'sma_short_period': config.SMA_SHORT_PERIOD,
+        'sma_long_period': config.SMA_LONG_PERIOD,
+
+        # --- [ (신규) 4개 전략 설정값 추가 ] ---
+
+        # (볼린저 밴드 - 평균회귀 설정)
+        'bbands_period': config.BBANDS_PERIOD,
+        'bbands_std_dev': config.BBANDS_STD_DEV,
+
+        # (MACD 설정)
+        'macd_fast_period': config.MACD_FAST_PERIOD,
+        'macd_slow_period': config.MACD_SLOW_PERIOD,
+        'macd_signal_period': config.MACD_SIGNAL_PERIOD,
+
+        # (볼린저 밴드 스퀴즈 설정)
+        'bbs_period': config.BBS_PERIOD,
+        'bbs_std_dev': config.BBS_STD_DEV,
+        'bbs_squeeze_period': config.BBS_SQUEEZE_PERIOD,
+
+        # (DEMA 설정)
+        'dema_short_period': config.DEMA_SHORT_PERIOD,
+        'dema_long_period': config.DEMA_LONG_PERIOD,
+    }
+    context.update(overrides)
+    return context
+
+
+def load_backtest_data(context):
+    """
+    context의 종목/기간 설정에 맞는 원본 가격 데이터를 로드합니다.
+    (★) start_date, end_date가 context에 있으면 데이터를 필터링합니다.
+
+    :return: 필터링된 DataFrame (실패 시 None)
+    """
+    SYMBOL_TO_TEST = context.get('symbol', 'AAPL')
     start_date = context.get('start_date', None)
     end_date = context.get('end_date', None)
 
-    date_range_str = f" ({start_date} ~ {end_date})" if start_date and end_date else ""
-    print(f"--- {SYMBOL_TO_TEST} 백테스트 시작 (전략: {strategy_name}{date_range_str}) ---")
-
-    # --- 2. 데이터 준비 ---
-    print("1/5: 데이터 로드 중...")
-    df_raw = data_manager.get_stock_data(SYMBOL_TO_TEST, output_size=DATA_OUTPUT_SIZE)
-    if df_raw is None:
+    df_raw = data_manager.get_price_data(SYMBOL_TO_TEST)
+    if df_raw is None or df_raw.empty:
         print(f"데이터 수집 실패. 백테스트를 종료합니다.")
-        return
+        return None
 
     # --- [ (★) 신규: 날짜 필터링 로직 ] ---
     # (데이터프레임 인덱스를 datetime으로 변환 (안전장치))
@@ -83,35 +121,94 @@ def run_single_backtest(context):
         df_filtered = df_raw.loc[start_date:end_date].copy()
         if df_filtered.empty:
             print(f"오류: {start_date} ~ {end_date} 범위에 데이터가 없습니다.")
-            return
+            return None
     else:
         df_filtered = df_raw.copy()
-    # --------------------------------------
+    return df_filtered
+
+
+def simulate_backtest(df_filtered, context, verbose=True):
+    """
+    로드된 데이터에 지표 계산 -> 신호 생성 -> 시뮬레이션 -> 통계 계산을 수행합니다.
+    (DB 저장/리포트 출력은 하지 않으므로 병렬 워커에서도 그대로 쓸 수 있습니다)
+
+    :param verbose: False면 단계별 진행 메시지를 출력하지 않음
+    :return: 성과 통계 딕셔너리 (실패 시 None)
+    """
+    INITIAL_CAPITAL = context.get('initial_capital', 10000.0)
+    strategy_name = context.get('strategy_name', 'turtle')
 
     # --- 3. 지표 계산 ---
-    print("2/5: 기술적 지표 계산 중...")
+    if verbose: print("2/5: 기술적 지표 계산 중...")
     indicator_func = INDICATOR_FUNCTIONS[strategy_name]
-    df_indicators = indicator_func(df_filtered, context)
+    with profiling.span('indicators'):
+        df_indicators = indicator_func(df_filtered.copy(), context)
 
     # --- 4. 매매 신호 생성 ---
-    print("3/5: 매매 신호 생성 중...")
+    if verbose: print("3/5: 매매 신호 생성 중...")
     signal_func = SIGNAL_FUNCTIONS[strategy_name]
-    df_signals = signal_func(df_indicators, context)
+    with profiling.span('signals'):
+        df_signals = signal_func(df_indicators, context)
     if df_signals is None:
         print(f"신호 생성 실패. 백테스트를 종료합니다.")
-        return
+        return None
 
     # --- 5. 가상 매매 시뮬레이션 ---
-    print("4/5: 시뮬레이션 실행 중...")
-    portfolio_history, trade_history = engine.run_backtest(df_signals, INITIAL_CAPITAL, context)
+    if verbose: print("4/5: 시뮬레이션 실행 중...")
+    with profiling.span('engine'):
+        portfolio_history, trade_history = engine.run_backtest(df_signals, INITIAL_CAPITAL, context)
 
     # --- 6. 성과 통계 계산 ---
-    print("5/5: 성과 통계 계산 중...")
-    stats = metrics.calculate_metrics(portfolio_history, trade_history, df_signals, INITIAL_CAPITAL)
+    if verbose: print("5/5: 성과 통계 계산 중...")
+    with profiling.span('metrics'):
+        stats = metrics.calculate_metrics(portfolio_history, trade_history, df_signals, INITIAL_CAPITAL)
+
+    # (선택) 일별 수익률 부트스트랩 신뢰구간 (context['robustness_paths']개 경로, mc_* 키로 추가)
+    if context.get('robustness_paths'):
+        with profiling.span('robustness'):
+            robustness.attach_robustness(stats, robustness.daily_returns(portfolio_history),
+                                         n_paths=context['robustness_paths'],
+                                         block_size=context.get('robustness_block_size'))
+    return stats
+
+
+def run_single_backtest(context):
+    """
+    하나의 설정값(context)을 받아 백테스트를 1회 실행합니다.
+    (★) start_date, end_date가 context에 있으면 데이터를 필터링합니다.
+    """
+
+    # --- 1. 컨텍스트에서 설정값 추출 ---
+    SYMBOL_TO_TEST = context.get('symbol', 'AAPL')
+
+    strategy_name = context.get('strategy_name', 'turtle')
+    if strategy_name not in INDICATOR_FUNCTIONS or strategy_name not in SIGNAL_FUNCTIONS:
+        print(f"오류: 알 수 없는 전략 이름 '{strategy_name}'. 백테스트를 종료합니다.")
+        return
+
+    # --- [ (★) 신규: 날짜 범위 추출 ] ---
+    start_date = context.get('start_date', None)
+    end_date = context.get('end_date', None)
+
+    date_range_str = f" ({start_date} ~ {end_date})" if start_date and end_date else ""
+    print(f"--- {SYMBOL_TO_TEST} 백테스트 시작 (전략: {strategy_name}{date_range_str}) ---")
+
+    # --- 2. 데이터 준비 ---
+    print("1/5: 데이터 로드 중...")
+    with profiling.span('load'):
+        df_filtered = load_backtest_data(context)
+    if df_filtered is None:
+        return
+
+    # --- 3~6. 지표 / 신호 / 시뮬레이션 / 통계 ---
+    stats = simulate_backtest(df_filtered, context)
+    if stats is None:
+        return
 
     # --- 7. 결과 로깅 ---
     print("결과 저장 중...")
-    logger.log_backtest_result(context, stats)
+    with profiling.span('logging'):
+        logger.log_backtest_result(context, stats)
 
     # --- 8. 결과 리포트 출력 ---
     print("\n--- 백테스트 결과 ---")
@@ -121,57 +218,72 @@ def run_single_backtest(context):
     print("백테스트 완료.")
 
 
-# 이 파일(run_backtest.py)을 직접 실행했을 때:
-if __name__ == "__main__":
-    print(">>> 단일 백테스트 실행 (기본 설정값: 'turtle') <<<")
+# ---------------------------------------------
+# 배치 실행 (여러 백테스트를 한 프로세스 풀에서)
+# ---------------------------------------------
+# 종목별 데이터는 워커마다 한 번만 로드하고, 같은 종목의 여러 기간/전략/파라미터를 그 데이터로 돌립니다.
+# (run_*_test 스크립트를 하나씩 실행할 때처럼 실행마다 import / DB 조회를 반복하지 않음)
+BATCH_KEY_COLUMNS = ['symbol', 'strategy_name', 'start_date', 'end_date']
+BATCH_STAT_COLUMNS = ['total_return', 'buy_and_hold_return', 'max_drawdown', 'win_rate', 'profit_factor', 'sqn',
+                      'total_trades', 'exposure_pct']
 
-    # 1. config.py에서 기본 설정값 로드
-    # (★수정★) 모든 전략의 파라미터를 context에 포함시킴
-    default_context = {
-        # (실행 설정)
-        'strategy_name': 'turtle',  # (★) 실행할 전략 이름 (e.g., 'rsi', 'sma', 'bbands', 'macd', 'bbs', 'dema')
-        'symbol': 'AAPL',
-        'initial_capital': 10000.0,
-        'output_size': 'full',
 
-        # (리스크/엔진 설정 - 공용)
-        'risk_percent': config.RISK_PER_TRADE_PERCENT,
-        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER,
-        'atr_period': config.ATR_PERIOD,  # (공용)
+def load_symbol_data(symbol):
+    """[배치 워커] 종목의 전체 가격 데이터 (데이터가 없으면 None -> 그 종목의 작업은 모두 스킵)"""
+    df = data_manager.get_price_data(symbol)
+    return None if df is None or df.empty else df
 
-        # (터틀 설정)
-        'entry_period': config.TURTLE_ENTRY_PERIOD,
-        'exit_period': config.TURTLE_EXIT_PERIOD,
 
-        # (RSI 설정)
-        'rsi_period': config.RSI_PERIOD,
-        'rsi_oversold': config.RSI_OVERSOLD,
-        'rsi_overbought': config.RSI_OVERBOUGHT,
+def evaluate_context(df_raw, context):
+    """[배치 워커] 전체 데이터에서 context의 기간만 잘라 simulate_backtest (진행 메시지 없이)"""
+    df_filtered = df_raw.loc[context.get('start_date'):context.get('end_date')]
+    if df_filtered.empty:
+        return None
+    return simulate_backtest(df_filtered.copy(), context, verbose=False)
 
-        # (SMA 설정)
-        'sma_short_period': config.SMA_SHORT_PERIOD,
-        'sma_long_period': config.SMA_LONG_PERIOD,
 
-        # --- [ (신규) 4개 전략 설정값 추가 ] ---
+def run_batch_backtests(contexts, processes=None, log_results=False, desc="Batch backtest"):
+    """
+    context 리스트 전체를 병렬로 백테스트합니다.
 
-        # (볼린저 밴드 - 평균회귀 설정)
-        'bbands_period': config.BBANDS_PERIOD,
-        'bbands_std_dev': config.BBANDS_STD_DEV,
+    :param contexts: build_context()로 만든 context 리스트 (symbol / strategy_name 필수)
+    :param processes: 워커 수 (기본: CPU 코어 수, 1이면 현재 프로세스에서 순차 실행)
+    :param log_results: True면 결과를 run_single_backtest처럼 결과 DB(logger)에 기록 (메인 프로세스에서만)
+    :return: (results, summary) - results는 [(context, stats), ...] contexts 순서 (데이터 없음 / 실패는 제외)
+    """
+    unknown = sorted({c.get('strategy_name') for c in contexts} - set(INDICATOR_FUNCTIONS))
+    if unknown:
+        raise ValueError(f"알 수 없는 전략 이름: {unknown}")
 
-        # (MACD 설정)
-        'macd_fast_period': config.MACD_FAST_PERIOD,
-        'macd_slow_period': config.MACD_SLOW_PERIOD,
-        'macd_signal_period': config.MACD_SIGNAL_PERIOD,
+    on_result = None
+    if log_results:
+        def on_result(job, stats):
+            with profiling.span('logging'):
+                logger.log_backtest_result(job[1], stats)
 
-        # (볼린저 밴드 스퀴즈 설정)
-        'bbs_period': config.BBS_PERIOD,
-        'bbs_std_dev': config.BBS_STD_DEV,
-        'bbs_squeeze_period': config.BBS_SQUEEZE_PERIOD,
+    jobs = [(context['symbol'], context) for context in contexts]
+    results, summary = run_sweep(jobs, evaluate_context, load_symbol_data, on_result=on_result,
+                                 processes=processes, desc=desc)
+    return [(context, stats) for (_, context), stats in results], summary
 
-        # (DEMA 설정)
-        'dema_short_period': config.DEMA_SHORT_PERIOD,
-        'dema_long_period': config.DEMA_LONG_PERIOD,
-    }
 
-    # 2. 단일 백테스트 함수 호출
-    run_single_backtest(default_context)
\ No newline at end of file
+def batch_summary(results, extra_columns=()):
+    """
+    run_batch_backtests 결과 -> 실행별 한 행 DataFrame (수익률/MDD는 %, 승률은 비율)
+
+    :param extra_columns: 함께 보여줄 context 키 (예: 그리드로 바꾼 파라미터)
+    """
+    key_columns = BATCH_KEY_COLUMNS + [k for k in extra_columns if k not in BATCH_KEY_COLUMNS]
+    rows = [{**{k: context.get(k) for k in key_columns}, **{k: stats.get(k) for k in BATCH_STAT_COLUMNS}}
+            for context, stats in results]
+    return pd.DataFrame(rows, columns=key_columns + BATCH_STAT_COLUMNS)
+
+
+# 이 파일(run_backtest.py)을 직접 실행했을 때:
+if __name__ == "__main__":
+    print(">>> 단일 백테스트 실행 (기본 설정값: 'turtle') <<<")
+
+    # 1. config.py에서 기본 설정값 로드 -> 2. 단일 백테스트 함수 호출
+    # (BACKTEST_PROFILE=spans 환경변수를 주면 단계별 시간 리포트도 출력)
+    with profiling.profile_run('single_backtest'):
+        run_single_backtest(build_context())
@@ -1,7 +1,7 @@
 # [ 📄 run_bbs_test.py (신규 파일) ]
 
 import config
-from run_backtest import run_single_backtest  # 리팩토링된 단일 실행 함수 임포트
+from run_backtest import build_context, run_single_backtest  # 공용 context 조립 / 단일 실행 함수
 
 
 def main_bbs_test():
@@ -18,52 +18,8 @@ def main_bbs_test():
     print(f"대상 종목: {SYMBOL_TO_TEST}")
     print("=" * 50)
 
-    # --- 2. 전략에 필요한 모든 설정값 로드 ---
-    # (run_single_backtest가 모든 키를 필요로 하므로,
-    #  config.py의 모든 파라미터를 로드합니다)
-    context = {
-        # (실행 설정)
-        'strategy_name': STRATEGY_NAME,
-        'symbol': SYMBOL_TO_TEST,
-        'initial_capital': 10000.0,
-        'output_size': 'full',
-
-        # (리스크/엔진 설정 - 공용)
-        'risk_percent': config.RISK_PER_TRADE_PERCENT,
-        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER,
-        'atr_period': config.ATR_PERIOD, # (공용)
-
-        # (터틀 설정)
-        'entry_period': config.TURTLE_ENTRY_PERIOD,
-        'exit_period': config.TURTLE_EXIT_PERIOD,
-
-        # (RSI 설정)
-        'rsi_period': config.RSI_PERIOD,
-        'rsi_oversold': config.RSI_OVERSOLD,
-        'rsi_overbought': config.RSI_OVERBOUGHT,
-
-        # (SMA 설정)
-        'sma_short_period': config.SMA_SHORT_PERIOD,
-        'sma_long_period': config.SMA_LONG_PERIOD,
-
-        # (볼린저 밴드 - 평균회귀 설정)
-        'bbands_period': config.BBANDS_PERIOD,
-        'bbands_std_dev': config.BBANDS_STD_DEV,
-
-        # (MACD 설정)
-        'macd_fast_period': config.MACD_FAST_PERIOD,
-        'macd_slow_period': config.MACD_SLOW_PERIOD,
-        'macd_signal_period': config.MACD_SIGNAL_PERIOD,
-
-        # (볼린저 밴드 스퀴즈 설정)
-        'bbs_period': config.BBS_PERIOD,
-        'bbs_std_dev': config.BBS_STD_DEV,
-        'bbs_squeeze_period': config.BBS_SQUEEZE_PERIOD,
-
-        # (DEMA 설정)
-        'dema_short_period': config.DEMA_SHORT_PERIOD,
-        'dema_long_period': config.DEMA_LONG_PERIOD,
-    }
+    # --- 2. 전략에 필요한 모든 설정값 로드 (config.py 기본값) ---
+    context = build_context(STRATEGY_NAME, SYMBOL_TO_TEST)
 
     # --- 3. 단일 백테스트 실행 ---
     run_single_backtest(context)
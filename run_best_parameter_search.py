@@ -5,8 +5,8 @@ import data_manager
 import strategy
 import indicator
 from backtesting import engine, metrics
-from tqdm import tqdm
 import config
+from backtesting.sweep import run_sweep
 
 # ==========================================
 # 1. 실험할 파라미터 그리드 (핵심 변수)
@@ -86,14 +86,43 @@ def run_dynamic_ensemble_backtest(df, params):
     # 5. 엔진 실행
     # (리스크 관리를 위해 strategy_name='turtle'로 설정하여 ATR 손절 기능 활성화)
     context['strategy_name'] = 'turtle'
-    portfolio, trades = engine.run_backtest(df, 10000.0, context)
+    portfolio, trades = engine.run_backtest(df, 10000.0, context, stats_only=True)
 
     # 6. 결과 통계 반환
     return metrics.calculate_metrics(portfolio, trades, df, 10000.0)
 
 
 # ==========================================
-# 3. 메인 실행기
+# 3. 병렬 Sweep용 워커 함수 (모듈 최상위 함수여야 pickle 가능)
+# ==========================================
+def load_ticker_data(symbol):
+    """데이터 로드 (2018년부터 현재까지 - 충분한 기간)"""
+    df_raw = data_manager.get_price_data(symbol, start_date='2018-01-01')
+    if df_raw is None or len(df_raw) < 200: return None
+    return df_raw
+
+
+def evaluate_params(df_raw, params):
+    """한 종목 x 한 조합을 평가해 결과 행(dict)을 반환합니다."""
+    stats = run_dynamic_ensemble_backtest(df_raw.copy(), params)
+    if not stats: return None
+
+    return {
+        'Symbol': params['symbol'],
+        'Entry': params['entry_period'],
+        'Exit': params['exit_period'],
+        'Weight': params['turtle_weight'],
+        'Threshold': params['score_threshold'],
+        'Return(%)': round(stats['total_return'], 2),
+        'MDD(%)': round(stats['max_drawdown'], 2),
+        'Trades': stats['total_trades'],
+        'WinRate(%)': round(stats.get('win_rate', 0) * 100, 1),
+        'ProfitFactor': round(stats.get('profit_factor', 0), 2)
+    }
+
+
+# ==========================================
+# 4. 메인 실행기
 # ==========================================
 def main():
     print(f"🔬 [Final Optimization] 전략의 최적 변수를 찾습니다...")
@@ -105,36 +134,10 @@ def main():
     print(
         f"📊 테스트할 조합: {len(combinations)}개 x 종목 {len(TEST_TICKERS)}개 = 총 {len(combinations) * len(TEST_TICKERS)}회 시뮬레이션")
 
-    results = []
-
-    # 종목별 루프
-    for symbol in tqdm(TEST_TICKERS, desc="Processing Tickers"):
-        # 데이터 로드 (2018년부터 현재까지 - 충분한 기간)
-        df_raw = data_manager.get_price_data(symbol, start_date='2018-01-01')
-        if df_raw is None or len(df_raw) < 200: continue
-
-        # 파라미터 조합별 루프
-        for params in combinations:
-            try:
-                stats = run_dynamic_ensemble_backtest(df_raw.copy(), params)
-
-                if stats:
-                    res = {
-                        'Symbol': symbol,
-                        'Entry': params['entry_period'],
-                        'Exit': params['exit_period'],
-                        'Weight': params['turtle_weight'],
-                        'Threshold': params['score_threshold'],
-                        'Return(%)': round(stats['total_return'], 2),
-                        'MDD(%)': round(stats['max_drawdown'], 2),
-                        'Trades': stats['total_trades'],
-                        'WinRate(%)': round(stats.get('win_rate', 0) * 100, 1),
-                        'ProfitFactor': round(stats.get('profit_factor', 0), 2)
-                    }
-                    results.append(res)
-            except Exception as e:
-                # print(f"Error: {e}")
-                continue
+    # (종목, 파라미터) 작업을 프로세스 풀에 분배 (종목 데이터는 워커별로 한 번만 로드)
+    jobs = [(symbol, {**params, 'symbol': symbol}) for symbol in TEST_TICKERS for params in combinations]
+    sweep_results, _ = run_sweep(jobs, evaluate_params, load_ticker_data, desc="Processing Combos")
+    results = [res for _, res in sweep_results]
 
     # 결과 분석 및 출력
     if not results:
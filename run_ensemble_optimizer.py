@@ -1,12 +1,11 @@
 import itertools
-import pandas as pd
-import sqlite3
 from datetime import datetime
 import data_manager
 import strategy
 import indicator
 from backtesting import engine, metrics
-from tqdm import tqdm
+from backtesting.sweep import run_sweep
+from backtesting.result_sink import get_result_sink
 
 
 # [재사용 1] 파라미터 조합 생성기
@@ -18,14 +17,8 @@ def generate_param_combinations(grid):
 
 # [재사용 2] DB 저장 함수 (테이블명만 변경)
 def save_result_to_db(result_data):
-    conn = sqlite3.connect("backtest_log.db")
-    df_result = pd.DataFrame([result_data])
-    try:
-        df_result.to_sql('ensemble_optimization_log', conn, if_exists='append', index=False)
-    except Exception as e:
-        print(f"DB 저장 오류: {e}")
-    finally:
-        conn.close()
+    # 공용 Result Sink가 버퍼에 모아 배치로 INSERT (조합마다 연결/commit 하지 않음)
+    get_result_sink("backtest_log.db").write('ensemble_optimization_log', result_data)
 
 
 # [핵심] 앙상블 전용 신호 생성기 (기존 run_optimization과 다른 점)
@@ -86,12 +79,37 @@ def run_silent_ensemble_test(df, context):
 
     # 엔진 실행 (터틀 방식의 리스크 관리 사용 가정)
     context['strategy_name'] = 'turtle'
-    portfolio, trades = engine.run_backtest(df_signals, 10000.0, context)
+    portfolio, trades = engine.run_backtest(df_signals, 10000.0, context, stats_only=True)
 
     # 통계 계산
     return metrics.calculate_metrics(portfolio, trades, df_signals, 10000.0)
 
 
+# [병렬 Sweep용 워커 함수] 모듈 최상위 함수여야 워커 프로세스로 pickle 가능
+def load_ensemble_data(symbol):
+    df_raw = data_manager.get_price_data(symbol, start_date='2023-01-01')
+    if df_raw is None or len(df_raw) < 100: return None
+    return df_raw
+
+
+def evaluate_ensemble_params(df_raw, params):
+    context = {**params, 'initial_capital': 10000.0}
+
+    # 백테스트 실행
+    stats = run_silent_ensemble_test(df_raw, context)
+    if not stats: return None
+
+    return {
+        'Symbol': params['symbol'],
+        'Threshold': params['score_threshold'],
+        'Turtle_Weight': params['turtle_weight'],
+        'Trades': stats['total_trades'],
+        'Return(%)': round(stats['total_return'], 2),
+        'MDD(%)': round(stats['max_drawdown'], 2),
+        'WinRate(%)': round(stats.get('win_rate', 0) * 100, 1)
+    }
+
+
 # --- 메인 실행 ---
 if __name__ == "__main__":
 
@@ -108,27 +126,11 @@ if __name__ == "__main__":
     combinations = generate_param_combinations(PARAM_GRID)
     print(f"🔥 총 {len(combinations)}가지 조합에 대해 테스트를 시작합니다.")
 
-    for symbol in tqdm(TEST_TICKERS):
-        df_raw = data_manager.get_price_data(symbol, start_date='2023-01-01')
-        if df_raw is None or len(df_raw) < 100: continue
-
-        for params in combinations:
-            context = {**params, 'initial_capital': 10000.0}
-
-            # 백테스트 실행
-            stats = run_silent_ensemble_test(df_raw, context)
-
-            if stats:
-                # 결과 저장
-                result = {
-                    'Symbol': symbol,
-                    'Threshold': params['score_threshold'],
-                    'Turtle_Weight': params['turtle_weight'],
-                    'Trades': stats['total_trades'],
-                    'Return(%)': round(stats['total_return'], 2),
-                    'MDD(%)': round(stats['max_drawdown'], 2),
-                    'WinRate(%)': round(stats.get('win_rate', 0) * 100, 1)
-                }
-                save_result_to_db(result)
-
-    print("\n✅ 실험 완료! 'backtest_log.db'의 'ensemble_optimization_log' 테이블을 확인하세요.")
\ No newline at end of file
+    # 3. (종목, 파라미터) 작업을 병렬 실행
+    # 결과 저장은 메인 프로세스에서만 수행 (on_result) -> DB lock 경합 없음
+    jobs = [(symbol, {**params, 'symbol': symbol}) for symbol in TEST_TICKERS for params in combinations]
+    run_sweep(jobs, evaluate_ensemble_params, load_ensemble_data,
+              on_result=lambda job, result: save_result_to_db(result), desc="Ensemble Sweep")
+    get_result_sink("backtest_log.db").flush()
+
+    print("\n✅ 실험 완료! 'backtest_log.db'의 'ensemble_optimization_log' 테이블을 확인하세요.")
@@ -4,7 +4,6 @@ import data_manager
 import strategy
 import indicator
 from backtesting import engine, metrics
-from tqdm import tqdm
 import config
 
 # ==========================================
@@ -33,14 +32,7 @@ def calculate_max_drawdown(value_series):
     자산 가치 시리즈(Series)를 받아 MDD(%)를 계산합니다.
     """
     if len(value_series) < 1: return 0.0
-
-    # 누적 최대값 (Peak)
-    running_max = value_series.cummax()
-    # 낙폭 (Drawdown)
-    drawdown = (value_series - running_max) / running_max
-    # 최대 낙폭 (MDD)
-    mdd = drawdown.min() * 100  # 퍼센트로 변환
-    return round(mdd, 2)
+    return round(float(metrics.max_drawdown(np.asarray(value_series, dtype=np.float64))), 2)
 
 
 # ==========================================
@@ -52,10 +44,10 @@ def calculate_buy_and_hold_stats(df, initial_capital):
     if df.empty: return 0.0, 0.0
 
     # 자산 가치 변화 = (주가 / 시작주가) * 원금
-    asset_values = (df['close'] / df['close'].iloc[0]) * initial_capital
+    asset_values = metrics.buy_and_hold(df['close'].to_numpy(dtype=np.float64), initial_capital)
 
     # 수익률
-    total_return = ((asset_values.iloc[-1] - initial_capital) / initial_capital) * 100
+    total_return = (asset_values[-1] / initial_capital - 1) * 100
 
     # MDD
     mdd = calculate_max_drawdown(asset_values)
@@ -64,51 +56,14 @@ def calculate_buy_and_hold_stats(df, initial_capital):
 
 
 def calculate_dca_stats(df, monthly_amount=1000):
-    """월 적립식(DCA)의 수익률과 MDD 계산"""
+    """월 적립식(DCA)의 수익률과 MDD 계산 (매월 첫 거래일 매수, metrics.dca_stats)"""
     if df.empty: return 0.0, 0.0
 
-    df = df.copy()
-    df['year_month'] = df.index.to_period('M')
-
-    total_invested = 0
-    total_shares = 0
-
-    # 날짜별 포트폴리오 가치를 저장할 리스트
-    portfolio_values = []
-
-    # 월별 첫 거래일 찾기 (매수일)
-    # 경고 해결: include_groups=False 옵션 추가
-    buy_dates = df.groupby('year_month').apply(lambda x: x.index[0], include_groups=False)
-    buy_dates_set = set(buy_dates)
-
-    for date, row in df.iterrows():
-        # 매수일이면 주식 추가
-        if date in buy_dates_set:
-            shares_bought = monthly_amount / row['close']
-            total_shares += shares_bought
-            total_invested += monthly_amount
-
-        # 매일매일의 평가금액 기록 (보유주식수 * 현재가)
-        # 아직 투자가 시작 안 된 날은 0
-        current_value = total_shares * row['close']
-        if total_invested > 0:
-            portfolio_values.append(current_value)
-        else:
-            portfolio_values.append(0)
-
-    # Series로 변환
-    value_series = pd.Series(portfolio_values)
-
-    # 수익률 계산 (총평가액 - 총투자금) / 총투자금
-    final_value = value_series.iloc[-1]
+    total_return, mdd, total_invested = metrics.dca_stats(df['close'].to_numpy(dtype=np.float64), df.index,
+                                                          monthly_amount)
     if total_invested == 0: return 0.0, 0.0
 
-    total_return = ((final_value - total_invested) / total_invested) * 100
-
-    # MDD 계산
-    mdd = calculate_max_drawdown(value_series)
-
-    return total_return, mdd
+    return total_return, round(float(mdd), 2)
 
 
 def run_ensemble_strategy(df, params):
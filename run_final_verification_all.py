@@ -5,7 +5,7 @@ import data_manager
 import strategy
 import indicator
 from backtesting import engine, metrics
-from tqdm import tqdm
+from backtesting.universe_scan import scan_universe
 import config
 from datetime import datetime
 
@@ -33,49 +33,24 @@ TABLE_NAME = "final_verification_results"
 # ==========================================
 def calculate_max_drawdown(value_series):
     if len(value_series) < 1: return 0.0
-    running_max = value_series.cummax()
-    drawdown = (value_series - running_max) / running_max
-    mdd = drawdown.min() * 100
-    return round(mdd, 2)
+    return round(float(metrics.max_drawdown(np.asarray(value_series, dtype=np.float64))), 2)
 
 
 def calculate_buy_and_hold_stats(df, initial_capital):
     if df.empty: return 0.0, 0.0
-    asset_values = (df['close'] / df['close'].iloc[0]) * initial_capital
-    total_return = ((asset_values.iloc[-1] - initial_capital) / initial_capital) * 100
+    asset_values = metrics.buy_and_hold(df['close'].to_numpy(dtype=np.float64), initial_capital)
+    total_return = (asset_values[-1] / initial_capital - 1) * 100
     mdd = calculate_max_drawdown(asset_values)
     return total_return, mdd
 
 
 def calculate_dca_stats(df, monthly_amount=1000):
     if df.empty: return 0.0, 0.0
-    df = df.copy()
-    df['year_month'] = df.index.to_period('M')
-
-    # [유지] 경고 메시지 해결 옵션
-    buy_dates = df.groupby('year_month').apply(lambda x: x.index[0], include_groups=False)
-    buy_dates_set = set(buy_dates)
-
-    total_invested = 0
-    total_shares = 0
-    portfolio_values = []
-
-    for date, row in df.iterrows():
-        if date in buy_dates_set:
-            shares_bought = monthly_amount / row['close']
-            total_shares += shares_bought
-            total_invested += monthly_amount
-
-        current_value = total_shares * row['close']
-        portfolio_values.append(current_value if total_invested > 0 else 0)
-
-    value_series = pd.Series(portfolio_values)
+    # 매월 첫 거래일 매수 (벡터 연산, metrics.dca_stats)
+    total_return, mdd, total_invested = metrics.dca_stats(df['close'].to_numpy(dtype=np.float64), df.index,
+                                                          monthly_amount)
     if total_invested == 0: return 0.0, 0.0
-
-    final_value = value_series.iloc[-1]
-    total_return = ((final_value - total_invested) / total_invested) * 100
-    mdd = calculate_max_drawdown(value_series)
-    return total_return, mdd
+    return total_return, round(float(mdd), 2)
 
 
 def run_ensemble_strategy(df, params):
@@ -126,68 +101,71 @@ def run_ensemble_strategy(df, params):
     return stats
 
 
+def verify_symbol(symbol):
+    """[스캔 워커] 종목 하나를 전략 / B&H / DCA로 검증한 결과 행 (데이터 부족이면 None)"""
+    # 2018년부터 검증
+    df = data_manager.get_price_data(symbol, start_date='2018-01-01')
+    if df is None or len(df) < 250: return None
+
+    # 1. 전략 실행
+    strat_stats = run_ensemble_strategy(df.copy(), FINAL_PARAMS)
+    if strat_stats is None: return None
+
+    # 2. B&H 계산
+    bh_ret, bh_mdd = calculate_buy_and_hold_stats(df.copy(), FINAL_PARAMS['initial_capital'])
+
+    # 3. DCA 계산
+    dca_ret, dca_mdd = calculate_dca_stats(df.copy())
+
+    # 승리 여부 판단
+    is_win = False
+    win_type = "Lose"
+
+    strat_ret = strat_stats['total_return']
+    strat_mdd = strat_stats['max_drawdown']
+
+    if strat_ret > bh_ret:
+        win_type = "Alpha"
+        is_win = True
+    elif strat_mdd > (bh_mdd * 0.5) and strat_ret > 0:
+        # MDD가 B&H의 절반 수준(예: -10% > -30% * 0.5)으로 방어력이 좋고 수익이 난 경우
+        # (주의: MDD는 음수이므로 클수록(-5 > -30) 좋은 것임)
+        win_type = "Defense"
+        is_win = True
+
+    return {
+        'Symbol': symbol,
+        'Strat_Ret': round(strat_ret, 2),
+        'Strat_MDD': round(strat_mdd, 2),
+        'BH_Ret': round(bh_ret, 2),
+        'BH_MDD': round(bh_mdd, 2),
+        'DCA_Ret': round(dca_ret, 2),
+        'Trades': strat_stats['total_trades'],
+        'Win_Type': win_type,
+        'Run_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # 실행 시간 기록
+    }
+
+
 # ==========================================
 # 3. 메인 실행 (전 종목 스캔)
 # ==========================================
-def main():
+def main(tickers=None):
+    """:param tickers: 검증할 종목 (기본: DB의 전체 종목)"""
     print(f"🌎 [Global Verification] S&P500 전 종목 검증 시작")
     print(
         f"   - 설정: Entry {FINAL_PARAMS['entry_period']} / Exit {FINAL_PARAMS['exit_period']} / Threshold {FINAL_PARAMS['score_threshold']}")
     print("-" * 60)
 
-    tickers = data_manager.get_ticker_list()
+    tickers = tickers or data_manager.get_ticker_list()
     # tickers = tickers[:10] # 테스트용 (필요 시 주석 해제)
 
     print(f"📊 총 {len(tickers)}개 종목 데이터를 로드하고 분석합니다...")
 
-    results = []
-
-    for symbol in tqdm(tickers):
-        try:
-            # 2018년부터 검증
-            df = data_manager.get_price_data(symbol, start_date='2018-01-01')
-            if df is None or len(df) < 250: continue
-
-            # 1. 전략 실행
-            strat_stats = run_ensemble_strategy(df.copy(), FINAL_PARAMS)
-            if strat_stats is None: continue
-
-            # 2. B&H 계산
-            bh_ret, bh_mdd = calculate_buy_and_hold_stats(df.copy(), FINAL_PARAMS['initial_capital'])
-
-            # 3. DCA 계산
-            dca_ret, dca_mdd = calculate_dca_stats(df.copy())
-
-            # 승리 여부 판단
-            is_win = False
-            win_type = "Lose"
-
-            strat_ret = strat_stats['total_return']
-            strat_mdd = strat_stats['max_drawdown']
-
-            if strat_ret > bh_ret:
-                win_type = "Alpha"
-                is_win = True
-            elif strat_mdd > (bh_mdd * 0.5) and strat_ret > 0:
-                # MDD가 B&H의 절반 수준(예: -10% > -30% * 0.5)으로 방어력이 좋고 수익이 난 경우
-                # (주의: MDD는 음수이므로 클수록(-5 > -30) 좋은 것임)
-                win_type = "Defense"
-                is_win = True
-
-            results.append({
-                'Symbol': symbol,
-                'Strat_Ret': round(strat_ret, 2),
-                'Strat_MDD': round(strat_mdd, 2),
-                'BH_Ret': round(bh_ret, 2),
-                'BH_MDD': round(bh_mdd, 2),
-                'DCA_Ret': round(dca_ret, 2),
-                'Trades': strat_stats['total_trades'],
-                'Win_Type': win_type,
-                'Run_Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')  # 실행 시간 기록
-            })
-
-        except Exception as e:
-            continue
+    # 종목별 검증은 프로세스 풀에서 병렬 실행 (실패 종목은 사유와 함께 수집)
+    scanned, errors, _ = scan_universe(tickers, verify_symbol, desc="Verification")
+    results = [row for _, row in scanned]
+    if errors:
+        print(f"⚠️ 검증 실패 {len(errors)}개 종목: {', '.join(list(errors)[:10])}")
 
     # ==========================================
     # 4. 결과 저장 (SQLite)
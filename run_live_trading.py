@@ -1,13 +1,17 @@
 # run_live_trading.py (실전 알림 봇)
 
 import pandas as pd
+import numpy as np
 import json
 import os
-import requests
 import data_manager
 import indicator
 import strategy
 from datetime import datetime, timedelta
+from backtesting.universe_scan import scan_universe
+from lazy_imports import lazy_module
+
+requests = lazy_module('requests')  # 텔레그램 전송 시에만 import
 
 # ==========================================
 # ⚙️ 실전 봇 설정 (LIVE_CONFIG)
@@ -41,6 +45,11 @@ LIVE_CONFIG = {
 # 보유 종목 파일 경로 (현재 내가 가진 주식 목록)
 PORTFOLIO_FILE = 'my_portfolio.json'
 
+# 종목 분석 설정
+LOOKBACK_DAYS = 365  # 최근 N일 데이터만 사용
+MIN_BARS = 60  # 이보다 데이터가 짧은 종목은 분석하지 않음
+ENSEMBLE_WEIGHTS = {'turtle': 2.0, 'rsi': 1.0, 'sma': 1.0, 'bbands': 1.0, 'macd': 1.0, 'bbs': 1.5, 'dema': 1.0}
+
 
 # ==========================================
 # 🛠️ 헬퍼 함수: 텔레그램 전송 & 포트폴리오 관리
@@ -83,70 +92,144 @@ def load_portfolio():
 # ==========================================
 # 🧠 핵심 로직: 종목 분석 (Analyze)
 # ==========================================
-def analyze_ticker(ticker):
-    """개별 종목의 데이터를 가져와 매수/매도 신호를 분석합니다."""
-    try:
-        # [수정 전] 전체 데이터 로드 (느림)
-        # df = data_manager.get_price_data(ticker)
-
-        # [수정 후] 최근 365일 데이터만 로드 (빠름)
-        start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-        df = data_manager.get_price_data(ticker, start_date=start_date)
-
-        if df is None or len(df) < 60: return None
-
-        # 지표 계산
-        context = LIVE_CONFIG.copy()
-        context['symbol'] = ticker
-
-        df = indicator.add_turtle_indicators(df, context)
-        df = indicator.add_atr_indicators(df, context)
-        df = indicator.add_rsi_indicators(df, context)
-        df = indicator.add_sma_indicators(df, context)
-        df = indicator.add_bollinger_band_indicators(df, context)
-        df = indicator.add_macd_indicators(df, context)
-        df = indicator.add_bbs_indicators(df, context)
-        df = indicator.add_dema_indicators(df, context)
-
-        df = strategy.apply_ensemble_strategy(df, context)
-
-        # 점수 계산
-        weights = {'turtle': 2.0, 'rsi': 1.0, 'sma': 1.0, 'bbands': 1.0, 'macd': 1.0, 'bbs': 1.5, 'dema': 1.0}
-        current_score = 0
-        latest = df.iloc[-1]  # 가장 최근 데이터(오늘 종가)
-
-        for name, weight in weights.items():
-            if f'signal_{name}' in df.columns:
-                if latest[f'signal_{name}'] == 1:
-                    current_score += weight
-
-        # 신호 판단 (어제 종가 대비 오늘 위치)
-        # Entry: 점수 만족 & 오늘 종가가 20일 고가 돌파 상태
-        # Exit: 오늘 종가가 20일 저가 이탈 상태
-
-        # entry_high는 shift(1) 되어 있으므로 '어제까지의 20일 고가'임.
-        buy_signal = (current_score >= context['score_threshold']) and (latest['close'] > latest['entry_high'])
-        sell_signal = latest['close'] < latest['exit_low']
-
-        return {
-            'symbol': ticker,
-            'close': latest['close'],
-            'atr': latest['atr'],
-            'score': current_score,
-            'buy_signal': buy_signal,
-            'sell_signal': sell_signal,
-            'vol_ratio': latest['volume'] / df['volume'].rolling(20).mean().iloc[-1] if len(df) > 20 else 1.0
-        }
+def add_live_indicators(df, ticker):
+    """실전 봇이 쓰는 지표를 모두 계산합니다. (analyze_ticker / analyze_universe 공용) -> (df, context)"""
+    context = LIVE_CONFIG.copy()
+    context['symbol'] = ticker
+
+    df = indicator.add_turtle_indicators(df, context)
+    df = indicator.add_atr_indicators(df, context)
+    df = indicator.add_rsi_indicators(df, context)
+    df = indicator.add_sma_indicators(df, context)
+    df = indicator.add_bollinger_band_indicators(df, context)
+    df = indicator.add_macd_indicators(df, context)
+    df = indicator.add_bbs_indicators(df, context)
+    df = indicator.add_dema_indicators(df, context)
+    return df, context
 
-    except Exception as e:
-        # print(f"Error analysing {ticker}: {e}")
-        return None
+
+def analyze_ticker(ticker):
+    """
+    개별 종목의 데이터를 가져와 매수/매도 신호를 분석합니다.
+    (universe_scan 워커에서 실행 - 예외는 스캔 실행기가 종목별로 수집하므로 여기서 삼키지 않음)
+    """
+    # [수정 전] 전체 데이터 로드 (느림)
+    # df = data_manager.get_price_data(ticker)
+
+    # [수정 후] 최근 365일 데이터만 로드 (빠름)
+    start_date = (datetime.now() - timedelta(days=LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+    df = data_manager.get_price_data(ticker, start_date=start_date)
+
+    if df is None or len(df) < MIN_BARS: return None
+
+    # 지표 계산
+    df, context = add_live_indicators(df, ticker)
+
+    df = strategy.apply_ensemble_strategy(df, context)
+
+    # 점수 계산
+    current_score = 0
+    latest = df.iloc[-1]  # 가장 최근 데이터(오늘 종가)
+
+    for name, weight in ENSEMBLE_WEIGHTS.items():
+        if f'signal_{name}' in df.columns:
+            if latest[f'signal_{name}'] == 1:
+                current_score += weight
+
+    # 신호 판단 (어제 종가 대비 오늘 위치)
+    # Entry: 점수 만족 & 오늘 종가가 20일 고가 돌파 상태
+    # Exit: 오늘 종가가 20일 저가 이탈 상태
+
+    # entry_high는 shift(1) 되어 있으므로 '어제까지의 20일 고가'임.
+    buy_signal = (current_score >= context['score_threshold']) and (latest['close'] > latest['entry_high'])
+    sell_signal = latest['close'] < latest['exit_low']
+
+    return {
+        'symbol': ticker,
+        'close': latest['close'],
+        'atr': latest['atr'],
+        'score': current_score,
+        'buy_signal': buy_signal,
+        'sell_signal': sell_signal,
+        'vol_ratio': latest['volume'] / df['volume'].rolling(20).mean().iloc[-1] if len(df) > 20 else 1.0
+    }
+
+
+def load_live_window(tickers):
+    """최근 LOOKBACK_DAYS일 데이터를 전 종목 한 번의 쿼리로 읽어 {종목: DataFrame}으로 나눕니다."""
+    start_date = (datetime.now() - timedelta(days=LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+    df_all = data_manager.get_all_price_data_bulk(start_date=start_date)
+    if df_all.empty: return {}
+
+    df_all = df_all[df_all['symbol'].isin(set(tickers))].sort_values(['symbol', 'date'], kind='stable')
+    return {symbol: group.drop(columns='symbol').set_index('date')
+            for symbol, group in df_all.groupby('symbol', sort=False)}
+
+
+def analyze_universe(tickers):
+    """
+    [일괄 분석] analyze_ticker를 종목마다 돌린 것과 같은 결과를 빠르게 만듭니다.
+    1) 최근 1년치를 한 번의 쿼리로 로드 (종목별 쿼리 / 연결 없음)
+    2) 지표는 종목별로 indicator.py 그대로 계산 (pandas_ta 백엔드에 따라 값이 달라지지 않도록)
+    3) 전략 신호(상태 머신)와 마지막 bar 매수/매도 판단은 패널(날짜 x 종목) 연산으로 한 번에
+
+    :return: (results, errors) - results는 tickers 순서의 analyze_ticker 결과 리스트, errors는 {종목: 사유}
+    """
+    frames = load_live_window(tickers)
+
+    symbols, prepared, vol_ratios, errors = [], [], [], {}
+    for ticker in tickers:
+        df = frames.get(ticker)
+        if df is None or len(df) < MIN_BARS: continue
+        try:
+            df, _ = add_live_indicators(df, ticker)
+        except Exception as e:
+            errors[ticker] = f"{type(e).__name__}: {e}"
+            continue
+        if df is None: continue
+        symbols.append(ticker)
+        prepared.append(df)
+        vol_ratios.append(df['volume'].iloc[-1] / df['volume'].rolling(20).mean().iloc[-1] if len(df) > 20 else 1.0)
+
+    if not prepared: return [], errors
+
+    columns = ['open', 'high', 'low', 'close', 'volume', 'atr', 'entry_high', 'exit_low', 'rsi', 'sma_short',
+               'sma_long', 'bbl', 'bbm', 'bbu', 'bbw', 'bbw_min_low', 'macd', 'macd_signal', 'dema_short', 'dema_long']
+    panel, first_row, present = strategy.build_signal_panel(prepared, columns)
+    signals = strategy.panel_last_signals(panel, first_row, LIVE_CONFIG, strategies=list(ENSEMBLE_WEIGHTS),
+                                          present=present)
+
+    # 점수 (analyze_ticker와 같은 순서로 가중치 누적)
+    score = np.zeros(len(symbols))
+    for name, weight in ENSEMBLE_WEIGHTS.items():
+        if name in signals:
+            score += np.where(signals[name] == 1, weight, 0.0)
+
+    # 마지막 bar 판단 (오른쪽 정렬 패널이므로 마지막 행 = 종목별 최신 bar)
+    close, entry_high, exit_low = panel['close'][-1], panel['entry_high'][-1], panel['exit_low'][-1]
+    buy_signal = (score >= LIVE_CONFIG['score_threshold']) & (close > entry_high)
+    sell_signal = close < exit_low
+
+    results = [{
+        'symbol': symbol,
+        'close': close[j],
+        'atr': panel['atr'][-1, j],
+        'score': score[j],
+        'buy_signal': buy_signal[j],
+        'sell_signal': sell_signal[j],
+        'vol_ratio': vol_ratios[j]
+    } for j, symbol in enumerate(symbols)]
+    return results, errors
 
 
 # ==========================================
 # 🚀 메인 실행: 데일리 스캔
 # ==========================================
-def run_daily_scan():
+def run_daily_scan(bulk=True):
+    """
+    :param bulk: True면 일괄 분석(analyze_universe - 쿼리 1회 + 패널 연산),
+                 False면 종목별 analyze_ticker를 universe_scan으로 병렬 실행
+    """
     print("🔍 [Live Trading Bot] 시장 분석을 시작합니다...")
 
     # 1. 내 포트폴리오 로드
@@ -160,11 +243,16 @@ def run_daily_scan():
     sell_candidates = []
     buy_candidates = []
 
-    # 3. 전체 종목 스캔
-    for ticker in tickers:
-        result = analyze_ticker(ticker)
-        if not result: continue
+    # 3. 전체 종목 스캔 (결과는 종목 리스트 순서)
+    if bulk:
+        results, errors = analyze_universe(tickers)
+        results = [(result['symbol'], result) for result in results]
+    else:
+        results, errors, _ = scan_universe(tickers, analyze_ticker, desc="Daily scan")
+    if errors:
+        print(f"⚠️ 분석 실패 {len(errors)}개 종목: {', '.join(list(errors)[:10])}")
 
+    for ticker, result in results:
         # 보유 중인 종목 -> 매도 검사
         if ticker in my_holdings:
             if result['sell_signal']:
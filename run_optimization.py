@@ -1,15 +1,18 @@
 import itertools
-import pandas as pd
+from functools import partial
 import csv
 import os
-import sqlite3
 from datetime import datetime
 import config
 import data_manager
 import indicator
 import strategy
 from market_analyzer import analyze_market_status
-from backtesting import engine, metrics
+from backtesting import engine, metrics, profiling
+from backtesting.pruning import make_pruner
+from backtesting.result_sink import get_result_sink
+from backtesting.sweep import run_sweep
+from backtesting.search import run_search
 
 # --- 전략 매핑 ---
 INDICATOR_FUNCTIONS = {
@@ -43,176 +46,246 @@ def generate_param_combinations(grid):
     return combinations
 
 
-def _run_silent_backtest(df_target, context):
+def _run_silent_backtest(df_target, context, pruner=None):
     """
     로그 출력 없이 백테스트를 수행하고 결과(stats)만 반환하는 내부 함수
+    :param pruner: (선택) Pruner - 주어지면 stats에 pruned / prune_reason이 추가됨
     """
     strategy_name = context.get('strategy_name')
 
     # 1. 지표 계산
     indicator_func = INDICATOR_FUNCTIONS[strategy_name]
-    df_indicators = indicator_func(df_target.copy(), context)
+    with profiling.span('indicators'):
+        df_indicators = indicator_func(df_target.copy(), context)
     if df_indicators is None: return None
 
     # 2. 신호 생성
     signal_func = SIGNAL_FUNCTIONS[strategy_name]
-    df_signals = signal_func(df_indicators, context)
+    with profiling.span('signals'):
+        df_signals = signal_func(df_indicators, context)
     if df_signals is None: return None
 
     # 3. 엔진 실행
     initial_capital = context.get('initial_capital', 10000.0)
-    portfolio_history, trade_history = engine.run_backtest(df_signals, initial_capital, context)
+    with profiling.span('engine'):
+        portfolio_history, trade_history = engine.run_backtest(df_signals, initial_capital, context, pruner=pruner,
+                                                               stats_only=True)
 
     # 4. 통계 계산
-    stats = metrics.calculate_metrics(portfolio_history, trade_history, df_signals, initial_capital)
+    with profiling.span('metrics'):
+        stats = metrics.calculate_metrics(portfolio_history, trade_history, df_signals, initial_capital)
+    if pruner is not None:
+        stats['prune_reason'] = portfolio_history.attrs.get('prune_reason')
+        stats['pruned'] = stats['prune_reason'] is not None
     return stats
 
 
-def save_optimization_result(result_data):
-    """
-    결과 딕셔너리(result_data)를 DataFrame으로 변환 후,
-    SQLite DB의 'optimization_log' 테이블에 저장합니다.
+def _run_budgeted_backtest(df_target, context, prune=False):
     """
-    # 1. 딕셔너리를 리스트로 감싸서 DataFrame 생성
-    df_result = pd.DataFrame([result_data])
-
-    # 2. DB 연결
-    conn = sqlite3.connect(config.BACKTEST_DB_NAME)
+    [Successive Halving용] context의 history_fraction(0~1)만큼 최근 구간만 잘라서 백테스트합니다.
+    (history_fraction이 없으면 전체 구간 = 기존 _run_silent_backtest와 동일)
 
-    try:
-        # 3. DB에 저장 (append 모드)
-        df_result.to_sql('optimization_log', conn, if_exists='append', index=False)
-        print(f"   💾 결과가 DB('{config.BACKTEST_DB_NAME}')에 저장되었습니다.")
+    :param prune: True면 config.py의 PRUNE_* 규칙으로 가망 없는 조합을 도중에 중단
+    """
+    context = dict(context)
+    fraction = context.pop('history_fraction', 1.0)
+    if fraction < 1.0:
+        df_target = df_target.iloc[-max(30, int(len(df_target) * fraction)):]
+    return _run_silent_backtest(df_target, context, pruner=make_pruner() if prune else None)
 
-    except Exception as e:
-        print(f"   ⚠️ DB 저장 중 오류 발생: {e}")
 
-    finally:
-        conn.close()
+def save_optimization_result(result_data):
+    """
+    결과 딕셔너리(result_data)를 SQLite DB의 'optimization_log' 테이블에 저장합니다.
+    (공용 Result Sink가 버퍼에 모아 배치로 INSERT, 새 컬럼은 자동 추가)
+    """
+    get_result_sink(config.BACKTEST_DB_NAME).write('optimization_log', result_data)
+    print(f"   💾 결과를 DB('{config.BACKTEST_DB_NAME}')에 기록합니다.")
 
 
-def run_optimization(strategy_name, target_regime, target_symbol='SPY'):
+def load_regime_data(data_key):
     """
-    특정 종목(target_symbol) + 시장(target_regime) + 전략(strategy_name) 조합을 최적화합니다.
+    [Sweep 데이터 로더] (종목, 시장 상태, 'in'|'out') -> 해당 구간 + 시장 상태의 데이터
+    각 워커 프로세스에서 key별로 한 번만 호출됩니다.
     """
-
-    print(f"\n🚀 [최적화 시작] 종목: {target_symbol} | 전략: {strategy_name} | 시장: {target_regime}")
+    target_symbol, target_regime, split = data_key
 
     # 1. 데이터 로드
     df_raw = data_manager.get_stock_data(target_symbol, output_size='full')
-
     if df_raw is None or df_raw.empty:
-        print(f"   ❌ 오류: {target_symbol} 데이터를 불러올 수 없습니다.")
-        return
+        return None
 
     # 시장 상태 분석
     df_regime = analyze_market_status(df_raw)
 
     # 2. 데이터 분할
-    in_sample_mask = (df_regime.index >= config.IN_SAMPLE_START) & (df_regime.index <= config.IN_SAMPLE_END)
-    out_sample_mask = (df_regime.index >= config.OUT_OF_SAMPLE_START) & (df_regime.index <= config.OUT_OF_SAMPLE_END)
+    if split == 'in':
+        period_mask = (df_regime.index >= config.IN_SAMPLE_START) & (df_regime.index <= config.IN_SAMPLE_END)
+    else:
+        period_mask = (df_regime.index >= config.OUT_OF_SAMPLE_START) & (df_regime.index <= config.OUT_OF_SAMPLE_END)
 
     regime_mask = df_regime['market_regime'] == target_regime
+    df_split = df_regime[period_mask & regime_mask].copy()
+
+    # 훈련 데이터 부족 시 해당 실험 전체 스킵
+    if split == 'in' and len(df_split) < 30:
+        return None
+    return df_split
 
-    df_in = df_regime[in_sample_mask & regime_mask].copy()
-    df_out = df_regime[out_sample_mask & regime_mask].copy()
 
+def _build_result_row(target_symbol, target_regime, strategy_name, best_params, best_stats, oos_stats,
+                      pruned_count=0):
+    """
+    In/Out-of-Sample 결과를 DB 저장용 한 줄로 정리합니다.
+    :param pruned_count: In-Sample에서 가지치기로 조기 중단된 조합 수
+    """
     in_period_str = f"{config.IN_SAMPLE_START}~{config.IN_SAMPLE_END}"
     out_period_str = f"{config.OUT_OF_SAMPLE_START}~{config.OUT_OF_SAMPLE_END}"
 
-    print(f"   - 훈련 데이터(In): {len(df_in)}일")
-    print(f"   - 검증 데이터(Out): {len(df_out)}일")
-
-    if len(df_in) < 30:
-        print("   ⚠️ 훈련 데이터 부족으로 스킵.")
-        return
+    # --- [ 데이터 기록 강화 ] ---
+    # metrics.py에서 계산된 값들을 가져옵니다.
+    return {
+        'Run_Time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Symbol': target_symbol,
+        'Target_Regime': target_regime,
+        'Strategy': strategy_name,
+        'Best_Params': str(best_params),
+
+        # --- In-Sample (훈련) ---
+        'In_Period': in_period_str,
+        'In_Return(%)': round(best_stats['total_return'], 2),
+        'In_WinRate(%)': round(best_stats.get('win_rate', 0) * 100, 1),
+        'In_ProfitFactor': round(best_stats.get('profit_factor', 0), 2),
+        'In_SQN': round(best_stats.get('sqn', 0), 2),  # [추가]
+        'In_Exposure(%)': round(best_stats.get('exposure_pct', 0), 1),  # [추가]
+        'In_Trades': best_stats['total_trades'],
+        'In_Pruned': pruned_count,
+
+        # --- Out-of-Sample (검증) ---
+        'Out_Period': out_period_str,
+        'Out_Return(%)': round(oos_stats['total_return'], 2),
+        'Out_BH_Return(%)': round(oos_stats['buy_and_hold_return'], 2),
+        'Out_WinRate(%)': round(oos_stats.get('win_rate', 0) * 100, 1),
+        'Out_ProfitFactor': round(oos_stats.get('profit_factor', 0), 2),
+        'Out_SQN': round(oos_stats.get('sqn', 0), 2),  # [추가]
+        'Out_Exposure(%)': round(oos_stats.get('exposure_pct', 0), 1),  # [추가]
+        'Out_Trades': oos_stats['total_trades'],
+        'Out_MDD(%)': round(oos_stats['max_drawdown'], 2),
+    }
 
-    # 3. 그리드 서치
-    param_grid = config.STRATEGY_GRID_MAP.get(strategy_name)
-    if not param_grid:
-        print(f"   ❌ 설정 오류: {strategy_name} 파라미터 그리드 없음.")
-        return
 
-    combinations = generate_param_combinations(param_grid)
+def run_batch_optimization(target_regimes, target_strategies, target_symbols, processes=None, search_mode='grid',
+                           prune=True):
+    """
+    (시장 x 종목 x 전략) 전체 실험을 한 번의 병렬 Sweep으로 최적화합니다.
+    1) 모든 In-Sample 조합을 프로세스 풀에서 평가
+       - search_mode='grid': 전수 조사
+       - search_mode='halving' / 'hyperband': In-Sample 기간의 일부(최근 1/9 -> 1/3 -> 전체)로 먼저 평가하고
+         실험별 상위 조합만 더 긴 구간으로 승격 (평가 횟수 대폭 감소)
+       - prune=True: MDD가 너무 크거나 거래가 없는 조합은 시뮬레이션 도중 중단 (최고 조합 후보에서 제외)
+    2) 실험별 최고 파라미터로 Out-of-Sample 검증 (역시 병렬, 가지치기 없이 끝까지)
+    3) DB 저장은 메인 프로세스에서만 수행 (단일 writer)
+    """
+    # 3. 그리드 서치 작업 생성
+    jobs = []
+    for target_regime in target_regimes:
+        for target_symbol in target_symbols:
+            for strategy_name in target_strategies:
+                param_grid = config.STRATEGY_GRID_MAP.get(strategy_name)
+                if not param_grid:
+                    print(f"   ❌ 설정 오류: {strategy_name} 파라미터 그리드 없음.")
+                    continue
 
-    best_score = -999
-    best_params = None
-    best_stats = None
+                for params in generate_param_combinations(param_grid):
+                    context = {
+                        'strategy_name': strategy_name,
+                        'initial_capital': 10000.0,
+                        'risk_percent': config.RISK_PER_TRADE_PERCENT,
+                        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER,
+                        'atr_period': config.ATR_PERIOD,
+                        **params
+                    }
+                    jobs.append(((target_symbol, target_regime, 'in'), context))
 
     # In-Sample 테스트
-    for params in combinations:
-        context = {
-            'strategy_name': strategy_name,
-            'initial_capital': 10000.0,
-            'risk_percent': config.RISK_PER_TRADE_PERCENT,
-            'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER,
-            'atr_period': config.ATR_PERIOD,
-            **params
-        }
-
-        stats = _run_silent_backtest(df_in, context)
-
-        if stats:
-            score = stats['total_return']  # 평가 기준: 수익률
-
-            if score > best_score:
-                best_score = score
-                best_params = params
-                best_stats = stats
-
-    if best_stats is None:
+    experiment_of = lambda job: (job[0][0], job[0][1], job[1]['strategy_name'])
+    pruned_counts = {}  # 실험별 가지치기된 조합 수
+
+    def evaluate_batch(batch, budget):
+        batch_jobs = [(data_key, dict(context, history_fraction=budget) if budget < 1.0 else context)
+                      for data_key, context in batch]
+        sweep_results, _ = run_sweep(batch_jobs, partial(_run_budgeted_backtest, prune=prune), load_regime_data,
+                                     processes=processes, desc=f"In-Sample {budget:.0%}", with_index=True)
+        # batch 안의 번호로 결과 자리를 맞춤 (결과 없음 / 실패는 None)
+        outputs = [None] * len(batch_jobs)
+        for i, job, stats in sweep_results:
+            outputs[i] = stats
+            if stats.get('pruned'):
+                pruned_counts[experiment_of(job)] = pruned_counts.get(experiment_of(job), 0) + 1
+        return outputs
+
+    # 가지치기된 조합은 점수 None -> 승격/선택 대상에서 제외
+    results, _ = run_search(search_mode, jobs, evaluate_batch,
+                            score=lambda stats: None if stats.get('pruned') else stats['total_return'],
+                            group=experiment_of, desc="In-Sample")
+    if pruned_counts:
+        print(f"   ✂️ 가지치기로 조기 중단된 조합: {sum(pruned_counts.values())}개")
+
+    # 실험별 최고 조합 선택 (평가 기준: 수익률, 동점이면 그리드 순서상 앞선 조합)
+    best = {}
+    for ((target_symbol, target_regime, _), context), stats in results:
+        if stats.get('pruned'): continue
+        group = (target_symbol, target_regime, context['strategy_name'])
+        score = stats['total_return']
+        if score > best.get(group, (None, None, -999))[2]:
+            params = {k: v for k, v in context.items() if k in config.STRATEGY_GRID_MAP[context['strategy_name']]}
+            best[group] = (params, stats, score)
+
+    if not best:
         print("   ⚠️ 유효한 거래가 발생하지 않음.")
         return
 
     # 4. Out-of-Sample 검증
-    context_out = {
-        'strategy_name': strategy_name,
-        'initial_capital': 10000.0,
-        **best_params
-    }
-
-    oos_stats = _run_silent_backtest(df_out, context_out)
-
-    if oos_stats:
-        # --- [ 데이터 기록 강화 ] ---
-        # metrics.py에서 계산된 값들을 가져옵니다.
-
-        result_row = {
-            'Run_Time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Symbol': target_symbol,
-            'Target_Regime': target_regime,
-            'Strategy': strategy_name,
-            'Best_Params': str(best_params),
-
-            # --- In-Sample (훈련) ---
-            'In_Period': in_period_str,
-            'In_Return(%)': round(best_stats['total_return'], 2),
-            'In_WinRate(%)': round(best_stats.get('win_rate', 0) * 100, 1),
-            'In_ProfitFactor': round(best_stats.get('profit_factor', 0), 2),
-            'In_SQN': round(best_stats.get('sqn', 0), 2),  # [추가]
-            'In_Exposure(%)': round(best_stats.get('exposure_pct', 0), 1),  # [추가]
-            'In_Trades': best_stats['total_trades'],
-
-            # --- Out-of-Sample (검증) ---
-            'Out_Period': out_period_str,
-            'Out_Return(%)': round(oos_stats['total_return'], 2),
-            'Out_BH_Return(%)': round(oos_stats['buy_and_hold_return'], 2),
-            'Out_WinRate(%)': round(oos_stats.get('win_rate', 0) * 100, 1),
-            'Out_ProfitFactor': round(oos_stats.get('profit_factor', 0), 2),
-            'Out_SQN': round(oos_stats.get('sqn', 0), 2),  # [추가]
-            'Out_Exposure(%)': round(oos_stats.get('exposure_pct', 0), 1),  # [추가]
-            'Out_Trades': oos_stats['total_trades'],
-            'Out_MDD(%)': round(oos_stats['max_drawdown'], 2),
+    oos_jobs = []
+    for (target_symbol, target_regime, strategy_name), (best_params, _, _) in best.items():
+        context_out = {
+            'strategy_name': strategy_name,
+            'initial_capital': 10000.0,
+            **best_params
         }
+        oos_jobs.append(((target_symbol, target_regime, 'out'), context_out))
+
+    def save_oos(job, oos_stats):
+        (target_symbol, target_regime, _), context_out = job
+        strategy_name = context_out['strategy_name']
+        best_params, best_stats, _ = best[(target_symbol, target_regime, strategy_name)]
 
         # DB 저장
-        save_optimization_result(result_row)
+        with profiling.span('logging'):
+            save_optimization_result(_build_result_row(target_symbol, target_regime, strategy_name,
+                                                       best_params, best_stats, oos_stats,
+                                                       pruned_count=pruned_counts.get((target_symbol, target_regime,
+                                                                                       strategy_name), 0)))
 
         # 콘솔 출력
-        print(f"   🏆 검증 수익률: {oos_stats['total_return']:.2f}% (SQN: {oos_stats.get('sqn', 0):.2f})")
+        print(f"   🏆 [{target_symbol}/{strategy_name}/{target_regime}] "
+              f"검증 수익률: {oos_stats['total_return']:.2f}% (SQN: {oos_stats.get('sqn', 0):.2f})")
 
-    else:
-        print("   ⚠️ 검증 데이터 부족으로 테스트 불가.")
+    _, summary = run_sweep(oos_jobs, _run_silent_backtest, load_regime_data, on_result=save_oos,
+                           processes=processes, desc="Out-of-Sample")
+    get_result_sink(config.BACKTEST_DB_NAME).flush()
+    if summary['empty']:
+        print(f"   ⚠️ 검증 데이터 부족으로 테스트 불가: {summary['empty']}건")
+
+
+def run_optimization(strategy_name, target_regime, target_symbol='SPY', processes=None, search_mode='grid',
+                     prune=True):
+    """
+    특정 종목(target_symbol) + 시장(target_regime) + 전략(strategy_name) 조합을 최적화합니다.
+    """
+    print(f"\n🚀 [최적화 시작] 종목: {target_symbol} | 전략: {strategy_name} | 시장: {target_regime}")
+    run_batch_optimization([target_regime], [strategy_name], [target_symbol], processes=processes,
+                           search_mode=search_mode, prune=prune)
 
 
 if __name__ == "__main__":
@@ -222,25 +295,12 @@ if __name__ == "__main__":
     TARGET_STRATEGIES = ['macd', 'dema', 'bbs', 'sma', 'turtle']
     TARGET_SYMBOLS = ['TSLA', 'TQQQ', 'SOXL']  # [수정] 여기에 원하는 종목 추가
 
-    print(f"🔥 [배치 작업 시작] 총 {len(TARGET_REGIMES) * len(TARGET_STRATEGIES) * len(TARGET_SYMBOLS)}개의 실험을 진행합니다...\n")
-
-    # 3중 반복문: 시장 -> 종목 -> 전략
-    for regime in TARGET_REGIMES:
-        print(f"==================================================")
-        print(f"🌍 [시장 변경] 현재 타겟 시장: {regime}")
-        print(f"==================================================")
-
-        for symbol in TARGET_SYMBOLS:
-            print(f"   target: {symbol}")
+    # 탐색 모드: 'grid'(전수 조사) | 'halving'(successive halving) | 'hyperband'
+    SEARCH_MODE = 'grid'
 
-            for strategy in TARGET_STRATEGIES:
-                try:
-                    # [수정] target_symbol 인자를 명시적으로 전달
-                    run_optimization(strategy_name=strategy, target_regime=regime, target_symbol=symbol)
+    print(f"🔥 [배치 작업 시작] 총 {len(TARGET_REGIMES) * len(TARGET_STRATEGIES) * len(TARGET_SYMBOLS)}개의 실험을 진행합니다...\n")
 
-                except Exception as e:
-                    print(f"   ⚠️ 오류 발생 ({symbol}-{strategy}): {e}")
-                    continue
-            print("-" * 30)
+    # 시장 x 종목 x 전략 전체를 하나의 병렬 Sweep으로 실행
+    run_batch_optimization(TARGET_REGIMES, TARGET_STRATEGIES, TARGET_SYMBOLS, search_mode=SEARCH_MODE)
 
     print("\n🎉 [모든 배치 작업 완료] 결과는 DB(backtest_log.db)를 확인하세요.")
\ No newline at end of file
@@ -3,8 +3,16 @@ import itertools
 import time
 import sqlite3
 import json
+import argparse
 from datetime import datetime
-from run_portfolio_backtest import run_backtest_with_config, PORTFOLIO_CONFIG
+import config
+from run_portfolio_backtest import (run_backtest_with_config, PORTFOLIO_CONFIG, PortfolioSession,
+                                    order_params_for_reuse, get_stage_report, UNIVERSE_FRACTION_KEY,
+                                    prefetch_market_data, get_result_key)
+from backtesting.search import run_search, bayesian_search, space_from_grid
+from backtesting.pruning import make_pruner
+from backtesting.result_sink import get_result_sink
+from backtesting.pareto import pareto_frontier
 
 # ==============================================================================
 # 🧪 [자유롭게 수정 가능] 테스트할 변수들의 조합 (Grid Search)
@@ -53,9 +61,67 @@ params_grid = {
 
 }
 
+# ==============================================================================
+# 🔎 탐색 모드
+# ==============================================================================
+# 'grid'      : 모든 조합을 전체 종목으로 1회씩 (기존 방식)
+# 'halving'   : 모든 조합을 일부 종목(1/9)으로 먼저 평가 -> 샤프 상위 1/3만 1/3 종목으로 -> 다시 상위 1/3만 전체 종목으로
+# 'hyperband' : 시작 예산이 다른 halving을 여러 번 실행 (초반 성적이 나쁜 조합을 놓칠 위험 감소)
+# 'bayes'     : TPE 기반 Bayesian 탐색 (지금까지의 결과를 보고 샤프가 높을 것 같은 조합을 골라 평가)
+# (DB에는 전체 종목으로 평가된 결과만 저장됩니다)
+SEARCH_MODE = 'grid'
+SEARCH_BUDGETS = (1 / 9, 1 / 3, 1.0)  # 단계별 사용할 종목 비율
+SEARCH_ETA = 3  # 단계마다 상위 1/ETA만 승격
+SEARCH_MIN_KEEP = 5  # 단계마다 최소 승격 개수 (최종 Top 5 리포트용)
+
+# --- Bayesian 탐색 설정 ---
+# 탐색 공간: None이면 params_grid의 최소~최대를 구간으로 사용
+#   (예: 'score_threshold': [0.5, 1.0, 2.0] -> 0.5 ~ 2.0 사이 실수, 'entry_period': [20, 50] -> 20 ~ 50 사이 정수)
+# 직접 지정 예시: {'score_threshold': ('float', 0.5, 3.0, 0.1), 'entry_period': ('int', 10, 60), 'max_positions': ('choice', [4, 5])}
+SEARCH_SPACE = None
+BAYES_BUDGET = 40  # 총 평가 횟수
+BAYES_BATCH_SIZE = 4  # 한 번에 제안해서 워커 풀에서 같이 계산할 조합 수
+BAYES_STARTUP = 10  # 처음 몇 번은 무작위 탐색
+
+# --- 가지치기(Pruning) ---
+# True면 config.py의 PRUNE_* 규칙(MDD -50% 초과, 2년간 무거래 등)에 걸린 조합을 도중에 중단합니다.
+# 중단된 조합도 DB에는 pruned=1, prune_reason과 함께 기록되고, Top 5 리포트와 탐색 승격에서는 제외됩니다.
+USE_PRUNING = True
+
+# --- Pareto Front 리포트 ---
+# Top 5(샤프/수익률)와 별도로, 목적들 사이의 균형이 다른 '비지배' 조합들을 함께 보여줍니다. (mdd는 음수 %)
+PARETO_OBJECTIVES = {'return': 'max', 'mdd': 'max', 'sharpe': 'max'}
+PARETO_MAX_ROWS = 15
+
 DB_PATH = "backtest_log.db"
 TABLE_NAME = "optimization_log"
 
+# 나중에 추가된 고정 컬럼 (예전에 만든 테이블에는 없을 수 있음)
+EXTRA_COLUMNS = {
+    'trial_id': 'TEXT',  # Bayesian 탐색 시도 번호 (Grid 실행은 NULL)
+    'status': 'TEXT',  # ok / pruned / reused / empty / failed (TRIAL_STATUSES)
+    'error': 'TEXT',  # status가 failed일 때 에러 메시지
+    'pruned': 'INTEGER',  # 가지치기로 조기 중단 여부 (1/0)
+    'prune_reason': 'TEXT',  # 중단 사유
+    'result_key': 'TEXT',  # 설정값 + 데이터 버전 + 코드 버전 해시 (같으면 재계산 없이 재사용)
+}
+
+
+# 시도(trial) 상태
+# - ok: 정상 완료 / pruned: 가지치기로 조기 중단 / reused: 저장된 결과 재사용 (Bayesian 시도 기록용 사본)
+# - empty: 결과 없음 (신호 데이터 없음 등) / failed: 에러 (성과 지표 컬럼은 NULL)
+TRIAL_STATUSES = ('ok', 'pruned', 'reused', 'empty', 'failed')
+
+
+def trial_key(params):
+    """파라미터 조합 -> 비교용 문자열 키"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _rounded(res, key, digits):
+    value = res.get(key)
+    return None if value is None else round(value, digits)
+
 
 # ==============================================================================
 # 🛠️ 동적 DB 관리 함수 (Dynamic Schema Management)
@@ -98,6 +164,12 @@ def ensure_table_exists(conn, param_keys):
     cursor.execute(f"PRAGMA table_info({TABLE_NAME})")
     existing_columns = {row[1] for row in cursor.fetchall()}
 
+    # 나중에 추가된 고정 컬럼 (trial_id, pruned 등) 보충
+    for column, col_type in EXTRA_COLUMNS.items():
+        if column not in existing_columns:
+            cursor.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {column} {col_type}")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_result_key ON {TABLE_NAME} (result_key)")
+
     # 3. params_grid에 있는데 DB에는 없는 컬럼 찾아서 추가 (ALTER TABLE)
     for param in param_keys:
         if param not in existing_columns:
@@ -108,108 +180,280 @@ def ensure_table_exists(conn, param_keys):
     conn.commit()
 
 
-def save_dynamic_result(conn, params, res):
+def save_dynamic_result(sink, params, res, trial_id=None, status=None, error=None):
     """
     파라미터(가변)와 결과(고정)를 합쳐서 DB에 저장
+    (ResultSink가 모아서 배치로 INSERT/commit 하므로 조합마다 commit하지 않음)
+    :param res: 결과 딕셔너리 (None이면 성과 지표 없이 파라미터 + 상태만 기록)
+    :param trial_id: Bayesian 탐색의 시도 번호 (예: '20250101_120000-007')
+    :param status: TRIAL_STATUSES 중 하나 (기본: res로 판단한 ok / pruned / empty)
     """
-    cursor = conn.cursor()
+    if status is None:
+        status = 'empty' if not res else ('pruned' if res.get('pruned') else 'ok')
+    res = res or {}
 
     # 1. 저장할 전체 데이터 딕셔너리 생성
     record = {
         'run_date': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        # --- 고정 결과값 매핑 ---
-        'total_return': round(res['return'], 2),
-        'cagr': round(res['cagr'], 2),
-        'mdd': round(res['mdd'], 2),
-        'final_equity': round(res['final_equity'], 0),
-        'sharpe_ratio': round(res.get('sharpe', 0), 4),
-        'sortino_ratio': round(res.get('sortino', 0), 4),
-        'calmar_ratio': round(res.get('calmar', 0), 4),
-        'win_rate': round(res['win_rate'], 2),
-        'profit_factor': round(res['profit_factor'], 2),
-        'total_trades': res['total_trades'],
-        'avg_win': round(res['avg_win'], 2),
-        'avg_loss': round(res['avg_loss'], 2),
-        'yearly_returns': res.get('yearly_json', '{}')
+        # --- 고정 결과값 매핑 (결과가 없으면 NULL) ---
+        'total_return': _rounded(res, 'return', 2),
+        'cagr': _rounded(res, 'cagr', 2),
+        'mdd': _rounded(res, 'mdd', 2),
+        'final_equity': _rounded(res, 'final_equity', 0),
+        'sharpe_ratio': _rounded(res, 'sharpe', 4),
+        'sortino_ratio': _rounded(res, 'sortino', 4),
+        'calmar_ratio': _rounded(res, 'calmar', 4),
+        'win_rate': _rounded(res, 'win_rate', 2),
+        'profit_factor': _rounded(res, 'profit_factor', 2),
+        'total_trades': res.get('total_trades'),
+        'avg_win': _rounded(res, 'avg_win', 2),
+        'avg_loss': _rounded(res, 'avg_loss', 2),
+        'yearly_returns': res.get('yearly_json', '{}') if res else None,
+        'trial_id': trial_id,
+        'status': status,
+        'error': error,
+        'pruned': int(bool(res.get('pruned'))),
+        'prune_reason': res.get('prune_reason'),
+        'result_key': res.get('result_key')
     }
 
     # 2. 파라미터 값 추가 (params 딕셔너리 병합)
     record.update(params)
 
-    # 3. 동적 INSERT 쿼리 생성
-    columns = ', '.join(record.keys())
-    placeholders = ', '.join(['?'] * len(record))
-    values = list(record.values())
+    # 3. Sink 버퍼에 추가 (동적 INSERT는 Sink가 컬럼 구성별로 executemany)
+    sink.write(TABLE_NAME, record)
 
-    sql = f"INSERT INTO {TABLE_NAME} ({columns}) VALUES ({placeholders})"
 
-    try:
-        cursor.execute(sql, values)
-        conn.commit()
-    except Exception as e:
-        print(f"❌ DB 저장 오류: {e}")
+def load_saved_results(conn):
+    """
+    이미 DB에 저장된 결과를 {result_key: res} 형태로 불러옵니다.
+    (중단됐던 최적화를 다시 실행하면 이 결과들은 시뮬레이션 없이 재사용)
+    """
+    cursor = conn.execute(f"SELECT * FROM {TABLE_NAME} WHERE result_key IS NOT NULL AND total_return IS NOT NULL "
+                          f"ORDER BY id")
+    columns = [d[0] for d in cursor.description]
+
+    saved = {}
+    for values in cursor.fetchall():
+        row = dict(zip(columns, values))
+        saved[row['result_key']] = {
+            'return': row['total_return'], 'cagr': row['cagr'], 'mdd': row['mdd'],
+            'final_equity': row['final_equity'], 'sharpe': row['sharpe_ratio'],
+            'sortino': row['sortino_ratio'], 'calmar': row['calmar_ratio'],
+            'yearly_json': row['yearly_returns'], 'total_trades': row['total_trades'],
+            'win_rate': row['win_rate'], 'profit_factor': row['profit_factor'],
+            'avg_win': row['avg_win'], 'avg_loss': row['avg_loss'],
+            'pruned': bool(row['pruned']), 'prune_reason': row['prune_reason'],
+            'result_key': row['result_key'], 'reused': True
+        }
+    return saved
+
+
+def get_result_key_extra():
+    """설정값 외에 결과에 영향을 주는 실행 옵션 (가지치기 규칙이 바뀌면 다시 계산)"""
+    if not USE_PRUNING:
+        return {}
+    return {'prune_rules': [config.PRUNE_CHECK_EVERY, config.PRUNE_MAX_DRAWDOWN,
+                            config.PRUNE_MIN_TRADES, config.PRUNE_MIN_TRADES_AFTER_DAYS]}
 
 
 # ==============================================================================
 # 🚀 최적화 실행 엔진
 # ==============================================================================
-def run_optimization():
-    # 1. 파라미터 조합 생성
-    keys, values = zip(*params_grid.items())
-    combinations = [dict(zip(keys, v)) for v in itertools.product(*values)]
-
-    print(f"🔬 총 {len(combinations)}개의 파라미터 조합을 테스트합니다.")
-    print(f"📂 DB 경로: {DB_PATH}")
-
-    # 2. DB 초기화 및 컬럼 자동 맞춤
-    conn = sqlite3.connect(DB_PATH)
-    ensure_table_exists(conn, params_grid.keys())
+def build_config(params, budget=1.0):
+    """기본 설정에 파라미터를 덮어쓴 config를 만듭니다. (budget < 1이면 일부 종목만 사용)"""
+    current_config = PORTFOLIO_CONFIG.copy()
+    current_config.update(params)
+    if budget < 1.0:
+        current_config[UNIVERSE_FRACTION_KEY] = budget
+    return current_config
 
-    start_time = time.time()
-    results_list = []  # 최종 리포트용
-
-    # 3. 반복 테스트 실행
-    for i, params in enumerate(combinations):
-        # 기본 설정에 덮어쓰기
-        current_config = PORTFOLIO_CONFIG.copy()
-        current_config.update(params)
 
+def evaluate_combinations(session, combinations, budget=1.0, on_result=None, prefetch=False, memo=None,
+                          failures=None):
+    """
+    파라미터 조합 리스트를 순서대로 백테스트하고 결과 리스트(실패는 None)를 반환합니다.
+
+    :param budget: 사용할 종목 비율 (1.0 = 전체 종목)
+    :param on_result: on_result(params, res) - 결과가 나올 때마다 호출 (DB 저장 등)
+                      재사용된 결과는 res['reused'] = True
+    :param prefetch: True면 모든 조합의 신호 데이터셋을 워커 풀에서 한꺼번에 먼저 만듦
+                     (배치가 작을 때만 사용 - 조합 수만큼 데이터셋이 메모리에 올라감)
+    :param memo: {result_key: res} - 전체 종목 평가(budget=1.0)일 때 같은 키의 결과가 있으면 재사용,
+                 새로 계산한 결과도 여기에 추가됨
+    :param failures: (선택) dict - 결과가 None인 조합의 {trial_key(params): (status, 에러 메시지)}를 기록
+                     (status: 'empty' 또는 'failed')
+    """
+    configs = [build_config(params, budget) for params in combinations]
+    keys = [None] * len(configs)
+    if memo is not None and budget >= 1.0:
+        extra = get_result_key_extra()
+        keys = [get_result_key(c, extra) for c in configs]
+
+    if prefetch and len(combinations) > 1:
+        prefetch_market_data([c for c, key in zip(configs, keys) if not memo or key not in memo], session)
+
+    budget_str = f" [종목 {budget:.0%}]" if budget < 1.0 else ""
+    pruner = make_pruner() if USE_PRUNING else None
+    outputs = []
+    for i, (params, current_config, result_key) in enumerate(zip(combinations, configs, keys)):
         # 진행 상황 출력 (한 줄에 덮어쓰지 않고 로그 남김)
         param_str = ", ".join([f"{k}={v}" for k, v in params.items()])
-        print(f"[{i + 1}/{len(combinations)}] {param_str} ...", end=" ", flush=True)
-
+        print(f"[{i + 1}/{len(combinations)}]{budget_str} {param_str} ...", end=" ", flush=True)
+
+        # 같은 설정 + 데이터 + 코드로 이미 계산한 결과가 있으면 재사용
+        if result_key is not None and result_key in memo:
+            res = memo[result_key]
+            print(f"♻️ 재사용 (Sharpe: {res.get('sharpe') or 0:.2f})")
+            if on_result is not None:
+                on_result(params, res)
+            outputs.append(res)
+            continue
+
+        res = None
         try:
             # --- 백테스트 실행 ---
-            res = run_backtest_with_config(current_config)
+            res = run_backtest_with_config(current_config, session=session, pruner=pruner)
 
             if res:
+                if result_key is not None:
+                    res['result_key'] = result_key
+                    memo[result_key] = dict(res, reused=True)
                 # 결과 요약 출력
-                print(f"✅ CAGR: {res['cagr']:.1f}% | MDD: {res['mdd']:.1f}% | Sharpe: {res.get('sharpe', 0):.2f}")
-
-                # DB 저장 (동적)
-                save_dynamic_result(conn, params, res)
-
-                # 리포트용 리스트 저장
-                combined_record = params.copy()
-                combined_record.update({
-                    'return': res['return'], 'mdd': res['mdd'], 'sharpe': res.get('sharpe', 0),
-                    'profit_factor': res['profit_factor'], 'win_rate': res['win_rate']
-                })
-                results_list.append(combined_record)
+                if res.get('pruned'):
+                    print(f"✂️ 조기 중단 ({res['prune_reason']})")
+                else:
+                    print(f"✅ CAGR: {res['cagr']:.1f}% | MDD: {res['mdd']:.1f}% | Sharpe: {res.get('sharpe', 0):.2f}")
+                if on_result is not None:
+                    on_result(params, res)
             else:
                 print("❌ 결과 없음")
+                if failures is not None:
+                    failures[trial_key(params)] = ('empty', None)
 
         except Exception as e:
             print(f"❌ 에러 발생: {e}")
+            res = None
+            if failures is not None:
+                failures[trial_key(params)] = ('failed', f"{type(e).__name__}: {e}")
 
+        outputs.append(res)
+    return outputs
+
+
+def score_result(res):
+    """탐색용 점수: 샤프 지수 (가지치기로 중단된 조합은 None -> 탈락)"""
+    return None if res.get('pruned') else res.get('sharpe', 0)
+
+
+def run_optimization(force=False):
+    """
+    :param force: True면 DB에 저장된 결과를 재사용하지 않고 모든 조합을 다시 계산
+    """
+    # 1. 파라미터 조합 생성
+    # (지표 파라미터가 가장 느리게 바뀌도록 키 순서를 재배치 -> 단계별 캐시 재사용 극대화)
+    keys, values = zip(*order_params_for_reuse(params_grid).items())
+    combinations = [dict(zip(keys, v)) for v in itertools.product(*values)]
+
+    print(f"🔬 총 {len(combinations)}개의 파라미터 조합을 테스트합니다. (탐색 모드: {SEARCH_MODE})")
+    print(f"📂 DB 경로: {DB_PATH}")
+
+    search_space = SEARCH_SPACE or space_from_grid(params_grid)
+    param_keys = list(params_grid.keys())
+    if SEARCH_MODE == 'bayes':
+        param_keys += [k for k in search_space if k not in params_grid]
+
+    # 2. DB 초기화 및 컬럼 자동 맞춤
+    conn = sqlite3.connect(DB_PATH)
+    ensure_table_exists(conn, param_keys)
+
+    # 이어서 실행: 이미 저장된 결과(result_key)는 다시 시뮬레이션하지 않음
+    memo = {} if force else load_saved_results(conn)
     conn.close()
 
+    # 결과 저장은 공용 Result Sink 하나로만 (WAL + 배치 commit)
+    sink = get_result_sink(DB_PATH)
+    if memo:
+        print(f"♻️ DB에 저장된 결과 {len(memo)}개를 재사용합니다. (모두 다시 계산하려면 --force)")
+
+    start_time = time.time()
+    results_list = []  # 최종 리포트용
+
+    def on_full_result(params, res, trial_id=None):
+        # DB 저장 (동적) - 재사용된 결과는 이미 저장되어 있음
+        if not res.get('reused'):
+            save_dynamic_result(sink, params, res, trial_id=trial_id)
+            # 이어서 실행은 'DB에 있는 result_key'로 판단하므로 조합마다 바로 commit
+            # (포트폴리오 시뮬레이션 1회가 수 초라 commit 비용은 무시할 수준)
+            sink.flush()
+
+        # 리포트용 리스트 저장
+        combined_record = params.copy()
+        combined_record.update({
+            'return': res['return'], 'mdd': res['mdd'], 'sharpe': res.get('sharpe', 0),
+            'profit_factor': res['profit_factor'], 'win_rate': res['win_rate'],
+            'pruned': bool(res.get('pruned')), 'reused': bool(res.get('reused'))
+        })
+        results_list.append(combined_record)
+
+    # 3. 반복 테스트 실행
+    # (워커 풀 + 공유 가격 패널은 세션 동안 한 번만 만들어 모든 조합이 재사용)
+    with PortfolioSession() as session:
+        def evaluate_batch(batch, budget):
+            # 일부 종목으로 평가한 중간 단계 결과는 DB에 저장하지 않음
+            return evaluate_combinations(session, batch, budget,
+                                         on_result=on_full_result if budget >= 1.0 else None, memo=memo)
+
+        if SEARCH_MODE == 'bayes':
+            # 시도(trial)마다 '실행 시각-번호'로 trial_id를 붙여 DB에 기록
+            # (가지치기 / 재사용 / 결과 없음 / 에러도 status와 함께 한 줄씩 -> 시도 번호가 빠짐없이 이어짐)
+            run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+            failures = {}
+
+            def on_trial(trial_no, params, res):
+                trial_id = f"{run_id}-{trial_no:03d}"
+                if not res:
+                    status, error = failures.pop(trial_key(params), ('empty', None))
+                    save_dynamic_result(sink, params, None, trial_id=trial_id, status=status, error=error)
+                    sink.flush()
+                elif res.get('reused'):
+                    save_dynamic_result(sink, params, res, trial_id=trial_id, status='reused')
+                    sink.flush()
+                    on_full_result(params, res)
+                else:
+                    on_full_result(params, res, trial_id=trial_id)
+
+            # 배치로 제안된 조합들은 신호 데이터셋을 워커 풀에서 동시에 계산
+            _, search_summary = bayesian_search(search_space,
+                                                lambda batch, budget: evaluate_combinations(session, batch,
+                                                                                            prefetch=True,
+                                                                                            memo=memo,
+                                                                                            failures=failures),
+                                                score=score_result,
+                                                budget=BAYES_BUDGET, batch_size=BAYES_BATCH_SIZE,
+                                                n_startup=BAYES_STARTUP, on_trial=on_trial, desc="Portfolio TPE")
+        else:
+            _, search_summary = run_search(SEARCH_MODE, combinations, evaluate_batch,
+                                           score=score_result,
+                                           budgets=SEARCH_BUDGETS, eta=SEARCH_ETA, min_keep=SEARCH_MIN_KEEP,
+                                           desc="Portfolio")
+
+    sink.flush()
+
     # 4. 최종 Top 5 리포트 출력
+    reused_count = sum(1 for r in results_list if r['reused'])
+    print(f"\n♻️ 재사용 {reused_count}개 / 🧮 새로 계산 {len(results_list) - reused_count}개")
+
+    pruned_count = sum(1 for r in results_list if r['pruned'])
+    if pruned_count:
+        print(f"\n✂️ 가지치기로 조기 중단된 조합: {pruned_count}개 (DB에는 pruned=1로 기록, 리포트에서 제외)")
+    results_list = [r for r in results_list if not r['pruned']]
+
     if results_list:
         df = pd.DataFrame(results_list)
 
         # 보기 좋게 컬럼 정렬 (파라미터 먼저, 결과 나중)
-        param_cols = list(params_grid.keys())
+        param_cols = param_keys
         result_cols = ['return', 'mdd', 'sharpe', 'profit_factor', 'win_rate']
         final_cols = param_cols + result_cols
 
@@ -223,8 +467,32 @@ def run_optimization():
         print("-" * 80)
         print(df.sort_values(by='return', ascending=False).head(5)[final_cols].to_string(index=False))
 
+        print("\n" + "=" * 80)
+        print("⚖️ Pareto Front (수익률↑ / MDD↑ / 샤프↑ 중 어느 것으로도 더 나은 조합이 없는 조합)")
+        print("-" * 80)
+        front = pareto_frontier(df, PARETO_OBJECTIVES)
+        print(front.head(PARETO_MAX_ROWS)[final_cols].to_string(index=False))
+        if len(front) > PARETO_MAX_ROWS:
+            print(f"... 외 {len(front) - PARETO_MAX_ROWS}개")
+
+    print("\n" + "=" * 80)
+    print("💾 단계별 캐시 적중률")
+    print("-" * 80)
+    print(get_stage_report())
+
+    if SEARCH_MODE == 'bayes':
+        print(f"\n🎯 Bayesian 탐색: {search_summary['evaluations']}회 평가 "
+              f"(전수 조사 시 {len(combinations)}회) | 최고 샤프 trial #{search_summary['best_trial']}")
+    elif SEARCH_MODE != 'grid':
+        print(f"\n✂️ 평가 횟수: {search_summary['evaluations']}회 "
+              f"(전체 종목 환산 {search_summary['full_equivalent']:.1f}회 / 전수 조사 {search_summary['exhaustive']}회)")
+
     print(f"\n⏱️ 총 소요 시간: {time.time() - start_time:.1f}초")
 
 
 if __name__ == "__main__":
-    run_optimization()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="포트폴리오 파라미터 최적화")
+    parser.add_argument('--force', action='store_true', help="DB에 저장된 결과를 무시하고 모든 조합을 다시 계산")
+    args = parser.parse_args()
+
+    run_optimization(force=args.force)
\ No newline at end of file
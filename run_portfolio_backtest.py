@@ -3,14 +3,18 @@ import numpy as np
 import data_manager
 import strategy
 import indicator
-from tqdm import tqdm
 import sqlite3
 import json
+import os
 from datetime import datetime
+import time
 import warnings
 from multiprocessing import Pool, cpu_count
-
-from run_portfolio_backtest2 import PORTFOLIO_CONFIG
+from backtesting import metrics, profiling
+from backtesting.streaming import StreamingStats
+from backtesting.shared_panel import SharedPricePanel
+from backtesting.cache import (DiskCache, StageCache, config_hash, file_fingerprint, code_fingerprint,
+                              merge_stage_stats, format_stage_report)
 
 # 경고 메시지 차단
 warnings.simplefilter(action='ignore', category=FutureWarning)
@@ -41,16 +45,195 @@ PORTFOLIO_CONFIG = {
     'rs_lookback': 120
 }
 
+# ==========================================
+# 💾 단계별(Stage) 캐시 설정
+# ==========================================
+# 파이프라인: indicators -> votes -> scores -> signals -> (panel) -> simulation
+# 각 단계는 '자기 자신과 상위 단계'가 사용하는 파라미터만으로 캐시 키를 만듭니다.
+# 예) score_threshold만 바뀌면 indicators/votes/scores는 재사용하고 signals만 다시 계산
+
+# 1) 지표 계산 (pandas_ta, 가장 무거움)
+INDICATOR_KEYS = (
+    'atr_period', 'rsi_period', 'sma_short_period', 'sma_long_period',
+    'bbands_period', 'bbands_std_dev', 'macd_fast_period', 'macd_slow_period', 'macd_signal_period',
+    'bbs_period', 'bbs_std_dev', 'bbs_squeeze_period', 'dema_short_period', 'dema_long_period',
+    'mfi_period',
+)
+# 2) 전략별 투표(signal_*) + 터틀 채널 + RS (전략 루프)
+#    (exit_period는 exit_low뿐 아니라 터틀 전략의 포지션 루프에도 영향을 줍니다)
+VOTE_KEYS = ('entry_period', 'exit_period', 'rsi_oversold', 'rsi_overbought', 'rs_lookback')
+# 3) 가중치 합산 점수
+SCORE_KEYS = ('turtle_weight', 'rs_weight')
+# 4) 최종 매수/매도 신호
+SIGNAL_KEYS = ('score_threshold',)
+
+STAGE_KEYS = {
+    'indicators': INDICATOR_KEYS,
+    'votes': INDICATOR_KEYS + VOTE_KEYS,
+    'scores': INDICATOR_KEYS + VOTE_KEYS + SCORE_KEYS,
+    'signals': INDICATOR_KEYS + VOTE_KEYS + SCORE_KEYS + SIGNAL_KEYS,
+}
+
+# 시뮬레이션 기간 (없으면 신호 데이터셋 전체 기간)
+# 지표/신호는 항상 전체 기간으로 계산하고 시뮬레이션만 이 구간에서 돌리므로,
+# 워크포워드의 겹치는 fold들이 같은 신호 데이터셋(panel)을 공유합니다.
+SIMULATION_WINDOW_KEYS = ('sim_start', 'sim_end')
+
+# 아래 키들은 '시뮬레이션' 단계에서만 사용되고 신호 데이터셋에는 영향을 주지 않습니다.
+# -> 이 값들만 다른 조합은 prepare_market_data를 건너뛰고 캐시를 재사용합니다.
+SIMULATION_ONLY_KEYS = ('initial_capital', 'max_positions', 'risk_per_trade') + SIMULATION_WINDOW_KEYS
+
+# Successive Halving 예산용 키: 전체 종목 중 일부(비율)만으로 신호 데이터셋을 만듭니다.
+# (종목별 단계 캐시 키에는 들어가지 않으므로, 예산을 키워도 이미 계산한 종목은 그대로 재사용)
+UNIVERSE_FRACTION_KEY = 'universe_fraction'
+
+MARKET_DB_PATH = "market_data.db"
+
+# 단계 캐시 키 / 결과(result_key) 계산에 포함할 소스 파일
+# -> 전략/지표/시뮬레이션/성과 지표 코드가 바뀌면 지표/투표/panel 캐시와 결과를 모두 다시 계산
+#    (stats_only 실행의 통계 누적기(streaming.py), 'pruned'로 저장할 결과를 정하는 가지치기 규칙(pruning.py) 포함)
+# (실행 위치와 무관하게 이 파일 기준 경로로 읽음 - 벤치마크 워커 / 다른 폴더에서 실행한 CLI도 같은 키)
+CODE_VERSION_FILES = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                           for name in ('run_portfolio_backtest.py', 'strategy.py', 'indicator.py',
+                                        os.path.join('backtesting', 'metrics.py'),
+                                        os.path.join('backtesting', 'streaming.py'),
+                                        os.path.join('backtesting', 'pruning.py')))
+
+# 종목별 단계 캐시 (워커 프로세스에서 사용)
+# - indicators/votes: 계산이 무거우므로 디스크에도 저장 (조합/실행 간 재사용)
+# - scores/signals: 계산이 가벼우므로 메모리에만 보관
+WORKER_STAGES = ('indicators', 'votes', 'scores', 'signals')
+STAGE_CACHES = {
+    'indicators': StageCache('indicators', persist=True, namespace='portfolio_stages'),
+    'votes': StageCache('votes', persist=True, namespace='portfolio_stages'),
+    'scores': StageCache('scores', persist=False, memory_size=512),
+    'signals': StageCache('signals', persist=False),
+    # 전 종목 신호 데이터셋 (메인 프로세스에서 사용)
+    'panel': StageCache('panel', persist=True, memory_size=2, namespace='portfolio_stages'),
+}
+
+# 워커에서 돌려받은 단계별 통계 누적 (메인 프로세스)
+STAGE_STATS = {}
+
+# panel(DataFrame) -> 날짜별 dict 변환 결과 (연속된 조합이 같은 panel을 쓸 때 재사용)
+_grouped_cache = {}
+
+
+def stamp_versions(config):
+    """
+    config에 데이터 버전 / 코드 버전을 한 번만 계산해서 붙입니다.
+    (워커가 종목 x 단계마다 DB 파일 / 소스 파일을 다시 읽지 않도록 config에 실어 보냄)
+    """
+    return dict(config, _data_version=file_fingerprint(MARKET_DB_PATH),
+                _code_version=code_fingerprint(CODE_VERSION_FILES))
+
+
+def get_stage_key(stage, config, symbol=None):
+    """
+    단계(stage)가 의존하는 파라미터 + 데이터 버전 + 코드 버전으로 캐시 키를 만듭니다.
+    'panel' 단계는 시뮬레이션 전용 키를 제외한 모든 설정값을 사용합니다.
+    """
+    if stage == 'panel':
+        subset = {k: v for k, v in config.items() if k not in SIMULATION_ONLY_KEYS}
+    else:
+        subset = {k: config.get(k) for k in STAGE_KEYS[stage]}
+    subset['_data_version'] = config.get('_data_version') or file_fingerprint(MARKET_DB_PATH)
+    subset['_code_version'] = config.get('_code_version') or code_fingerprint(CODE_VERSION_FILES)
+    key = config_hash(subset)
+    return f"{symbol}_{key}" if symbol else key
+
+
+def get_result_key(config, extra=None):
+    """
+    최적화 결과 한 줄의 결정적(deterministic) 키: 설정값 + 데이터 버전 + 코드 버전의 해시
+    같은 키의 결과가 이미 DB에 있으면 다시 시뮬레이션할 필요가 없습니다.
+
+    :param extra: 결과에 영향을 주는 추가 설정 (예: 가지치기 규칙)
+    """
+    payload = {k: v for k, v in config.items() if not k.startswith('_')}
+    payload.update(extra or {})
+    payload['_data_version'] = file_fingerprint(MARKET_DB_PATH)
+    payload['_code_version'] = code_fingerprint(CODE_VERSION_FILES)
+    return config_hash(payload)
+
+
+def get_signal_cache_key(config):
+    """전 종목 신호 데이터셋(panel)의 캐시 키"""
+    return get_stage_key('panel', config)
+
+
+def order_params_for_reuse(params_grid):
+    """
+    그리드 키를 '상위 단계 -> 하위 단계' 순서로 재배치합니다.
+    itertools.product는 마지막 키가 가장 빠르게 변하므로,
+    지표 파라미터는 가장 느리게, 시뮬레이션 파라미터는 가장 빠르게 바뀌어 캐시 재사용이 극대화됩니다.
+    """
+    def rank(key):
+        for i, stage in enumerate(WORKER_STAGES):
+            if key in STAGE_KEYS[stage] and (i == 0 or key not in STAGE_KEYS[WORKER_STAGES[i - 1]]):
+                return i
+        if key in SIMULATION_ONLY_KEYS:
+            return len(WORKER_STAGES) + 1
+        return len(WORKER_STAGES)  # 알 수 없는 키는 panel 단계
+
+    ordered_keys = sorted(params_grid.keys(), key=rank)  # sorted는 안정 정렬 (같은 단계는 원래 순서 유지)
+    return {k: params_grid[k] for k in ordered_keys}
+
+
+def select_universe(indices, fraction):
+    """
+    종목 인덱스 리스트에서 fraction 비율만큼 고르게(등간격) 뽑습니다.
+    항상 같은 종목이 선택되므로 예산이 같은 조합끼리는 panel 캐시를 공유합니다.
+    """
+    if fraction is None or fraction >= 1.0 or not indices:
+        return list(indices)
+    k = max(1, int(round(len(indices) * fraction)))
+    picks = np.unique(np.linspace(0, len(indices) - 1, k).round().astype(int))
+    return [indices[i] for i in picks]
+
+
+def pop_worker_stage_stats():
+    """워커 프로세스의 단계별 통계를 꺼내고 초기화합니다."""
+    return {stage: STAGE_CACHES[stage].pop_stats() for stage in WORKER_STAGES}
+
+
+def get_stage_report():
+    """지금까지 누적된 단계별 캐시 적중률 리포트"""
+    stats = {stage: dict(STAGE_STATS.get(stage, {'hits': 0, 'misses': 0, 'saved_sec': 0.0}))
+             for stage in WORKER_STAGES}
+    stats['panel'] = dict(STAGE_CACHES['panel'].stats)
+    return format_stage_report(stats)
+
+
 # ==========================================
 # 전역 변수 및 워커 함수 (멀티프로세싱용)
 # ==========================================
 spy_global = None
+panel_global = None  # 워커에서 연결한 공유 메모리 가격 패널
 
+# 작업(task)에는 config 해시만 실어 보내고, 실제 config는 여기 한 번 기록해 둡니다.
+TASK_CONFIGS = DiskCache('portfolio_configs')
+_task_config_memo = {}
 
-def init_worker(spy_data):
-    """메인 프로세스에서 SPY 데이터를 받아와 전역 변수에 저장"""
-    global spy_global
-    spy_global = spy_data
+
+def init_worker(panel_meta, spy_idx):
+    """
+    워커 프로세스 시작 시 1회 실행:
+    공유 메모리 가격 패널에 연결하고 SPY 데이터를 전역 변수에 저장
+    """
+    global spy_global, panel_global
+    panel_global = SharedPricePanel.attach(panel_meta)
+    spy_global = panel_global.frame(spy_idx) if spy_idx >= 0 else None
+    # fork로 복사된 메인 프로세스의 통계가 섞이지 않도록 초기화
+    pop_worker_stage_stats()
+    profiling.reset()
+
+
+def _load_task_config(config_key):
+    """config 해시 -> config 딕셔너리 (워커 내 메모이제이션)"""
+    if config_key not in _task_config_memo:
+        _task_config_memo[config_key] = TASK_CONFIGS.get(config_key)
+    return _task_config_memo[config_key]
 
 
 def calculate_relative_strength(stock_df, spy_df, lookback=120):
@@ -71,145 +254,379 @@ def calculate_relative_strength(stock_df, spy_df, lookback=120):
 
 
 # ==========================================
-# [수정] 워커 함수 (Config를 인자로 받음)
+# 단계별 계산 함수 (캐시된 입력을 수정하지 않도록 항상 복사본에 작업)
 # ==========================================
-def process_single_stock(args):
+def compute_indicator_stage(df, context):
+    """[Stage 1] 터틀 채널을 제외한 모든 보조지표 계산"""
+    df = df.copy()
+    df = indicator.add_atr_indicators(df, context)
+    df = indicator.add_rsi_indicators(df, context)
+    df = indicator.add_sma_indicators(df, context)
+    df = indicator.add_bollinger_band_indicators(df, context)
+    df = indicator.add_macd_indicators(df, context)
+    df = indicator.add_bbs_indicators(df, context)
+    df = indicator.add_dema_indicators(df, context)
+    df = indicator.add_volume_indicators(df, context)
+    return df
+
+
+def compute_vote_stage(df, context):
+    """[Stage 2] 터틀 채널 + 전략별 투표(signal_*) + RS 계산"""
+    df = indicator.add_turtle_channels(df.copy(), context.get('entry_period', 20), context.get('exit_period', 10))
+
+    # 전략 적용
+    df = strategy.apply_ensemble_strategy(df, context)
+
+    # RS 계산
+    if spy_global is not None:
+        # RS 기간도 설정값에서 가져옴
+        df['rs_val'] = calculate_relative_strength(df, spy_global, context.get('rs_lookback', 120))
+    else:
+        df['rs_val'] = 0.0
+
+    df['vol_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
+
+    # 하위 단계에서 쓰는 컬럼만 남겨서 캐시 크기를 줄입니다.
+    keep = ['open', 'high', 'low', 'close', 'atr', 'entry_high', 'exit_low', 'rs_val', 'vol_ratio']
+    keep += [c for c in df.columns if c.startswith('signal_')]
+    return df[[c for c in keep if c in df.columns]]
+
+
+def compute_score_stage(df, context):
+    """[Stage 3] 가중치 점수 합산 (Series 반환)"""
+    weights = {
+        'turtle': context.get('turtle_weight', 1.0),
+        'rsi': 1.0, 'sma': 1.0, 'bbands': 1.0,
+        'macd': 1.0, 'bbs': 1.0, 'dema': 1.0,
+        'obv': 0.5, 'mfi': 0.5, 'vol_spike': 0.5,
+        'rs': context.get('rs_weight', 0.0)
+    }
+
+    score = pd.Series(0.0, index=df.index)
+    for name, weight in weights.items():
+        col_name = f'signal_{name}'
+        if col_name in df.columns:
+            score += (df[col_name] == 1) * weight
+
+    if weights['rs'] > 0:
+        score += (df['rs_val'] > 0).astype(int) * weights['rs']
+
+    return score
+
+
+def compute_signal_stage(df, score, context, symbol):
+    """[Stage 4] 최종 매수/매도 신호 생성 및 시뮬레이션용 컬럼 정리"""
+    df = df.copy()
+    df['score'] = score
+    df['symbol'] = symbol
+
+    # 신호 생성
+    df['buy_signal'] = (df['score'] >= context['score_threshold']) & \
+                       (df['close'] > df['entry_high']) & \
+                       (df['rs_val'] > 0)
+
+    df['sell_signal'] = df['close'] < df['exit_low']
+
+    if 'date' not in df.columns: df = df.reset_index()
+    df.rename(columns={'index': 'date', 'Date': 'date'}, inplace=True)
+
+    cols = ['date', 'symbol', 'open', 'high', 'low', 'close', 'atr', 'buy_signal', 'sell_signal', 'score',
+            'vol_ratio', 'rs_val']
+    return df[[c for c in cols if c in df.columns]]
+
+
+def run_stock_pipeline(symbol, df, context):
     """
-    args: (symbol, df, config)
-    -> config를 직접 받아서 사용하므로 멀티프로세싱에서도 설정이 적용됨
+    한 종목에 대해 indicators -> votes -> scores -> signals 단계를 캐시와 함께 실행합니다.
+    하위 단계가 캐시에 있으면 상위 단계는 아예 조회/계산하지 않습니다.
     """
-    symbol, df, config = args  # [핵심] Config 언패킹
-    global spy_global
+    def indicators():
+        with profiling.span('indicators'):
+            return compute_indicator_stage(df, context)
 
-    try:
-        if len(df) < 130: return None
-        df = df.sort_index()
+    def votes():
+        df_ind = STAGE_CACHES['indicators'].get_or_compute(
+            get_stage_key('indicators', context, symbol), indicators)
+        if df_ind is None: return None
+        with profiling.span('votes'):
+            return compute_vote_stage(df_ind, context)
 
-        # 전달받은 config 사용
-        context = config.copy()
-        context['symbol'] = symbol
-
-        # 지표 계산
-        df = indicator.add_turtle_indicators(df, context)
-        df = indicator.add_atr_indicators(df, context)
-        df = indicator.add_rsi_indicators(df, context)
-        df = indicator.add_sma_indicators(df, context)
-        df = indicator.add_bollinger_band_indicators(df, context)
-        df = indicator.add_macd_indicators(df, context)
-        df = indicator.add_bbs_indicators(df, context)
-        df = indicator.add_dema_indicators(df, context)
-        df = indicator.add_volume_indicators(df, context)
-
-        # 전략 적용
-        df = strategy.apply_ensemble_strategy(df, context)
-
-        # RS 계산
-        if spy_global is not None:
-            # RS 기간도 설정값에서 가져옴
-            df['rs_val'] = calculate_relative_strength(df, spy_global, context.get('rs_lookback', 120))
-        else:
-            df['rs_val'] = 0.0
+    def get_votes():
+        return STAGE_CACHES['votes'].get_or_compute(get_stage_key('votes', context, symbol), votes)
 
-        if 'entry_high' not in df.columns: return None
+    def scores():
+        df_votes = get_votes()
+        if df_votes is None: return None
+        with profiling.span('scores'):
+            return compute_score_stage(df_votes, context)
 
-        # 점수 합산
-        weights = {
-            'turtle': context.get('turtle_weight', 1.0),
-            'rsi': 1.0, 'sma': 1.0, 'bbands': 1.0,
-            'macd': 1.0, 'bbs': 1.0, 'dema': 1.0,
-            'obv': 0.5, 'mfi': 0.5, 'vol_spike': 0.5,
-            'rs': context.get('rs_weight', 0.0)
-        }
+    def signals():
+        score = STAGE_CACHES['scores'].get_or_compute(get_stage_key('scores', context, symbol), scores)
+        if score is None: return None
+        df_votes = get_votes()
+        with profiling.span('signals'):
+            return compute_signal_stage(df_votes, score, context, symbol)
 
-        df['score'] = 0.0
-        for name, weight in weights.items():
-            col_name = f'signal_{name}'
-            if col_name in df.columns:
-                df['score'] += df[col_name].apply(lambda x: weight if x == 1 else 0)
+    return STAGE_CACHES['signals'].get_or_compute(get_stage_key('signals', context, symbol), signals)
 
-        if weights['rs'] > 0:
-            df['score'] += (df['rs_val'] > 0).astype(int) * weights['rs']
 
-        df['vol_ratio'] = df['volume'] / df['volume'].rolling(20).mean()
-        df['symbol'] = symbol
+# ==========================================
+# [수정] 워커 함수 (종목 인덱스 + config 해시만 받음)
+# ==========================================
+def process_single_stock(args):
+    """
+    args: (symbol_idx, config_key)
+    -> 가격 데이터는 공유 메모리 패널에서, config는 해시로 조회하므로
+       작업마다 DataFrame/config를 pickle 해서 보낼 필요가 없음
+    -> (결과 DataFrame, 단계별 캐시 통계, 프로파일링 span 통계)를 반환
+    """
+    symbol_idx, config_key = args
 
-        # 신호 생성
-        df['buy_signal'] = (df['score'] >= context['score_threshold']) & \
-                           (df['close'] > df['entry_high']) & \
-                           (df['rs_val'] > 0)
+    try:
+        config = _load_task_config(config_key)
+        symbol = panel_global.symbols[symbol_idx]
+        df = panel_global.frame(symbol_idx)
 
-        df['sell_signal'] = df['close'] < df['exit_low']
+        if config is None or len(df) < 130: return None, pop_worker_stage_stats(), profiling.pop_snapshot()
+        df = df.sort_index()
 
-        if 'date' not in df.columns: df = df.reset_index()
-        df.rename(columns={'index': 'date', 'Date': 'date'}, inplace=True)
+        # 전달받은 config 사용
+        context = config.copy()
+        context['symbol'] = symbol
 
-        cols = ['date', 'symbol', 'open', 'high', 'low', 'close', 'atr', 'buy_signal', 'sell_signal', 'score',
-                'vol_ratio', 'rs_val']
-        return df[[c for c in cols if c in df.columns]]
+        result = run_stock_pipeline(symbol, df, context)
+        return result, pop_worker_stage_stats(), profiling.pop_snapshot()
 
     except Exception:
-        return None
+        return None, pop_worker_stage_stats(), profiling.pop_snapshot()
 
 
 # ==========================================
-# [수정] 데이터 로드 (Config 전달)
+# 🏭 최적화 세션: 워커 풀 + 공유 가격 패널 (1회 생성 후 재사용)
 # ==========================================
-def prepare_market_data(config=PORTFOLIO_CONFIG):
+class PortfolioSession:
     """
-    config를 인자로 받아서 워커들에게 전달
+    최적화 세션 동안 유지되는 워커 풀과 공유 메모리 가격 패널입니다.
+    종목 리스트 조회, Bulk Load, 프로세스 생성은 세션 시작 시 한 번만 일어나고,
+    조합마다 워커에게는 (종목 인덱스, config 해시)만 전달됩니다.
+
+    사용 예)
+        with PortfolioSession() as session:
+            for config in configs:
+                run_backtest_with_config(config, session=session)
+    (데이터 로드와 워커 생성은 실제로 계산이 필요한 첫 조합에서 일어납니다)
     """
-    print("⏳ [Step 1] 나스닥 100 종목 리스트 DB 조회...")
-    conn = sqlite3.connect("market_data.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT symbol FROM tickers WHERE listing_board = 'NASDAQ100'")
-    rows = cursor.fetchall()
-    target_tickers = [row[0] for row in rows]
-    conn.close()
 
-    if not target_tickers:
-        target_tickers = data_manager.get_ticker_list()
+    def __init__(self, processes=None, start_date='2017-06-01'):
+        self.processes = processes or cpu_count()
+        self.start_date = start_date
+        self.pool = None
+        self.panel = None
+        self.task_indices = []
+
+    def start(self):
+        if self.pool is not None: return self
+
+        print("⏳ [Step 1] 나스닥 100 종목 리스트 DB 조회...")
+        conn = sqlite3.connect(MARKET_DB_PATH)
+        cursor = conn.cursor()
+        cursor.execute("SELECT symbol FROM tickers WHERE listing_board = 'NASDAQ100'")
+        rows = cursor.fetchall()
+        target_tickers = [row[0] for row in rows]
+        conn.close()
+
+        if not target_tickers:
+            target_tickers = data_manager.get_ticker_list()
+
+        print("⏳ [Step 2] 데이터 로드 중 (Bulk Load)...")
+        df_all = data_manager.get_all_price_data_bulk(start_date=self.start_date)
+        if df_all.empty: return self
+
+        # SPY가 없으면 첫 번째 종목을 벤치마크로 대체 (기존 동작 유지)
+        spy_symbol = 'SPY' if (df_all['symbol'] == 'SPY').any() else df_all['symbol'].iloc[0]
+
+        print(f"📦 [Step 3] 가격 패널 공유 메모리 게시 + 워커 {self.processes}개 시작...")
+        self.panel = SharedPricePanel.publish(df_all, symbols=set(target_tickers) | {spy_symbol})
+        del df_all
+
+        target_set = set(target_tickers)
+        self.task_indices = [i for i, symbol in enumerate(self.panel.symbols)
+                             if symbol in target_set and symbol != 'SPY']
+
+        self.pool = Pool(processes=self.processes, initializer=init_worker,
+                         initargs=(self.panel.meta, self.panel.symbol_index(spy_symbol)))
+        return self
+
+    def build_signal_frame(self, config):
+        """
+        전 종목의 신호가 합쳐진 DataFrame을 반환합니다.
+        (config는 해시로 한 번 기록하고, 작업에는 해시만 실어 보냄)
+        """
+        return self.build_signal_frames([config])[0]
+
+    def build_signal_frames(self, configs):
+        """
+        여러 config의 신호 DataFrame을 한 번의 imap으로 만듭니다. (config 순서대로 반환, 실패는 None)
+        조합 여러 개를 동시에 평가할 때 워커 풀이 쉬는 구간 없이 돌아갑니다.
+        """
+        self.start()
+        if self.panel is None: return [None] * len(configs)
+
+        tasks, owners = [], []  # owners[i]: tasks[i]가 속한 config 번호
+        for j, config in enumerate(configs):
+            config_key = get_signal_cache_key(config)
+            TASK_CONFIGS.put(config_key, config)
+            indices = select_universe(self.task_indices, config.get(UNIVERSE_FRACTION_KEY))
+            tasks += [(idx, config_key) for idx in indices]
+            owners += [j] * len(indices)
+
+        print(f"🚀 병렬 데이터 생성..." + (f" (조합 {len(configs)}개 동시)" if len(configs) > 1 else ""))
+        chunksize = max(1, len(tasks) // (self.processes * 4))
+
+        all_signals = [[] for _ in configs]
+        # tqdm 제거 (Optimizer 실행 시 로그 너무 많음)
+        results = self.pool.imap(process_single_stock, tasks, chunksize=chunksize)
+        for j, (res, stats, spans) in zip(owners, results):
+            merge_stage_stats(STAGE_STATS, stats)
+            profiling.merge(spans)
+            if res is not None:
+                all_signals[j].append(res)
+
+        print("🔄 데이터 병합 중...")
+        frames = []
+        for signals in all_signals:
+            if not signals:
+                frames.append(None)
+                continue
+            full_df = pd.concat(signals)
+            full_df['date'] = pd.to_datetime(full_df['date'])
+            frames.append(full_df[full_df['date'] >= '2018-01-01'].sort_values(['date', 'symbol']))
+        return frames
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        if self.panel is not None:
+            self.panel.close()
+            self.panel = None
+
+    def __enter__(self):
+        # 실제 데이터 로드/워커 생성은 첫 캐시 미스 때 (모든 조합이 캐시에 있으면 생략)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _build_signal_frame(config, session=None):
+    """세션이 없으면 이번 호출만을 위한 임시 세션을 만들어 사용합니다."""
+    if session is not None:
+        return session.build_signal_frame(config)
+    with PortfolioSession() as temp_session:
+        return temp_session.build_signal_frame(config)
+
+
+# prefetch_market_data로 미리 만든 panel: key -> (DataFrame, 조합당 계산 시간)
+_prefetched = {}
+
+
+def prefetch_market_data(configs, session):
+    """
+    여러 조합의 신호 데이터셋(panel)을 워커 풀에서 한꺼번에 만들어 둡니다.
+    (Bayesian 탐색처럼 조합을 배치로 제안할 때 사용, 이미 캐시에 있는 조합은 건너뜀)
+    이후 prepare_market_data가 같은 조합을 요청하면 계산 없이 바로 가져갑니다.
+    """
+    pending = {}
+    for config in map(stamp_versions, configs):
+        key = get_signal_cache_key(config)
+        if key in _grouped_cache or key in _prefetched or STAGE_CACHES['panel'].contains(key):
+            continue
+        pending[key] = config
+    if not pending: return
+
+    start = time.perf_counter()
+    frames = session.build_signal_frames(list(pending.values()))
+    per_config_sec = (time.perf_counter() - start) / len(pending)
+    for key, frame in zip(pending, frames):
+        _prefetched[key] = (frame, per_config_sec)
+
+
+def warm_panel_cache(configs, session, batch_size=8):
+    """
+    여러 조합의 신호 데이터셋(panel)을 워커 풀에서 batch_size개씩 만들어 디스크 캐시에 저장만 합니다.
+    (이후 다른 프로세스에서도 prepare_market_data가 계산 없이 디스크에서 바로 읽음)
+    :return: 새로 만든 panel 수
+    """
+    pending = {}
+    for config in map(stamp_versions, configs):
+        key = get_signal_cache_key(config)
+        if key not in pending and not STAGE_CACHES['panel'].contains(key):
+            pending[key] = config
+
+    items = list(pending.items())
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        start = time.perf_counter()
+        frames = session.build_signal_frames([config for _, config in batch])
+        per_config_sec = (time.perf_counter() - start) / len(batch)
+        for (key, _), frame in zip(batch, frames):
+            STAGE_CACHES['panel'].put(key, frame, per_config_sec)
+    return len(pending)
+
+
+def is_panel_cached(config):
+    """config의 신호 데이터셋(panel)이 디스크 캐시에 있는지 (다른 프로세스에서도 계산 없이 읽을 수 있는지)"""
+    disk = STAGE_CACHES['panel'].disk
+    return disk is not None and disk.exists(get_signal_cache_key(stamp_versions(config)))
+
+
+def prepare_market_data(config=PORTFOLIO_CONFIG, use_cache=True, session=None, cache_only=False):
+    """
+    날짜별 신호 데이터(dict)와 날짜 리스트를 반환합니다.
+    같은 신호 설정으로 이미 만든 데이터셋은 메모리 -> 디스크 캐시 순으로 재사용하고,
+    없을 때만 종목별 단계 캐시를 거쳐 새로 만듭니다.
+
+    :param config: 포트폴리오 설정 딕셔너리
+    :param use_cache: False면 panel 캐시를 무시하고 새로 계산 (결과는 캐시에 다시 저장)
+    :param session: PortfolioSession (없으면 필요할 때 임시 세션 생성)
+    :param cache_only: True면 캐시에서만 읽고, 없으면 새로 만들지 않고 RuntimeError
+                       (Sweep 워커처럼 워커 풀을 새로 만들 수 없는 daemon 프로세스에서 사용)
+    """
+    # 데이터 / 코드 버전은 한 번만 계산해서 워커들에게 함께 전달
+    config = stamp_versions(config)
+    key = get_signal_cache_key(config)
 
-    print("⏳ [Step 2] 데이터 로드 중 (Bulk Load)...")
-    df_all = data_manager.get_all_price_data_bulk(start_date='2017-06-01')
-    if df_all.empty: return {}, []
+    if cache_only and key not in _grouped_cache and key not in _prefetched \
+            and not STAGE_CACHES['panel'].contains(key):
+        raise RuntimeError(f"신호 데이터셋 캐시 없음 (panel {key}) - 부모 프로세스에서 warm_panel_cache()로 먼저 만들어야 합니다.")
 
-    try:
-        spy_df = df_all[df_all['symbol'] == 'SPY'].set_index('date').sort_index()
-        if spy_df.empty:
-            spy_df = df_all[df_all['symbol'] == df_all['symbol'].iloc[0]].set_index('date').sort_index()
-    except:
-        return {}, []
-
-    print(f"🚀 [Step 3] 병렬 데이터 생성...")
-    tasks = []
-    grouped = df_all.groupby('symbol')
-
-    for symbol, group in grouped:
-        if symbol in target_tickers and symbol != 'SPY':
-            # [핵심] 일꾼에게 config를 함께 포장해서 전달!
-            tasks.append((symbol, group.set_index('date').sort_index(), config))
-
-    all_signals = []
-    with Pool(processes=cpu_count(), initializer=init_worker, initargs=(spy_df,)) as pool:
-        # tqdm 제거 (Optimizer 실행 시 로그 너무 많음)
-        results = list(pool.imap(process_single_stock, tasks))
-        all_signals = [res for res in results if res is not None]
+    if use_cache and key in _grouped_cache:
+        STAGE_CACHES['panel'].stats['hits'] += 1
+        return _grouped_cache[key]
 
-    if not all_signals: return {}, []
+    if key in _prefetched:
+        full_df, compute_sec = _prefetched.pop(key)
+        STAGE_CACHES['panel'].put(key, full_df, compute_sec)
+    else:
+        full_df = STAGE_CACHES['panel'].get_or_compute(key, lambda: _build_signal_frame(config, session),
+                                                       refresh=not use_cache)
+    if full_df is None: return {}, []
 
-    print("🔄 데이터 병합 중...")
-    full_df = pd.concat(all_signals)
-    full_df['date'] = pd.to_datetime(full_df['date'])
-    full_df = full_df[full_df['date'] >= '2018-01-01'].sort_values(['date', 'symbol'])
+    result = ({date: data for date, data in full_df.groupby('date')}, full_df['date'].unique())
 
-    return {date: data for date, data in full_df.groupby('date')}, full_df['date'].unique()
+    # 직전 panel 하나만 보관 (조합 순서가 정렬되어 있으면 연속 적중)
+    _grouped_cache.clear()
+    _grouped_cache[key] = result
+    return result
 
 
 # ==========================================
 # Portfolio 클래스
 # ==========================================
 class Portfolio:
-    def __init__(self, initial_cash, max_pos):
+    def __init__(self, initial_cash, max_pos, stats_only=False):
         self.initial_capital = initial_cash
         self.cash = initial_cash
         self.equity = initial_cash
@@ -217,6 +634,18 @@ class Portfolio:
         self.positions = {}
         self.history = []
         self.trade_log = []
+        # 통계 전용 모드: history / trade_log 대신 누적기만 갱신 (메모리 O(1))
+        self.stats = StreamingStats(initial_cash) if stats_only else None
+
+    @property
+    def closed_trades(self):
+        return int(self.stats.trades) if self.stats is not None else len(self.trade_log)
+
+    def record_equity(self, date):
+        if self.stats is not None:
+            self.stats.update(date, self.equity, self.cash)
+        else:
+            self.history.append({'date': date, 'equity': self.equity})
 
     def update_equity(self, current_prices):
         pos_value = 0
@@ -240,6 +669,9 @@ class Portfolio:
     def record_trade(self, symbol, entry_date, exit_date, entry_price, exit_price, shares, note=""):
         profit = (exit_price - entry_price) * shares
         ret = (exit_price - entry_price) / entry_price
+        if self.stats is not None:
+            self.stats.add_trade(ret, profit)
+            return
         self.trade_log.append({
             'symbol': symbol,
             'entry_date': entry_date,
@@ -254,21 +686,55 @@ class Portfolio:
 # ==========================================
 # [수정] 실행 엔진
 # ==========================================
-def run_backtest_with_config(config):
-    """Optimizer용 실행 함수"""
+def run_backtest_with_config(config, session=None, pruner=None):
+    """
+    Optimizer용 실행 함수
+    :param session: 최적화 루프 전체에서 공유할 PortfolioSession (없으면 임시 생성)
+    :param pruner: (선택) backtesting.pruning.Pruner - 규칙에 걸리면 시뮬레이션을 조기 중단하고
+                   결과에 pruned=True, prune_reason을 남김
+    """
     global PORTFOLIO_CONFIG
     PORTFOLIO_CONFIG = config
     # [핵심] config를 prepare_market_data에 전달
-    market_data, date_list = prepare_market_data(config)
+    with profiling.span('prepare'):
+        market_data, date_list = prepare_market_data(config, session=session)
     if not market_data: return None
 
-    pf = Portfolio(config['initial_capital'], config['max_positions'])
+    with profiling.span('engine'):
+        pf = simulate_portfolio(config, market_data, date_list, pruner=pruner, stats_only=True)
+    with profiling.span('metrics'):
+        return summarize_portfolio(pf, config, pruner=pruner)
+
+
+def window_dates(date_list, start=None, end=None):
+    """날짜 리스트에서 [start, end] 구간만 남깁니다. (None이면 열린 구간)"""
+    dates = pd.DatetimeIndex(date_list)
+    mask = np.ones(len(dates), dtype=bool)
+    if start is not None:
+        mask &= dates >= pd.Timestamp(start)
+    if end is not None:
+        mask &= dates <= pd.Timestamp(end)
+    return dates[mask]
+
+
+def simulate_portfolio(config, market_data, date_list, pruner=None, stats_only=False):
+    """
+    날짜별 신호 데이터로 포트폴리오를 시뮬레이션하고 Portfolio 객체를 반환합니다.
+    config에 sim_start / sim_end가 있으면 그 구간만 (초기 자본으로 새로 시작해서) 시뮬레이션합니다.
+
+    :param stats_only: True면 일별 자산/거래 기록을 남기지 않고 pf.stats(StreamingStats)만 갱신합니다.
+                       (최종 통계만 필요한 최적화 스윕용 - summarize_portfolio 결과는 동일)
+    """
+    date_list = window_dates(date_list, config.get('sim_start'), config.get('sim_end'))
+    pf = Portfolio(config['initial_capital'], config['max_positions'], stats_only=stats_only)
+    if pruner is not None:
+        pruner.reset()
 
     for date in date_list:
         day_data = market_data[date].set_index('symbol')
         current_prices = day_data['close'].to_dict()
         pf.update_equity(current_prices)
-        pf.history.append({'date': date, 'equity': pf.equity})
+        pf.record_equity(date)
 
         symbols_to_sell = []
         for symbol, info in pf.positions.items():
@@ -295,52 +761,33 @@ def run_backtest_with_config(config):
                             'entry_date': date, 'last_price': row['close']
                         }
 
-    if not pf.history: return None
+        # 가지치기 체크포인트 (체결 수 = 청산된 거래 + 보유 중인 포지션)
+        if pruner is not None and pruner.update(date, pf.equity, pf.closed_trades + len(pf.positions)):
+            break
 
-    history_df = pd.DataFrame(pf.history).set_index('date')
-    history_df['daily_ret'] = history_df['equity'].pct_change().fillna(0)
+    return pf
 
-    final_equity = history_df['equity'].iloc[-1]
-    total_ret = (final_equity - config['initial_capital']) / config['initial_capital'] * 100
-    mdd = ((history_df['equity'] - history_df['equity'].cummax()) / history_df['equity'].cummax()).min() * 100
-    days = (history_df.index[-1] - history_df.index[0]).days
-    cagr = ((final_equity / config['initial_capital']) ** (365 / days) - 1) * 100 if days > 0 else 0
 
-    # Metrics
-    std_dev = history_df['daily_ret'].std() * np.sqrt(252)
-    sharpe = (cagr / 100) / std_dev if std_dev > 0 else 0
-    down_std = history_df[history_df['daily_ret'] < 0]['daily_ret'].std() * np.sqrt(252)
-    sortino = (cagr / 100) / down_std if down_std > 0 else 0
-    calmar = abs(cagr / mdd) if mdd != 0 else 0
-
-    yearly = history_df['equity'].resample('Y').last().pct_change() * 100
-    yearly.iloc[0] = (history_df['equity'].resample('Y').last().iloc[0] - config['initial_capital']) / config[
-        'initial_capital'] * 100
-    yearly_json = json.dumps({str(k.year): round(v, 2) for k, v in yearly.items()})
-
-    trades_df = pd.DataFrame(pf.trade_log)
-    if not trades_df.empty:
-        total_trades = len(trades_df)
-        win_trades = trades_df[trades_df['return'] > 0]
-        loss_trades = trades_df[trades_df['return'] <= 0]
-        win_rate = len(win_trades) / total_trades * 100
-        profit_factor = win_trades['profit'].sum() / abs(loss_trades['profit'].sum()) if loss_trades[
-                                                                                             'profit'].sum() != 0 else 99.9
-        avg_win = win_trades['return'].mean() * 100 if not win_trades.empty else 0
-        avg_loss = loss_trades['return'].mean() * 100 if not loss_trades.empty else 0
+def summarize_portfolio(pf, config, pruner=None):
+    """시뮬레이션이 끝난 Portfolio로 성과 지표 딕셔너리를 만듭니다. (기록이 없으면 None)"""
+    if pf.stats is not None:
+        stats = pf.stats.portfolio_stats()
+        if stats is None: return None
     else:
-        total_trades = 0;
-        win_rate = 0.0;
-        profit_factor = 0.0;
-        avg_win = 0.0;
-        avg_loss = 0.0
-
-    return {
-        'return': total_ret, 'cagr': cagr, 'mdd': mdd, 'final_equity': final_equity,
-        'sharpe': sharpe, 'sortino': sortino, 'calmar': calmar, 'yearly_json': yearly_json,
-        'total_trades': total_trades, 'win_rate': win_rate, 'profit_factor': profit_factor,
-        'avg_win': avg_win, 'avg_loss': avg_loss
+        if not pf.history: return None
+        stats = metrics.portfolio_stats(pf.history, pf.trade_log, config['initial_capital'])
+    yearly_json = json.dumps({str(year): round(ret, 2) for year, ret in stats['yearly'].items()})
+
+    result = {
+        'return': stats['return'], 'cagr': stats['cagr'], 'mdd': stats['mdd'], 'final_equity': stats['final_equity'],
+        'sharpe': stats['sharpe'], 'sortino': stats['sortino'], 'calmar': stats['calmar'], 'yearly_json': yearly_json,
+        'total_trades': stats['total_trades'], 'win_rate': stats['win_rate'], 'profit_factor': stats['profit_factor'],
+        'avg_win': stats['avg_win'], 'avg_loss': stats['avg_loss']
     }
+    if pruner is not None:
+        result['pruned'] = pruner.reason is not None
+        result['prune_reason'] = pruner.reason
+    return result
 
 
 def run_portfolio_simulation():
@@ -366,26 +813,10 @@ if __name__ == "__main__":
 def analyze_results(pf):
     if not pf.history: return
 
-    # 데이터 가공
-    history_df = pd.DataFrame(pf.history).set_index('date')
-    history_df['daily_ret'] = history_df['equity'].pct_change().fillna(0)
-
-    final = history_df['equity'].iloc[-1]
-    initial = pf.initial_capital
-    total_ret = (final - initial) / initial * 100
-
-    roll_max = history_df['equity'].cummax()
-    mdd = ((history_df['equity'] - roll_max) / roll_max).min() * 100
-
-    days = (history_df.index[-1] - history_df.index[0]).days
-    cagr = ((final / initial) ** (365 / days) - 1) * 100 if days > 0 else 0
-
-    # 지표
-    std_dev = history_df['daily_ret'].std() * np.sqrt(252)
-    sharpe = (cagr / 100) / std_dev if std_dev > 0 else 0
-    down_std = history_df[history_df['daily_ret'] < 0]['daily_ret'].std() * np.sqrt(252)
-    sortino = (cagr / 100) / down_std if down_std > 0 else 0
-    calmar = abs(cagr / mdd) if mdd != 0 else 0
+    stats = metrics.portfolio_stats(pf.history, pf.trade_log, pf.initial_capital)
+    final, initial = stats['final_equity'], pf.initial_capital
+    total_ret, cagr, mdd = stats['return'], stats['cagr'], stats['mdd']
+    sharpe, sortino, calmar = stats['sharpe'], stats['sortino'], stats['calmar']
 
     trades_df = pd.DataFrame(pf.trade_log)
 
@@ -399,13 +830,8 @@ def analyze_results(pf):
     print(f"📐 Sharpe   : {sharpe:.2f} | Sortino: {sortino:.2f} | Calmar: {calmar:.2f}")
     print("-" * 50)
 
+    total, win_rate, pf_val = stats['total_trades'], stats['win_rate'], stats['profit_factor']
     if not trades_df.empty:
-        total = len(trades_df)
-        wins = len(trades_df[trades_df['return'] > 0])
-        win_rate = wins / total * 100
-        pf_val = trades_df[trades_df['return'] > 0]['profit'].sum() / abs(
-            trades_df[trades_df['return'] <= 0]['profit'].sum())
-
         print(f"🔄 총 거래수 : {total}회")
         print(f"🎯 승률     : {win_rate:.2f}%")
         print(f"⚖️ 손익비   : {pf_val:.2f}")
@@ -418,18 +844,16 @@ def analyze_results(pf):
 
     print("-" * 50)
     print("[연도별 수익률]")
-    yearly = history_df['equity'].resample('Y').last().pct_change() * 100
-    yearly.iloc[0] = (history_df['equity'].resample('Y').last().iloc[0] - initial) / initial * 100
-    for y, r in yearly.items():
-        print(f"{y.year}: {r:6.2f}%")
+    for y, r in stats['yearly'].items():
+        print(f"{y}: {r:6.2f}%")
     print("=" * 50)
 
     # 단독 실행 시에도 DB 저장
     res_dict = {
         'return': total_ret, 'cagr': cagr, 'mdd': mdd, 'sharpe': sharpe, 'sortino': sortino,
-        'calmar': calmar, 'yearly_json': json.dumps({str(k.year): round(v, 2) for k, v in yearly.items()}),
+        'calmar': calmar, 'yearly_json': json.dumps({str(y): round(r, 2) for y, r in stats['yearly'].items()}),
         'final_equity': final, 'total_trades': total, 'win_rate': win_rate, 'profit_factor': pf_val,
-        'avg_win': 0, 'avg_loss': 0  # analyze_results에서는 생략했지만 DB 저장을 위해 dummy
+        'avg_win': stats['avg_win'], 'avg_loss': stats['avg_loss']
     }
     # save_to_db는 optimizer에 있으므로 여기서는 생략하거나 별도 구현
 
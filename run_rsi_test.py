@@ -1,7 +1,7 @@
 # [ 📄 run_rsi_test.py (신규 파일) ]
 
 import config
-from run_backtest import run_single_backtest  # 리팩토링된 단일 실행 함수 임포트
+from run_backtest import build_context, run_single_backtest  # 공용 context 조립 / 단일 실행 함수
 
 
 def main_rsi_test():
@@ -19,29 +19,8 @@ def main_rsi_test():
     print(f"대상 종목: {SYMBOL_TO_TEST}")
     print("=" * 50)
 
-    # --- 2. 전략에 필요한 모든 설정값 로드 ---
-    # (run_single_backtest가 모든 키를 필요로 하므로,
-    #  터틀/RSI 설정값을 모두 로드합니다)
-    context = {
-        'strategy_name': STRATEGY_NAME,
-        'symbol': SYMBOL_TO_TEST,
-        'initial_capital': 10000.0,
-        'output_size': 'full',
-
-        # (터틀 설정) - 사용되진 않지만, 로깅 등을 위해 전달
-        'entry_period': config.TURTLE_ENTRY_PERIOD,
-        'exit_period': config.TURTLE_EXIT_PERIOD,
-        'atr_period': config.ATR_PERIOD,
-
-        # (RSI 설정) - RSI 지표/신호 함수가 사용할 값
-        'rsi_period': config.RSI_PERIOD,
-        'rsi_oversold': config.RSI_OVERSOLD,
-        'rsi_overbought': config.RSI_OVERBOUGHT,
-
-        # (리스크/엔진 설정) - RSI 전략에도 동일하게 적용해볼 값
-        'risk_percent': config.RISK_PER_TRADE_PERCENT,
-        'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER
-    }
+    # --- 2. 전략에 필요한 모든 설정값 로드 (config.py 기본값) ---
+    context = build_context(STRATEGY_NAME, SYMBOL_TO_TEST)
 
     # --- 3. 단일 백테스트 실행 ---
     run_single_backtest(context)
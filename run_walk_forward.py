@@ -0,0 +1,162 @@
+import itertools
+import time
+import argparse
+import pandas as pd
+import config
+from run_portfolio_backtest import (PortfolioSession, order_params_for_reuse, warm_panel_cache, prepare_market_data,
+                                    simulate_portfolio, summarize_portfolio, get_signal_cache_key, is_panel_cached,
+                                    TASK_CONFIGS)
+from run_optimizer import params_grid, build_config, score_result
+from backtesting.sweep import run_sweep
+from backtesting.walk_forward import make_folds, stitch_equity, equity_stats
+
+
+# ==============================================================================
+# 🔁 워크포워드 분석 (Walk-forward Analysis)
+# ==============================================================================
+# 1) 조합마다 신호 데이터셋(지표 -> 투표 -> 점수 -> 신호)을 '전체 기간'으로 한 번만 만들어 디스크 캐시에 저장
+#    -> 겹치는 fold들이 같은 지표 계산 결과를 공유 (fold마다 다시 계산하지 않음)
+# 2) (조합, fold) 작업을 프로세스 풀에서 병렬로: 훈련 구간 / 검증 구간 시뮬레이션
+# 3) fold마다 훈련 구간 샤프 1위 조합을 고르고, 그 조합의 검증 구간 자산곡선만 이어 붙여 OOS 성과 계산
+
+
+def load_fold_data(config_key):
+    """
+    [워커] 신호 데이터셋 해시 -> (날짜별 신호 dict, 날짜 리스트) (디스크 캐시에서만 읽음)
+    Sweep 워커는 daemon 프로세스라 워커 풀을 만들 수 없으므로, 캐시에 없으면 계산하지 않고 에러
+    (부모 프로세스가 run_walk_forward 3단계에서 모든 조합의 캐시를 미리 만들어 둠)
+    """
+    current_config = TASK_CONFIGS.get(config_key)
+    if current_config is None:
+        raise RuntimeError(f"작업 config 없음 ({config_key})")
+    market_data, date_list = prepare_market_data(current_config, cache_only=True)
+    return (market_data, date_list) if market_data else None
+
+
+def evaluate_fold(data, job):
+    """[워커] 조합 하나를 fold 하나의 훈련/검증 구간에서 시뮬레이션합니다."""
+    market_data, date_list = data
+    current_config, fold = job
+
+    output = {}
+    for phase in ('train', 'test'):
+        window_config = dict(current_config, sim_start=fold[f'{phase}_start'], sim_end=fold[f'{phase}_end'])
+        # 훈련 구간은 통계만 필요 (자산곡선은 검증 구간만 이어 붙임)
+        pf = simulate_portfolio(window_config, market_data, date_list, stats_only=(phase == 'train'))
+        output[phase] = summarize_portfolio(pf, window_config)
+        if phase == 'test' and pf.history:
+            history = pd.DataFrame(pf.history)
+            output['equity'] = pd.Series(history['equity'].values, index=pd.DatetimeIndex(history['date']))
+    return output if output['train'] else None
+
+
+def run_walk_forward(processes=None, anchored=config.WALK_FORWARD_ANCHORED,
+                     train_months=config.WALK_FORWARD_TRAIN_MONTHS, test_months=config.WALK_FORWARD_TEST_MONTHS):
+    start_time = time.time()
+
+    # 1. fold 생성
+    folds = make_folds(config.WALK_FORWARD_START, config.WALK_FORWARD_END,
+                       train_months=train_months, test_months=test_months, anchored=anchored)
+    if not folds:
+        print("❌ fold를 만들 수 없습니다. (기간이 훈련 구간보다 짧음)")
+        return None
+
+    print(f"🔁 워크포워드 ({'Anchored' if anchored else 'Rolling'}, 훈련 {train_months}개월 / 검증 {test_months}개월) "
+          f"- fold {len(folds)}개")
+    for fold in folds:
+        print(f"   #{fold['fold']} 훈련 {fold['train_start']} ~ {fold['train_end']} | "
+              f"검증 {fold['test_start']} ~ {fold['test_end']}")
+
+    # 2. 파라미터 조합 (지표 파라미터가 가장 느리게 바뀌도록 정렬 -> 단계 캐시 재사용)
+    keys, values = zip(*order_params_for_reuse(params_grid).items())
+    combinations = [dict(zip(keys, v)) for v in itertools.product(*values)]
+    configs = [build_config(params) for params in combinations]
+    varying = [k for k in keys if len(params_grid[k]) > 1]
+
+    # 3. 신호 데이터셋은 조합마다 전체 기간으로 1회만 계산 (모든 fold가 공유)
+    with PortfolioSession(processes=processes) as session:
+        built = warm_panel_cache(configs, session)
+    print(f"💾 신호 데이터셋: 새로 계산 {built}개 / 캐시 재사용 {len(set(map(get_signal_cache_key, configs))) - built}개")
+
+    # 워커는 디스크 캐시에서만 읽으므로, 신호 데이터셋을 만들지 못한 조합(결과 없음)은 여기서 제외
+    cached = [c for c in configs if is_panel_cached(c)]
+    if len(cached) < len(configs):
+        print(f"⚠️ 신호 데이터셋이 없는 조합 {len(configs) - len(cached)}개 제외 (신호 없음 / 계산 실패)")
+    configs = cached
+    if not configs:
+        print("❌ 평가할 조합이 없습니다.")
+        return None
+
+    # 4. (조합, fold) 작업 병렬 실행 - 같은 신호 데이터셋을 쓰는 작업끼리 묶여서 워커에 전달됨
+    jobs = []
+    for current_config in configs:
+        config_key = get_signal_cache_key(current_config)
+        TASK_CONFIGS.put(config_key, current_config)
+        jobs += [(config_key, (current_config, fold)) for fold in folds]
+
+    results, _ = run_sweep(jobs, evaluate_fold, load_fold_data, processes=processes,
+                           desc="Walk-forward", data_cache_size=1)
+
+    # 5. fold별 최적 조합 선택 (훈련 구간 샤프 기준) -> 검증 구간 성과
+    best = {}
+    for (_, (current_config, fold)), output in results:
+        score = score_result(output['train'])
+        if score is None:
+            continue
+        if fold['fold'] not in best or score > best[fold['fold']][0]:
+            best[fold['fold']] = (score, current_config, output)
+
+    rows, curves = [], []
+    for fold in folds:
+        if fold['fold'] not in best:
+            print(f"⚠️ fold #{fold['fold']}: 유효한 결과 없음")
+            continue
+        score, current_config, output = best[fold['fold']]
+        test = output['test'] or {}
+        row = {'fold': fold['fold'], 'test_period': f"{fold['test_start']} ~ {fold['test_end']}"}
+        row.update({k: current_config[k] for k in varying})
+        row.update({
+            'train_sharpe': score,
+            'test_return': test.get('return', 0.0), 'test_mdd': test.get('mdd', 0.0),
+            'test_sharpe': test.get('sharpe', 0.0), 'test_trades': test.get('total_trades', 0),
+        })
+        rows.append(row)
+        curves.append(output.get('equity'))
+
+    if not rows:
+        return None
+
+    df_folds = pd.DataFrame(rows)
+    initial_capital = configs[0]['initial_capital']
+    oos_equity = stitch_equity(curves, initial_capital)
+    stats = equity_stats(oos_equity)
+
+    print("\n" + "=" * 80)
+    print("🧭 fold별 선택 파라미터 (훈련 구간 샤프 1위) 와 검증 구간 성과")
+    print("-" * 80)
+    print(df_folds.to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    print("\n" + "=" * 80)
+    print("📈 OOS 자산곡선 연결 결과")
+    print("-" * 80)
+    if len(oos_equity):
+        print(f"기간      : {oos_equity.index[0].date()} ~ {oos_equity.index[-1].date()}")
+        print(f"최종 자본 : ${oos_equity.iloc[-1]:,.0f} (초기 ${initial_capital:,.0f})")
+    print(f"총 수익률 : {stats['return']:.2f}% | CAGR: {stats['cagr']:.2f}% | "
+          f"MDD: {stats['mdd']:.2f}% | Sharpe: {stats['sharpe']:.2f}")
+    print(f"\n⏱️ 총 소요 시간: {time.time() - start_time:.1f}초")
+
+    return df_folds, oos_equity, stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="포트폴리오 전략 워크포워드 분석")
+    parser.add_argument('--anchored', action='store_true', default=config.WALK_FORWARD_ANCHORED,
+                        help="훈련 구간 시작을 고정 (기본: Rolling)")
+    parser.add_argument('--train-months', type=int, default=config.WALK_FORWARD_TRAIN_MONTHS)
+    parser.add_argument('--test-months', type=int, default=config.WALK_FORWARD_TEST_MONTHS)
+    parser.add_argument('--processes', type=int, default=None, help="워커 수 (기본: CPU 코어 수)")
+    args = parser.parse_args()
+
+    run_walk_forward(processes=args.processes, anchored=args.anchored,
+                     train_months=args.train_months, test_months=args.test_months)
@@ -1,13 +1,19 @@
 import pandas as pd
-from tqdm import tqdm
+import numpy as np
+import json
+import os
 import time
+from functools import lru_cache
 
 # 만든 모듈들 임포트
 import data_manager
+import database
 import market_analyzer
 import indicator
 import strategy
 import config  # 설정값 (필요시)
+from backtesting.cache import config_hash, code_fingerprint
+from backtesting.universe_scan import scan_universe
 
 # ==========================================
 # ⚙️ 앙상블 전략 설정 (가중치 및 기준점)
@@ -38,6 +44,17 @@ DEFAULT_PARAMS = {
     'dema_short_period': 20, 'dema_long_period': 50
 }
 
+# latest_signals 갱신 설정
+LOOKBACK_START = "2023-01-01"  # 지표 계산에 쓰는 데이터 시작일 (SMA 200 등 워밍업 포함)
+MIN_BARS = 200  # 데이터가 이보다 짧은 종목은 점수 없이(NULL) 기록
+WRITE_BATCH = 200  # latest_signals에 한 번에 쓰는 행 수
+PRICE_COLUMNS = ['open', 'high', 'low', 'close', 'adj_close', 'volume']
+
+# 점수 계산 로직이 들어 있는 소스 파일 -> 코드가 바뀌면 latest_signals 전체 재계산
+# (실행 위치와 무관하게 이 파일 기준 경로로 읽음)
+CODE_VERSION_FILES = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                           for name in ('screener.py', 'indicator.py', 'strategy.py'))
+
 
 # ==========================================
 # 🛠️ 내부 헬퍼 함수
@@ -80,16 +97,170 @@ def _calculate_ensemble_score(latest_row):
     return total_score, triggered_strategies
 
 
+@lru_cache(maxsize=1)
+def _code_version():
+    """지금 프로세스가 로드한 점수 계산 코드의 버전 (종목마다 파일을 다시 읽지 않도록 1회만 계산)"""
+    return code_fingerprint(CODE_VERSION_FILES)
+
+
+def _params_hash():
+    """지표 파라미터 / 가중치 / 기간 / 코드가 바뀌면 달라지는 해시 (latest_signals 전체 재계산 판단용)"""
+    return config_hash({'params': DEFAULT_PARAMS, 'weights': STRATEGY_WEIGHTS,
+                        'strategies': strategy.ENSEMBLE_STRATEGIES, 'start': LOOKBACK_START, 'min_bars': MIN_BARS,
+                        'code': _code_version()})
+
+
+def _to_db_value(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def compute_latest_signal(symbol):
+    """[스캔 워커] 종목 하나의 데이터를 읽어 latest_signals 1행을 만듭니다. (마지막 bar 기준, 데이터 없으면 None)"""
+    df = data_manager.get_price_data(symbol, start_date=LOOKBACK_START)
+    return score_frame(symbol, df)
+
+
+def score_frame(symbol, df):
+    """
+    이미 로드된 가격 DataFrame(LOOKBACK_START 이후)으로 latest_signals 1행을 만듭니다.
+    (compute_latest_signal과 상주 조회 서비스(service.py)가 함께 사용)
+    """
+    if df is None or df.empty: return None
+
+    signal_columns = [f'signal_{name}' for name in strategy.ENSEMBLE_STRATEGIES]
+    row = {'symbol': symbol, 'date': df.index[-1].strftime('%Y-%m-%d'), 'close': float(df['close'].iloc[-1]),
+           'bars': len(df), 'score': None, 'strategies': None, 'indicators_json': None,
+           'params_hash': _params_hash()}
+    row.update({col: None for col in signal_columns})
+
+    # 데이터가 너무 짧으면 점수 없이 기록만 (다음 bar가 들어오기 전까지 다시 계산하지 않음)
+    if len(df) < MIN_BARS:
+        return row
+
+    # 모든 지표 계산 -> 모든 전략 신호 생성 (strategy.py의 앙상블 함수 사용)
+    df = _prepare_data_for_ensemble(df)
+    if df is None: return row
+    df = strategy.apply_ensemble_strategy(df, DEFAULT_PARAMS)
+
+    # 점수 채점 (오늘 날짜 기준)
+    latest_row = df.iloc[-1]
+    score, reasons = _calculate_ensemble_score(latest_row)
+    row['score'] = score
+    row['strategies'] = ", ".join(reasons)
+    for col in signal_columns:
+        if col in latest_row:
+            row[col] = _to_db_value(latest_row[col])
+
+    # 마지막 bar의 지표 상태 (가격 / 신호 컬럼 제외)
+    indicators = {k: _to_db_value(v) for k, v in latest_row.items()
+                  if k not in PRICE_COLUMNS and not k.startswith('signal') and k != 'position'}
+    row['indicators_json'] = json.dumps(indicators, default=str)
+    return row
+
+
+def find_stale_symbols(conn, params_hash=None):
+    """
+    latest_signals를 다시 계산해야 하는 종목 리스트
+    (행이 없거나, daily_price에 더 새 bar가 있거나, 계산 파라미터가 바뀐 종목)
+    """
+    params_hash = params_hash or _params_hash()
+    rows = conn.execute("""
+        SELECT p.symbol
+        FROM (SELECT symbol, MAX(date) AS last_date FROM daily_price GROUP BY symbol) p
+        LEFT JOIN latest_signals s ON s.symbol = p.symbol
+        WHERE s.symbol IS NULL OR s.date < p.last_date OR s.params_hash IS NOT ?
+    """, (params_hash,)).fetchall()
+    return [r[0] for r in rows]
+
+
+def _write_latest_signals(conn, rows):
+    if not rows: return
+    columns = list(rows[0].keys())
+    conn.executemany(
+        f"INSERT OR REPLACE INTO latest_signals ({', '.join(columns)}, updated_at) "
+        f"VALUES ({', '.join('?' * len(columns))}, CURRENT_TIMESTAMP)",
+        [tuple(r[c] for c in columns) for r in rows])
+    conn.commit()
+
+
+def update_latest_signals(tickers=None, verbose=True, processes=None):
+    """
+    [야간 파이프라인] 새 bar가 들어온 종목만 지표/전략 신호/앙상블 점수를 다시 계산해 latest_signals에 저장합니다.
+    (계산은 universe_scan으로 병렬, DB 기록은 메인 프로세스에서 WRITE_BATCH 단위로)
+
+    :param tickers: 대상 종목 (기본: data_manager.get_ticker_list())
+    :param processes: 스캔 워커 수 (기본: CPU 코어 수)
+    :return: 갱신한 종목 수
+    """
+    conn = database.get_connection()
+    try:
+        database.create_latest_signals_table(conn.cursor())
+        stale = find_stale_symbols(conn)
+        universe = set(tickers if tickers is not None else data_manager.get_ticker_list())
+        stale = [s for s in stale if s in universe]
+        if verbose:
+            print(f" 👉 latest_signals: {len(universe)}개 중 {len(stale)}개 종목 갱신")
+
+        if not stale: return 0
+
+        pending = []
+
+        def on_result(symbol, row):
+            pending.append(row)
+            if len(pending) >= WRITE_BATCH:
+                _write_latest_signals(conn, pending)
+                pending.clear()
+
+        # 실패한 종목은 기록하지 않음 -> 다음 실행 때 다시 갱신 대상
+        results, _, _ = scan_universe(stale, compute_latest_signal, on_result=on_result, processes=processes,
+                                      desc="Latest signals", verbose=verbose)
+        _write_latest_signals(conn, pending)
+        return len(results)
+    finally:
+        conn.close()
+
+
+def query_latest_signals(threshold=SCORE_THRESHOLD, tickers=None):
+    """
+    latest_signals에서 점수가 threshold 이상인 종목을 점수 높은 순으로 조회 (SQL 한 번)
+    상장폐지 / 유니버스에서 빠진 종목의 예전 행은 제외합니다.
+
+    :param tickers: 대상 종목 (기본: get_ticker_list()와 같은 유니버스 - tickers 테이블, 비어 있으면 전체)
+    """
+    conn = database.get_connection()
+    try:
+        database.create_latest_signals_table(conn.cursor())
+        has_tickers = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tickers'").fetchone() is not None
+        universe_filter = ("AND (symbol IN (SELECT symbol FROM tickers) OR NOT EXISTS (SELECT 1 FROM tickers))"
+                           if has_tickers and tickers is None else "")
+        df = pd.read_sql(f"""
+            SELECT symbol AS Symbol, date AS Date, close AS Price, score AS Score, strategies AS Strategies
+            FROM latest_signals
+            WHERE score >= ? {universe_filter}
+            ORDER BY score DESC, symbol
+        """, conn, params=(threshold,))
+    finally:
+        conn.close()
+    if tickers is not None:
+        df = df[df['Symbol'].isin(set(tickers))].reset_index(drop=True)
+    return df
+
+
 # ==========================================
 # 🚀 메인 스크리너 함수
 # ==========================================
 
-def run_screener():
+def run_screener(refresh=False, threshold=SCORE_THRESHOLD):
     """
     1. 시장 상태 확인 (Market Check)
-    2. 전체 종목 순회 (Loop)
-    3. 앙상블 점수 계산 (Scoring)
+    2. (refresh=True면) 새 bar가 있는 종목만 latest_signals 갱신
+    3. latest_signals 조회 (Scoring은 야간 파이프라인에서 이미 끝남)
     4. 결과 리포트 반환 (Reporting)
+
+    :param threshold: 매수 후보 최소 합산 점수 (기본: SCORE_THRESHOLD)
     """
     print("\n" + "=" * 50)
     print("🕵️  STOCK SCREENER v4.0 (Ensemble Edition)")
@@ -110,65 +281,25 @@ def run_screener():
         print("   (현금 비중을 늘리고 관망하는 것을 추천합니다.)")
         return []
 
-    # 2. 종목 리스트 가져오기
-    print("\n[Step 2] 분석 대상 종목 로딩 중...")
-    tickers = data_manager.get_ticker_list()
-    print(f" 👉 총 {len(tickers)}개 종목 분석 시작")
-
-    recommendations = []
-
-    # 3. 전체 종목 순회 (tqdm으로 진행률 표시)
-    print("\n[Step 3] 전략 앙상블 가동...")
-    time.sleep(0.5)  # UX를 위한 짧은 대기
-
-    for symbol in tqdm(tickers):
-        try:
-            # (1) 데이터 가져오기 (DB)
-            # 최근 300일 치만 가져와도 충분 (속도 최적화)
-            df = data_manager.get_price_data(symbol, start_date="2023-01-01")
-
-            if df is None or len(df) < 200:  # 데이터가 너무 짧으면 패스
-                continue
-
-            # (2) 모든 지표 계산
-            df = _prepare_data_for_ensemble(df)
-            if df is None: continue
-
-            # (3) 모든 전략 신호 생성 (strategy.py의 앙상블 함수 사용)
-            df = strategy.apply_ensemble_strategy(df, DEFAULT_PARAMS)
-
-            # (4) 점수 채점 (오늘 날짜 기준)
-            latest_row = df.iloc[-1]
-            score, reasons = _calculate_ensemble_score(latest_row)
-
-            # (5) 합격자 선발
-            if score >= SCORE_THRESHOLD:
-                # 결과 저장
-                rec = {
-                    'Symbol': symbol,
-                    'Date': latest_row.name.strftime('%Y-%m-%d'),
-                    'Price': latest_row['close'],
-                    'Score': score,
-                    'Strategies': ", ".join(reasons),  # 어떤 전략들이 추천했는지 기록
-                    'Market': status_code
-                }
-                recommendations.append(rec)
-
-        except Exception as e:
-            # 개별 종목 에러는 무시하고 계속 진행
-            # print(f"Error analyzing {symbol}: {e}")
-            continue
-
-    # 4. 결과 정렬 및 출력
+    # 2. 최신 신호 테이블 갱신 (야간 파이프라인이 이미 했다면 건너뜀)
+    if refresh:
+        print("\n[Step 2] 최신 신호 갱신 중 (새 bar가 있는 종목만)...")
+        update_latest_signals()
+
+    # 3. 조회
+    print("\n[Step 3] 최신 신호 조회 중...")
+    start = time.time()
+    df_result = query_latest_signals(threshold)
+    print(f" 👉 조회 완료 ({(time.time() - start) * 1000:.1f}ms)")
+
+    # 4. 결과 출력
     print("\n[Step 4] 최종 결과 집계 중...")
 
-    if not recommendations:
+    if df_result.empty:
         print("\n🤷 조건에 부합하는 종목을 찾지 못했습니다.")
         return []
 
-    # 점수 높은 순으로 정렬
-    df_result = pd.DataFrame(recommendations)
-    df_result = df_result.sort_values(by='Score', ascending=False).reset_index(drop=True)
+    df_result['Market'] = status_code
 
     print(f"\n🎉 총 {len(df_result)}개 유망 종목 발견!\n")
     print(df_result[['Symbol', 'Price', 'Score', 'Strategies']].to_string())
@@ -178,4 +309,4 @@ def run_screener():
 
 # 테스트용 실행
 if __name__ == "__main__":
-    run_screener()
\ No newline at end of file
+    run_screener(refresh=True)
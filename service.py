@@ -0,0 +1,336 @@
+# service.py (로컬 조회 서비스)
+# 가격 데이터 / 지표 점수 / 최신 신호 / 시장 상태를 메모리에 올려두고 HTTP/JSON으로 바로 답하는 상주 프로세스
+#
+# - 시작할 때 가격 데이터 전체(SERVICE_PRICE_START 이후)를 한 번의 쿼리로 읽어 {종목: DataFrame}으로 보관
+# - 종목 점수 / 단일 종목 백테스트 결과는 LRU 캐시 (같은 요청은 다시 계산하지 않음)
+# - 시장 상태(regime) / 스크리너 목록은 데이터 버전마다 한 번만 계산
+# - SERVICE_RELOAD_CHECK_SEC마다 DB의 daily_price가 바뀌었는지 확인해 바뀌었으면 다시 로드 (POST /reload로 즉시)
+# - 127.0.0.1에만 바인딩 (외부 네트워크 / 외부 API 호출 없음)
+#
+# 실행)
+#   python service.py [--host 127.0.0.1] [--port 8765]
+#
+# 조회 예)
+#   curl "localhost:8765/score?symbol=AAPL"
+#   curl "localhost:8765/backtest?symbol=AAPL&strategy=macd&start=2020-01-01&end=2024-12-31&macd_fast_period=8"
+#   curl "localhost:8765/screener?threshold=2.5"
+#   curl "localhost:8765/regime"
+#   curl -X POST "localhost:8765/reload"
+
+import argparse
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+import config
+import data_manager
+import database
+import market_analyzer
+import screener
+from backtesting.cache import config_hash
+from run_backtest import INDICATOR_FUNCTIONS, build_context, simulate_backtest
+
+
+class ServiceError(Exception):
+    """요청 처리 실패 (HTTP 상태 코드 포함)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """스레드 안전한 고정 크기 LRU 캐시 (가장 오래 안 쓴 항목부터 제거)"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+def _parse_value(text):
+    """쿼리 문자열 값 -> int / float / str"""
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _to_json(value):
+    """numpy / pandas 값과 NaN을 JSON으로 보낼 수 있는 값으로 변환"""
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return [_to_json(v) for v in value.tolist()]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    if isinstance(value, (pd.Timestamp, pd.Timedelta)):
+        return str(value)
+    return value
+
+
+class MarketDataService:
+    """
+    메모리 상주 데이터 / 캐시를 관리하고 각 조회 요청을 처리합니다. (HTTP 핸들러와 분리되어 있어 직접 호출도 가능)
+
+    :param start_date: 메모리에 올릴 가격 데이터 시작일
+    :param cache_size: 점수 / 백테스트 결과 LRU 캐시 항목 수
+    :param reload_check_sec: DB 변경 확인 간격 (None이면 자동 재로드 안 함)
+    """
+
+    def __init__(self, start_date=config.SERVICE_PRICE_START, cache_size=config.SERVICE_CACHE_SIZE,
+                 reload_check_sec=config.SERVICE_RELOAD_CHECK_SEC):
+        self.start_date = start_date
+        self.reload_check_sec = reload_check_sec
+        self.cache = LRUCache(cache_size)
+        self._lock = threading.RLock()
+        self.frames = {}
+        self.version = None
+        self.loaded_at = None
+        self._checked_at = 0.0
+        self._regime = None
+        self._signals = None
+
+    # ------------------------------------------------------------------
+    # 데이터 로드 / 버전 관리
+    # ------------------------------------------------------------------
+    def _data_version(self):
+        """daily_price의 (행 수, 최신 날짜, 최대 id) - 수집기가 새 bar를 넣으면 바뀜"""
+        conn = database.get_connection()
+        try:
+            return tuple(conn.execute("SELECT COUNT(*), MAX(date), MAX(id) FROM daily_price").fetchone())
+        finally:
+            conn.close()
+
+    def load(self):
+        """가격 데이터 전체를 한 번의 쿼리로 다시 읽고 모든 캐시를 비웁니다."""
+        with self._lock:
+            start = time.time()
+            version = self._data_version()
+            df_all = data_manager.get_all_price_data_bulk(start_date=self.start_date)
+            frames = {}
+            if not df_all.empty:
+                df_all = df_all.sort_values(['symbol', 'date'], kind='stable')
+                frames = {symbol: group.drop(columns='symbol').set_index('date')
+                          for symbol, group in df_all.groupby('symbol', sort=False)}
+
+            self.frames = frames
+            self.version = version
+            self.loaded_at = time.strftime('%Y-%m-%d %H:%M:%S')
+            self._checked_at = time.time()
+            self._regime = None
+            self._signals = None
+            self.cache.clear()
+            print(f"📦 [Service] {len(frames)}개 종목 / {len(df_all)}행 로드 ({time.time() - start:.1f}초, "
+                  f"최신 날짜 {version[1]})")
+            return len(frames)
+
+    def refresh_if_stale(self):
+        """마지막 확인 후 reload_check_sec가 지났으면 DB 변경 여부를 확인하고, 바뀌었으면 다시 로드"""
+        if self.reload_check_sec is None or time.time() - self._checked_at < self.reload_check_sec:
+            return False
+        with self._lock:
+            if time.time() - self._checked_at < self.reload_check_sec:
+                return False
+            self._checked_at = time.time()
+            if self._data_version() == self.version:
+                return False
+            self.load()
+            return True
+
+    def _frame(self, symbol):
+        df = self.frames.get(symbol.upper())
+        if df is None:
+            raise ServiceError(f"가격 데이터가 없는 종목: {symbol}", status=404)
+        return df
+
+    # ------------------------------------------------------------------
+    # 조회
+    # ------------------------------------------------------------------
+    def health(self):
+        return {'status': 'ok', 'symbols': len(self.frames), 'version': self.version, 'loaded_at': self.loaded_at,
+                'cache': {'size': len(self.cache), 'hits': self.cache.hits, 'misses': self.cache.misses}}
+
+    def score(self, symbol):
+        """종목 하나의 앙상블 점수 / 전략별 신호 / 마지막 bar 지표 (screener.score_frame과 같은 결과)"""
+        symbol = symbol.upper()
+        key = ('score', symbol)
+        row = self.cache.get(key)
+        if row is None:
+            df = self._frame(symbol).loc[screener.LOOKBACK_START:]
+            row = screener.score_frame(symbol, df.copy())
+            if row is None:
+                raise ServiceError(f"{screener.LOOKBACK_START} 이후 데이터가 없는 종목: {symbol}", status=404)
+            row = dict(row)
+            row['indicators'] = json.loads(row.pop('indicators_json') or 'null')
+            self.cache.put(key, row)
+        return row
+
+    def backtest(self, symbol, params):
+        """
+        단일 종목 백테스트 (run_backtest.simulate_backtest를 메모리의 가격 데이터로 실행)
+
+        :param params: strategy / start / end / 그 밖의 context 키(entry_period 등) 오버라이드
+        """
+        context = build_context()
+        params = dict(params)
+        if 'strategy' in params:
+            context['strategy_name'] = params.pop('strategy')
+        start_date, end_date = params.pop('start', None), params.pop('end', None)
+        context.update({k: _parse_value(v) for k, v in params.items()})
+        context['symbol'] = symbol.upper()
+        if context['strategy_name'] not in INDICATOR_FUNCTIONS:
+            raise ServiceError(f"알 수 없는 전략: {context['strategy_name']} "
+                               f"(가능: {', '.join(INDICATOR_FUNCTIONS)})")
+
+        key = ('backtest', config_hash({'context': context, 'start': start_date, 'end': end_date}))
+        stats = self.cache.get(key)
+        if stats is None:
+            df = self._frame(symbol).loc[start_date:end_date]
+            if df.empty:
+                raise ServiceError(f"{start_date} ~ {end_date} 범위에 데이터가 없습니다.", status=404)
+            stats = simulate_backtest(df.copy(), context, verbose=False)
+            if stats is None:
+                raise ServiceError("신호 생성 실패", status=500)
+            stats = {'symbol': context['symbol'], 'strategy': context['strategy_name'],
+                     'start': df.index[0].strftime('%Y-%m-%d'), 'end': df.index[-1].strftime('%Y-%m-%d'),
+                     'context': context, 'stats': _to_json(stats)}
+            self.cache.put(key, stats)
+        return stats
+
+    def screener_list(self, threshold=screener.SCORE_THRESHOLD):
+        """latest_signals의 매수 후보 (데이터 버전마다 한 번 읽고, threshold 필터는 메모리에서)"""
+        with self._lock:
+            if self._signals is None:
+                self._signals = screener.query_latest_signals(threshold=float('-inf'))
+            signals = self._signals
+        df = signals[signals['Score'] >= threshold]
+        return {'threshold': threshold, 'count': len(df), 'results': df.to_dict(orient='records')}
+
+    def regime(self):
+        """시장 상태 (market_analyzer.analyze_market_status, 데이터 버전마다 한 번 계산)"""
+        with self._lock:
+            if self._regime is None:
+                self._regime = market_analyzer.analyze_market_status()
+            return self._regime
+
+
+def make_handler(service):
+    """service를 참조하는 요청 핸들러 클래스를 만듭니다."""
+
+    class QueryHandler(BaseHTTPRequestHandler):
+        GET_ROUTES = {
+            '/health': lambda q: service.health(),
+            '/score': lambda q: service.score(_require(q, 'symbol')),
+            '/backtest': lambda q: service.backtest(_require(q, 'symbol'),
+                                                    {k: v for k, v in q.items() if k != 'symbol'}),
+            '/screener': lambda q: service.screener_list(float(q.get('threshold', screener.SCORE_THRESHOLD))),
+            '/regime': lambda q: service.regime(),
+        }
+        POST_ROUTES = {
+            '/reload': lambda q: {'symbols': service.load(), 'version': service.version},
+        }
+
+        def _dispatch(self, routes):
+            start = time.time()
+            url = urlparse(self.path)
+            query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            route = routes.get(url.path.rstrip('/') or '/')
+            try:
+                if route is None:
+                    raise ServiceError(f"없는 경로: {url.path}", status=404)
+                service.refresh_if_stale()
+                body, status = {'ok': True, 'data': route(query)}, 200
+            except ServiceError as e:
+                body, status = {'ok': False, 'error': str(e)}, e.status
+            except Exception as e:
+                body, status = {'ok': False, 'error': f"{type(e).__name__}: {e}"}, 500
+            body['elapsed_ms'] = round((time.time() - start) * 1000, 2)
+
+            payload = json.dumps(_to_json(body), ensure_ascii=False, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            self._dispatch(self.GET_ROUTES)
+
+        def do_POST(self):
+            self._dispatch(self.POST_ROUTES)
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 콘솔 출력하지 않음
+
+    return QueryHandler
+
+
+def _require(query, name):
+    if not query.get(name):
+        raise ServiceError(f"'{name}' 파라미터가 필요합니다.")
+    return query[name]
+
+
+def serve(host=config.SERVICE_HOST, port=config.SERVICE_PORT, service=None):
+    """데이터를 로드하고 요청을 받기 시작합니다. (Ctrl+C로 종료)"""
+    service = service or MarketDataService()
+    service.load()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"🚀 [Service] http://{host}:{port} 에서 대기 중 (/health, /score, /backtest, /screener, /regime, /reload)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n🛑 [Service] 종료")
+    finally:
+        server.server_close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="메모리 상주 로컬 조회 서비스 (HTTP/JSON)")
+    parser.add_argument('--host', default=config.SERVICE_HOST)
+    parser.add_argument('--port', type=int, default=config.SERVICE_PORT)
+    parser.add_argument('--start', default=config.SERVICE_PRICE_START, help="메모리에 올릴 가격 데이터 시작일")
+    args = parser.parse_args(argv)
+    serve(args.host, args.port, MarketDataService(start_date=args.start))
+
+
+if __name__ == "__main__":
+    main()
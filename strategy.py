@@ -3,6 +3,9 @@
 import pandas as pd
 import numpy as np
 
+# 앙상블(apply_ensemble_strategy)에 포함되는 전략 목록 - signal_{전략명} 컬럼으로 저장됨
+ENSEMBLE_STRATEGIES = ['turtle', 'rsi', 'sma', 'bbands', 'macd', 'bbs', 'dema', 'obv', 'mfi', 'vol_spike']
+
 
 # --- 0. 공통 유틸리티 & Dispatcher ---
 
@@ -60,9 +63,8 @@ def apply_ensemble_strategy(df, context):
 
     df_ensemble = df.copy()
 
-    # 앙상블에 포함할 전략 리스트 정의
-    strategies = ['turtle', 'rsi', 'sma', 'bbands', 'macd', 'bbs', 'dema', 'obv', 'mfi', 'vol_spike']
-    for name in strategies:
+    # 앙상블에 포함할 전략 리스트 (ENSEMBLE_STRATEGIES)
+    for name in ENSEMBLE_STRATEGIES:
         # 1. 각 전략 실행 (임시 DF 사용)
         temp_df = execute_strategy(name, df_ensemble.copy(), context)
 
@@ -354,4 +356,141 @@ def generate_vol_spike_signals(df, context):
     # (단, 가격이 양봉일 때만 유효하다고 가정할 수도 있으나 여기선 거래량 자체만 봄)
     df.loc[df['vol_spike_ratio'] >= 2.0, 'signal'] = 1
 
-    return _clean_signals(df)
\ No newline at end of file
+    return _clean_signals(df)
+
+# ==========================================
+# 패널(종목 x 날짜) 버전: 마지막 bar 신호만 한 번에 계산
+# ==========================================
+# 위 generate_*_signals의 상태 머신(포지션 0/1)을 종목 축으로 벡터화한 버전입니다.
+# 시간 축만 루프를 돌고(T번), 종목 N개는 한 번에 처리합니다. 결과(마지막 bar 신호)는 종목별로 돌린 것과 동일합니다.
+# 패널은 종목별 시계열을 '오른쪽 정렬'한 (T x N) 배열 - 종목마다 마지막 행이 자신의 마지막 bar
+
+def build_signal_panel(frames, columns):
+    """
+    종목별 DataFrame 리스트 -> {컬럼: (T x N) 배열} + 종목별 첫 행 인덱스 + 종목별 컬럼 존재 여부
+
+    :param frames: [df, ...] (지표가 계산된 종목별 DataFrame, 날짜 오름차순)
+    :param columns: 패널로 만들 컬럼 이름들 (없는 컬럼은 NaN)
+    :return: (panel dict, first_row 배열, present dict - {컬럼: 길이 N bool 배열, 그 종목에 컬럼이 실제로 있었는지})
+    """
+    lengths = np.array([len(df) for df in frames], dtype=np.int64)
+    T = int(lengths.max()) if len(frames) else 0
+    panel = {col: np.full((T, len(frames)), np.nan) for col in columns}
+    present = {col: np.zeros(len(frames), dtype=bool) for col in columns}
+    for j, df in enumerate(frames):
+        start = T - lengths[j]
+        for col in columns:
+            if col in df.columns:
+                panel[col][start:, j] = df[col].to_numpy(dtype=np.float64)
+                present[col][j] = True
+    return panel, T - lengths, present
+
+
+def _last_signal(buy, sell, skip, first_row):
+    """
+    (T x N) 매수/매도 조건으로 상태 머신을 실행하고 마지막 행의 신호(1 / -1 / 0) 벡터를 반환합니다.
+    - skip: 루프가 continue하는 행 (NaN 등 - 포지션 유지, 신호 0)
+    - first_row: 종목별 첫 행 (generate_* 루프처럼 그 다음 행부터 평가)
+    """
+    T, N = buy.shape
+    position = np.zeros(N, dtype=bool)
+    signal = np.zeros(N, dtype=np.int64)
+    for i in range(1, T):
+        active = (i > first_row) & ~skip[i]
+        entered = active & ~position & buy[i]
+        exited = active & position & sell[i]
+        position = (position | entered) & ~exited
+        signal = entered.astype(np.int64) - exited.astype(np.int64)
+    return signal
+
+
+def _previous(values):
+    """한 행 아래로 민 배열 (i행에 i-1행 값, 첫 행은 NaN)"""
+    prev = np.full_like(values, np.nan)
+    prev[1:] = values[:-1]
+    return prev
+
+
+def _cross_last_signal(fast, slow, first_row):
+    """SMA / MACD / DEMA 공통: 직전 값이 NaN이면 건너뛰고, 상향 돌파 매수 / 하향 돌파 매도"""
+    fast_prev, slow_prev = _previous(fast), _previous(slow)
+    with np.errstate(invalid='ignore'):
+        buy = (fast_prev <= slow_prev) & (fast > slow)
+        sell = (fast_prev >= slow_prev) & (fast < slow)
+    return _last_signal(buy, sell, np.isnan(fast_prev) | np.isnan(slow_prev), first_row)
+
+
+# panel_last_signals 전략별 필요 컬럼 (generate_*_signals가 확인하는 컬럼과 같음)
+PANEL_STRATEGY_COLUMNS = {
+    'turtle': ('close', 'entry_high', 'exit_low'),
+    'rsi': ('rsi',),
+    'sma': ('sma_short', 'sma_long'),
+    'bbands': ('low', 'high', 'bbl', 'bbu'),
+    'macd': ('macd', 'macd_signal'),
+    'bbs': ('close', 'bbu', 'bbm', 'bbw', 'bbw_min_low'),
+    'dema': ('dema_short', 'dema_long'),
+}
+
+
+def panel_last_signals(panel, first_row, context, strategies=None, present=None):
+    """
+    generate_*_signals를 종목마다 돌렸을 때의 마지막 bar 신호를 패널 연산으로 계산합니다.
+
+    :param panel: build_signal_panel()의 결과 (필요한 지표 컬럼 포함)
+    :param strategies: 계산할 전략 (기본: 상태 머신 전략 7개 - turtle, rsi, sma, bbands, macd, bbs, dema)
+    :param present: build_signal_panel()의 컬럼 존재 여부 (없으면 패널에 있는 컬럼은 모든 종목에 있다고 봄)
+    :return: {전략명: 길이 N 신호 배열}
+             필요한 컬럼이 어느 종목에도 없는 전략은 제외, 일부 종목에만 없으면 그 종목의 신호는 0
+             (generate_*가 그 종목에 신호 컬럼을 만들지 않는 것과 동일 - 점수에 들어가지 않음)
+    """
+    strategies = strategies or list(PANEL_STRATEGY_COLUMNS)
+    first_row = np.asarray(first_row)
+    T = panel['close'].shape[0] if 'close' in panel else 0
+    no_skip = np.zeros((T, len(first_row)), dtype=bool)
+
+    available = {}  # {전략명: 필요 컬럼이 모두 있는 종목 마스크}
+    for name in strategies:
+        cols = PANEL_STRATEGY_COLUMNS.get(name, ())
+        if not cols or not all(col in panel for col in cols): continue
+        mask = np.ones(len(first_row), dtype=bool)
+        if present is not None:
+            for col in cols:
+                mask &= present[col]
+        if mask.any():
+            available[name] = mask
+    has = lambda name: name in available
+    signals = {}
+
+    with np.errstate(invalid='ignore'):
+        if has('turtle'):
+            close = panel['close']
+            signal = _last_signal(close > panel['entry_high'], close < panel['exit_low'], no_skip, first_row)
+            signal[(T - first_row) < context.get('entry_period', 20)] = 0  # 데이터가 너무 적으면 계산 불가
+            signals['turtle'] = signal
+
+        if has('rsi'):
+            rsi = panel['rsi']
+            signals['rsi'] = _last_signal(rsi < context.get('rsi_oversold', 30), rsi > context.get('rsi_overbought', 70),
+                                          np.isnan(rsi), first_row)
+
+        if has('sma'):
+            signals['sma'] = _cross_last_signal(panel['sma_short'], panel['sma_long'], first_row)
+
+        if has('bbands'):
+            signals['bbands'] = _last_signal(panel['low'] < panel['bbl'], panel['high'] > panel['bbu'],
+                                             np.isnan(panel['bbl']), first_row)
+
+        if has('macd'):
+            signals['macd'] = _cross_last_signal(panel['macd'], panel['macd_signal'], first_row)
+
+        if has('bbs'):
+            is_squeeze = panel['bbw'] <= panel['bbw_min_low']
+            signals['bbs'] = _last_signal(is_squeeze & (panel['close'] > panel['bbu']), panel['close'] < panel['bbm'],
+                                          np.isnan(panel['bbw_min_low']), first_row)
+
+        if has('dema'):
+            signals['dema'] = _cross_last_signal(panel['dema_short'], panel['dema_long'], first_row)
+
+    for name, signal in signals.items():
+        signal[~available[name]] = 0
+    return signals
@@ -0,0 +1,5 @@
+# 테스트는 저장소 루트의 모듈(config, indicator, backtesting ...)을 바로 import 합니다.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,58 @@
+# backtesting/cache.py StageCache + 포트폴리오 단계 캐시 키
+
+import os
+
+from backtesting.cache import StageCache
+
+
+def test_none_result_is_not_persisted(tmp_path):
+    cache = StageCache('indicators', persist=True, cache_dir=str(tmp_path))
+    assert cache.get_or_compute('k', lambda: None) is None
+    assert not cache.disk.exists('k')
+
+    # 새 프로세스(새 캐시 객체)에서는 실패한 계산을 다시 시도
+    retry = StageCache('indicators', persist=True, cache_dir=str(tmp_path))
+    assert retry.get_or_compute('k', lambda: 42) == 42
+    assert retry.disk.exists('k')
+    assert StageCache('indicators', persist=True, cache_dir=str(tmp_path)).get_or_compute('k', lambda: 0) == 42
+
+
+def test_stage_keys_include_code_version(tmp_path, monkeypatch):
+    import run_portfolio_backtest as rpb
+
+    config = dict(rpb.PORTFOLIO_CONFIG, _data_version='v1', _code_version='code-a')
+    changed = dict(config, _code_version='code-b')
+    for stage in ('indicators', 'votes', 'scores', 'signals'):
+        assert rpb.get_stage_key(stage, config, 'AAA') != rpb.get_stage_key(stage, changed, 'AAA')
+    assert rpb.get_signal_cache_key(config) != rpb.get_signal_cache_key(changed)
+
+    stamped = rpb.stamp_versions(rpb.PORTFOLIO_CONFIG)
+    assert stamped['_code_version'] == rpb.code_fingerprint(rpb.CODE_VERSION_FILES)
+
+    # 소스 파일 복사본으로 바꿔 두고, 결과를 만드는 파일 하나만 수정해도 결과 키가 바뀌는지 확인
+    copies = []
+    for path in rpb.CODE_VERSION_FILES:
+        copy = tmp_path / os.path.relpath(path, os.path.dirname(rpb.__file__))
+        copy.parent.mkdir(parents=True, exist_ok=True)
+        copy.write_bytes(open(path, 'rb').read())
+        copies.append(str(copy))
+    monkeypatch.setattr(rpb, 'CODE_VERSION_FILES', tuple(copies))
+
+    # 성과 지표 / 통계 누적기 / 가지치기 규칙 파일
+    for name in ('metrics.py', 'streaming.py', 'pruning.py'):
+        source_copy = tmp_path / 'backtesting' / name
+        assert str(source_copy) in copies
+        before = rpb.get_result_key(rpb.PORTFOLIO_CONFIG)
+        source_copy.write_text(source_copy.read_text(encoding='utf-8') + "\n# edited\n", encoding='utf-8')
+        assert rpb.get_result_key(rpb.PORTFOLIO_CONFIG) != before, name
+
+
+def test_code_version_does_not_depend_on_cwd(tmp_path, monkeypatch):
+    import run_portfolio_backtest as rpb
+
+    expected = rpb.code_fingerprint(rpb.CODE_VERSION_FILES)
+    monkeypatch.chdir(tmp_path)  # 벤치마크 워커처럼 저장소 밖에서 실행
+    assert all(os.path.isfile(path) for path in rpb.CODE_VERSION_FILES)
+    assert rpb.code_fingerprint(rpb.CODE_VERSION_FILES) == expected
+    assert rpb.code_fingerprint(rpb.CODE_VERSION_FILES) != rpb.code_fingerprint(
+        [os.path.basename(path) for path in rpb.CODE_VERSION_FILES])
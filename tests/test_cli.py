@@ -0,0 +1,20 @@
+# cli.py - 작업 명세 펼치기(expand_jobs) 테스트
+
+from cli import expand_jobs
+
+
+def test_grid_overrides_keys_also_set_by_defaults_and_job():
+    spec = {'defaults': {'strategy': 'macd', 'macd_fast_period': 12},
+            'jobs': [{'symbol': 'SPY', 'macd_slow_period': 26,
+                      'grid': {'macd_fast_period': [8, 10], 'macd_slow_period': [21]}}]}
+    contexts = expand_jobs(spec)
+
+    assert [c['macd_fast_period'] for c in contexts] == [8, 10]
+    assert all(c['macd_slow_period'] == 21 for c in contexts)
+    assert all(c['strategy_name'] == 'macd' and c['symbol'] == 'SPY' for c in contexts)
+
+
+def test_strategy_name_and_symbol_as_plain_or_grid_keys():
+    contexts = expand_jobs([{'strategy_name': 'rsi', 'grid': {'symbol': ['AAPL', 'MSFT']}}])
+
+    assert [(c['strategy_name'], c['symbol']) for c in contexts] == [('rsi', 'AAPL'), ('rsi', 'MSFT')]
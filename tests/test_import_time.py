@@ -0,0 +1,27 @@
+# benchmarks/import_time.py - import 시간 예산을 테스트로 실행
+
+import pytest
+
+from benchmarks import import_time
+
+# 진입점(cli / main / pipeline) + pandas를 쓰는 대표 모듈(strategy) - 지연 import 위반도 함께 확인
+BUDGET_MODULES = ('config', 'lazy_imports', 'cli', 'pipeline', 'strategy', 'main')
+
+
+def test_parse_importtime():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       120 |        120 |   json.decoder\n"
+              "import time:       300 |        420 | json\n")
+    assert import_time.parse_importtime(stderr) == [('json.decoder', 120, 120, 1), ('json', 300, 420, 0)]
+
+
+@pytest.mark.parametrize('module', BUDGET_MODULES)
+def test_import_within_budget(module):
+    ok, report = import_time.check_budgets({module: import_time.IMPORT_BUDGETS_MS[module]}, verbose=False)
+    assert ok, report
+
+
+def test_cli_startup_does_not_import_pandas():
+    _, rows = import_time.measure('cli')
+    loaded = {name.split('.')[0] for name, _, _, _ in rows}
+    assert not loaded.intersection({'pandas', 'numpy'} | set(import_time.DEFERRED_MODULES))
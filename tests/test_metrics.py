@@ -0,0 +1,82 @@
+# backtesting/metrics.py - 손으로 계산한 값과 비교하는 성과 지표 테스트
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting import metrics
+
+
+def test_calculate_metrics_pairs_trades_with_stop_loss():
+    dates = pd.bdate_range('2024-03-01', periods=4)
+    history = pd.DataFrame({'portfolio_value': [100.0, 110.0, 99.0, 120.0],
+                            'cash': [100.0, 10.0, 99.0, 20.0]}, index=dates)
+    trades = [
+        {'type': 'Sell', 'price': 80.0},        # 매수 없이 나온 매도 -> 무시
+        {'type': 'Buy', 'price': 100.0},
+        {'type': 'Stop-Loss', 'price': 90.0},   # -10%
+        {'type': 'Buy', 'price': 50.0},
+        {'type': 'Sell', 'price': 60.0},        # +20%
+        {'type': 'Sell', 'price': 70.0},        # 같은 매수의 두 번째 청산 -> 무시
+    ]
+    df_signals = pd.DataFrame({'close': [10.0, 11.0, 12.0, 15.0]}, index=dates)
+
+    stats = metrics.calculate_metrics(history, trades, df_signals, 100.0)
+
+    assert stats['total_trades'] == 2
+    assert stats['win_rate'] == pytest.approx(0.5)
+    assert stats['profit_factor'] == pytest.approx(1.0)  # 주당 손익 +10 / -10
+    # SQN = 평균(0.05) / 모표준편차(0.15) * sqrt(2)
+    assert stats['sqn'] == pytest.approx(0.05 / 0.15 * np.sqrt(2))
+    assert stats['total_return'] == pytest.approx(20.0)
+    assert stats['max_drawdown'] == pytest.approx((99.0 / 110.0 - 1) * 100)
+    assert stats['exposure_pct'] == pytest.approx(50.0)
+    assert stats['buy_and_hold_return'] == pytest.approx(50.0)
+
+
+def test_dca_buys_on_first_trading_day_of_each_month_across_year_end():
+    dates = pd.DatetimeIndex(['2023-12-28', '2023-12-29', '2024-01-02', '2024-01-03'])
+    close = np.array([10.0, 20.0, 5.0, 10.0])
+
+    # 12/28에 100달러(10주), 1/2에 100달러(20주) -> 평가금액 100, 200, 150, 300 / 투자금 200
+    values, invested = metrics.dca_curve(close, dates)
+    np.testing.assert_allclose(values, [100.0, 200.0, 150.0, 300.0])
+    np.testing.assert_allclose(invested, [100.0, 100.0, 200.0, 200.0])
+
+    total_return, mdd, total_invested = metrics.dca_stats(close, dates)
+    assert total_return == pytest.approx(50.0)
+    assert mdd == pytest.approx(-25.0)
+    assert total_invested == pytest.approx(200.0)
+
+    # 2D 입력(종목별)도 같은 값
+    returns, mdds, _ = metrics.dca_stats(np.vstack([close, close * 2]), dates)
+    np.testing.assert_allclose(returns, [50.0, 50.0])
+    np.testing.assert_allclose(mdds, [-25.0, -25.0])
+
+
+def test_flat_curve_has_zero_drawdown_and_ratios():
+    dates = pd.bdate_range('2023-12-27', periods=6)
+    history = [{'date': d, 'equity': 1000.0} for d in dates]
+
+    stats = metrics.portfolio_stats(history, [], 1000.0)
+
+    assert stats['mdd'] == 0.0
+    assert stats['return'] == 0.0 and stats['cagr'] == 0.0
+    assert stats['sharpe'] == 0.0 and stats['sortino'] == 0.0 and stats['calmar'] == 0.0
+    assert stats['yearly'] == {2023: 0.0, 2024: 0.0}
+    assert stats['total_trades'] == 0 and stats['profit_factor'] == 0.0
+
+
+def test_portfolio_stats_yearly_returns_and_no_loss_profit_factor():
+    dates = pd.DatetimeIndex(['2023-06-01', '2023-12-29', '2024-01-02', '2024-12-31'])
+    history = [{'date': d, 'equity': e} for d, e in zip(dates, [100.0, 110.0, 88.0, 132.0])]
+    trade_log = [{'return': 0.1, 'profit': 10.0}, {'return': 0.2, 'profit': 22.0}]
+
+    stats = metrics.portfolio_stats(history, trade_log, 100.0)
+
+    # 2023: 110 / 100 - 1, 2024: 132 / 110 - 1
+    assert stats['yearly'][2023] == pytest.approx(10.0)
+    assert stats['yearly'][2024] == pytest.approx(20.0)
+    assert stats['mdd'] == pytest.approx(-20.0)
+    assert stats['win_rate'] == pytest.approx(100.0)
+    assert stats['profit_factor'] == metrics.PROFIT_FACTOR_NO_LOSS
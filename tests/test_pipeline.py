@@ -0,0 +1,60 @@
+# pipeline.py - lane 직렬화 / 부분 실패 스탬프 테스트
+
+import threading
+import time
+
+from pipeline import Stage, StageIncomplete, Pipeline
+
+
+def test_same_lane_stages_never_overlap():
+    lock = threading.Lock()
+    active, overlaps = [0], []
+
+    def collect(inputs):
+        with lock:
+            active[0] += 1
+            overlaps.append(active[0])
+        time.sleep(0.05)
+        with lock:
+            active[0] -= 1
+        return 1
+
+    stages = [Stage(name, collect, outputs=[name], lane='collect') for name in ['a', 'b', 'c']]
+    stages.append(Stage('free', lambda inputs: 2, outputs=['free']))
+    values = Pipeline(stages, stamp_file=None, workers=4).run(verbose=False)
+
+    assert values == {'a': 1, 'b': 1, 'c': 1, 'free': 2}
+    assert max(overlaps) == 1
+
+
+def test_incomplete_stage_feeds_downstream_but_is_not_stamped(tmp_path):
+    stamp_file = str(tmp_path / 'stamps.json')
+    calls = []
+
+    def update(inputs):
+        calls.append('update')
+        if len(calls) == 1:
+            raise StageIncomplete("1/3개 종목 업데이트 실패", [2, '2024-01-02'])
+        return [3, '2024-01-02']
+
+    def build():
+        return Pipeline([Stage('update', update, outputs=['prices'], fingerprint=lambda: 'today'),
+                         Stage('signals', lambda inputs: inputs['prices'][0], inputs=['prices'])],
+                        stamp_file=stamp_file)
+
+    pipeline = build()
+    values = pipeline.run(verbose=False)
+    assert values['signals'] == 2  # 부분 결과로 하위 단계 진행
+    assert [row['status'] for row in pipeline.report] == ['failed', 'done']
+
+    # 같은 날 다시 실행해도 완료 스탬프가 없으므로 다시 수집
+    pipeline = build()
+    values = pipeline.run(verbose=False)
+    assert calls == ['update', 'update']
+    assert values['signals'] == 3
+
+    # 전부 성공한 뒤에는 건너뜀
+    pipeline = build()
+    pipeline.run(verbose=False)
+    assert calls == ['update', 'update']
+    assert [row['status'] for row in pipeline.report] == ['skipped', 'skipped']
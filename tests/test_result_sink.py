@@ -0,0 +1,54 @@
+# backtesting/result_sink.py - 배치 writer 저장 / 실패 보고
+
+import sqlite3
+
+import pytest
+
+from backtesting.result_sink import ResultSink, ResultSinkError
+
+
+def read_rows(db_path, table):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT name, value FROM {table} ORDER BY id").fetchall()
+
+
+def test_rows_are_written_on_flush(tmp_path):
+    db_path = str(tmp_path / 'log.db')
+    sink = ResultSink(db_path, batch_size=1000, flush_interval=60)
+    try:
+        sink.write('results', {'name': 'a', 'value': 1.5})
+        sink.write('results', {'name': 'b', 'value': 2})
+        sink.flush(timeout=10)
+        assert read_rows(db_path, 'results') == [('a', 1.5), ('b', 2)]
+    finally:
+        sink.close()
+
+
+def test_failed_batch_is_reported_and_writer_keeps_running(tmp_path):
+    db_path = str(tmp_path / 'log.db')
+    sink = ResultSink(db_path, batch_size=1000, flush_interval=60)
+    try:
+        sink.write('results', {'name': 'ok', 'value': 1})
+        sink.flush(timeout=10)
+
+        sink.write('results', {'name': 'too_big', 'value': 2 ** 70})  # sqlite3 INTEGER 범위 초과 (OverflowError)
+        with pytest.raises(ResultSinkError):
+            sink.flush(timeout=10)
+
+        # writer 스레드는 살아 있고 이후 기록도 정상
+        sink.write('results', {'name': 'after', 'value': 3})
+        sink.flush(timeout=10)
+        assert read_rows(db_path, 'results') == [('ok', 1), ('after', 3)]
+    finally:
+        sink.close(timeout=10)
+    assert not sink._thread.is_alive()
+
+
+def test_close_reports_pending_failures(tmp_path):
+    sink = ResultSink(str(tmp_path / 'log.db'), batch_size=1000, flush_interval=60)
+    sink.write('results', {'name': 'too_big', 'value': 2 ** 70})
+    with pytest.raises(ResultSinkError):
+        sink.close(timeout=10)
+    assert not sink._thread.is_alive()
+    with pytest.raises(ResultSinkError):
+        sink.write('results', {'name': 'closed', 'value': 1})
@@ -0,0 +1,34 @@
+# screener.py - latest_signals 조회 범위 / 재계산 해시
+
+import sqlite3
+
+import database
+import screener
+
+
+def insert_signal(conn, symbol, score, date='2024-12-31'):
+    conn.execute("INSERT INTO latest_signals (symbol, date, close, score, strategies) VALUES (?, ?, ?, ?, ?)",
+                 (symbol, date, 100.0, score, 'turtle'))
+
+
+def test_query_skips_symbols_outside_universe(tmp_path, monkeypatch):
+    db_path = str(tmp_path / 'market_data.db')
+    database.create_tables(db_path)
+    monkeypatch.setattr(database, 'get_connection', lambda db=None: sqlite3.connect(db or db_path))
+
+    with sqlite3.connect(db_path) as conn:
+        database.create_latest_signals_table(conn.cursor())
+        conn.executemany("INSERT INTO tickers (symbol) VALUES (?)", [('AAA',), ('BBB',)])
+        insert_signal(conn, 'AAA', 3.0)
+        insert_signal(conn, 'BBB', 1.0)
+        insert_signal(conn, 'OLD', 5.0, date='2020-06-30')  # 유니버스에서 빠진 종목의 예전 행
+
+    assert screener.query_latest_signals(2.0)['Symbol'].tolist() == ['AAA']
+    assert screener.query_latest_signals(float('-inf'))['Symbol'].tolist() == ['AAA', 'BBB']
+    assert screener.query_latest_signals(2.0, tickers=['OLD'])['Symbol'].tolist() == ['OLD']
+
+
+def test_params_hash_tracks_code_version(monkeypatch):
+    before = screener._params_hash()
+    monkeypatch.setattr(screener, '_code_version', lambda: 'edited')
+    assert screener._params_hash() != before
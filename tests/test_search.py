@@ -0,0 +1,121 @@
+# backtesting/search.py - successive halving / hyperband가 작은 그리드에서 전수 조사와 같은 최적 조합을 찾는지
+
+import itertools
+
+import pytest
+
+from backtesting.search import run_search
+
+GRID = {'fast': [5, 8, 12, 16], 'slow': [20, 26, 34], 'threshold': [0.5, 1.0, 1.5]}
+
+
+def make_candidates():
+    keys, values = zip(*GRID.items())
+    return [dict(zip(keys, v)) for v in itertools.product(*values)]
+
+
+def true_score(params):
+    """전체 예산 점수: fast=12, slow=26, threshold=1.0에서 최대"""
+    return -((params['fast'] - 12) ** 2) / 10 - abs(params['slow'] - 26) / 4 - (params['threshold'] - 1.0) ** 2
+
+
+def noise(params):
+    """조합마다 고정된 작은 잡음 (-0.5 ~ 0.5)"""
+    return ((params['fast'] * 7 + params['slow'] * 13 + int(params['threshold'] * 10) * 3) % 11) / 10 - 0.5
+
+
+def evaluate_batch_factory(log):
+    """예산이 작을수록 잡음이 큰 평가 (짧은 기간으로 백테스트한 것처럼)"""
+    def evaluate_batch(batch, budget):
+        log.append((budget, len(batch)))
+        return [{'total_return': true_score(p) + (1 - budget) * noise(p)} for p in batch]
+    return evaluate_batch
+
+
+def best_of(final):
+    return max(final, key=lambda item: item[1]['total_return'])[0]
+
+
+@pytest.mark.parametrize('mode', ['halving', 'hyperband'])
+def test_matches_exhaustive_best(mode):
+    candidates = make_candidates()
+    score = lambda r: r['total_return']
+
+    grid_final, grid_summary = run_search('grid', candidates, evaluate_batch_factory([]), score)
+    log = []
+    final, summary = run_search(mode, candidates, evaluate_batch_factory(log), score)
+
+    assert best_of(final) == best_of(grid_final) == {'fast': 12, 'slow': 26, 'threshold': 1.0}
+    assert grid_summary['full_equivalent'] == len(candidates)
+    assert summary['full_equivalent'] < grid_summary['full_equivalent']
+
+
+def test_halving_group_promotion_keeps_each_group_best():
+    candidates = [dict(p, symbol=s) for s in ('AAA', 'BBB') for p in make_candidates()]
+    score = lambda r: r['total_return']
+
+    def evaluate_batch(batch, budget):
+        # BBB는 전체적으로 점수가 낮아도 그룹별로 따로 승격되어야 함
+        return [{'total_return': true_score(p) + (1 - budget) * noise(p) - (100 if p['symbol'] == 'BBB' else 0)}
+                for p in batch]
+
+    final, _ = run_search('halving', candidates, evaluate_batch, score, group=lambda p: p['symbol'])
+    for symbol in ('AAA', 'BBB'):
+        members = [(p, r) for p, r in final if p['symbol'] == symbol]
+        assert best_of(members) == {'fast': 12, 'slow': 26, 'threshold': 1.0, 'symbol': symbol}
+
+
+def test_failed_candidates_are_dropped():
+    candidates = make_candidates()
+    score = lambda r: r['total_return']
+
+    def evaluate_batch(batch, budget):
+        return [None if p['fast'] == 12 else {'total_return': true_score(p)} for p in batch]
+
+    final, _ = run_search('halving', candidates, evaluate_batch, score)
+    assert final and all(p['fast'] != 12 for p, _ in final)
+
+
+@pytest.mark.parametrize('strategy_name', ['dema', 'sma'])
+def test_real_grid_full_budget_results_match_exhaustive(strategy_name):
+    """
+    config.STRATEGY_GRID_MAP 그리드를 합성 종목으로 실제 백테스트 (run_optimization._run_budgeted_backtest)
+    짧은 기간 예산의 순위는 전체 기간과 다를 수 있어 최적 조합이 전수 조사와 항상 같지는 않음
+    -> 전체 예산으로 승격된 조합의 결과가 전수 조사와 같고, 그중 최고를 고르는지 확인
+    """
+    pytest.importorskip('pandas_ta')
+    import pandas as pd
+    import config
+    import run_optimization
+    from benchmarks.synthetic_data import simulate_market, simulate_symbol
+
+    n_days = 1500
+    market = simulate_market(11, n_days)
+    _, first_day, (open_, high, low, close, volume) = simulate_symbol(11, 0, market)
+    df = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+                      index=pd.DatetimeIndex(pd.bdate_range(end='2024-12-31', periods=n_days)[first_day:], name='date'))
+
+    grid = config.STRATEGY_GRID_MAP[strategy_name]
+    candidates = [{'strategy_name': strategy_name, 'initial_capital': 10000.0,
+                   'risk_percent': config.RISK_PER_TRADE_PERCENT, 'stop_loss_atr': config.STOP_LOSS_ATR_MULTIPLIER,
+                   'atr_period': config.ATR_PERIOD, **params}
+                  for params in run_optimization.generate_param_combinations(grid)]
+
+    def evaluate_batch(batch, budget):
+        return [run_optimization._run_budgeted_backtest(df, dict(c, history_fraction=budget) if budget < 1.0 else c,
+                                                         prune=True) for c in batch]
+
+    score = lambda stats: None if stats.get('pruned') else stats['total_return']
+    key = lambda c: tuple(c[k] for k in grid)
+    grid_final, grid_summary = run_search('grid', candidates, evaluate_batch, score)
+    exhaustive = {key(c): stats for c, stats in grid_final}
+
+    for mode in ('halving', 'hyperband'):
+        final, summary = run_search(mode, candidates, evaluate_batch, score)
+        assert final and summary['full_equivalent'] < grid_summary['full_equivalent']
+        for c, stats in final:
+            assert stats == exhaustive[key(c)]  # 전체 예산 평가 = 전수 조사 평가 (예산 1.0은 자르지 않음)
+
+        promoted = [(c, s) for c, s in final if score(s) is not None]
+        best = max(promoted, key=lambda item: score(item[1]))[0]
+        assert score(exhaustive[key(best)]) == max(score(exhaustive[key(c)]) for c, _ in promoted)
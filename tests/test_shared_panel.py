@@ -0,0 +1,53 @@
+# backtesting/shared_panel.py - 공유 메모리 가격 패널 왕복 테스트
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtesting.shared_panel import SharedPricePanel
+
+
+def make_long_frame(unit):
+    dates = pd.date_range('2020-01-01', periods=5, freq='B').as_unit(unit)
+    rows = []
+    for k, symbol in enumerate(['AAA', 'BBB']):
+        for i, date in enumerate(dates):
+            if symbol == 'BBB' and i == 0:
+                continue  # BBB는 첫날 데이터 없음
+            price = 100.0 + 10 * k + i
+            rows.append({'date': date, 'symbol': symbol, 'open': price, 'high': price + 1, 'low': price - 1,
+                         'close': price, 'volume': 1000.0 + i})
+    return pd.DataFrame(rows), dates
+
+
+@pytest.mark.parametrize('unit', ['s', 'ms', 'us', 'ns'])
+def test_dates_survive_publish_and_attach(unit):
+    df_all, dates = make_long_frame(unit)
+    panel = SharedPricePanel.publish(df_all)
+    try:
+        worker = SharedPricePanel.attach(panel.meta)
+        try:
+            expected = pd.DatetimeIndex(dates).as_unit('ns')
+            assert list(worker.dates.as_unit('ns')) == list(expected)
+
+            aaa = worker.frame(worker.symbol_index('AAA'))
+            assert list(aaa.index.as_unit('ns')) == list(expected)
+            assert aaa['close'].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+
+            bbb = worker.frame(worker.symbol_index('BBB'))
+            assert list(bbb.index.as_unit('ns')) == list(expected[1:])
+            assert np.allclose(bbb['volume'], [1001.0, 1002.0, 1003.0, 1004.0])
+        finally:
+            worker.close()
+    finally:
+        panel.close()
+
+
+def test_unknown_symbol_index():
+    df_all, _ = make_long_frame('ns')
+    panel = SharedPricePanel.publish(df_all, symbols=['AAA'])
+    try:
+        assert panel.symbols == ['AAA']
+        assert panel.symbol_index('BBB') == -1
+    finally:
+        panel.close()
@@ -0,0 +1,88 @@
+# strategy.py - 패널 신호(panel_last_signals)와 종목별 generate_*_signals 일치 테스트
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pandas_ta')
+
+import strategy
+from benchmarks.synthetic_data import simulate_market, simulate_symbol
+from run_live_trading import LIVE_CONFIG, ENSEMBLE_WEIGHTS, add_live_indicators
+
+N_DAYS = 400
+N_SYMBOLS = 12
+COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'atr', 'entry_high', 'exit_low', 'rsi', 'sma_short',
+           'sma_long', 'bbl', 'bbm', 'bbu', 'bbw', 'bbw_min_low', 'macd', 'macd_signal', 'dema_short', 'dema_long']
+GENERATORS = {
+    'turtle': strategy.generate_turtle_signals,
+    'rsi': strategy.generate_rsi_signals,
+    'sma': strategy.generate_sma_signals,
+    'bbands': strategy.generate_bbands_signals,
+    'macd': strategy.generate_macd_signals,
+    'bbs': strategy.generate_bbs_signals,
+    'dema': strategy.generate_dema_signals,
+}
+
+
+@pytest.fixture(scope='module')
+def frames():
+    """합성 종목들 (상장일이 달라 길이가 제각각) -> 지표 계산된 DataFrame 리스트"""
+    market = simulate_market(7, N_DAYS)
+    dates = pd.bdate_range(end='2024-12-31', periods=N_DAYS)
+    result = []
+    for index in range(N_SYMBOLS):
+        _, first_day, (open_, high, low, close, volume) = simulate_symbol(7, index, market)
+        df = pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+                          index=pd.DatetimeIndex(dates[first_day:], name='date'))
+        df = df.iloc[index * 15:]  # 상장일과 별개로 종목마다 길이를 다르게 (패널 앞쪽 NaN 정렬 확인)
+        df, _ = add_live_indicators(df, f'SY{index}')
+        result.append(df)
+    return result
+
+
+def per_symbol_last_signals(frames):
+    """generate_*_signals를 종목마다 돌린 마지막 bar 신호 -> {전략명: 길이 N 배열}"""
+    signals = {}
+    for name, func in GENERATORS.items():
+        context = dict(LIVE_CONFIG)
+        signals[name] = np.array([func(df, context)['signal'].iloc[-1] for df in frames], dtype=np.int64)
+    return signals
+
+
+def test_panel_signals_match_generators(frames):
+    events = 0
+    for end in range(N_DAYS - 120, N_DAYS + 1, 8):
+        # 모든 종목을 같은 날짜(end)에서 자름 (패널은 마지막 날짜 기준 우측 정렬)
+        window = [df.iloc[:max(0, end - (N_DAYS - len(df)))] for df in frames]
+        window = [df for df in window if len(df) >= 2]
+        panel, first_row, present = strategy.build_signal_panel(window, COLUMNS)
+        panel_signals = strategy.panel_last_signals(panel, first_row, LIVE_CONFIG, strategies=list(ENSEMBLE_WEIGHTS),
+                                                    present=present)
+        expected = per_symbol_last_signals(window)
+
+        assert set(panel_signals) == set(GENERATORS)
+        for name in GENERATORS:
+            np.testing.assert_array_equal(panel_signals[name], expected[name], err_msg=f'{name} @ {end}')
+            events += int(np.count_nonzero(expected[name]))
+
+    # 매수/매도 신호가 실제로 발생한 시점을 충분히 비교했는지 (모두 0끼리 비교하는 테스트가 되지 않도록)
+    assert events >= 20
+
+
+def test_missing_indicator_columns_are_not_scored(frames):
+    """컬럼이 없는 종목은 generate_*처럼 신호 컬럼이 없음(0), 어느 종목에도 없으면 전략 자체를 제외"""
+    window = [df.drop(columns=['macd', 'macd_signal']) for df in frames]
+    window[0] = window[0].drop(columns=['rsi'])
+    panel, first_row, present = strategy.build_signal_panel(window, COLUMNS)
+    assert not present['macd'].any() and not present['rsi'][0] and present['rsi'][1:].all()
+
+    panel_signals = strategy.panel_last_signals(panel, first_row, LIVE_CONFIG, strategies=list(ENSEMBLE_WEIGHTS),
+                                                present=present)
+    assert 'macd' not in panel_signals
+    for name in panel_signals:
+        context = dict(LIVE_CONFIG)
+        for j, df in enumerate(window):
+            result = GENERATORS[name](df, context)
+            expected = result['signal'].iloc[-1] if 'signal' in result.columns else 0
+            assert panel_signals[name][j] == expected, f'{name} / {j}'
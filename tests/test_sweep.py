@@ -0,0 +1,29 @@
+# backtesting/sweep.py - 결과 순서 / with_index
+
+import pytest
+
+pytest.importorskip('tqdm')
+
+from backtesting.sweep import run_sweep
+
+
+def load_data(key):
+    return None if key == 'missing' else {'key': key}
+
+
+def evaluate(data, params):
+    if params.get('fail'):
+        raise ValueError('boom')
+    return None if params.get('empty') else f"{data['key']}-{params['n']}"
+
+
+def test_results_keep_job_order_and_indices():
+    jobs = [('b', {'n': 0}), ('a', {'n': 1}), ('missing', {'n': 2}), ('a', {'n': 3, 'empty': True}),
+            ('b', {'n': 4, 'fail': True}), ('a', {'n': 5})]
+
+    results, summary = run_sweep(jobs, evaluate, load_data, processes=1)
+    assert [r for _, r in results] == ['b-0', 'a-1', 'a-5']
+    assert (summary['completed'], summary['empty'], summary['errors']) == (3, 2, 1)
+
+    indexed, _ = run_sweep([tuple(job) for job in jobs], evaluate, load_data, processes=1, with_index=True)
+    assert [(i, r) for i, _, r in indexed] == [(0, 'b-0'), (1, 'a-1'), (5, 'a-5')]